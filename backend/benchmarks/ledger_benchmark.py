@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Ledger Benchmark — JSON File vs SQLite
+
+Builds a synthetic, validly chained ledger of each size on both backends and
+reports (milliseconds, median over repeats):
+
+- open: load + full chain verification (what server startup pays)
+- append: one append (JSON rewrites the file; SQLite writes one WAL row)
+- by agent / by hash: exact-match query, one page
+- top env: 10 best rewards within one env_type
+- deep page: 100 entries from the middle of the ledger
+- count env: count of one env_type
+
+Ledgers are bulk-built (JSON: one file write; SQLite: import_entries), not
+appended one by one — appending 1M entries to the JSON ledger is quadratic.
+
+Usage (from backend/):
+    python benchmarks/ledger_benchmark.py
+    python benchmarks/ledger_benchmark.py --sizes 10000 100000 --backends sqlite --appends 50
+"""
+
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# Add backend directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.ledger.ledger import LEDGER_HASH_VERSION, LedgerEntry, PolicyLedger, compute_entry_hash
+from src.ledger.sqlite_ledger import SqlitePolicyLedger
+
+
+BACKENDS = ("json", "sqlite")
+ENV_TYPES = ["standard", "short_burst", "extended", "high_pressure", "sparse_attacks"]
+AGENTS = 1000  # Distinct agent ids in the synthetic ledger
+
+
+def synthetic_entries(size: int, seed: int = 0) -> Iterator[LedgerEntry]:
+    """A valid hash chain of `size` entries with random agents, rewards and env types."""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    previous_hash = "genesis"
+    for i in range(size):
+        policy_hash = f"{rng.getrandbits(256):064x}"
+        reward = round(rng.uniform(-50.0, 50.0), 6)
+        agent_id = f"agent_{rng.randrange(AGENTS)}"
+        timestamp = (start + timedelta(seconds=i)).isoformat()
+        env_config = {"env_type": ENV_TYPES[i % len(ENV_TYPES)]}
+        current_hash = compute_entry_hash(policy_hash, reward, agent_id, timestamp, previous_hash,
+                                          env_config, LEDGER_HASH_VERSION)
+        yield LedgerEntry(policy_hash, reward, agent_id, timestamp, previous_hash, current_hash,
+                          env_config, LEDGER_HASH_VERSION)
+        previous_hash = current_hash
+
+
+def build(backend: str, path: Path, size: int):
+    if backend == "json":
+        ledger = PolicyLedger(path)
+        ledger._entries = list(synthetic_entries(size))
+        ledger._save_to_storage()
+    else:
+        ledger = SqlitePolicyLedger(path)
+        ledger.import_entries(synthetic_entries(size))
+        ledger.close()
+
+
+def timed(fn: Callable, repeats: int) -> float:
+    """Median wall-clock milliseconds of fn()."""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append(1000 * (time.perf_counter() - start))
+    return statistics.median(samples)
+
+
+def benchmark(sizes: Sequence[int], backends: Sequence[str], appends: int, repeats: int) -> List[Dict]:
+    rows = []
+    for size in sizes:
+        probe = next(e for i, e in enumerate(synthetic_entries(size)) if i == size // 2)
+        for backend in backends:
+            with tempfile.TemporaryDirectory() as tmp:
+                path = Path(tmp) / ("ledger.json" if backend == "json" else "ledger.db")
+                start = time.perf_counter()
+                build(backend, path, size)
+                build_seconds = time.perf_counter() - start
+
+                opened = []
+                open_ms = timed(lambda: opened.append(
+                    PolicyLedger(path) if backend == "json" else SqlitePolicyLedger(path)), 1)
+                ledger = opened[-1]
+
+                counter = iter(range(appends))
+                row = {
+                    'size': size,
+                    'backend': backend,
+                    'build_s': build_seconds,
+                    'open': open_ms,
+                    'append': timed(lambda: ledger.append(f"{next(counter):064x}", 1.0, "bench_agent",
+                                                          {"env_type": "standard"}), appends),
+                    'by agent': timed(lambda: ledger.query(agent_id=probe.agent_id), repeats),
+                    'by hash': timed(lambda: ledger.query(policy_hash=probe.policy_hash), repeats),
+                    'top env': timed(lambda: ledger.query(env_type="extended", order_by="verified_reward",
+                                                          descending=True, limit=10), repeats),
+                    'deep page': timed(lambda: ledger.query(offset=size // 2, limit=100), repeats),
+                    'count env': timed(lambda: ledger.count_matching(env_type="extended"), repeats),
+                }
+                if backend == "sqlite":
+                    ledger.close()
+                rows.append(row)
+                print(f"  {backend} @ {size}: built in {build_seconds:.1f}s", file=sys.stderr)
+    return rows
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare JSON and SQLite ledger latency")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=list(BACKENDS))
+    parser.add_argument("--appends", type=int, default=10, help="Appends timed per ledger")
+    parser.add_argument("--repeats", type=int, default=20, help="Repeats per query")
+    args = parser.parse_args(argv)
+
+    rows = benchmark(args.sizes, args.backends, args.appends, args.repeats)
+
+    columns = ['open', 'append', 'by agent', 'by hash', 'top env', 'deep page', 'count env']
+    print("median milliseconds")
+    print(f"{'size':>9}  {'backend':<8}" + "".join(f"{c:>11}" for c in columns))
+    for row in rows:
+        print(f"{row['size']:>9}  {row['backend']:<8}" + "".join(f"{row[c]:>11.2f}" for c in columns))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
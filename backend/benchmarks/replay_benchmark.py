@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Replay Buffer Benchmark — Uniform vs Prioritized
+
+Trains the live-session learner (Double Q-Learning + experience replay) on
+every environment preset with both replay buffers and reports (each run uses
+the preset's own environment, seeded with its seed_base + `--seeds` offset):
+
+- episodes to convergence: first episode at which the 50-episode rolling
+  mean reward reaches 90% of the way from the starting level to the final
+  plateau (start/plateau are shared by both buffers, so the target is the
+  same for each)
+- wall-clock seconds for the full run and per episode
+
+Usage (from backend/):
+    python benchmarks/replay_benchmark.py
+    python benchmarks/replay_benchmark.py --episodes 1000 --seeds 0 1 2 3 --presets standard extended
+"""
+
+from typing import Dict, List, Optional, Sequence
+import argparse
+import os
+import random
+import sys
+import time
+
+# Add backend directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agent.double_q_learning import create_replay_buffer, initialize_double_q_tables, REPLAY_KINDS
+from src.agent.trainer import train_episode
+from src.environments.env_presets import ENV_PRESETS
+from src.environments.env_spec import EnvSpec, env_registry
+from src.shared.config import (
+    EPSILON_START, EPSILON_END, EPSILON_DECAY,
+    REPLAY_BUFFER_SIZE, REPLAY_BATCH_SIZE, REPLAY_START_SIZE
+)
+
+
+WINDOW = 50  # Rolling window for the convergence criterion
+PROGRESS = 0.9  # Fraction of the start → plateau gap that counts as converged
+
+
+def run(kind: str, preset: str, seed: int, episodes: int) -> Dict:
+    """Train one agent on a preset (its dynamics and seed_base + seed); returns reward history and time."""
+    config = ENV_PRESETS[preset]
+    random.seed(config.seed_base + seed)
+    env = env_registry.make(EnvSpec.cyber(config.seed_base + seed, config.time_horizon, preset))
+    q_table_a, q_table_b = initialize_double_q_tables()
+    replay_buffer = create_replay_buffer(kind, REPLAY_BUFFER_SIZE, REPLAY_BATCH_SIZE, REPLAY_START_SIZE)
+
+    epsilon = EPSILON_START
+    rewards = []
+    start = time.perf_counter()
+    for _ in range(episodes):
+        reward, _ = train_episode(env, {}, epsilon, q_table_a=q_table_a, q_table_b=q_table_b,
+                                  replay_buffer=replay_buffer)
+        rewards.append(reward)
+        epsilon = max(EPSILON_END, epsilon * EPSILON_DECAY)
+    return {'rewards': rewards, 'seconds': time.perf_counter() - start}
+
+
+def rolling_means(values: Sequence[float], window: int = WINDOW) -> List[float]:
+    """Mean of each full window (index i covers values[i:i + window])."""
+    total = sum(values[:window])
+    means = [total / window]
+    for i in range(window, len(values)):
+        total += values[i] - values[i - window]
+        means.append(total / window)
+    return means
+
+
+def episodes_to_target(means: Sequence[float], target: float, rising: bool) -> Optional[int]:
+    """Episodes completed when the rolling mean first reaches target (None = never)."""
+    for i, mean in enumerate(means):
+        if (mean >= target) if rising else (mean <= target):
+            return i + WINDOW
+    return None
+
+
+def benchmark(presets: Sequence[str], seeds: Sequence[int], episodes: int) -> List[Dict]:
+    rows = []
+    for preset in presets:
+        for seed in seeds:
+            results = {kind: run(kind, preset, seed, episodes) for kind in REPLAY_KINDS}
+            means = {kind: rolling_means(result['rewards']) for kind, result in results.items()}
+
+            start_level = sum(m[0] for m in means.values()) / len(means)
+            plateau = max(m[-1] for m in means.values())
+            target = start_level + PROGRESS * (plateau - start_level)
+            rising = plateau >= start_level
+
+            for kind, result in results.items():
+                rows.append({
+                    'preset': preset,
+                    'seed': seed,
+                    'replay': kind,
+                    'episodes_to_convergence': episodes_to_target(means[kind], target, rising),
+                    'final_reward': means[kind][-1],
+                    'seconds': result['seconds'],
+                    'ms_per_episode': 1000 * result['seconds'] / episodes,
+                })
+    return rows
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare uniform and prioritized experience replay")
+    parser.add_argument("--episodes", type=int, default=600, help="Episodes per run")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0, 1, 2])
+    parser.add_argument("--presets", nargs="+", default=list(ENV_PRESETS), choices=list(ENV_PRESETS))
+    args = parser.parse_args(argv)
+
+    rows = benchmark(args.presets, args.seeds, args.episodes)
+
+    print(f"{'preset':<16}{'seed':>5}  {'replay':<12}{'to conv.':>9}{'final':>10}{'time (s)':>10}{'ms/ep':>8}")
+    for row in rows:
+        converged = row['episodes_to_convergence']
+        print(f"{row['preset']:<16}{row['seed']:>5}  {row['replay']:<12}"
+              f"{converged if converged is not None else '—':>9}{row['final_reward']:>10.2f}"
+              f"{row['seconds']:>10.2f}{row['ms_per_episode']:>8.2f}")
+
+    print()
+    print(f"{'replay':<12}{'mean to conv.':>14}{'not conv.':>10}{'mean time (s)':>15}")
+    for kind in REPLAY_KINDS:
+        subset = [row for row in rows if row['replay'] == kind]
+        reached = [row['episodes_to_convergence'] for row in subset if row['episodes_to_convergence'] is not None]
+        mean_episodes = sum(reached) / len(reached) if reached else float('nan')
+        mean_seconds = sum(row['seconds'] for row in subset) / len(subset)
+        print(f"{kind:<12}{mean_episodes:>14.1f}{len(subset) - len(reached):>10}{mean_seconds:>15.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
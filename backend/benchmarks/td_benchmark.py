@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+TD Method Benchmark — One-Step vs n-Step vs Watkins Q(λ)
+
+Trains the live-session learner (Double Q-Learning + uniform replay) on
+every environment preset with each TD method and reports the wall-clock
+training time until the greedy policy reaches a target verified reward.
+Each run uses the preset's own environment, seeded with its seed_base +
+`--seeds` offset.
+
+- Every `--eval-every` episodes the greedy policy is replayed by
+  PolicyVerifier (the same 20-episode replay that verification uses);
+  evaluation time is not counted as training time
+- The target is `--fraction` of the best verified reward any method
+  reached for that (preset, seed), so it is the same for every method;
+  `--target` sets an absolute target instead
+
+Usage (from backend/):
+    python benchmarks/td_benchmark.py
+    python benchmarks/td_benchmark.py --episodes 1500 --seeds 0 1 2 --presets standard extended --n-step 5
+"""
+
+from typing import Dict, List, Optional, Sequence
+import argparse
+import os
+import random
+import sys
+import time
+
+# Add backend directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agent.double_q_learning import create_replay_buffer, initialize_double_q_tables, merge_q_tables
+from src.agent.multistep import TD_METHODS, make_episode_fn
+from src.agent.policy import extract_policy
+from src.environments.env_presets import ENV_PRESETS
+from src.environments.env_spec import EnvSpec, env_registry
+from src.verifier.verifier import PolicyVerifier
+from src.shared.config import (
+    EPSILON_START, EPSILON_END, EPSILON_DECAY, N_STEP, TRACE_LAMBDA,
+    REPLAY_BUFFER_SIZE, REPLAY_BATCH_SIZE, REPLAY_START_SIZE
+)
+
+
+def run(td_method: str, preset: str, seed: int, episodes: int, eval_every: int,
+        n_step: int, trace_lambda: float) -> Dict:
+    """
+    Train one agent on a preset (its dynamics and seed_base + seed), scoring
+    the greedy policy every eval_every episodes.
+
+    Returns:
+        Dict with 'checkpoints': [(episodes, training seconds, verified reward)]
+        and 'seconds' (total training time)
+    """
+    config = ENV_PRESETS[preset]
+    rng = random.Random(config.seed_base + seed)
+    spec = EnvSpec.cyber(config.seed_base + seed, config.time_horizon, preset)
+    env = env_registry.make(spec)
+    verifier = PolicyVerifier()
+    episode_fn = make_episode_fn(td_method, n_step, trace_lambda)
+    q_table_a, q_table_b = initialize_double_q_tables()
+    replay_buffer = create_replay_buffer("uniform", REPLAY_BUFFER_SIZE, REPLAY_BATCH_SIZE, REPLAY_START_SIZE)
+
+    epsilon = EPSILON_START
+    training_seconds = 0.0
+    checkpoints = []
+    for episode in range(1, episodes + 1):
+        start = time.perf_counter()
+        episode_fn(env, {}, epsilon, q_table_a=q_table_a, q_table_b=q_table_b,
+                   replay_buffer=replay_buffer, rng=rng)
+        epsilon = max(EPSILON_END, epsilon * EPSILON_DECAY)
+        training_seconds += time.perf_counter() - start
+
+        if episode % eval_every == 0:
+            policy = extract_policy(merge_q_tables(q_table_a, q_table_b))
+            try:
+                verified = verifier.replay(spec.env_id, policy)
+            except ValueError:  # Greedy replay reached a state the policy has not seen
+                verified = float('-inf')
+            checkpoints.append((episode, training_seconds, verified))
+    return {'checkpoints': checkpoints, 'seconds': training_seconds}
+
+
+def time_to_target(checkpoints, target: float):
+    """(episodes, seconds) at the first evaluation reaching target (None = never)."""
+    for episode, seconds, verified in checkpoints:
+        if verified >= target:
+            return episode, seconds
+    return None
+
+
+def benchmark(presets: Sequence[str], seeds: Sequence[int], episodes: int, eval_every: int,
+              fraction: float, target: Optional[float], n_step: int, trace_lambda: float) -> List[Dict]:
+    rows = []
+    for preset in presets:
+        for seed in seeds:
+            results = {
+                method: run(method, preset, seed, episodes, eval_every, n_step, trace_lambda)
+                for method in TD_METHODS
+            }
+            best = max(v for r in results.values() for _, _, v in r['checkpoints'])
+            run_target = target if target is not None else (best * fraction if best >= 0 else best / fraction)
+
+            for method, result in results.items():
+                reached = time_to_target(result['checkpoints'], run_target)
+                rows.append({
+                    'preset': preset,
+                    'seed': seed,
+                    'td_method': method,
+                    'target': run_target,
+                    'episodes_to_target': reached[0] if reached else None,
+                    'seconds_to_target': reached[1] if reached else None,
+                    'best_verified': max(v for _, _, v in result['checkpoints']),
+                    'ms_per_episode': 1000 * result['seconds'] / episodes,
+                })
+    return rows
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare one-step, n-step and Q(lambda) TD updates")
+    parser.add_argument("--episodes", type=int, default=800, help="Episodes per run")
+    parser.add_argument("--eval-every", type=int, default=25, help="Episodes between verified-reward checks")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0, 1, 2])
+    parser.add_argument("--presets", nargs="+", default=list(ENV_PRESETS), choices=list(ENV_PRESETS))
+    parser.add_argument("--fraction", type=float, default=0.9, help="Target as a fraction of the best verified reward")
+    parser.add_argument("--target", type=float, default=None, help="Absolute target verified reward")
+    parser.add_argument("--n-step", type=int, default=N_STEP)
+    parser.add_argument("--trace-lambda", type=float, default=TRACE_LAMBDA)
+    args = parser.parse_args(argv)
+
+    rows = benchmark(args.presets, args.seeds, args.episodes, args.eval_every,
+                     args.fraction, args.target, args.n_step, args.trace_lambda)
+
+    print(f"{'preset':<16}{'seed':>5}  {'td_method':<10}{'target':>9}{'episodes':>9}{'time (s)':>10}{'best':>9}{'ms/ep':>8}")
+    for row in rows:
+        episodes = row['episodes_to_target']
+        seconds = row['seconds_to_target']
+        print(f"{row['preset']:<16}{row['seed']:>5}  {row['td_method']:<10}{row['target']:>9.2f}"
+              f"{episodes if episodes is not None else '—':>9}"
+              f"{f'{seconds:.2f}' if seconds is not None else '—':>10}"
+              f"{row['best_verified']:>9.2f}{row['ms_per_episode']:>8.2f}")
+
+    print()
+    print(f"{'preset':<16}{'td_method':<10}{'mean time (s)':>14}{'not reached':>12}")
+    for preset in args.presets:
+        for method in TD_METHODS:
+            subset = [r for r in rows if r['preset'] == preset and r['td_method'] == method]
+            reached = [r['seconds_to_target'] for r in subset if r['seconds_to_target'] is not None]
+            mean_seconds = sum(reached) / len(reached) if reached else float('nan')
+            print(f"{preset:<16}{method:<10}{mean_seconds:>14.2f}{len(subset) - len(reached):>12}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
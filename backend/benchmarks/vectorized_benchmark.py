@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Vectorized Training Benchmark — Lockstep Batch vs Per-Episode Loop
+
+Trains Double-Q tables on the same episode seeds two ways and reports
+transitions per second (median over repeats):
+
+- lockstep: run_lockstep_round() steps all seeds' episodes together on a
+  BatchCyberDefenseEnv with dense array tables (one batched update per step)
+- loop: train_episode() runs each seed's CyberDefenseEnv one episode at a
+  time with dict tables (online Double-Q, no replay: the same update rule)
+
+Both follow the per-episode epsilon schedule train_vectorized() uses, so
+each method sees the same number of episodes at the same exploration rates.
+
+Usage (from backend/):
+    python benchmarks/vectorized_benchmark.py
+    python benchmarks/vectorized_benchmark.py --batch-sizes 16 256 --rounds 20 --horizon 48
+"""
+
+from typing import Dict, List, Optional, Sequence
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+import numpy as np
+
+# Add backend directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agent.trainer import train_episode
+from src.agent.vectorized import initialize_q_arrays, run_lockstep_round
+from src.environments.batch_env import BatchCyberDefenseEnv
+from src.environments.cyber_env import CyberDefenseEnv
+from src.shared.config import EPSILON_START, EPSILON_END, EPSILON_DECAY
+
+
+METHODS = ("lockstep", "loop")
+
+
+def run_lockstep(seeds: Sequence[int], horizon: int, rounds: int) -> Dict:
+    """Train on a batch env, one lockstep round per pass over the seeds."""
+    batch_env = BatchCyberDefenseEnv.from_seeds(seeds, time_horizon=horizon)
+    q_a, q_b, visits = initialize_q_arrays()
+    rng = np.random.default_rng(0)
+
+    epsilon = EPSILON_START
+    transitions = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        _, round_transitions = run_lockstep_round(batch_env, q_a, q_b, visits, epsilon, rng)
+        transitions += round_transitions
+        epsilon = max(EPSILON_END, epsilon * EPSILON_DECAY ** len(seeds))
+    return {'transitions': transitions, 'seconds': time.perf_counter() - start}
+
+
+def run_loop(seeds: Sequence[int], horizon: int, rounds: int) -> Dict:
+    """Train with train_episode(), one episode per seed per round."""
+    envs = [CyberDefenseEnv(time_horizon=horizon, seed=seed) for seed in seeds]
+    q_table_a, q_table_b = {}, {}
+    rng = random.Random(0)
+
+    epsilon = EPSILON_START
+    transitions = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for env in envs:
+            _, action_counts = train_episode(env, {}, epsilon, q_table_a=q_table_a, q_table_b=q_table_b, rng=rng)
+            transitions += sum(action_counts.values())
+        epsilon = max(EPSILON_END, epsilon * EPSILON_DECAY ** len(seeds))
+    return {'transitions': transitions, 'seconds': time.perf_counter() - start}
+
+
+RUNNERS = {"lockstep": run_lockstep, "loop": run_loop}
+
+
+def benchmark(batch_sizes: Sequence[int], horizon: int, rounds: int, repeats: int) -> List[Dict]:
+    rows = []
+    for batch_size in batch_sizes:
+        seeds = list(range(batch_size))
+        for method in METHODS:
+            results = [RUNNERS[method](seeds, horizon, rounds) for _ in range(repeats)]
+            seconds = statistics.median(r['seconds'] for r in results)
+            transitions = results[0]['transitions']
+            rows.append({
+                'batch_size': batch_size,
+                'method': method,
+                'episodes': batch_size * rounds,
+                'transitions': transitions,
+                'seconds': seconds,
+                'transitions_per_second': transitions / seconds if seconds > 0 else 0.0,
+            })
+    return rows
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare lockstep batch training with the per-episode loop")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 16, 64, 256],
+                        help="Episodes per lockstep round (seeds 0 .. n-1)")
+    parser.add_argument("--rounds", type=int, default=10, help="Passes over the seeds")
+    parser.add_argument("--horizon", type=int, default=24, help="Time steps per episode")
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per method (median time)")
+    args = parser.parse_args(argv)
+
+    rows = benchmark(args.batch_sizes, args.horizon, args.rounds, args.repeats)
+
+    loop_rate = {row['batch_size']: row['transitions_per_second'] for row in rows if row['method'] == "loop"}
+    print(f"{'batch':>6}  {'method':<10}{'episodes':>9}{'transitions':>12}{'time (s)':>10}{'trans/s':>12}{'speedup':>9}")
+    for row in rows:
+        speedup = row['transitions_per_second'] / loop_rate[row['batch_size']]
+        print(f"{row['batch_size']:>6}  {row['method']:<10}{row['episodes']:>9}{row['transitions']:>12}"
+              f"{row['seconds']:>10.3f}{row['transitions_per_second']:>12.0f}{speedup:>8.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,14 +13,14 @@ This bridges the PolicyLedger core with the frontend dashboard.
 
 from fastapi import FastAPI, HTTPException, BackgroundTasks, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.responses import FileResponse, PlainTextResponse
+from pydantic import BaseModel, Field, field_validator
 from typing import List, Optional, Dict, Set
 import json
 import time
 from datetime import datetime
 from pathlib import Path
 import asyncio
-import ast
 import os
 from dotenv import load_dotenv
 
@@ -30,15 +30,28 @@ load_dotenv()
 from src.agent.runner import run_agent, PolicyClaim
 from src.agent.policy import serialize_policy, deserialize_policy
 from src.verifier.verifier import PolicyVerifier, VerificationStatus
-from src.ledger.ledger import PolicyLedger, verify_chain_integrity
+from src.verifier.cache import VerificationCache
+from src.verifier.sequential import SequentialTest
+from src.verifier.jobs import VerificationJobManager
+from src.verifier.audit import run_audit
+from src.agent.profiling import check_trace_episodes
+from src.ledger.ledger import PolicyLedger, entry_env_type, verify_chain_integrity
+from src.ledger.sqlite_ledger import SqlitePolicyLedger
+from src.environments.env_spec import EnvSpec
+from src.ledger.policy_store import PolicyStore
+from src.environments.env_presets import get_env_config
+from src.shared.config import DEFAULT_TIME_HORIZON, POLICY_PACK_FILENAME
 from src.marketplace.ranking import select_best_policy, PolicyMarketplace
 from src.consumer.reuse import reuse_best_policy
 from src.training.live_trainer import training_manager
+from src.training.population import PopulationTrainer, build_population
+from src.training.warm_start import load_warm_start
 from src.explainability.explainer import Explainer
 from src.explainability.metrics import ExplanationMetrics
 from src.execution.live_executor import (
     LivePolicyExecutor,
     ExecutionConfig,
+    create_execution_env,
     AdaptiveEnvironmentPressure,
     PartialObservabilityFilter,
     PolicyConfidenceCalculator
@@ -62,10 +75,27 @@ app.add_middleware(
 
 # Global instances
 BACKEND_DIR = Path(__file__).parent
-LEDGER_FILE = BACKEND_DIR / "ledger.json"
+LEDGER_BACKEND = os.getenv("LEDGER_BACKEND", "json")  # "json" or "sqlite"
+LEDGER_FILE = BACKEND_DIR / ("ledger.db" if LEDGER_BACKEND == "sqlite" else "ledger.json")
+AUDIT_REPORT_FILE = BACKEND_DIR / "audits" / "ledger_audit.jsonl"
 POLICIES_DIR = BACKEND_DIR / "policies"
-ledger = PolicyLedger(LEDGER_FILE)
-verifier = PolicyVerifier(reward_threshold=10.0)  # Allow reasonable variance in stochastic env
+
+
+def open_ledger():
+    """The ledger of the configured backend (same interface either way)."""
+    if LEDGER_BACKEND == "sqlite":
+        return SqlitePolicyLedger(LEDGER_FILE)
+    return PolicyLedger(LEDGER_FILE)
+
+
+ledger = open_ledger()
+policy_store = PolicyStore(POLICIES_DIR, pack_path=POLICIES_DIR / POLICY_PACK_FILENAME)  # Single read/write path for policy artifacts
+VERIFICATION_CACHE_FILE = BACKEND_DIR / "verification_cache.json"
+verification_cache = VerificationCache(VERIFICATION_CACHE_FILE)
+# Sequential mode: stop replaying once the claim is clearly inside/outside ±threshold
+verifier = PolicyVerifier(reward_threshold=10.0, cache=verification_cache,
+                          sequential=SequentialTest())  # Allow reasonable variance in stochastic env
+verification_jobs = VerificationJobManager(verifier)  # Shared /ws/verify jobs
 explainer = Explainer(use_gemini=False)  # Use fallback explainer only
 
 # Training state
@@ -79,41 +109,6 @@ active_connections: Set[WebSocket] = set()
 # Helper Functions
 # ============================================================================
 
-def load_policy_from_file(policy_path: Path) -> Dict:
-    """
-    Load and parse policy from JSON file.
-    
-    Handles nested structure and safely parses tuple keys.
-    """
-    with open(policy_path, 'r') as f:
-        policy_data = json.load(f)
-    
-    # Handle nested structure (policy might be under "policy" key)
-    if "policy" in policy_data:
-        policy_dict = policy_data["policy"]
-    else:
-        policy_dict = policy_data
-    
-    # Parse tuple keys safely
-    policy = {}
-    for k, v in policy_dict.items():
-        try:
-            # Parse tuple string like "(0, 1, 2, 0, 1)"
-            key = tuple(map(int, k.strip('()').split(', ')))
-            policy[key] = v
-        except (ValueError, AttributeError):
-            # Try ast.literal_eval as fallback
-            try:
-                policy[ast.literal_eval(k)] = v
-            except Exception as e:
-                print(f"Warning: Could not parse policy key '{k}': {e}")
-    
-    print(f"  [Policy Loader] Loaded policy from {policy_path.name}")
-    print(f"  [Policy Loader] Policy has {len(policy)} states")
-    
-    return policy
-
-
 def serialize_policy_to_bytes(policy: Dict) -> bytes:
     """
     Serialize policy dict to bytes using the same method as training.
@@ -128,27 +123,6 @@ def serialize_policy_to_bytes(policy: Dict) -> bytes:
     return serialize_policy(policy)
 
 
-def load_policy_artifact_from_file(policy_path: Path) -> bytes:
-    """
-    Load the policy and serialize it exactly as it was during training.
-    
-    This reads the JSON file and re-serializes the policy portion only,
-    matching the exact serialization used when computing the original hash.
-    """
-    with open(policy_path, 'r') as f:
-        data = json.load(f)
-    
-    # Extract just the policy portion (serializable_policy with string keys)
-    if "policy" in data:
-        serializable_policy = data["policy"]
-    else:
-        serializable_policy = data
-    
-    # Re-serialize with sorted keys for determinism (matching training)
-    json_str = json.dumps(serializable_policy, sort_keys=True)
-    return json_str.encode('utf-8')
-
-
 # ============================================================================
 # WebSocket Connection Manager
 # ============================================================================
@@ -194,6 +168,17 @@ class AgentTrainRequest(BaseModel):
     agent_id: str
     seed: int = 42
     episodes: int = 150
+    warm_start_policy_hash: Optional[str] = None  # Seed from a policy in the ledger
+    warm_start_checkpoint: Optional[str] = None  # Seed from this agent's session checkpoint
+
+
+class PopulationTrainRequest(BaseModel):
+    """Configuration for a parallel population training run"""
+    seeds: List[int] = Field(..., min_length=1)  # Offsets from each preset's seed_base
+    env_types: Optional[List[str]] = None  # None = every preset
+    episodes: int = Field(150, gt=0)
+    max_workers: Optional[int] = Field(None, gt=0)
+    agent_prefix: str = "pop"
 
 
 class LiveTrainRequest(BaseModel):
@@ -206,12 +191,36 @@ class LiveTrainRequest(BaseModel):
     epsilon_decay: float = 0.995
     learning_rate: float = 0.1
     discount_factor: float = 0.99
+    auto_stop: bool = True  # Stop once the greedy policy stops changing
+    convergence_patience: int = Field(100, gt=0)
+    convergence_max_changes: int = Field(0, ge=0)
+    td_error_threshold: Optional[float] = None
+    checkpoint_every: int = Field(500, ge=0)  # Episodes between checkpoints (0 = disabled)
+    replay: str = Field("uniform", pattern="^(uniform|prioritized)$")  # Experience replay sampling
+    td_method: str = Field("one_step", pattern="^(one_step|n_step|q_lambda)$")  # TD update rule
+    n_step: int = Field(3, ge=1)  # Rewards per n-step return (td_method "n_step")
+    trace_lambda: float = Field(0.8, ge=0.0, le=1.0)  # Trace decay (td_method "q_lambda")
+    planning_steps: int = Field(0, ge=0, le=100)  # Dyna-Q planning updates per real step (0 = off)
+    warm_start_policy_hash: Optional[str] = None  # Seed from a policy in the ledger
+    warm_start_checkpoint: Optional[str] = None  # Seed from this agent's session checkpoint
+    profile: bool = False  # Record per-phase hot-path timing
+    profile_trace_episodes: Optional[List[int]] = Field(None, min_length=2, max_length=2)  # [start, end) for cProfile
+    
+    @field_validator('profile_trace_episodes')
+    @classmethod
+    def _check_trace_range(cls, value):
+        # Reject here (422) rather than inside the background training task
+        if value is not None:
+            check_trace_episodes(value)
+        return value
 
 
 class TrainingControlRequest(BaseModel):
     """Control request for training session"""
     agent_id: str
     action: str = Field(..., pattern="^(stop|pause|resume)$")
+    max_episodes: Optional[int] = None  # resume only: new episode limit
+    auto_stop: Optional[bool] = None  # resume only: override convergence auto-stop
 
 
 class AgentTrainResponse(BaseModel):
@@ -227,6 +236,8 @@ class VerifyResponse(BaseModel):
     verified_reward: float
     status: str
     reason: Optional[str] = None
+    episodes: Optional[int] = None  # Replay episodes consumed (0 = cached replay)
+    divergence: Optional[Dict] = None  # First divergent step (INVALID claims with a trajectory digest)
 
 
 class LedgerEntryResponse(BaseModel):
@@ -285,10 +296,37 @@ async def health_check():
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
         "ledger_file": LEDGER_FILE,
-        "ledger_size": len(ledger.read_all())
+        "ledger_size": ledger.count()
     }
 
 
+def _resolve_warm_start(policy_hash: Optional[str], checkpoint_agent_id: Optional[str], target: EnvSpec):
+    """
+    Load the warm-start source of a training request.
+    
+    Args:
+        policy_hash: Ledger policy to seed from
+        checkpoint_agent_id: Agent whose session checkpoint to seed from
+        target: Environment the request trains on
+    
+    Returns:
+        WarmStart, or None for a cold start
+    
+    Raises:
+        HTTPException: 400 if both sources are given, the policy is not in
+                       the ledger or the source was trained on a different
+                       environment, 404 if the artifact/checkpoint is missing
+    """
+    checkpoint_path = (str(training_manager.checkpoint_path_for(checkpoint_agent_id))
+                       if checkpoint_agent_id else None)
+    try:
+        return load_warm_start(policy_hash, checkpoint_path, ledger=ledger, policy_dir=POLICIES_DIR, target=target)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=f"Warm-start source not found: {e}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @app.post("/agent/train", response_model=AgentTrainResponse)
 async def train_agent_endpoint(request: AgentTrainRequest, background_tasks: BackgroundTasks):
     """
@@ -298,7 +336,10 @@ async def train_agent_endpoint(request: AgentTrainRequest, background_tasks: Bac
     - Trains an agent with specified parameters
     - Returns the claimed reward and policy hash
     - Does NOT verify or add to ledger (separate steps)
+    - Optionally warm-starts from a ledger policy or a session checkpoint
     """
+    warm_start = _resolve_warm_start(request.warm_start_policy_hash, request.warm_start_checkpoint,
+                                     EnvSpec.cyber(request.seed, DEFAULT_TIME_HORIZON))
     try:
         start_time = time.time()
         
@@ -306,7 +347,8 @@ async def train_agent_endpoint(request: AgentTrainRequest, background_tasks: Bac
         claim = run_agent(
             agent_id=request.agent_id,
             seed=request.seed,
-            episodes=request.episodes
+            episodes=request.episodes,
+            warm_start=warm_start
         )
         
         training_time = time.time() - start_time
@@ -330,6 +372,98 @@ async def train_agent_endpoint(request: AgentTrainRequest, background_tasks: Bac
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _store_population_claims(result) -> None:
+    """Make population claims available to /agent/verify like single runs."""
+    for member_result in result.results:
+        if member_result.claim is not None:
+            training_jobs[member_result.claim.agent_id] = {
+                "claim": member_result.claim,
+                "timestamp": datetime.now().isoformat(),
+                "training_time": member_result.training_time
+            }
+
+
+@app.post("/agent/train/population")
+async def train_population_endpoint(request: PopulationTrainRequest):
+    """
+    Train a population of agents in parallel over seeds × environment presets.
+    
+    Agents run in a process pool; claims are stored for verification exactly
+    like /agent/train claims. For live per-agent progress use the
+    /ws/population WebSocket instead.
+    """
+    try:
+        members = build_population(
+            seeds=request.seeds,
+            env_types=request.env_types,
+            episodes=request.episodes,
+            agent_prefix=request.agent_prefix
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    trainer = PopulationTrainer(max_workers=request.max_workers)
+    result = await asyncio.to_thread(trainer.run, members)
+    _store_population_claims(result)
+    
+    return result.summary()
+
+
+@app.websocket("/ws/population")
+async def websocket_population_endpoint(websocket: WebSocket):
+    """
+    WebSocket endpoint for population training with per-agent progress.
+    
+    Send configuration via JSON message after connecting (same fields as
+    POST /agent/train/population):
+    {
+        "seeds": [1, 2, 3, 4],
+        "env_types": ["standard", "extended"],
+        "episodes": 150,
+        "max_workers": 4
+    }
+    
+    Receives "progress" and "agent_complete" events, then a final
+    "population_complete" message with the run summary.
+    """
+    await websocket.accept()
+    
+    try:
+        config_data = await websocket.receive_json()
+        request = PopulationTrainRequest(**config_data)
+        members = build_population(
+            seeds=request.seeds,
+            env_types=request.env_types,
+            episodes=request.episodes,
+            agent_prefix=request.agent_prefix
+        )
+        
+        loop = asyncio.get_running_loop()
+        
+        def forward(event: dict):
+            # Called from the trainer thread; hop back onto the event loop
+            asyncio.run_coroutine_threadsafe(websocket.send_json(event), loop)
+        
+        trainer = PopulationTrainer(max_workers=request.max_workers)
+        result = await asyncio.to_thread(trainer.run, members, forward)
+        _store_population_claims(result)
+        
+        await websocket.send_json({"type": "population_complete", **result.summary()})
+        
+    except WebSocketDisconnect:
+        print("Population training monitor disconnected")
+    except Exception as e:
+        try:
+            await websocket.send_json({"type": "error", "message": str(e)})
+        except:
+            pass
+    finally:
+        try:
+            await websocket.close()
+        except:
+            pass
+
+
 # ============================================================================
 # Live Training Endpoints (WebSocket)
 # ============================================================================
@@ -352,18 +486,51 @@ async def websocket_train_endpoint(websocket: WebSocket, agent_id: str):
         "epsilon_start": 1.0,
         "epsilon_end": 0.01,
         "epsilon_decay": 0.995,
-        "env_type": "standard"  // Environment type: standard, short_burst, extended, high_pressure, sparse_attacks
+        "env_type": "standard",  // Environment type: standard, short_burst, extended, high_pressure, sparse_attacks
+        "auto_stop": true,  // Stop once the greedy policy stops changing
+        "convergence_patience": 100,  // Episodes without greedy change before stopping
+        "convergence_max_changes": 0,  // Changed states per episode tolerated as "unchanged"
+        "td_error_threshold": null,  // Optional: also stop when mean |TD error| falls below this
+        "checkpoint_every": 500,  // Episodes between checkpoints (0 = disabled)
+        "replay": "uniform",  // Experience replay: uniform or prioritized
+        "td_method": "one_step",  // TD update: one_step, n_step or q_lambda
+        "n_step": 3,  // Rewards per n-step return
+        "trace_lambda": 0.8,  // Eligibility trace decay for q_lambda
+        "planning_steps": 0,  // Dyna-Q: simulated updates per real step (e.g. 10; 0 = off)
+        "warm_start_policy_hash": null,  // Optional: seed Q-tables from a ledger policy
+        "warm_start_checkpoint": null,  // Optional: seed Q-tables from this agent's checkpoint
+        "profile": false,  // Record per-phase timing (GET /training/session/{agent_id}/profile)
+        "profile_trace_episodes": null  // Optional: [start, end) episodes to run cProfile over
     }
     
     Send control commands:
     {"action": "stop"}
     """
     await manager.connect(websocket, agent_id)
+    training_task = None
     
     try:
         # Wait for configuration
         config_data = await websocket.receive_json()
         
+        try:
+            env_type = config_data.get('env_type', 'standard')
+            warm_start = _resolve_warm_start(
+                config_data.get('warm_start_policy_hash'),
+                config_data.get('warm_start_checkpoint'),
+                EnvSpec.cyber(config_data.get('seed', 42), get_env_config(env_type).time_horizon, env_type)
+            )
+        except HTTPException as e:
+            await websocket.send_json({"type": "error", "message": e.detail})
+            return
+        
+        if config_data.get('profile_trace_episodes') is not None:
+            try:
+                check_trace_episodes(config_data['profile_trace_episodes'])
+            except ValueError as e:
+                await websocket.send_json({"type": "error", "message": str(e)})
+                return
+        
         # Define callback for training updates
         async def send_update(data):
             try:
@@ -379,7 +546,8 @@ async def websocket_train_endpoint(websocket: WebSocket, agent_id: str):
                 max_episodes=config_data.get('max_episodes'),
                 callback=send_update,
                 config=config_data,
-                env_type=config_data.get('env_type', 'standard')
+                env_type=config_data.get('env_type', 'standard'),
+                warm_start=warm_start
             )
         )
         
@@ -407,6 +575,9 @@ async def websocket_train_endpoint(websocket: WebSocket, agent_id: str):
         print(f"   WebSocket disconnected for {agent_id}, but training continues...")
     finally:
         manager.disconnect(websocket, agent_id)
+        if training_task is None:
+            # Training never started (bad config or early disconnect)
+            return
         
         # Wait for training to complete before saving to ledger
         try:
@@ -423,38 +594,22 @@ async def websocket_train_endpoint(websocket: WebSocket, agent_id: str):
                 print(f"Training completed for {agent_id}. Running verification...")
                 
                 # Load policy for verification
-                policy_path = POLICIES_DIR / f"{session.final_policy_hash}.json"
-                if not policy_path.exists():
-                    print(f"⚠ Policy file not found: {policy_path}")
+                if session.final_policy_hash not in policy_store:
+                    print(f"⚠ Policy artifact not found: {session.final_policy_hash}")
                 else:
-                    # Load policy artifact (serialized bytes matching original hash)
-                    policy_artifact = load_policy_artifact_from_file(policy_path)
-                    
-                    # Create proper env_id format for verifier
-                    # Format: "cyber_defense_env_seed_{seed}_horizon_{time_horizon}"
-                    time_horizon = session.env_config.get('time_horizon', 24)
-                    env_id = f"cyber_defense_env_seed_{session.seed}_horizon_{time_horizon}"
-                    
-                    # Create policy claim
-                    from src.agent.runner import PolicyClaim
-                    claim = PolicyClaim(
-                        agent_id=agent_id,
-                        env_id=env_id,
-                        policy_hash=session.final_policy_hash,
-                        policy_artifact=policy_artifact,
-                        claimed_reward=session.final_reward
-                    )
+                    # Create policy claim (artifact bytes matching the original hash)
+                    claim = _session_claim(agent_id, session)
                     
                     # VERIFY the policy claim
                     verification_result = verifier.verify(claim)
                     
                     if verification_result.status == VerificationStatus.VALID:
-                        # Only add VALID policies to ledger
-                        entry = ledger.append(
+                        # Only add VALID policies to ledger (once, even if /ws/verify also verified it)
+                        entry, _ = ledger.append_if_absent(
                             policy_hash=session.final_policy_hash,
                             verified_reward=verification_result.verified_reward,
                             agent_id=agent_id,
-                            env_config=session.env_config
+                            env_config=dict(session.env_config, env_id=claim.env_id)  # env_id lets audits replay it
                         )
                         print(f"✓ Policy VERIFIED and added to ledger")
                         print(f"  Claimed: {session.final_reward:.3f} | Verified: {verification_result.verified_reward:.3f}")
@@ -476,6 +631,124 @@ async def websocket_train_endpoint(websocket: WebSocket, agent_id: str):
             traceback.print_exc()
 
 
+def _session_claim(agent_id: str, session) -> PolicyClaim:
+    """
+    Build the verification claim for a finished live training session.
+    
+    Raises:
+        HTTPException: 404 if the session's policy artifact is missing
+    """
+    if session.final_policy_hash not in policy_store:
+        raise HTTPException(status_code=404, detail=f"Policy file not found for {agent_id}")
+    
+    return PolicyClaim(
+        agent_id=agent_id,
+        env_id=EnvSpec.from_env_config(session.seed, session.env_config).env_id,
+        policy_hash=session.final_policy_hash,
+        policy_artifact=policy_store.artifact_bytes(session.final_policy_hash),
+        claimed_reward=session.final_reward,
+        trajectory=session.final_trajectory  # Lets an INVALID result name the first divergent step
+    )
+
+
+@app.websocket("/ws/verify/{agent_id}")
+async def websocket_verify_endpoint(websocket: WebSocket, agent_id: str):
+    """
+    WebSocket endpoint for verification with streamed progress.
+    
+    Verifies the agent's finished live training session (like
+    POST /agent/verify/{agent_id}) on a worker thread. Every observer of the
+    same agent watches the same job; connecting while it runs does not
+    start another replay.
+    
+    Receives, in order:
+    - {"type": "verification_started", ...}
+    - {"type": "verification_progress", "episodes", "max_episodes",
+       "running_mean", "ci_lower", "ci_upper", "elapsed_seconds", "eta_seconds"}
+      after every replay batch
+    - {"type": "verification_complete", "result": {...}}
+      (or "verification_cancelled" / "verification_error")
+    
+    Send control commands:
+    {"action": "cancel"}
+    
+    A VALID result is appended to the ledger. Disconnecting does not cancel
+    the job.
+    """
+    await websocket.accept()
+    job = None
+    queue = None
+    
+    try:
+        if any(entry.agent_id == agent_id for entry in ledger.read_all()):
+            await websocket.send_json({
+                "type": "verification_complete",
+                "agent_id": agent_id,
+                "result": {"agent_id": agent_id, "status": "VALID",
+                           "reason": "Policy already verified and added to ledger"}
+            })
+            return
+        
+        session = training_manager.get_session_state(agent_id)
+        if session is None or not hasattr(session, 'final_policy_hash') or session.status not in ["completed", "stopped"]:
+            await websocket.send_json({"type": "error", "message": f"No finished training session for {agent_id}"})
+            return
+        try:
+            claim = _session_claim(agent_id, session)
+        except HTTPException as e:
+            await websocket.send_json({"type": "error", "message": e.detail})
+            return
+        
+        def record(result):
+            # Runs on the job's worker thread: the ledger serializes appends,
+            # and a REST verification of the same policy may have won the race
+            if result.status == VerificationStatus.VALID:
+                _, appended = ledger.append_if_absent(
+                    policy_hash=claim.policy_hash,
+                    verified_reward=result.verified_reward,
+                    agent_id=agent_id,
+                    env_config=dict(session.env_config, env_id=claim.env_id)  # env_id lets audits replay it
+                )
+                if appended:
+                    print(f"✓ Policy VERIFIED and added to ledger via /ws/verify")
+        
+        job = verification_jobs.get(agent_id)
+        if job is None or job.status != "completed" or job.claim.policy_hash != claim.policy_hash:
+            job = verification_jobs.start(claim, on_result=record)  # Joins a running job for this policy
+        queue = job.subscribe()
+        
+        async def listen():
+            while True:
+                message = await websocket.receive_json()
+                if message.get('action') == 'cancel':
+                    verification_jobs.cancel(agent_id)
+        
+        listener = asyncio.create_task(listen())
+        try:
+            while True:
+                getter = asyncio.create_task(queue.get())
+                await asyncio.wait({getter, listener}, return_when=asyncio.FIRST_COMPLETED)
+                if not getter.done():
+                    getter.cancel()
+                    break  # Client went away; the job keeps running
+                event = getter.result()
+                await websocket.send_json(event)
+                if event["type"] in ["verification_complete", "verification_cancelled", "verification_error"]:
+                    break
+        finally:
+            listener.cancel()
+    
+    except WebSocketDisconnect:
+        print(f"   Verification monitor disconnected for {agent_id}; verification continues")
+    finally:
+        if job is not None and queue is not None:
+            job.unsubscribe(queue)
+        try:
+            await websocket.close()
+        except:
+            pass
+
+
 @app.websocket("/ws/execute/{policy_hash}")
 async def websocket_execute_endpoint(websocket: WebSocket, policy_hash: str):
     """
@@ -494,7 +767,9 @@ async def websocket_execute_endpoint(websocket: WebSocket, policy_hash: str):
         "speed_ms": 50,
         "adaptive_pressure": false,
         "partial_observability": false,
-        "pressure_rate": 1.0
+        "pressure_rate": 1.0,
+        "scenario_mode": "fixed",  // "streaming" = chunked schedule, horizon = max_steps
+        "scenario_chunk_size": 1024
     }
     
     Features:
@@ -514,8 +789,7 @@ async def websocket_execute_endpoint(websocket: WebSocket, policy_hash: str):
         print(f"[WebSocket] Config: max_steps={config_data.get('max_steps')}, adaptive={config_data.get('adaptive_pressure')}, partial_obs={config_data.get('partial_observability')}")
         
         # Load policy
-        policy_path = Path("policies") / f"{policy_hash}.json"
-        if not policy_path.exists():
+        if policy_hash not in policy_store:
             await websocket.send_json({
                 "type": "error",
                 "message": f"Policy {policy_hash} not found"
@@ -524,7 +798,7 @@ async def websocket_execute_endpoint(websocket: WebSocket, policy_hash: str):
             return
         
         # Load and parse policy
-        policy = load_policy_from_file(policy_path)
+        policy = policy_store.load_policy(policy_hash)
         
         # Create execution config
         exec_config = ExecutionConfig(
@@ -533,15 +807,18 @@ async def websocket_execute_endpoint(websocket: WebSocket, policy_hash: str):
             speed_ms=config_data.get('speed_ms', 50),
             adaptive_pressure=config_data.get('adaptive_pressure', False),
             partial_observability=config_data.get('partial_observability', False),
-            pressure_rate=config_data.get('pressure_rate', 1.0)
+            pressure_rate=config_data.get('pressure_rate', 1.0),
+            scenario_mode=config_data.get('scenario_mode', 'fixed'),
+            scenario_chunk_size=config_data.get('scenario_chunk_size', 1024)
         )
+        # Steps are already streamed to the client; only retain them for short runs
+        exec_config.retain_steps = exec_config.scenario_mode == "fixed"
         
         # Create environment with varied seed for different executions
         import time
-        from src.environments.cyber_env import CyberDefenseEnv
         # Use policy hash + timestamp to ensure different runs have variety
         default_seed = (hash(policy_hash) + int(time.time() * 1000)) % 10000
-        env = CyberDefenseEnv(seed=config_data.get('seed', default_seed))
+        env = create_execution_env(config_data.get('seed', default_seed), exec_config)
         
         print(f"[WebSocket] Using environment seed: {config_data.get('seed', default_seed)}")
         
@@ -586,6 +863,9 @@ async def start_live_training(request: LiveTrainRequest):
                 detail=f"Agent {request.agent_id} is already training"
             )
         
+        warm_start = _resolve_warm_start(request.warm_start_policy_hash, request.warm_start_checkpoint,
+                                         EnvSpec.cyber(request.seed, get_env_config().time_horizon, "standard"))
+        
         # Start training (no callback, updates go to WebSocket)
         asyncio.create_task(
             training_manager.start_training(
@@ -596,15 +876,29 @@ async def start_live_training(request: LiveTrainRequest):
                 config={
                     'epsilon_start': request.epsilon_start,
                     'epsilon_end': request.epsilon_end,
-                    'epsilon_decay': request.epsilon_decay
-                }
+                    'epsilon_decay': request.epsilon_decay,
+                    'auto_stop': request.auto_stop,
+                    'convergence_patience': request.convergence_patience,
+                    'convergence_max_changes': request.convergence_max_changes,
+                    'td_error_threshold': request.td_error_threshold,
+                    'checkpoint_every': request.checkpoint_every,
+                    'replay': request.replay,
+                    'td_method': request.td_method,
+                    'n_step': request.n_step,
+                    'trace_lambda': request.trace_lambda,
+                    'planning_steps': request.planning_steps,
+                    'profile': request.profile or request.profile_trace_episodes is not None,
+                    'profile_trace_episodes': request.profile_trace_episodes
+                },
+                warm_start=warm_start
             )
         )
         
         return {
             "status": "started",
             "agent_id": request.agent_id,
-            "message": "Training started. Connect via WebSocket for updates."
+            "message": "Training started. Connect via WebSocket for updates.",
+            "warm_start": warm_start.provenance if warm_start else None
         }
         
     except HTTPException:
@@ -619,6 +913,9 @@ async def control_training(request: TrainingControlRequest):
     Control a running training session.
     
     Actions: stop, pause, resume
+    
+    - pause: checkpoint the session after its current episode and free its memory
+    - resume: reload the last checkpoint and continue training in the background
     """
     try:
         if request.action == "stop":
@@ -630,8 +927,44 @@ async def control_training(request: TrainingControlRequest):
                 )
             return {"status": "stopped", "agent_id": request.agent_id}
         
-        # Add pause/resume logic if needed
-        raise HTTPException(status_code=400, detail=f"Action {request.action} not implemented")
+        if request.action == "pause":
+            success = training_manager.pause_training(request.agent_id)
+            if not success:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"No active training session for {request.agent_id}"
+                )
+            return {"status": "paused", "agent_id": request.agent_id}
+        
+        # resume
+        existing = training_manager.get_session_state(request.agent_id)
+        if existing and existing.status == "running":
+            raise HTTPException(
+                status_code=400,
+                detail=f"Agent {request.agent_id} is already training"
+            )
+        checkpoint_path = (existing.checkpoint_path if existing and existing.checkpoint_path
+                           else training_manager.checkpoint_path_for(request.agent_id))
+        if not Path(checkpoint_path).exists():
+            raise HTTPException(
+                status_code=404,
+                detail=f"No checkpoint for {request.agent_id}"
+            )
+        
+        overrides = {}
+        if request.auto_stop is not None:
+            overrides['auto_stop'] = request.auto_stop
+        
+        asyncio.create_task(
+            training_manager.resume_training(
+                agent_id=request.agent_id,
+                callback=lambda data: manager.broadcast(data, request.agent_id),
+                checkpoint_path=str(checkpoint_path),
+                max_episodes=request.max_episodes,
+                config=overrides
+            )
+        )
+        return {"status": "resumed", "agent_id": request.agent_id, "checkpoint_path": str(checkpoint_path)}
         
     except HTTPException:
         raise
@@ -639,6 +972,17 @@ async def control_training(request: TrainingControlRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/training/checkpoint/{agent_id}")
+async def checkpoint_training(agent_id: str):
+    """Request an on-demand checkpoint; it is written after the current episode"""
+    if not training_manager.request_checkpoint(agent_id):
+        raise HTTPException(
+            status_code=404,
+            detail=f"No active training session for {agent_id}"
+        )
+    return {"status": "checkpoint_requested", "agent_id": agent_id}
+
+
 @app.get("/training/sessions")
 async def get_training_sessions():
     """Get all active training sessions"""
@@ -661,7 +1005,10 @@ async def get_training_session(agent_id: str):
         "episode": state.episode,
         "total_episodes": state.total_episodes,
         "metrics_count": len(state.metrics_history),
-        "q_table_size": len(state.q_table)
+        "q_table_size": len(state.q_table),
+        "stop_reason": state.stop_reason,
+        "stopped_at_episode": state.stopped_at_episode,
+        **state.checkpoint_stats()
     }
     
     # Include policy info if training completed
@@ -673,6 +1020,38 @@ async def get_training_session(agent_id: str):
     return response
 
 
+@app.get("/training/session/{agent_id}/profile")
+async def get_training_profile(agent_id: str, format: str = "json"):
+    """
+    Per-phase hot-path timing of a profiled session.
+    
+    Formats:
+        json: Cumulative time, call count and share per phase
+        collapsed: Folded stacks for flamegraph.pl / speedscope
+        trace: The cProfile stats file of the traced episode range
+    """
+    state = training_manager.get_session_state(agent_id)
+    if not state:
+        raise HTTPException(status_code=404, detail=f"No session for {agent_id}")
+    if state.profiler is None:
+        raise HTTPException(status_code=400, detail=f"Session {agent_id} was not started with profiling enabled")
+    
+    if format == "collapsed":
+        return PlainTextResponse(state.profiler.collapsed())
+    if format == "trace":
+        if not state.profiler.trace_written:
+            raise HTTPException(status_code=404, detail="Trace not written yet (episode range not finished)")
+        return FileResponse(state.profiler.trace_path, filename=state.profiler.trace_path.name)
+    if format != "json":
+        raise HTTPException(status_code=400, detail="format must be json, collapsed or trace")
+    
+    return {
+        "agent_id": agent_id,
+        "status": state.status,
+        **state.profiler.report()
+    }
+
+
 @app.post("/agent/verify/{agent_id}", response_model=VerifyResponse)
 async def verify_agent_endpoint(agent_id: str):
     """
@@ -701,28 +1080,7 @@ async def verify_agent_endpoint(agent_id: str):
         session = training_manager.get_session_state(agent_id)
         if session and hasattr(session, 'final_policy_hash'):
             # Create a policy claim from the session
-            from src.agent.runner import PolicyClaim
-            
-            # Load the policy file
-            policy_path = POLICIES_DIR / f"{session.final_policy_hash}.json"
-            if not policy_path.exists():
-                raise HTTPException(status_code=404, detail=f"Policy file not found for {agent_id}")
-            
-            # Load policy artifact (serialized bytes matching original hash)
-            policy_artifact = load_policy_artifact_from_file(policy_path)
-            
-            # Create proper env_id format for verifier
-            # Format: "cyber_defense_env_seed_{seed}_horizon_{time_horizon}"
-            time_horizon = session.env_config.get('time_horizon', 24)
-            env_id = f"cyber_defense_env_seed_{session.seed}_horizon_{time_horizon}"
-            
-            claim = PolicyClaim(
-                agent_id=agent_id,
-                env_id=env_id,
-                policy_hash=session.final_policy_hash,
-                policy_artifact=policy_artifact,
-                claimed_reward=session.final_reward
-            )
+            claim = _session_claim(agent_id, session)
             
             # Verify claim
             print(f"🔍 Starting verification for {agent_id}")
@@ -737,15 +1095,18 @@ async def verify_agent_endpoint(agent_id: str):
             if result.status == VerificationStatus.VALID:
                 try:
                     print(f"   ✓ Verification PASSED - Adding to ledger...")
-                    entry = ledger.append(
+                    entry, appended = ledger.append_if_absent(
                         policy_hash=session.final_policy_hash,
                         verified_reward=result.verified_reward,
                         agent_id=agent_id,
-                        env_config=session.env_config
+                        env_config=dict(session.env_config, env_id=claim.env_id)  # env_id lets audits replay it
                     )
-                    print(f"✓ Policy VERIFIED and added to ledger via /agent/verify")
+                    if appended:
+                        print(f"✓ Policy VERIFIED and added to ledger via /agent/verify")
+                    else:
+                        print(f"✓ Policy VERIFIED; already in ledger (recorded by another verification)")
                     print(f"  Agent: {agent_id} | Verified reward: {result.verified_reward:.3f}")
-                    print(f"  Ledger now has {len(ledger.read_all())} entries")
+                    print(f"  Ledger now has {ledger.count()} entries")
                 except Exception as e:
                     print(f"⚠ Failed to add to ledger: {e}")
                     import traceback
@@ -758,7 +1119,9 @@ async def verify_agent_endpoint(agent_id: str):
                 agent_id=claim.agent_id,
                 verified_reward=result.verified_reward,
                 status=result.status.value,
-                reason=result.reason
+                reason=result.reason,
+                episodes=result.episodes,
+                divergence=result.divergence.to_dict() if result.divergence else None
             )
         
         # Fall back to old training_jobs
@@ -785,7 +1148,9 @@ async def verify_agent_endpoint(agent_id: str):
             agent_id=claim.agent_id,
             verified_reward=result.verified_reward,
             status=result.status.value,
-            reason=result.reason
+            reason=result.reason,
+            episodes=result.episodes,
+            divergence=result.divergence.to_dict() if result.divergence else None
         )
         
     except HTTPException:
@@ -821,10 +1186,11 @@ async def add_to_ledger_endpoint(agent_id: str):
         claim = job["claim"]
         
         # Add to ledger
-        entry = ledger.append(
+        entry, _ = ledger.append_if_absent(
             policy_hash=claim.policy_hash,
             verified_reward=verification["verified_reward"],
-            agent_id=claim.agent_id
+            agent_id=claim.agent_id,
+            env_config={"env_id": claim.env_id}
         )
         
         return {
@@ -863,6 +1229,46 @@ async def get_ledger():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/ledger/query", response_model=List[LedgerEntryResponse])
+async def query_ledger(
+    agent_id: Optional[str] = None,
+    policy_hash: Optional[str] = None,
+    env_type: Optional[str] = None,
+    min_reward: Optional[float] = None,
+    max_reward: Optional[float] = None,
+    order_by: str = "seq",
+    descending: bool = False,
+    limit: int = 100,
+    offset: int = 0
+):
+    """
+    Filtered, paginated ledger entries.
+    
+    - order_by: "seq" (append order) or "verified_reward"
+    - limit/offset: page size and start (limit capped at 1000)
+    """
+    try:
+        entries = ledger.query(
+            agent_id=agent_id, policy_hash=policy_hash, env_type=env_type,
+            min_reward=min_reward, max_reward=max_reward,
+            order_by=order_by, descending=descending,
+            limit=max(0, min(limit, 1000)), offset=max(0, offset)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return [
+        LedgerEntryResponse(
+            policy_hash=entry.policy_hash,
+            verified_reward=entry.verified_reward,
+            agent_id=entry.agent_id,
+            timestamp=entry.timestamp,
+            previous_hash=entry.previous_hash,
+            current_hash=entry.current_hash
+        )
+        for entry in entries
+    ]
+
+
 @app.get("/ledger/integrity")
 async def check_ledger_integrity():
     """Verify ledger chain integrity"""
@@ -880,6 +1286,71 @@ async def check_ledger_integrity():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/ledger/audit")
+async def audit_ledger(workers: Optional[int] = None, mismatches_only: bool = True):
+    """
+    Replay every ledger entry against its policy artifact.
+    
+    - workers: replay processes (default: CPU count)
+    - mismatches_only: only failing entries go into the JSONL report
+    
+    Runs off the event loop; returns the summary (counts, throughput, report path).
+    """
+    try:
+        summary = await asyncio.to_thread(
+            run_audit,
+            ledger.iter_entries(),
+            POLICIES_DIR,
+            pack_path=policy_store.pack_path if policy_store.pack_path and policy_store.pack_path.exists() else None,
+            report_path=AUDIT_REPORT_FILE,
+            max_workers=workers,
+            mismatches_only=mismatches_only,
+        )
+        return summary.to_dict()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/verification/cache")
+async def get_verification_cache_stats():
+    """Verification cache size and hit metrics."""
+    return verification_cache.stats()
+
+
+@app.delete("/verification/cache")
+async def invalidate_verification_cache(policy_hash: Optional[str] = None, stale_only: bool = False):
+    """
+    Drop cached replay results.
+    
+    - policy_hash: only this policy's results (default: all)
+    - stale_only: only results from older verifier versions
+    """
+    removed = verification_cache.invalidate(policy_hash=policy_hash, stale_only=stale_only)
+    return {"removed": removed, **verification_cache.stats()}
+
+
+@app.post("/policies/gc")
+async def collect_policy_garbage(dry_run: bool = False, grace_seconds: Optional[float] = None):
+    """
+    Delete policy artifacts that no ledger entry references.
+    
+    Policies of live sessions and of /agent/train runs (trained but not yet
+    added to the ledger) are kept, as is anything younger than the grace period.
+    """
+    try:
+        pinned = [
+            session.final_policy_hash
+            for session in training_manager.sessions.values()
+            if hasattr(session, 'final_policy_hash')
+        ]
+        pinned += [job["claim"].policy_hash for job in training_jobs.values()]
+        kwargs = {} if grace_seconds is None else {"grace_seconds": grace_seconds}
+        result = policy_store.collect_garbage(ledger, pinned=pinned, dry_run=dry_run, **kwargs)
+        return result.to_dict()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.get("/marketplace", response_model=List[MarketplacePolicy])
 async def get_marketplace():
     """Get ranked policies from marketplace"""
@@ -966,10 +1437,7 @@ async def get_marketplace_by_environment(env_type: Optional[str] = None):
             entries = ledger.read_all()
             entry = next((e for e in entries if e.policy_hash == policy.policy_hash), None)
             
-            if entry and entry.env_config:
-                policy_env_type = entry.env_config.get('env_type', 'unknown')
-            else:
-                policy_env_type = 'unknown'  # Legacy policies without env_config
+            policy_env_type = (entry_env_type(entry.env_config) if entry else None) or 'unknown'  # Legacy: no env_config
             
             # Filter by env_type if specified
             if env_type and policy_env_type != env_type:
@@ -1010,7 +1478,7 @@ async def reuse_policy_endpoint(seed: int = 9999):
             raise HTTPException(status_code=404, detail="No policies available for reuse")
         
         # Reuse best policy
-        result = reuse_best_policy(best, seed=seed)
+        result = reuse_best_policy(best, policy_store_dir=POLICIES_DIR, seed=seed)
         
         # Ensure all float values are JSON compliant
         def make_json_safe(value: float) -> float:
@@ -1106,11 +1574,8 @@ async def get_policy_explanation(agent_id: str):
         rank = next((i + 1 for i, p in enumerate(ranked) if p.agent_id == agent_id), None)
         
         # Load policy to analyze behavior patterns
-        policy_path = Path("policies") / f"{entry.policy_hash}.json"
-        if policy_path.exists():
-            with open(policy_path) as f:
-                policy_data = json.load(f)
-                policy = policy_data.get("policy", {})
+        if entry.policy_hash in policy_store:
+            policy = policy_store.get(entry.policy_hash)["policy"]
         else:
             policy = {}
         
@@ -1198,13 +1663,16 @@ async def reset_system():
         training_jobs.clear()
         
         # Reset ledger
-        ledger = PolicyLedger(LEDGER_FILE)
+        if isinstance(ledger, SqlitePolicyLedger):
+            ledger.close()
         
-        # Clear ledger file
-        if Path(LEDGER_FILE).exists():
-            Path(LEDGER_FILE).unlink()
+        # Clear ledger file (and SQLite's WAL side files)
+        for suffix in ("", "-wal", "-shm"):
+            path = Path(f"{LEDGER_FILE}{suffix}")
+            if path.exists():
+                path.unlink()
         
-        ledger = PolicyLedger(LEDGER_FILE)
+        ledger = open_ledger()
         
         return {
             "status": "reset",
@@ -1227,6 +1695,8 @@ class ExecutionRequest(BaseModel):
     adaptive_pressure: bool = False
     partial_observability: bool = False
     pressure_rate: float = 1.0
+    scenario_mode: str = Field("fixed", pattern="^(fixed|streaming)$")
+    scenario_chunk_size: int = Field(1024, gt=0)
 
 
 class ExecutionSummary(BaseModel):
@@ -1255,15 +1725,14 @@ async def execute_policy_batch(request: ExecutionRequest):
     """
     try:
         # Load policy
-        policy_path = Path("policies") / f"{request.policy_hash}.json"
-        if not policy_path.exists():
+        if request.policy_hash not in policy_store:
             raise HTTPException(
                 status_code=404,
                 detail=f"Policy {request.policy_hash} not found"
             )
         
         # Load and parse policy
-        policy = load_policy_from_file(policy_path)
+        policy = policy_store.load_policy(request.policy_hash)
         
         # Create execution config
         exec_config = ExecutionConfig(
@@ -1272,26 +1741,28 @@ async def execute_policy_batch(request: ExecutionRequest):
             speed_ms=0,  # No delay for batch
             adaptive_pressure=request.adaptive_pressure,
             partial_observability=request.partial_observability,
-            pressure_rate=request.pressure_rate
+            pressure_rate=request.pressure_rate,
+            scenario_mode=request.scenario_mode,
+            scenario_chunk_size=request.scenario_chunk_size,
+            retain_steps=False  # Only the summary is returned
         )
         
         # Create environment
-        from src.environments.cyber_env import CyberDefenseEnv
-        env = CyberDefenseEnv(seed=request.seed)
+        env = create_execution_env(request.seed, exec_config)
         
         # Create executor and run
         executor = LivePolicyExecutor(env, policy, exec_config)
-        steps = executor.execute_batch()
+        executor.execute_batch()
         
-        # Calculate summary
-        import numpy as np
+        # Calculate summary from running aggregates
+        run_summary = executor.get_summary()
         summary = ExecutionSummary(
             policy_hash=request.policy_hash,
-            total_steps=len(steps),
-            final_reward=steps[-1].cumulative_reward if steps else 0.0,
-            avg_confidence=float(np.mean([s.confidence for s in steps])) if steps else 0.0,
-            avg_entropy=float(np.mean([s.entropy for s in steps])) if steps else 0.0,
-            execution_time=steps[-1].time_elapsed if steps else 0.0,
+            total_steps=run_summary["total_steps"],
+            final_reward=run_summary["final_reward"],
+            avg_confidence=run_summary["avg_confidence"],
+            avg_entropy=run_summary["avg_entropy"],
+            execution_time=run_summary["execution_time"],
             adaptive_pressure=request.adaptive_pressure,
             partial_observability=request.partial_observability
         )
@@ -1367,7 +1838,9 @@ async def get_execution_features():
                 "adaptive_pressure": False,
                 "partial_observability": False,
                 "pressure_rate": 1.0,
-                "seed": 9999
+                "seed": 9999,
+                "scenario_mode": "fixed",
+                "scenario_chunk_size": 1024
             }
         }
     }
@@ -1384,7 +1857,7 @@ async def startup_event():
     print("🚀 PolicyLedger API Starting")
     print("=" * 80)
     print(f"Ledger file: {LEDGER_FILE}")
-    print(f"Ledger entries: {len(ledger.read_all())}")
+    print(f"Ledger entries: {ledger.count()}")
     print("=" * 80)
 
 
@@ -12,6 +12,11 @@ Public Exports:
 - PolicyClaim: Data structure for policy submissions
 - discretize_state: State space discretization
 - Training utilities (initialize_q_table, select_action, etc.)
+- Vectorized batch training (train_vectorized, merge_q_arrays)
+- Multi-step TD: n-step returns and Watkins Q(λ) (MultiStepLearner, make_episode_fn)
+- Dyna-Q planning with a learned tabular model (DynaPlanner)
+- Hot-path phase profiling (PhaseProfiler)
+- Per-step trajectory digests of greedy episodes (TrajectoryDigest, TrajectoryRecorder)
 - Policy utilities (extract_policy, serialize_policy, etc.)
 
 Usage:
@@ -32,8 +37,14 @@ from src.agent.trainer import (
     ACTION_SAVE,
     ACTION_USE,
 )
+from src.agent.vectorized import train_vectorized, merge_q_arrays
+from src.agent.multistep import MultiStepLearner, make_episode_fn, TD_METHODS
+from src.agent.dyna import DynaPlanner
+from src.agent.profiling import PhaseProfiler
+from src.agent.trajectory import TrajectoryDigest, TrajectoryRecorder
 from src.agent.policy import (
     extract_policy,
+    extract_policy_arrays,
     serialize_policy,
     deserialize_policy,
     hash_policy,
@@ -55,8 +66,23 @@ __all__ = [
     # Actions
     "ACTION_SAVE",
     "ACTION_USE",
+    # Vectorized training
+    "train_vectorized",
+    "merge_q_arrays",
+    # Multi-step TD
+    "MultiStepLearner",
+    "make_episode_fn",
+    "TD_METHODS",
+    # Dyna-Q planning
+    "DynaPlanner",
+    # Profiling
+    "PhaseProfiler",
+    # Trajectory digests
+    "TrajectoryDigest",
+    "TrajectoryRecorder",
     # Policy handling
     "extract_policy",
+    "extract_policy_arrays",
     "serialize_policy",
     "deserialize_policy",
     "hash_policy",
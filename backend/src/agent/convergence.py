@@ -0,0 +1,388 @@
+"""
+convergence.py
+
+Online convergence monitoring and pluggable stopping rules for training.
+
+Detailed description:
+- RollingStats keeps windowed mean/variance with Welford updates, O(1) per push
+- GreedyChangeTracker counts states whose greedy action changed over an
+  episode; only the state touched by each Q update is re-examined, so it is
+  cheap, and flips that revert within the episode do not count
+- Stopping rules look at the monitor after each episode and return a reason
+  string when training should stop
+- ConvergenceMonitor ties these together for train() and live sessions
+
+Main Components:
+- RollingStats: Windowed Welford mean/variance
+- GreedyChangeTracker: Per-episode greedy-action change counter
+- RewardPlateauRule, PolicyStableRule, TDErrorRule: Stopping rules
+- ConvergenceMonitor: Per-update / per-episode bookkeeping and rule evaluation
+- greedy_single_q(), greedy_double_q(): Greedy-action functions for both tables
+
+Rules:
+    - Does NOT modify Q-tables
+    - Does NOT use randomness
+    - Same sequence of updates → same stop decision
+"""
+
+from collections import deque
+from typing import Callable, Dict, Hashable, List, NamedTuple, Optional, Sequence
+import math
+
+from src.shared.config import OPTIMISTIC_INIT
+
+
+GreedyFn = Callable[[Hashable], int]
+
+
+class RollingStats:
+    """
+    Mean and population variance over the last `window` values.
+
+    Uses Welford's update for additions and its inverse for evictions, so
+    each push is O(1) regardless of window size.
+    """
+
+    def __init__(self, window: int):
+        if window <= 0:
+            raise ValueError(f"window must be positive, got {window}")
+        self.window = window
+        self._values = deque()
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def push(self, value: float) -> None:
+        """Add a value, evicting the oldest once the window is full."""
+        if len(self._values) == self.window:
+            old = self._values.popleft()
+            n = len(self._values)
+            if n == 0:
+                self._mean = 0.0
+                self._m2 = 0.0
+            else:
+                old_mean = self._mean
+                self._mean = (old_mean * (n + 1) - old) / n
+                self._m2 -= (old - old_mean) * (old - self._mean)
+
+        self._values.append(value)
+        n = len(self._values)
+        delta = value - self._mean
+        self._mean += delta / n
+        self._m2 += delta * (value - self._mean)
+
+    @property
+    def count(self) -> int:
+        return len(self._values)
+
+    @property
+    def full(self) -> bool:
+        return len(self._values) == self.window
+
+    @property
+    def mean(self) -> float:
+        return self._mean if self._values else 0.0
+
+    @property
+    def variance(self) -> float:
+        if not self._values:
+            return 0.0
+        # Clamp tiny negatives from floating-point cancellation
+        return max(self._m2, 0.0) / len(self._values)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def state_dict(self) -> Dict:
+        """JSON-friendly internal state (restores bit-exactly)."""
+        return {"window": self.window, "values": list(self._values), "mean": self._mean, "m2": self._m2}
+
+    @classmethod
+    def from_state_dict(cls, data: Dict) -> "RollingStats":
+        stats = cls(data["window"])
+        stats._values.extend(data["values"])
+        stats._mean = data["mean"]
+        stats._m2 = data["m2"]
+        return stats
+
+
+class GreedyChangeTracker:
+    """
+    Counts greedy-policy changes caused by Q updates.
+
+    After every update the caller passes the updated state; only that state's
+    greedy action is recomputed and compared with the cached one. A state
+    counts as changed for the episode if its greedy action at the end of the
+    episode differs from the one at the start (new states count as changes).
+    """
+
+    def __init__(self, greedy_fn: GreedyFn, max_changes: int = 0):
+        """
+        Args:
+            greedy_fn: Maps a state to its current greedy action
+            max_changes: Episodes with at most this many changes count as stable
+        """
+        self.greedy_fn = greedy_fn
+        self.max_changes = max_changes
+        self._greedy: Dict[Hashable, int] = {}
+        self._episode_start: Dict[Hashable, Optional[int]] = {}
+        self.stable_episodes = 0
+        self.total_flips = 0
+
+    def after_update(self, state: Hashable) -> None:
+        """Re-evaluate the greedy action of a state that was just updated."""
+        action = self.greedy_fn(state)
+        previous = self._greedy.get(state)
+        if previous is None or previous != action:
+            if state not in self._episode_start:
+                self._episode_start[state] = previous
+            self._greedy[state] = action
+            self.total_flips += 1
+
+    def end_episode(self) -> int:
+        """Close the episode; returns the number of states whose greedy action changed."""
+        changes = sum(
+            1 for state, start_action in self._episode_start.items()
+            if self._greedy[state] != start_action
+        )
+        self._episode_start.clear()
+        self.stable_episodes = self.stable_episodes + 1 if changes <= self.max_changes else 0
+        return changes
+
+
+def greedy_single_q(q_table: Dict, actions: Sequence[int], default: float = 0.0) -> GreedyFn:
+    """Greedy action on a single dict Q-table (first max wins)."""
+    def greedy(state: Hashable) -> int:
+        return max(actions, key=lambda a: q_table.get((state, a), default))
+    return greedy
+
+
+def greedy_double_q(
+    q_table_a: Dict,
+    q_table_b: Dict,
+    actions: Sequence[int] = (0, 1, 2, 3, 4),
+) -> GreedyFn:
+    """Greedy action on averaged Double-Q tables, as in select_action_double_q."""
+    def greedy(state: Hashable) -> int:
+        return max(
+            actions,
+            key=lambda a: (q_table_a.get((state, a), OPTIMISTIC_INIT)
+                           + q_table_b.get((state, a), OPTIMISTIC_INIT)) / 2
+        )
+    return greedy
+
+
+# =============================================================================
+# STOPPING RULES
+# =============================================================================
+
+class RewardPlateauRule:
+    """Stop when the stddev of the last `window` episode rewards drops below threshold."""
+
+    name = "reward_plateau"
+
+    def __init__(self, window: int = 100, threshold: float = 0.01):
+        self.window = window
+        self.threshold = threshold
+
+    def check(self, monitor: "ConvergenceMonitor") -> Optional[str]:
+        stats = monitor.reward_stats(self.window)
+        # Require more than one full window of history (as train() always has)
+        if monitor.episodes > self.window and stats.std < self.threshold:
+            return f"reward stddev {stats.std:.4f} < {self.threshold} over {self.window} episodes"
+        return None
+
+
+class PolicyStableRule:
+    """
+    Stop when the greedy policy has not changed for `patience` consecutive episodes.
+
+    With a constant learning rate in a stochastic environment, near-tied
+    states can keep flipping forever; max_changes tolerates that many
+    changed states per episode.
+    """
+
+    name = "policy_stable"
+
+    def __init__(self, patience: int = 50, max_changes: int = 0):
+        if patience <= 0:
+            raise ValueError(f"patience must be positive, got {patience}")
+        self.patience = patience
+        self.max_changes = max_changes
+
+    def check(self, monitor: "ConvergenceMonitor") -> Optional[str]:
+        if monitor.tracker is not None and monitor.tracker.stable_episodes >= self.patience:
+            if self.max_changes:
+                return f"greedy policy changed in <= {self.max_changes} states for {self.patience} episodes"
+            return f"greedy policy unchanged for {self.patience} episodes"
+        return None
+
+
+class TDErrorRule:
+    """Stop when the mean |TD error| over the last `window` episodes drops below threshold."""
+
+    name = "td_error"
+
+    def __init__(self, threshold: float = 0.01, window: int = 20):
+        self.threshold = threshold
+        self.window = window
+
+    def check(self, monitor: "ConvergenceMonitor") -> Optional[str]:
+        stats = monitor.td_stats(self.window)
+        if stats.full and stats.mean < self.threshold:
+            return f"mean |TD error| {stats.mean:.4f} < {self.threshold} over {self.window} episodes"
+        return None
+
+
+class StopDecision(NamedTuple):
+    """Why and when training stopped."""
+    rule: str
+    reason: str
+    episode: int  # Number of episodes completed when the rule fired
+
+
+class ConvergenceMonitor:
+    """
+    Tracks training progress and evaluates stopping rules.
+
+    Usage:
+        monitor = ConvergenceMonitor([PolicyStableRule(50)], greedy_fn=greedy_double_q(qa, qb))
+        ... after each Q update:  monitor.record_update(state, td_error)
+        ... after each episode:   decision = monitor.end_episode(reward)
+    """
+
+    def __init__(
+        self,
+        rules: Optional[List] = None,
+        greedy_fn: Optional[GreedyFn] = None,
+    ):
+        """
+        Args:
+            rules: Stopping rules, checked in order (first match wins)
+            greedy_fn: Greedy-action function; enables greedy change tracking
+        """
+        self.rules = list(rules or [])
+        # Tolerance comes from the policy-stability rule, if any
+        max_changes = max(
+            (rule.max_changes for rule in self.rules if isinstance(rule, PolicyStableRule)),
+            default=0,
+        )
+        self.tracker = GreedyChangeTracker(greedy_fn, max_changes) if greedy_fn is not None else None
+        self.episodes = 0
+        self.decision: Optional[StopDecision] = None
+        self.last_greedy_changes = 0
+        self.last_td_error = 0.0
+
+        self._reward_stats: Dict[int, RollingStats] = {}
+        self._td_stats: Dict[int, RollingStats] = {}
+        self._td_sum = 0.0
+        self._td_count = 0
+
+        # Pre-create windows used by the rules so no history is missed
+        for rule in self.rules:
+            if isinstance(rule, RewardPlateauRule):
+                self.reward_stats(rule.window)
+            elif isinstance(rule, TDErrorRule):
+                self.td_stats(rule.window)
+
+    @property
+    def tracks_updates(self) -> bool:
+        """True when record_update() matters (greedy tracking or a TD-error rule)."""
+        return self.tracker is not None or any(isinstance(rule, TDErrorRule) for rule in self.rules)
+
+    def reward_stats(self, window: int) -> RollingStats:
+        """Rolling reward statistics for a window (created on first use)."""
+        if window not in self._reward_stats:
+            self._reward_stats[window] = RollingStats(window)
+        return self._reward_stats[window]
+
+    def td_stats(self, window: int) -> RollingStats:
+        """Rolling per-episode mean |TD error| for a window (created on first use)."""
+        if window not in self._td_stats:
+            self._td_stats[window] = RollingStats(window)
+        return self._td_stats[window]
+
+    def record_update(self, state: Hashable, td_error: Optional[float]) -> None:
+        """Record one Q update (O(1), plus one greedy lookup if tracking)."""
+        if td_error is not None:
+            self._td_sum += abs(td_error)
+            self._td_count += 1
+        if self.tracker is not None:
+            self.tracker.after_update(state)
+
+    def end_episode(self, reward: float) -> Optional[StopDecision]:
+        """
+        Close an episode and evaluate the stopping rules.
+
+        Returns:
+            StopDecision if a rule fired (also kept in self.decision), else None
+        """
+        self.episodes += 1
+        for stats in self._reward_stats.values():
+            stats.push(reward)
+
+        self.last_td_error = self._td_sum / self._td_count if self._td_count else 0.0
+        for stats in self._td_stats.values():
+            stats.push(self.last_td_error)
+        self._td_sum = 0.0
+        self._td_count = 0
+
+        if self.tracker is not None:
+            self.last_greedy_changes = self.tracker.end_episode()
+
+        for rule in self.rules:
+            reason = rule.check(self)
+            if reason is not None:
+                self.decision = StopDecision(rule=rule.name, reason=reason, episode=self.episodes)
+                return self.decision
+        return None
+
+    def state_dict(self) -> Dict:
+        """
+        JSON-friendly monitor state, taken between episodes (for checkpoints).
+
+        The greedy-action cache is not included: it always equals the greedy
+        action of every state in the Q-tables, so load_state_dict() rebuilds it.
+        """
+        return {
+            "episodes": self.episodes,
+            "last_greedy_changes": self.last_greedy_changes,
+            "last_td_error": self.last_td_error,
+            "reward_stats": [stats.state_dict() for stats in self._reward_stats.values()],
+            "td_stats": [stats.state_dict() for stats in self._td_stats.values()],
+            "stable_episodes": self.tracker.stable_episodes if self.tracker else 0,
+            "total_flips": self.tracker.total_flips if self.tracker else 0,
+            "decision": list(self.decision) if self.decision else None,
+        }
+
+    def load_state_dict(self, data: Dict, tracked_states: Sequence[Hashable] = ()) -> None:
+        """
+        Restore state saved by state_dict().
+
+        Args:
+            data: Output of state_dict()
+            tracked_states: States present in the Q-tables (re-seeds the greedy cache)
+        """
+        self.episodes = data["episodes"]
+        self.last_greedy_changes = data["last_greedy_changes"]
+        self.last_td_error = data["last_td_error"]
+        for item in data["reward_stats"]:
+            self._reward_stats[item["window"]] = RollingStats.from_state_dict(item)
+        for item in data["td_stats"]:
+            self._td_stats[item["window"]] = RollingStats.from_state_dict(item)
+        self.decision = StopDecision(*data["decision"]) if data["decision"] else None
+        if self.tracker is not None:
+            self.tracker.stable_episodes = data["stable_episodes"]
+            self.tracker.total_flips = data["total_flips"]
+            for state in tracked_states:
+                self.tracker._greedy[state] = self.tracker.greedy_fn(state)
+
+    def snapshot(self) -> Dict:
+        """JSON-friendly view of the current convergence signals."""
+        return {
+            "greedy_changes": self.last_greedy_changes,
+            "stable_episodes": self.tracker.stable_episodes if self.tracker else None,
+            "td_error": self.last_td_error,
+            "stop_rule": self.decision.rule if self.decision else None,
+            "stop_reason": self.decision.reason if self.decision else None,
+        }
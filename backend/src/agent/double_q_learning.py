@@ -6,14 +6,18 @@ Improved Q-Learning with Double Q-Learning and Experience Replay
 Features:
 - Double Q-Learning: Reduces overestimation bias
 - Experience Replay: Better sample efficiency
+- Prioritized Replay: TD-error proportional sampling on a sum-tree
 - Optimistic Initialization: Better exploration
 - Adaptive Learning: Faster convergence
 """
 
-from typing import Dict, Tuple, List
+from typing import Dict, Tuple, List, Optional, Sequence
 import random
 from collections import deque
-from ..shared.config import ALPHA, GAMMA, OPTIMISTIC_INIT
+from ..shared.config import (
+    ALPHA, GAMMA, OPTIMISTIC_INIT,
+    PER_ALPHA, PER_BETA_START, PER_BETA_INCREMENT, PER_EPSILON
+)
 
 
 State = Tuple[int, int, int, int, int]
@@ -30,20 +34,25 @@ def select_action_double_q(
     q_table_a: Dict[Tuple[State, Action], float],
     q_table_b: Dict[Tuple[State, Action], float],
     epsilon: float,
-    actions: List[Action] = [0, 1, 2, 3, 4]
+    actions: List[Action] = [0, 1, 2, 3, 4],
+    optimistic_value: float = OPTIMISTIC_INIT,
+    rng: Optional[random.Random] = None
 ) -> Action:
     """
     Select action using epsilon-greedy with combined Q-tables.
     Uses average of both Q-tables for action selection.
+    
+    rng is the random stream to draw from (default: the global `random` module).
     """
-    if random.random() < epsilon:
-        return random.choice(actions)
+    rng = random if rng is None else rng
+    if rng.random() < epsilon:
+        return rng.choice(actions)
     
     # Use average of both Q-tables for action selection
     q_values = {}
     for action in actions:
-        q_a = q_table_a.get((state, action), OPTIMISTIC_INIT)
-        q_b = q_table_b.get((state, action), OPTIMISTIC_INIT)
+        q_a = q_table_a.get((state, action), optimistic_value)
+        q_b = q_table_b.get((state, action), optimistic_value)
         q_values[action] = (q_a + q_b) / 2
     
     return max(q_values, key=q_values.get)
@@ -59,53 +68,62 @@ def update_double_q_tables(
     done: bool,
     actions: List[Action] = [0, 1, 2, 3, 4],
     alpha: float = ALPHA,
-    gamma: float = GAMMA
-) -> None:
+    gamma: float = GAMMA,
+    optimistic_value: float = OPTIMISTIC_INIT,
+    rng: Optional[random.Random] = None
+) -> float:
     """
     Update Q-tables using Double Q-Learning algorithm.
     Randomly choose which table to update to reduce overestimation.
+    
+    rng is the random stream for the table coin flip (default: global `random`).
+    Returns the TD error of the update (target - old Q-value).
     """
+    rng = random if rng is None else rng
     # If terminal state, next_state has no value
     if done:
         gamma = 0.0
     
-    if random.random() < 0.5:
+    if rng.random() < 0.5:
         # Update Q_A using Q_B for next state value
-        current_q = q_table_a.get((state, action), OPTIMISTIC_INIT)
+        current_q = q_table_a.get((state, action), optimistic_value)
         
         # Find best action according to Q_A
         best_next_action = max(
             actions,
-            key=lambda a: q_table_a.get((next_state, a), OPTIMISTIC_INIT)
+            key=lambda a: q_table_a.get((next_state, a), optimistic_value)
         )
         
         # Use Q_B to evaluate that action
-        next_q = q_table_b.get((next_state, best_next_action), OPTIMISTIC_INIT)
+        next_q = q_table_b.get((next_state, best_next_action), optimistic_value)
         
         # Update Q_A
-        new_q = current_q + alpha * (reward + gamma * next_q - current_q)
-        q_table_a[(state, action)] = new_q
+        td_error = reward + gamma * next_q - current_q
+        q_table_a[(state, action)] = current_q + alpha * td_error
     else:
         # Update Q_B using Q_A for next state value
-        current_q = q_table_b.get((state, action), OPTIMISTIC_INIT)
+        current_q = q_table_b.get((state, action), optimistic_value)
         
         # Find best action according to Q_B
         best_next_action = max(
             actions,
-            key=lambda a: q_table_b.get((next_state, a), OPTIMISTIC_INIT)
+            key=lambda a: q_table_b.get((next_state, a), optimistic_value)
         )
         
         # Use Q_A to evaluate that action
-        next_q = q_table_a.get((next_state, best_next_action), OPTIMISTIC_INIT)
+        next_q = q_table_a.get((next_state, best_next_action), optimistic_value)
         
         # Update Q_B
-        new_q = current_q + alpha * (reward + gamma * next_q - current_q)
-        q_table_b[(state, action)] = new_q
+        td_error = reward + gamma * next_q - current_q
+        q_table_b[(state, action)] = current_q + alpha * td_error
+    
+    return td_error
 
 
 def merge_q_tables(
     q_table_a: Dict[Tuple[State, Action], float],
-    q_table_b: Dict[Tuple[State, Action], float]
+    q_table_b: Dict[Tuple[State, Action], float],
+    optimistic_value: float = OPTIMISTIC_INIT
 ) -> Dict[Tuple[State, Action], float]:
     """
     Merge two Q-tables by averaging their values.
@@ -115,8 +133,8 @@ def merge_q_tables(
     all_keys = set(q_table_a.keys()) | set(q_table_b.keys())
     
     for key in all_keys:
-        q_a = q_table_a.get(key, OPTIMISTIC_INIT)
-        q_b = q_table_b.get(key, OPTIMISTIC_INIT)
+        q_a = q_table_a.get(key, optimistic_value)
+        q_b = q_table_b.get(key, optimistic_value)
         merged[key] = (q_a + q_b) / 2
     
     return merged
@@ -137,12 +155,164 @@ class ExperienceReplay:
         """Add experience to buffer"""
         self.buffer.append((state, action, reward, next_state, done))
     
-    def sample(self, batch_size: int = None) -> List[Tuple[State, Action, float, State, bool]]:
-        """Sample random batch from buffer"""
+    def sample(self, batch_size: int = None, rng: Optional[random.Random] = None) -> List[Tuple[State, Action, float, State, bool]]:
+        """Sample random batch from buffer (rng defaults to the global `random` module)"""
         batch_size = batch_size or self.batch_size
         if len(self.buffer) < batch_size:
             return list(self.buffer)
-        return random.sample(list(self.buffer), batch_size)
+        rng = random if rng is None else rng
+        return rng.sample(list(self.buffer), batch_size)
+    
+    def can_sample(self) -> bool:
+        """Check if buffer has enough experiences to sample"""
+        return len(self.buffer) >= self.min_size
+    
+    def size(self) -> int:
+        """Get current buffer size"""
+        return len(self.buffer)
+
+
+class SumTree:
+    """
+    Array-based binary sum-tree over `capacity` priorities.
+    
+    Leaves live at tree[leaf_base + i] (leaf_base is capacity rounded up to
+    a power of two), internal node k holds tree[2k] + tree[2k + 1] and the
+    root tree[1] is the total. Updates and prefix-sum lookups are O(log N).
+    """
+    
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.leaf_base = 1 << max(0, (capacity - 1).bit_length())
+        self.tree = [0.0] * (2 * self.leaf_base)
+    
+    @property
+    def total(self) -> float:
+        return self.tree[1]
+    
+    def get(self, index: int) -> float:
+        """Priority stored at a data index"""
+        return self.tree[self.leaf_base + index]
+    
+    def update(self, index: int, priority: float) -> None:
+        """Set a priority and recompute its ancestors"""
+        tree = self.tree
+        node = self.leaf_base + index
+        tree[node] = priority
+        node //= 2
+        while node:
+            tree[node] = tree[2 * node] + tree[2 * node + 1]
+            node //= 2
+    
+    def find(self, value: float) -> int:
+        """Data index whose cumulative priority range contains value"""
+        tree = self.tree
+        node = 1
+        while node < self.leaf_base:
+            left = 2 * node
+            if value < tree[left]:
+                node = left
+            else:
+                value -= tree[left]
+                node = left + 1
+        return node - self.leaf_base
+    
+    def leaves(self, count: int) -> List[float]:
+        """First `count` leaf priorities"""
+        return self.tree[self.leaf_base:self.leaf_base + count]
+    
+    def rebuild(self, priorities: Sequence[float]) -> None:
+        """Load leaf priorities in bulk and recompute all internal nodes"""
+        tree = self.tree
+        tree[self.leaf_base:self.leaf_base + len(priorities)] = list(priorities)
+        for node in range(self.leaf_base - 1, 0, -1):
+            tree[node] = tree[2 * node] + tree[2 * node + 1]
+
+
+class PrioritizedExperienceReplay:
+    """
+    Proportional prioritized replay (Schaul et al.) on a SumTree.
+    
+    Transitions are sampled with probability p_i / sum(p), where
+    p_i = (|TD error| + epsilon) ** alpha. New transitions get the largest
+    priority seen so far so each is replayed at least once. Sampling returns
+    importance-sampling weights (N * P(i)) ** -beta, normalized by the batch
+    maximum; beta anneals towards 1.0 by beta_increment per batch.
+    
+    Storage is a ring buffer: `buffer` holds experiences by slot and
+    `position` is the next slot to overwrite once full.
+    """
+    
+    def __init__(
+        self,
+        max_size: int = 10000,
+        batch_size: int = 32,
+        min_size: int = 100,
+        alpha: float = PER_ALPHA,
+        beta_start: float = PER_BETA_START,
+        beta_increment: float = PER_BETA_INCREMENT,
+        epsilon: float = PER_EPSILON
+    ):
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.min_size = min_size
+        self.alpha = alpha
+        self.beta = beta_start
+        self.beta_increment = beta_increment
+        self.epsilon = epsilon
+        self.buffer: List[Tuple[State, Action, float, State, bool]] = []
+        self.position = 0
+        self.max_priority = 1.0
+        self.tree = SumTree(max_size)
+    
+    def add(self, state: State, action: Action, reward: float, next_state: State, done: bool):
+        """Add experience with the current maximum priority"""
+        experience = (state, action, reward, next_state, done)
+        if len(self.buffer) < self.max_size:
+            self.buffer.append(experience)
+        else:
+            self.buffer[self.position] = experience
+        self.tree.update(self.position, self.max_priority)
+        self.position = (self.position + 1) % self.max_size
+    
+    def sample(self, batch_size: int = None, rng: Optional[random.Random] = None) -> Tuple[List[Tuple[State, Action, float, State, bool]], List[int], List[float]]:
+        """
+        Sample a batch proportionally to priority (stratified over the total).
+        
+        Args:
+            batch_size: Batch size (default: self.batch_size)
+            rng: Random stream (default: the global `random` module)
+        
+        Returns:
+            Tuple of (experiences, indices, importance-sampling weights)
+        """
+        batch_size = batch_size or self.batch_size
+        rng = random if rng is None else rng
+        size = len(self.buffer)
+        batch_size = min(batch_size, size)
+        total = self.tree.total
+        segment = total / batch_size
+        
+        indices = []
+        for i in range(batch_size):
+            # Float rounding can land past the last filled leaf; clamp to it
+            index = min(self.tree.find((i + rng.random()) * segment), size - 1)
+            indices.append(index)
+        
+        weights = [(size * self.tree.get(index) / total) ** -self.beta for index in indices]
+        max_weight = max(weights)
+        weights = [w / max_weight for w in weights]
+        
+        self.beta = min(1.0, self.beta + self.beta_increment)
+        return [self.buffer[index] for index in indices], indices, weights
+    
+    def update_priorities(self, indices: Sequence[int], td_errors: Sequence[float]) -> None:
+        """Re-prioritize sampled experiences by their new TD errors"""
+        for index, td_error in zip(indices, td_errors):
+            priority = (abs(td_error) + self.epsilon) ** self.alpha
+            self.tree.update(index, priority)
+            if priority > self.max_priority:
+                self.max_priority = priority
     
     def can_sample(self) -> bool:
         """Check if buffer has enough experiences to sample"""
@@ -151,3 +321,23 @@ class ExperienceReplay:
     def size(self) -> int:
         """Get current buffer size"""
         return len(self.buffer)
+
+
+REPLAY_KINDS = ("uniform", "prioritized")
+
+
+def create_replay_buffer(kind: str, max_size: int, batch_size: int, min_size: int):
+    """
+    Build a replay buffer by name.
+    
+    Args:
+        kind: "uniform" (ExperienceReplay) or "prioritized" (PrioritizedExperienceReplay)
+    
+    Raises:
+        ValueError: If kind is unknown
+    """
+    if kind == "uniform":
+        return ExperienceReplay(max_size=max_size, batch_size=batch_size, min_size=min_size)
+    if kind == "prioritized":
+        return PrioritizedExperienceReplay(max_size=max_size, batch_size=batch_size, min_size=min_size)
+    raise ValueError(f"Unknown replay kind: {kind} (expected one of {REPLAY_KINDS})")
@@ -0,0 +1,198 @@
+"""
+dyna.py
+
+Dyna-Q planning with a learned tabular model.
+
+Detailed description:
+- Every real transition (s, a, r, s', done) is recorded in TabularModel:
+  visit count and reward sum per (state, action), plus counts of each
+  observed (next_state, done) outcome
+- After each real update, DynaPlanner performs K simulated updates: pick
+  an observed (state, action) uniformly, use its mean reward, sample an
+  outcome in proportion to how often it was seen, and apply the usual
+  (Double) Q-learning update
+- Real env steps are the expensive part of training; planning reuses them
+  K more times at the cost of a dict update each
+
+Model layout (one row per observed (state, action), in first-seen order):
+    pairs[i]             (state, action)
+    visits[i]            times the pair was taken
+    reward_sums[i]       sum of its rewards
+    outcomes[i]          [(next_state, done), ...] distinct outcomes
+    outcome_counts[i]    [count, ...] parallel to outcomes[i]
+
+Main Components:
+- TabularModel: Compact transition statistics
+- DynaPlanner: K planning updates per real step, with real/planned counters
+"""
+
+from typing import Dict, List, Optional, Tuple
+import random
+
+from src.shared.config import ALPHA, GAMMA, OPTIMISTIC_INIT
+from src.agent.convergence import ConvergenceMonitor
+from src.agent.double_q_learning import update_double_q_tables
+from src.agent.trainer import update_q_value
+
+
+class TabularModel:
+    """Empirical transition model over observed (state, action) pairs."""
+
+    def __init__(self):
+        self.index: Dict[Tuple, int] = {}
+        self.pairs: List[Tuple] = []
+        self.visits: List[int] = []
+        self.reward_sums: List[float] = []
+        self.outcomes: List[List[Tuple]] = []
+        self.outcome_counts: List[List[int]] = []
+
+    def __len__(self) -> int:
+        return len(self.pairs)
+
+    def observe(self, state, action: int, reward: float, next_state, done: bool) -> None:
+        """Record one real transition."""
+        key = (state, action)
+        row = self.index.get(key)
+        if row is None:
+            row = len(self.pairs)
+            self.index[key] = row
+            self.pairs.append(key)
+            self.visits.append(0)
+            self.reward_sums.append(0.0)
+            self.outcomes.append([])
+            self.outcome_counts.append([])
+        self.visits[row] += 1
+        self.reward_sums[row] += reward
+
+        outcome = (next_state, done)
+        outcomes = self.outcomes[row]
+        for i, seen in enumerate(outcomes):
+            if seen == outcome:
+                self.outcome_counts[row][i] += 1
+                return
+        outcomes.append(outcome)
+        self.outcome_counts[row].append(1)
+
+    def sample(self, rng) -> Tuple:
+        """
+        Simulate one transition from a uniformly chosen observed pair.
+
+        Returns:
+            Tuple of (state, action, mean_reward, next_state, done)
+        """
+        row = int(rng.random() * len(self.pairs))
+        counts = self.outcome_counts[row]
+        pick = rng.random() * self.visits[row]
+        i = 0
+        while pick >= counts[i] and i < len(counts) - 1:
+            pick -= counts[i]
+            i += 1
+        state, action = self.pairs[row]
+        next_state, done = self.outcomes[row][i]
+        return state, action, self.reward_sums[row] / self.visits[row], next_state, done
+
+    def state_dict(self) -> Dict:
+        """Plain-data snapshot (for checkpoints)."""
+        return {
+            'pairs': list(self.pairs),
+            'visits': list(self.visits),
+            'reward_sums': list(self.reward_sums),
+            'outcomes': [list(o) for o in self.outcomes],
+            'outcome_counts': [list(c) for c in self.outcome_counts],
+        }
+
+    @classmethod
+    def from_state_dict(cls, data: Dict) -> "TabularModel":
+        model = cls()
+        model.pairs = [(tuple(state), action) for state, action in data['pairs']]
+        model.index = {pair: i for i, pair in enumerate(model.pairs)}
+        model.visits = list(data['visits'])
+        model.reward_sums = list(data['reward_sums'])
+        model.outcomes = [[(tuple(next_state), done) for next_state, done in outcomes]
+                          for outcomes in data['outcomes']]
+        model.outcome_counts = [list(c) for c in data['outcome_counts']]
+        return model
+
+
+class DynaPlanner:
+    """
+    Model learning plus K planning updates per real step.
+
+    Counters:
+        real_updates: Real transitions observed
+        planned_updates: Simulated updates applied
+    """
+
+    def __init__(self, planning_steps: int, model: Optional[TabularModel] = None):
+        """
+        Args:
+            planning_steps: Simulated updates after each real step (K)
+            model: Existing model to continue from (default: empty)
+        """
+        if planning_steps < 0:
+            raise ValueError(f"planning_steps must be non-negative, got {planning_steps}")
+        self.planning_steps = planning_steps
+        self.model = model if model is not None else TabularModel()
+        self.real_updates = 0
+        self.planned_updates = 0
+
+    def step(
+        self,
+        state, action: int, reward: float, next_state, done: bool,
+        q_table: Dict,
+        q_table_a: Optional[Dict] = None,
+        q_table_b: Optional[Dict] = None,
+        monitor: Optional[ConvergenceMonitor] = None,
+        alpha: float = ALPHA,
+        gamma: float = GAMMA,
+        optimistic_value: float = OPTIMISTIC_INIT,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        """
+        Record a real transition, then plan K simulated updates.
+
+        Args:
+            state, action, reward, next_state, done: The real transition
+            Other args as in train_episode()
+        """
+        rng = random if rng is None else rng
+        model = self.model
+        model.observe(state, action, reward, next_state, done)
+        self.real_updates += 1
+
+        use_double_q = (q_table_a is not None and q_table_b is not None)
+        for _ in range(self.planning_steps):
+            sim_state, sim_action, sim_reward, sim_next, sim_done = model.sample(rng)
+            if use_double_q:
+                td_error = update_double_q_tables(q_table_a, q_table_b, sim_state, sim_action, sim_reward,
+                                                  sim_next, sim_done, alpha=alpha, gamma=gamma,
+                                                  optimistic_value=optimistic_value, rng=rng)
+            else:
+                td_error = update_q_value(q_table, sim_state, sim_action, sim_reward, sim_next, sim_done,
+                                          alpha=alpha, gamma=gamma)
+            if monitor is not None:
+                monitor.record_update(sim_state, td_error)
+        self.planned_updates += self.planning_steps
+
+    def stats(self) -> Dict:
+        return {
+            "planning_steps": self.planning_steps,
+            "real_updates": self.real_updates,
+            "planned_updates": self.planned_updates,
+            "model_pairs": len(self.model),
+        }
+
+    def state_dict(self) -> Dict:
+        return {
+            'planning_steps': self.planning_steps,
+            'real_updates': self.real_updates,
+            'planned_updates': self.planned_updates,
+            'model': self.model.state_dict(),
+        }
+
+    @classmethod
+    def from_state_dict(cls, data: Dict) -> "DynaPlanner":
+        planner = cls(data['planning_steps'], TabularModel.from_state_dict(data['model']))
+        planner.real_updates = data['real_updates']
+        planner.planned_updates = data['planned_updates']
+        return planner
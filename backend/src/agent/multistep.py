@@ -0,0 +1,352 @@
+"""
+multistep.py
+
+n-step returns and Watkins Q(λ) for the (Double) Q-learning trainer.
+
+Detailed description:
+- One-step TD moves the terminal bonus/penalty of CyberDefenseEnv back one
+  state per visit; n-step returns move it n states, Q(λ) along the whole
+  greedy part of the trajectory
+- Both work with the Double-Q tables: a coin flip picks the table to
+  update, its argmax picks the bootstrap action and the other table
+  evaluates it (as in update_double_q_tables); without Double-Q tables the
+  single table bootstraps with its own max
+- Per-episode state lives in flat preallocated lists (NStepBuffer ring,
+  EligibilityTraces slots) that reset in O(1) / O(active traces) instead
+  of being reallocated every episode
+- Experience replay still replays one-step transitions (replay_learning)
+
+n-step (off-policy, no importance sampling, as in n-step DQN):
+    G = r_t + γ r_{t+1} + ... + γ^{n-1} r_{t+n-1} + γ^n Q(s_{t+n}, a*)
+    Q(s_t, a_t) += α (G - Q(s_t, a_t))
+    Pending returns are flushed with shorter horizons at episode end.
+
+Watkins Q(λ) (replacing traces):
+    δ = r + γ Q(s', a*) - Q(s, a);  e(s, a) = 1
+    Q(x) += α δ e(x) for every traced pair x
+    e *= γλ if the next action is greedy, otherwise all traces are cut
+
+Main Components:
+- TD_METHODS: Selectable update rules ("one_step", "n_step", "q_lambda")
+- NStepBuffer, EligibilityTraces: Reusable per-episode workspaces
+- MultiStepLearner: train_episode()-compatible episode runner
+- make_episode_fn(): Pick the episode function for a session config
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+import random
+import time
+
+from src.shared.config import ALPHA, GAMMA, OPTIMISTIC_INIT, N_STEP, TRACE_LAMBDA, TRACE_CUTOFF
+from src.agent.state import discretize_state
+from src.agent.trainer import ACTIONS, select_action, train_episode, replay_learning
+from src.agent.double_q_learning import select_action_double_q
+from src.agent.convergence import ConvergenceMonitor
+from src.agent.profiling import PhaseProfiler
+
+
+TD_METHODS = ("one_step", "n_step", "q_lambda")
+
+DOUBLE_Q_ACTIONS = (0, 1, 2, 3, 4)
+
+
+class NStepBuffer:
+    """Ring of the last n (state, action, reward) steps; reset() is O(1)."""
+
+    __slots__ = ("n", "states", "actions", "rewards", "start", "count")
+
+    def __init__(self, n: int):
+        if n < 1:
+            raise ValueError(f"n must be at least 1, got {n}")
+        self.n = n
+        self.states: List = [None] * n
+        self.actions: List[int] = [0] * n
+        self.rewards: List[float] = [0.0] * n
+        self.start = 0
+        self.count = 0
+
+    def reset(self) -> None:
+        self.start = 0
+        self.count = 0
+
+    def push(self, state, action: int, reward: float) -> None:
+        """Append a step (the buffer must not be full)."""
+        slot = (self.start + self.count) % self.n
+        self.states[slot] = state
+        self.actions[slot] = action
+        self.rewards[slot] = reward
+        self.count += 1
+
+    def full(self) -> bool:
+        return self.count == self.n
+
+    def pop_return(self, gamma: float) -> Tuple:
+        """
+        Remove the oldest step and return it with its discounted reward sum.
+
+        Returns:
+            Tuple of (state, action, G, γ^k) where k is the number of rewards in G
+        """
+        total = 0.0
+        discount = 1.0
+        for i in range(self.count):
+            total += discount * self.rewards[(self.start + i) % self.n]
+            discount *= gamma
+        state, action = self.states[self.start], self.actions[self.start]
+        self.start = (self.start + 1) % self.n
+        self.count -= 1
+        return state, action, total, discount
+
+
+class EligibilityTraces:
+    """
+    Replacing eligibility traces in parallel flat lists.
+
+    keys[i] / values[i] hold the active traces; slots maps a key to its
+    index. Decay drops traces below `cutoff`, so the active set stays short.
+    """
+
+    __slots__ = ("keys", "values", "slots", "cutoff")
+
+    def __init__(self, cutoff: float = TRACE_CUTOFF):
+        self.keys: List = []
+        self.values: List[float] = []
+        self.slots: Dict = {}
+        self.cutoff = cutoff
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def reset(self) -> None:
+        self.keys.clear()
+        self.values.clear()
+        self.slots.clear()
+
+    def replace(self, key) -> None:
+        """Set the trace of `key` to 1."""
+        slot = self.slots.get(key)
+        if slot is None:
+            self.slots[key] = len(self.keys)
+            self.keys.append(key)
+            self.values.append(1.0)
+        else:
+            self.values[slot] = 1.0
+
+    def decay(self, factor: float) -> None:
+        """Multiply every trace by factor, dropping those below the cutoff."""
+        values = [v * factor for v in self.values]
+        if values and min(values) < self.cutoff:
+            kept = [(k, v) for k, v in zip(self.keys, values) if v >= self.cutoff]
+            self.keys[:] = [k for k, _ in kept]
+            values = [v for _, v in kept]
+            self.slots.clear()
+            self.slots.update((k, i) for i, k in enumerate(self.keys))
+        self.values[:] = values
+
+
+class MultiStepLearner:
+    """
+    n-step or Watkins Q(λ) episode runner with reusable workspaces.
+
+    run_episode() has the signature of train_episode(), so callers can swap
+    it in (see make_episode_fn()). Create one learner per training session.
+    """
+
+    def __init__(
+        self,
+        method: str,
+        n_step: int = N_STEP,
+        trace_lambda: float = TRACE_LAMBDA,
+        trace_cutoff: float = TRACE_CUTOFF,
+    ):
+        """
+        Args:
+            method: "n_step" or "q_lambda"
+            n_step: Rewards per n-step return
+            trace_lambda: Trace decay λ for Q(λ)
+            trace_cutoff: Traces below this are dropped
+        """
+        if method not in ("n_step", "q_lambda"):
+            raise ValueError(f"Unknown multi-step method: {method!r}")
+        if not 0.0 <= trace_lambda <= 1.0:
+            raise ValueError(f"trace_lambda must be in [0, 1], got {trace_lambda}")
+        self.method = method
+        self.n_step = n_step
+        self.trace_lambda = trace_lambda
+        self.buffer = NStepBuffer(n_step)
+        self.traces = EligibilityTraces(trace_cutoff)
+
+    def run_episode(self, env, q_table: Dict, epsilon: float, discretize_fn=None,
+                    q_table_a: Dict = None, q_table_b: Dict = None,
+                    replay_buffer=None, monitor: Optional[ConvergenceMonitor] = None,
+                    alpha: float = ALPHA, gamma: float = GAMMA,
+                    optimistic_value: float = OPTIMISTIC_INIT,
+                    rng: Optional[random.Random] = None,
+                    profiler: Optional[PhaseProfiler] = None,
+                    planner=None) -> Tuple[float, Dict[str, int]]:
+        """
+        Run one training episode (arguments and return value as train_episode()).
+        """
+        if discretize_fn is None:
+            discretize_fn = discretize_state
+        rng_ = random if rng is None else rng
+        use_double_q = (q_table_a is not None and q_table_b is not None)
+        if use_double_q:
+            actions = DOUBLE_Q_ACTIONS
+            default = optimistic_value
+
+            def choose(s):
+                return select_action_double_q(s, q_table_a, q_table_b, epsilon,
+                                              optimistic_value=optimistic_value, rng=rng)
+
+            def behaviour_values(s):
+                return [(q_table_a.get((s, a), default) + q_table_b.get((s, a), default)) / 2 for a in actions]
+        else:
+            actions = ACTIONS
+            default = 0.0
+
+            def choose(s):
+                return select_action(s, q_table, epsilon, optimistic_value=0.0, rng=rng)
+
+            def behaviour_values(s):
+                return [q_table.get((s, a), default) for a in actions]
+
+        def pick_tables():
+            """(table to update, table evaluating its argmax)."""
+            if not use_double_q:
+                return q_table, q_table
+            return (q_table_a, q_table_b) if rng_.random() < 0.5 else (q_table_b, q_table_a)
+
+        def bootstrap(update_table, eval_table, s):
+            best = max(actions, key=lambda a: update_table.get((s, a), default))
+            return eval_table.get((s, best), default)
+
+        prof = profiler
+        if prof is not None:
+            t = time.perf_counter()
+        state = discretize_fn(env.reset())
+        buffer = self.buffer
+        traces = self.traces
+        buffer.reset()
+        traces.reset()
+        if prof is not None:
+            t = prof.lap("env_reset", t)
+
+        total_reward = 0.0
+        done = False
+        action_counts: Dict[str, int] = {}
+        action = choose(state)
+        if prof is not None:
+            t = prof.lap("select_action", t)
+
+        while not done:
+            action_name = str(action)
+            action_counts[action_name] = action_counts.get(action_name, 0) + 1
+            if prof is not None:
+                t = prof.lap("action_counting", t)
+
+            next_env_state, reward, done = env.step(action)
+            if prof is not None:
+                t = prof.lap("env_step", t)
+            next_state = discretize_fn(next_env_state)
+            if prof is not None:
+                t = prof.lap("discretize", t)
+
+            if replay_buffer is not None:
+                replay_buffer.add(state, action, reward, next_state, done)
+                if prof is not None:
+                    t = prof.lap("replay_add", t)
+
+            # Next action first: Q(λ) needs to know whether it is greedy
+            next_action = None if done else choose(next_state)
+            if prof is not None:
+                t = prof.lap("select_action", t)
+
+            if self.method == "n_step":
+                buffer.push(state, action, reward)
+                if done:
+                    while buffer.count:
+                        self._n_step_update(buffer.pop_return(gamma), None, pick_tables, bootstrap,
+                                            alpha, default, monitor)
+                elif buffer.full():
+                    self._n_step_update(buffer.pop_return(gamma), next_state, pick_tables, bootstrap,
+                                        alpha, default, monitor)
+            else:
+                update_table, eval_table = pick_tables()
+                key = (state, action)
+                target = reward if done else reward + gamma * bootstrap(update_table, eval_table, next_state)
+                td_error = target - update_table.get(key, default)
+                traces.replace(key)
+                step = alpha * td_error
+                for trace_key, trace in zip(traces.keys, traces.values):
+                    update_table[trace_key] = update_table.get(trace_key, default) + step * trace
+                if monitor is not None:
+                    monitor.record_update(state, td_error)
+                    for trace_state, _ in traces.keys:
+                        if trace_state != state:
+                            monitor.record_update(trace_state, None)
+
+                if not done:
+                    values = behaviour_values(next_state)
+                    if values[actions.index(next_action)] >= max(values):
+                        traces.decay(gamma * self.trace_lambda)
+                    else:
+                        traces.reset()  # Exploratory action: Watkins cut
+            if prof is not None:
+                t = prof.lap("q_update", t)
+
+            # Dyna-Q planning uses one-step updates on model samples
+            if planner is not None:
+                planner.step(state, action, reward, next_state, done, q_table, q_table_a, q_table_b,
+                             monitor=monitor, alpha=alpha, gamma=gamma, optimistic_value=optimistic_value,
+                             rng=rng)
+                if prof is not None:
+                    t = prof.lap("planning", t)
+
+            total_reward += reward
+            state = next_state
+            action = next_action
+
+        if replay_buffer is not None:
+            replay_learning(replay_buffer, q_table, q_table_a, q_table_b, monitor=monitor,
+                            alpha=alpha, gamma=gamma, optimistic_value=optimistic_value,
+                            rng=rng, profiler=profiler)
+
+        return total_reward, action_counts
+
+    @staticmethod
+    def _n_step_update(popped, bootstrap_state, pick_tables, bootstrap, alpha, default, monitor) -> None:
+        """Apply one n-step return (bootstrap_state None = episode ended)."""
+        state, action, n_step_return, discount = popped
+        update_table, eval_table = pick_tables()
+        target = n_step_return
+        if bootstrap_state is not None:
+            target += discount * bootstrap(update_table, eval_table, bootstrap_state)
+        key = (state, action)
+        current = update_table.get(key, default)
+        update_table[key] = current + alpha * (target - current)
+        if monitor is not None:
+            monitor.record_update(state, target - current)
+
+
+def make_episode_fn(
+    td_method: str = "one_step",
+    n_step: int = N_STEP,
+    trace_lambda: float = TRACE_LAMBDA,
+) -> Callable[..., Tuple[float, Dict[str, int]]]:
+    """
+    Episode function for a TD method, with train_episode()'s signature.
+
+    Args:
+        td_method: One of TD_METHODS
+        n_step: Rewards per n-step return ("n_step")
+        trace_lambda: Trace decay ("q_lambda")
+
+    Raises:
+        ValueError: If td_method is unknown
+    """
+    if td_method == "one_step":
+        return train_episode
+    if td_method not in TD_METHODS:
+        raise ValueError(f"Unknown td_method: {td_method!r}. Available: {list(TD_METHODS)}")
+    return MultiStepLearner(td_method, n_step=n_step, trace_lambda=trace_lambda).run_episode
@@ -9,8 +9,16 @@ Detailed description:
 - Generates cryptographic hashes for policy verification
 - Provides complete policy lifecycle management
 
+Tie-breaking (all extractors):
+- The action with the highest Q-value wins; equal Q-values go to the
+  lowest action id
+- Only (state, action) pairs present in the table compete, so the result
+  does not depend on key insertion order: identical Q-tables always give
+  identical policies and therefore identical policy hashes
+
 Main Components:
-- extract_policy(): Converts Q-table to deterministic policy
+- extract_policy(): Converts Q-table to deterministic policy (one pass)
+- extract_policy_arrays(): Same for dense (states, actions) arrays
 - serialize_policy(): Converts policy to bytes for storage
 - deserialize_policy(): Reconstructs policy from bytes
 - hash_policy(): Generates SHA-256 fingerprint
@@ -27,6 +35,10 @@ from typing import Dict, Tuple
 import json
 import hashlib
 
+import numpy as np
+
+from src.agent.state import CYBER_STATE_SHAPE
+
 
 # Type aliases for clarity
 State = Tuple[int, int, int]  # (time_bucket, battery_bucket, demand)
@@ -38,7 +50,8 @@ def extract_policy(q_table: Dict[Tuple[State, Action], float]) -> Policy:
     """
     Extract deterministic policy from Q-table.
 
-    For each state, pick the action with highest Q-value.
+    For each state, pick the action with highest Q-value. Single pass over
+    the table: O(S·A).
 
     Args:
         q_table: Trained Q-table {(state, action): q_value}
@@ -50,29 +63,40 @@ def extract_policy(q_table: Dict[Tuple[State, Action], float]) -> Policy:
         - Does NOT include training metadata
         - Does NOT include rewards history
         - Pure state→action mapping
+        - Ties go to the lowest action id (see module docstring)
     """
     policy = {}
+    best_values = {}
 
-    # Get all unique states from Q-table
-    states = set(state for (state, action) in q_table.keys())
+    for (state, action), value in q_table.items():
+        best = best_values.get(state)
+        if best is None or value > best or (value == best and action < policy[state]):
+            best_values[state] = value
+            policy[state] = action
 
-    # For each state, find action with max Q-value
-    for state in states:
-        # Get Q-values for all actions in this state
-        # Determine number of actions from Q-table
-        available_actions = set(action for (s, action) in q_table.keys() if s == state)
-        if not available_actions:
-            # Fallback to common action space (cyber defense: 0-4)
-            available_actions = [0, 1, 2, 3, 4]
-        
-        q_values = [(action, q_table.get((state, action), 0.0)) for action in available_actions]
+    return policy
 
-        # Pick action with highest Q-value (deterministic)
-        best_action = max(q_values, key=lambda x: x[1])[0]
 
-        policy[state] = best_action
+def extract_policy_arrays(q_values: np.ndarray, visits: np.ndarray) -> Policy:
+    """
+    Extract the policy straight from dense cyber Q-arrays.
 
-    return policy
+    Equivalent to extract_policy(merge_q_arrays(q_values, q_values, visits)),
+    without building the dict Q-table.
+
+    Args:
+        q_values: (NUM_CYBER_STATES, actions) Q-values
+        visits: Same-shape visit counts; unvisited cells do not compete
+
+    Returns:
+        Deterministic policy {state: best_action} over visited states
+    """
+    visited = visits > 0
+    masked = np.where(visited, q_values, -np.inf)
+    rows = np.flatnonzero(visited.any(axis=1))
+    best_actions = np.argmax(masked[rows], axis=1)  # First maximum = lowest action id
+    states = zip(*(dim.tolist() for dim in np.unravel_index(rows, CYBER_STATE_SHAPE)))
+    return dict(zip(states, best_actions.tolist()))
 
 
 def serialize_policy(policy: Policy) -> bytes:
@@ -0,0 +1,186 @@
+"""
+profiling.py
+
+Opt-in per-phase timing for the training hot path.
+
+Detailed description:
+- train_episode() interleaves action selection, env.step, discretization,
+  action counting, Q updates and replay work on every step
+- PhaseProfiler accumulates wall time and call counts per phase
+- When no profiler is passed, the only cost is an `is not None` check per phase
+- Optionally runs cProfile over a chosen episode range and dumps a pstats
+  file (readable by snakeviz, flameprof, gprof2dot); async callers pause the
+  trace across awaits so it only covers their own episodes
+- collapsed() exports the phase totals in folded-stack format for
+  flamegraph.pl / speedscope
+
+Usage (what train_episode does):
+    t = time.perf_counter()
+    action = select_action(...)
+    t = profiler.lap("select_action", t)
+
+Main Components:
+- PhaseProfiler: Phase accumulator plus episode-range cProfile tracing
+- check_trace_episodes(): Validate a [start, end) trace range up front
+- PHASES: Phase names recorded by train_episode() and the live trainer
+"""
+
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+import cProfile
+import time
+
+
+# Phase names in hot-path order
+PHASES = (
+    "env_reset",
+    "select_action",
+    "action_counting",
+    "env_step",
+    "discretize",
+    "replay_add",
+    "q_update",
+    "monitor",
+    "planning",
+    "replay_sample",
+    "replay_update",
+    "priority_update",
+    "merge_q_tables",  # Live trainer, once per episode
+    "broadcast",  # Live trainer, once per episode
+)
+
+
+def check_trace_episodes(trace_episodes) -> Tuple[int, int]:
+    """
+    Validate a cProfile episode range.
+
+    Returns:
+        (start, end) as ints
+
+    Raises:
+        ValueError: Unless it is a pair with 0 <= start < end
+    """
+    try:
+        start, end = (int(x) for x in trace_episodes)
+    except (TypeError, ValueError):
+        raise ValueError(f"trace_episodes must be a [start, end) pair, got {trace_episodes!r}") from None
+    if not 0 <= start < end:
+        raise ValueError(f"trace_episodes must be a non-empty [start, end) range, got {trace_episodes}")
+    return start, end
+
+
+class PhaseProfiler:
+    """
+    Cumulative per-phase wall time and call counts.
+
+    Not thread-safe: use one profiler per training session.
+    """
+
+    def __init__(
+        self,
+        trace_episodes: Optional[Tuple[int, int]] = None,
+        trace_path: Optional[Path] = None,
+    ):
+        """
+        Args:
+            trace_episodes: Optional [start, end) episode range to run cProfile over
+            trace_path: Where to dump the cProfile stats (.prof) when the range ends
+        """
+        if trace_episodes is not None:
+            trace_episodes = check_trace_episodes(trace_episodes)
+            if trace_path is None:
+                raise ValueError("trace_path is required with trace_episodes")
+        self.seconds: Dict[str, float] = {phase: 0.0 for phase in PHASES}
+        self.calls: Dict[str, int] = {phase: 0 for phase in PHASES}
+        self.episodes = 0
+        self.trace_episodes = trace_episodes
+        self.trace_path = Path(trace_path) if trace_path else None
+        self.trace_written = False
+        self.trace_error: Optional[str] = None
+        self._cprofile: Optional[cProfile.Profile] = None
+        self._tracing = False
+
+    def lap(self, phase: str, start: float) -> float:
+        """Charge time since `start` to `phase`; returns now (start of the next phase)."""
+        now = time.perf_counter()
+        self.seconds[phase] += now - start
+        self.calls[phase] += 1
+        return now
+
+    def begin_episode(self, episode: int) -> None:
+        """Start cProfile at the first episode of the trace range; resume it for later ones."""
+        if not self.trace_episodes or self.trace_written:
+            return
+        if episode == self.trace_episodes[0]:
+            self._cprofile = cProfile.Profile()
+        self.resume_trace()
+
+    def end_episode(self, episode: int) -> None:
+        """Count the episode; dump the trace after the last episode of the range."""
+        self.episodes += 1
+        if self._cprofile is not None and episode + 1 >= self.trace_episodes[1]:
+            self.finish_trace()
+
+    def pause_trace(self) -> None:
+        """
+        Disable cProfile, keeping what it has collected.
+
+        cProfile is process-wide: a session must pause it before awaiting,
+        or other sessions' work lands in its trace and they cannot trace.
+        """
+        if self._tracing:
+            self._cprofile.disable()
+            self._tracing = False
+
+    def resume_trace(self) -> None:
+        """Re-enable a paused cProfile trace (no-op outside the trace range)."""
+        if self._cprofile is None or self._tracing:
+            return
+        try:
+            self._cprofile.enable()
+            self._tracing = True
+        except ValueError as e:  # Another profiler (e.g. a debugger) is active
+            self._cprofile = None
+            self.trace_error = str(e)
+
+    def finish_trace(self) -> None:
+        """Stop cProfile (if running) and write the stats file."""
+        if self._cprofile is None:
+            return
+        self.pause_trace()
+        self.trace_path.parent.mkdir(parents=True, exist_ok=True)
+        self._cprofile.dump_stats(str(self.trace_path))
+        self._cprofile = None
+        self.trace_written = True
+
+    def report(self) -> Dict:
+        """JSON-friendly per-phase totals, sorted by time spent."""
+        total = sum(self.seconds.values())
+        phases = [
+            {
+                "phase": phase,
+                "total_ms": self.seconds[phase] * 1000,
+                "calls": self.calls[phase],
+                "mean_us": self.seconds[phase] / self.calls[phase] * 1e6 if self.calls[phase] else 0.0,
+                "share": self.seconds[phase] / total if total > 0 else 0.0,
+            }
+            for phase in PHASES
+            if self.calls[phase]
+        ]
+        phases.sort(key=lambda p: p["total_ms"], reverse=True)
+        return {
+            "episodes": self.episodes,
+            "instrumented_ms": total * 1000,
+            "phases": phases,
+            "trace_episodes": list(self.trace_episodes) if self.trace_episodes else None,
+            "trace_path": str(self.trace_path) if self.trace_written else None,
+            "trace_error": self.trace_error,
+        }
+
+    def collapsed(self, root: str = "train_episode") -> str:
+        """Folded stacks ("root;phase microseconds" per line) for flame graph tools."""
+        return "\n".join(
+            f"{root};{phase} {int(self.seconds[phase] * 1e6)}"
+            for phase in PHASES
+            if self.calls[phase]
+        ) + "\n"
@@ -20,6 +20,7 @@ Dependencies:
 - src.agent.trainer: Q-learning training functions
 - src.agent.policy: Policy extraction and serialization
 - src.agent.state: State discretization
+- src.agent.trajectory: Per-step digest of the claimed episode
 
 Author: PolicyLedger Team
 Created: 2025-12-28
@@ -31,11 +32,10 @@ TODO: Google Cloud Integration
 - Firestore: Track training metrics and lineage
 """
 
-from typing import NamedTuple
-import json
-from pathlib import Path
-from src.environments.cyber_env import CyberDefenseEnv
+from typing import Callable, NamedTuple, Optional
+import random
 from src.environments.base_env import BaseEnv
+from src.environments.env_spec import EnvSpec, env_registry
 from src.shared.config import (
     DEFAULT_EPISODES,
     DEFAULT_TIME_HORIZON,
@@ -43,6 +43,7 @@ from src.shared.config import (
 from src.agent.trainer import train
 from src.agent.policy import extract_policy, serialize_policy, hash_policy, Policy
 from src.agent.state import discretize_state
+from src.agent.trajectory import TrajectoryDigest, TrajectoryRecorder
 
 
 class PolicyClaim(NamedTuple):
@@ -57,12 +58,15 @@ class PolicyClaim(NamedTuple):
         policy_hash: SHA-256 hash of policy artifact
         policy_artifact: Serialized policy
         claimed_reward: Agent's claimed defense score (reward)
+        trajectory: Digest of the greedy episode behind claimed_reward
+                    (None for claims made without one)
     """
     agent_id: str  # Unique identifier for this agent
     env_id: str  # Environment configuration identifier (based on seed)
     policy_hash: str  # SHA-256 hash of policy artifact
     policy_artifact: bytes  # Serialized policy
     claimed_reward: float  # Agent's claimed defense score
+    trajectory: Optional[TrajectoryDigest] = None  # Per-step digest of the claimed episode
 
     def __repr__(self) -> str:
         return (
@@ -75,7 +79,7 @@ class PolicyClaim(NamedTuple):
         )
 
 
-def evaluate_policy(env: BaseEnv, policy: Policy) -> float:
+def evaluate_policy(env: BaseEnv, policy: Policy, recorder: Optional[TrajectoryRecorder] = None) -> float:
     """
     Evaluate a deterministic policy by running it greedily in the environment.
 
@@ -84,6 +88,7 @@ def evaluate_policy(env: BaseEnv, policy: Policy) -> float:
     Args:
         env: Environment instance
         policy: Deterministic policy {state: action}
+        recorder: Optional TrajectoryRecorder fed every (state, action, reward)
 
     Returns:
         Total reward from running policy greedily
@@ -112,6 +117,8 @@ def evaluate_policy(env: BaseEnv, policy: Policy) -> float:
 
         # Take action
         state_dict, reward, done = env.step(action)
+        if recorder is not None:
+            recorder.record(state_tuple, action, reward)
 
         # Accumulate reward
         total_reward += reward
@@ -124,6 +131,10 @@ def run_agent(
     seed: int = 42,
     episodes: int = DEFAULT_EPISODES,
     time_horizon: int = DEFAULT_TIME_HORIZON,
+    episode_callback: Optional[Callable[[int, float, float], None]] = None,
+    rng: Optional[random.Random] = None,
+    warm_start=None,
+    preset: Optional[str] = None,
 ) -> PolicyClaim:
     """
     Run agent training and produce policy claim.
@@ -141,6 +152,14 @@ def run_agent(
         seed: Random seed for environment (for reproducibility)
         episodes: Number of training episodes
         time_horizon: Simulation time horizon (number of decision steps)
+        episode_callback: Optional per-episode progress hook, passed to train()
+        rng: Training random stream (default: random.Random(seed), so the same
+             seed always produces the same policy hash)
+        warm_start: Optional WarmStart (src.training.warm_start) to seed the
+                    Q-table and lower the initial exploration rate; its
+                    provenance is recorded in the policy artifact metadata
+        preset: Optional ENV_PRESETS key whose attack dynamics to train on
+                (recorded in the claim's env_id)
 
     Returns:
         PolicyClaim containing all artifacts and claimed performance
@@ -153,16 +172,25 @@ def run_agent(
         - Just trains and claims
     """
     # Create simulated cyber defense environment with deterministic seed
-    env = CyberDefenseEnv(
-        time_horizon=time_horizon,
-        seed=seed
-    )
+    spec = EnvSpec.cyber(seed, time_horizon, preset)
+    env = env_registry.make(spec)
 
     # Generate environment ID (identifies configuration)
-    env_id = f"cyber_defense_env_seed_{seed}_horizon_{time_horizon}"
+    env_id = spec.env_id
 
     # Train policy with convergence detection
-    q_table, avg_training_reward, training_stats = train(env, episodes)
+    if rng is None:
+        rng = random.Random(seed)
+    if warm_start is None:
+        q_table, avg_training_reward, training_stats = train(env, episodes, episode_callback=episode_callback, rng=rng)
+    else:
+        from src.training.warm_start import episodes_saved
+        print(f"  🔥 Warm start from {warm_start.provenance['source']} "
+              f"({warm_start.provenance['states_seeded']} states, ε={warm_start.epsilon_start})")
+        q_table, avg_training_reward, training_stats = train(
+            env, episodes, episode_callback=episode_callback, rng=rng,
+            initial_q_table=warm_start.single_q_table(), epsilon_start=warm_start.epsilon_start
+        )
 
     # Extract deterministic policy
     policy = extract_policy(q_table)
@@ -171,7 +199,10 @@ def run_agent(
     # This must match what the verifier will compute during replay
     # The average training reward includes exploration and early learning,
     # but the verifier runs the greedy policy, so we must claim that reward.
-    claimed_reward = evaluate_policy(env, policy)
+    # Training advanced the env's RNG, so replay on a fresh env like the verifier does.
+    recorder = TrajectoryRecorder()
+    with env_registry.env(spec) as eval_env:
+        claimed_reward = evaluate_policy(eval_env, policy, recorder)
 
     # Log training completion
     if training_stats['converged']:
@@ -179,6 +210,10 @@ def run_agent(
     else:
         print(f"  ⚠ Training completed {training_stats['episodes_trained']} episodes without convergence")
     print(f"  📊 Q-table size: {training_stats['q_table_size']} state-action pairs")
+    warm_start_info = None
+    if warm_start is not None:
+        warm_start_info = dict(warm_start.provenance, episodes_saved=episodes_saved(warm_start.epsilon_start))
+        print(f"  ⏱ Warm start saved ~{warm_start_info['episodes_saved']} exploration episodes vs. a cold start")
 
     # Serialize policy
     policy_bytes = serialize_policy(policy)
@@ -192,16 +227,18 @@ def run_agent(
         env_id=env_id,
         policy_hash=policy_hash_str,
         policy_artifact=policy_bytes,
-        claimed_reward=claimed_reward  # Use evaluated reward, not training average
+        claimed_reward=claimed_reward,  # Use evaluated reward, not training average
+        trajectory=recorder.digest()
     )
 
     # Save policy artifact to disk for reuse
-    _save_policy_artifact(policy_hash_str, policy, claimed_reward, agent_id)
+    _save_policy_artifact(policy_hash_str, policy, claimed_reward, agent_id, warm_start=warm_start_info)
 
     return claim
 
 
-def _save_policy_artifact(policy_hash: str, policy: Policy, reward: float, agent_id: str):
+def _save_policy_artifact(policy_hash: str, policy: Policy, reward: float, agent_id: str,
+                          warm_start: Optional[dict] = None):
     """
     Save policy artifact to disk for later reuse.
 
@@ -210,27 +247,19 @@ def _save_policy_artifact(policy_hash: str, policy: Policy, reward: float, agent
         policy: Policy dictionary
         reward: Claimed reward
         agent_id: Agent ID
+        warm_start: Warm-start provenance, if training was seeded
     """
-    from pathlib import Path as PathlibPath
-    backend_dir = PathlibPath(__file__).parent.parent.parent
-    policies_dir = backend_dir / "policies"
-    policies_dir.mkdir(exist_ok=True)
-
-    # Convert policy to serializable format
-    serializable_policy = {str(k): v for k, v in policy.items()}
-
-    artifact = {
-        "policy": serializable_policy,
-        "metadata": {
-            "agent_id": agent_id,
-            "claimed_reward": reward,
-            "policy_hash": policy_hash
-        }
+    from src.ledger.policy_store import default_policy_store
+
+    metadata = {
+        "agent_id": agent_id,
+        "claimed_reward": reward,
+        "policy_hash": policy_hash
     }
+    if warm_start is not None:
+        metadata["warm_start"] = warm_start
 
-    artifact_path = policies_dir / f"{policy_hash}.json"
-    with open(artifact_path, 'w') as f:
-        json.dump(artifact, f, indent=2)
+    default_policy_store().put_policy(policy, policy_hash, metadata)
 
 
 def quick_train(agent_id: str = "agent_001", seed: int = 42, episodes: int = 500) -> PolicyClaim:
@@ -12,6 +12,8 @@ Detailed description:
 Main Components:
 - discretize_state(): Core discretization function for cyber defense
 - discretize_energy_state(): Legacy energy environment (backward compatibility)
+- discretize_energy_states(): Vectorized energy discretization for batched envs
+- encode_cyber_states() / decode_cyber_state(): Flat state indices for array Q-tables
 
 Dependencies:
 - src.shared.config: Bucket configuration constants
@@ -22,13 +24,34 @@ Updated: 2025-12-30 (cyber defense refactor)
 """
 
 from typing import Dict, Tuple
+import numpy as np
 from src.shared.config import (
     BATTERY_BUCKETS, 
     TIME_SLOT_BUCKETS, 
-    DEFAULT_TIME_SLOTS
+    DEFAULT_TIME_SLOTS,
+    ATTACK_SEVERITY_BUCKETS,
+    ATTACK_TYPE_BUCKETS,
+    SYSTEM_HEALTH_BUCKETS,
+    ALERT_CONFIDENCE_BUCKETS,
+    TIME_UNDER_ATTACK_BUCKETS,
 )
 
 
+# Energy bucket widths (computed once, shared by scalar and vectorized paths)
+# Example: 24 slots → 6 buckets (each bucket covers 4 slots)
+_SLOTS_PER_BUCKET = DEFAULT_TIME_SLOTS / TIME_SLOT_BUCKETS
+
+# Cyber state tuple layout, in discretize_cyber_state order
+CYBER_STATE_SHAPE = (
+    ATTACK_SEVERITY_BUCKETS,
+    ATTACK_TYPE_BUCKETS,
+    SYSTEM_HEALTH_BUCKETS,
+    ALERT_CONFIDENCE_BUCKETS,
+    TIME_UNDER_ATTACK_BUCKETS,
+)
+NUM_CYBER_STATES = int(np.prod(CYBER_STATE_SHAPE))  # 108
+
+
 def discretize_state(env_state: Dict) -> Tuple:
     """
     Convert environment state into discrete state tuple.
@@ -123,9 +146,7 @@ def discretize_energy_state(env_state: Dict) -> Tuple[int, int, int]:
     demand = env_state["demand"]
 
     # Discretize time slot into buckets
-    # Example: 24 slots → 6 buckets (each bucket covers 4 slots)
-    slots_per_bucket = DEFAULT_TIME_SLOTS / TIME_SLOT_BUCKETS
-    time_bucket = min(int(time_slot / slots_per_bucket), TIME_SLOT_BUCKETS - 1)
+    time_bucket = min(int(time_slot / _SLOTS_PER_BUCKET), TIME_SLOT_BUCKETS - 1)
 
     # Discretize battery level into buckets
     # Battery ranges from 0.0 to 1.0
@@ -137,3 +158,60 @@ def discretize_energy_state(env_state: Dict) -> Tuple[int, int, int]:
     demand_discrete = int(demand)
 
     return (time_bucket, battery_bucket, demand_discrete)
+
+
+def discretize_energy_states(env_states: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Vectorized discretize_energy_state for N energy states at once.
+    
+    Applies exactly the same float operations as the scalar version
+    (divide, clamp, multiply, truncate), so every row equals
+    discretize_energy_state() of the corresponding single state.
+    
+    Args:
+        env_states: Dict of equal-length arrays with keys
+                    time_slot, battery_level, demand
+                    (e.g. BatchEnergySlotEnv observations)
+    
+    Returns:
+        (N, 3) int64 array of (time_bucket, battery_bucket, demand) rows
+    """
+    time_slot = np.asarray(env_states["time_slot"], dtype=np.float64)
+    battery_level = np.asarray(env_states["battery_level"], dtype=np.float64)
+    demand = np.asarray(env_states["demand"])
+
+    time_bucket = np.minimum(
+        (time_slot / _SLOTS_PER_BUCKET).astype(np.int64), TIME_SLOT_BUCKETS - 1
+    )
+
+    battery_clamped = np.maximum(0.0, np.minimum(1.0, battery_level))
+    battery_bucket = np.minimum(
+        (battery_clamped * BATTERY_BUCKETS).astype(np.int64), BATTERY_BUCKETS - 1
+    )
+
+    return np.stack([time_bucket, battery_bucket, demand.astype(np.int64)], axis=1)
+
+
+def encode_cyber_states(states: np.ndarray) -> np.ndarray:
+    """
+    Map cyber state tuples to flat indices (row-major over CYBER_STATE_SHAPE).
+    
+    Args:
+        states: (N, 5) int array of cyber state tuples
+                (e.g. BatchCyberDefenseEnv observations)
+    
+    Returns:
+        (N,) int64 array of indices in [0, NUM_CYBER_STATES)
+    """
+    states = np.asarray(states, dtype=np.int64)
+    return np.ravel_multi_index(tuple(states.T), CYBER_STATE_SHAPE)
+
+
+def decode_cyber_state(index: int) -> Tuple[int, int, int, int, int]:
+    """
+    Inverse of encode_cyber_states for a single index.
+    
+    Returns:
+        Cyber state tuple as produced by discretize_cyber_state
+    """
+    return tuple(int(v) for v in np.unravel_index(index, CYBER_STATE_SHAPE))
@@ -14,6 +14,7 @@ Main Components:
 - update_q_value(): Q-learning update rule
 - train_episode(): Single episode training
 - train(): Complete training pipeline
+  (both accept an optional PhaseProfiler, see src.agent.profiling)
 
 Dependencies:
 - src.shared.config: Q-learning hyperparameters (ALPHA, GAMMA, EPSILON_*)
@@ -23,10 +24,16 @@ Author: PolicyLedger Team
 Created: 2025-12-28
 """
 
-from typing import Dict, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 import random
-from src.shared.config import ALPHA, GAMMA, EPSILON_START, EPSILON_END, EPSILON_DECAY
+import time
+from src.shared.config import (
+    ALPHA, GAMMA, EPSILON_START, EPSILON_END, EPSILON_DECAY, OPTIMISTIC_INIT,
+    REPLAY_BUFFER_SIZE, REPLAY_BATCH_SIZE, REPLAY_START_SIZE, N_STEP, TRACE_LAMBDA
+)
 from src.agent.state import discretize_state
+from src.agent.convergence import ConvergenceMonitor, PolicyStableRule, RewardPlateauRule, greedy_single_q
+from src.agent.profiling import PhaseProfiler
 
 
 # Action space (fixed, explicit)
@@ -64,7 +71,8 @@ def select_action(
     state: Tuple[int, int, int],
     q_table: Dict,
     epsilon: float,
-    optimistic_value: float = 0.0
+    optimistic_value: float = 0.0,
+    rng: Optional[random.Random] = None
 ) -> int:
     """
     Select action using epsilon-greedy strategy with optimistic initialization.
@@ -77,6 +85,7 @@ def select_action(
         q_table: Current Q-table mapping (state, action) to Q-values
         epsilon: Current exploration rate (0.0 to 1.0)
         optimistic_value: Default Q-value for unseen state-action pairs
+        rng: Random stream for exploration and tie-breaking (default: global `random`)
 
     Returns:
         Selected action (0=SAVE or 1=USE)
@@ -88,9 +97,11 @@ def select_action(
         - Exploration probability decreases over training
         - Optimistic values encourage exploration
     """
+    rng = random if rng is None else rng
+    
     # Exploration: random action
-    if random.random() < epsilon:
-        return random.choice(ACTIONS)
+    if rng.random() < epsilon:
+        return rng.choice(ACTIONS)
     
     # Exploitation: best known action
     # Get Q-values for all actions in this state (optimistic for unseen)
@@ -100,7 +111,7 @@ def select_action(
     max_q = max(q_values)
     best_actions = [action for action in ACTIONS if q_table.get((state, action), optimistic_value) == max_q]
     
-    return random.choice(best_actions)
+    return rng.choice(best_actions)
 
 
 def update_q_value(
@@ -109,8 +120,10 @@ def update_q_value(
     action: int,
     reward: float,
     next_state: Tuple[int, int, int],
-    done: bool
-) -> None:
+    done: bool,
+    alpha: float = ALPHA,
+    gamma: float = GAMMA
+) -> float:
     """
     Apply Q-learning update rule.
 
@@ -126,6 +139,11 @@ def update_q_value(
         reward: Immediate reward received
         next_state: Resulting state after action
         done: Whether episode terminated (no future rewards)
+        alpha: Learning rate (prioritized replay scales it by the IS weight)
+        gamma: Discount factor
+
+    Returns:
+        TD error of this update (target - old Q-value)
 
     Rules:
         - Does NOT change environment
@@ -144,15 +162,84 @@ def update_q_value(
         max_next_q = max(next_q_values)
     
     # Q-learning update
-    new_q = current_q + ALPHA * (reward + GAMMA * max_next_q - current_q)
+    td_error = reward + gamma * max_next_q - current_q
+    new_q = current_q + alpha * td_error
     
     # Update table
     q_table[(state, action)] = new_q
+    
+    return td_error
+
+
+def replay_learning(
+    replay_buffer,
+    q_table: Dict,
+    q_table_a: Optional[Dict] = None,
+    q_table_b: Optional[Dict] = None,
+    monitor: Optional[ConvergenceMonitor] = None,
+    alpha: float = ALPHA,
+    gamma: float = GAMMA,
+    optimistic_value: float = OPTIMISTIC_INIT,
+    rng: Optional[random.Random] = None,
+    profiler: Optional[PhaseProfiler] = None,
+) -> None:
+    """
+    Replay one sampled batch of one-step transitions (end of an episode).
+
+    Shared by train_episode() and the multi-step learners: stored transitions
+    are always one-step, whatever update the online pass used.
+
+    Args:
+        replay_buffer: ExperienceReplay or PrioritizedExperienceReplay
+        q_table: Single Q-table (used when q_table_a / q_table_b are None)
+        q_table_a, q_table_b: Double-Q tables
+        Other args as in train_episode()
+    """
+    if not replay_buffer.can_sample():
+        return
+    use_double_q = (q_table_a is not None and q_table_b is not None)
+    prof = profiler
+    from ..agent.double_q_learning import update_double_q_tables, PrioritizedExperienceReplay
+    prioritized = isinstance(replay_buffer, PrioritizedExperienceReplay)
+    if prof is not None:
+        t = time.perf_counter()
+    if prioritized:
+        batch, indices, weights = replay_buffer.sample(rng=rng)
+        td_errors = []
+    else:
+        batch = replay_buffer.sample(rng=rng)
+    if prof is not None:
+        t = prof.lap("replay_sample", t)
+    for i, (exp_state, exp_action, exp_reward, exp_next_state, exp_done) in enumerate(batch):
+        step_alpha = alpha * weights[i] if prioritized else alpha
+        if use_double_q:
+            td_error = update_double_q_tables(q_table_a, q_table_b, exp_state, exp_action, 
+                                              exp_reward, exp_next_state, exp_done,
+                                              alpha=step_alpha, gamma=gamma, optimistic_value=optimistic_value,
+                                              rng=rng)
+        else:
+            td_error = update_q_value(q_table, exp_state, exp_action, exp_reward, exp_next_state, exp_done,
+                                      alpha=step_alpha, gamma=gamma)
+        if prioritized:
+            td_errors.append(td_error)
+        if monitor is not None:
+            monitor.record_update(exp_state, td_error)
+    if prof is not None:
+        t = prof.lap("replay_update", t)
+    if prioritized:
+        replay_buffer.update_priorities(indices, td_errors)
+        if prof is not None:
+            prof.lap("priority_update", t)
 
 
 def train_episode(env, q_table: Dict, epsilon: float, discretize_fn=None, 
                  q_table_a: Dict = None, q_table_b: Dict = None, 
-                 replay_buffer=None) -> Tuple[float, Dict[str, int]]:
+                 replay_buffer=None, monitor: Optional[ConvergenceMonitor] = None,
+                 alpha: float = ALPHA, gamma: float = GAMMA,
+                 optimistic_value: float = OPTIMISTIC_INIT,
+                 rng: Optional[random.Random] = None,
+                 profiler: Optional[PhaseProfiler] = None,
+                 planner=None) -> Tuple[float, Dict[str, int]]:
     """
     Run one full training episode with Double Q-Learning and Experience Replay.
 
@@ -167,7 +254,18 @@ def train_episode(env, q_table: Dict, epsilon: float, discretize_fn=None,
         discretize_fn: Optional state discretization function (defaults to discretize_state)
         q_table_a: First Q-table for Double Q-Learning (if None, uses standard Q-learning)
         q_table_b: Second Q-table for Double Q-Learning (if None, uses standard Q-learning)
-        replay_buffer: ExperienceReplay buffer for batch learning (if None, uses online learning)
+        replay_buffer: ExperienceReplay or PrioritizedExperienceReplay buffer for batch
+                       learning (if None, uses online learning)
+        monitor: Optional ConvergenceMonitor notified of every Q update (TD error, greedy changes)
+        alpha: Learning rate
+        gamma: Discount factor
+        optimistic_value: Initial Q-value of unseen pairs in the Double-Q tables
+        rng: Random stream for exploration, Double-Q coin flips and replay sampling
+             (default: the global `random` module). Pass a per-session
+             random.Random to keep concurrent sessions reproducible.
+        profiler: Optional PhaseProfiler charged with per-phase time (None = no timing)
+        planner: Optional DynaPlanner (src.agent.dyna); records each real transition
+                 and applies its simulated planning updates after the real one
 
     Returns:
         Tuple of (total_reward, action_counts)
@@ -180,16 +278,27 @@ def train_episode(env, q_table: Dict, epsilon: float, discretize_fn=None,
         - Single episode: reset → loop → done
         - Updates Q-tables in-place during episode
         - If replay_buffer provided, stores experiences and performs batch updates
+        - Prioritized buffers scale each replayed update by its importance-sampling
+          weight and get the new |TD errors| back as priorities
     """
     if discretize_fn is None:
         discretize_fn = discretize_state
     
     # Determine if using Double Q-Learning
     use_double_q = (q_table_a is not None and q_table_b is not None)
+    if use_double_q:
+        from ..agent.double_q_learning import select_action_double_q, update_double_q_tables
+    
+    # Phase timing (opt-in): t marks the start of the current phase
+    prof = profiler
+    if prof is not None:
+        t = time.perf_counter()
     
     # Reset environment
     env_state = env.reset()
     state = discretize_fn(env_state)
+    if prof is not None:
+        t = prof.lap("env_reset", t)
     
     total_reward = 0.0
     done = False
@@ -199,29 +308,53 @@ def train_episode(env, q_table: Dict, epsilon: float, discretize_fn=None,
     while not done:
         # Select action using appropriate method
         if use_double_q:
-            from ..agent.double_q_learning import select_action_double_q
-            action = select_action_double_q(state, q_table_a, q_table_b, epsilon)
+            action = select_action_double_q(state, q_table_a, q_table_b, epsilon,
+                                            optimistic_value=optimistic_value, rng=rng)
         else:
-            action = select_action(state, q_table, epsilon, optimistic_value=0.0)
+            action = select_action(state, q_table, epsilon, optimistic_value=0.0, rng=rng)
+        if prof is not None:
+            t = prof.lap("select_action", t)
         
         # Track actions
         action_name = str(action)
         action_counts[action_name] = action_counts.get(action_name, 0) + 1
+        if prof is not None:
+            t = prof.lap("action_counting", t)
         
         # Take action in environment
         next_env_state, reward, done = env.step(action)
+        if prof is not None:
+            t = prof.lap("env_step", t)
         next_state = discretize_fn(next_env_state)
+        if prof is not None:
+            t = prof.lap("discretize", t)
         
         # Store experience in replay buffer if provided
         if replay_buffer is not None:
             replay_buffer.add(state, action, reward, next_state, done)
+            if prof is not None:
+                t = prof.lap("replay_add", t)
         
         # Update Q-table(s)
         if use_double_q:
-            from ..agent.double_q_learning import update_double_q_tables
-            update_double_q_tables(q_table_a, q_table_b, state, action, reward, next_state, done)
+            td_error = update_double_q_tables(q_table_a, q_table_b, state, action, reward, next_state, done,
+                                              alpha=alpha, gamma=gamma, optimistic_value=optimistic_value,
+                                              rng=rng)
         else:
-            update_q_value(q_table, state, action, reward, next_state, done)
+            td_error = update_q_value(q_table, state, action, reward, next_state, done, alpha=alpha, gamma=gamma)
+        if prof is not None:
+            t = prof.lap("q_update", t)
+        if monitor is not None:
+            monitor.record_update(state, td_error)
+            if prof is not None:
+                t = prof.lap("monitor", t)
+        
+        # Dyna-Q: learn the model, then plan with it
+        if planner is not None:
+            planner.step(state, action, reward, next_state, done, q_table, q_table_a, q_table_b,
+                         monitor=monitor, alpha=alpha, gamma=gamma, optimistic_value=optimistic_value, rng=rng)
+            if prof is not None:
+                t = prof.lap("planning", t)
         
         # Accumulate reward
         total_reward += reward
@@ -230,20 +363,31 @@ def train_episode(env, q_table: Dict, epsilon: float, discretize_fn=None,
         state = next_state
     
     # Perform replay learning if buffer has enough experiences
-    if replay_buffer is not None and replay_buffer.can_sample():
-        from ..agent.double_q_learning import update_double_q_tables
-        batch = replay_buffer.sample()
-        for exp_state, exp_action, exp_reward, exp_next_state, exp_done in batch:
-            if use_double_q:
-                update_double_q_tables(q_table_a, q_table_b, exp_state, exp_action, 
-                                     exp_reward, exp_next_state, exp_done)
-            else:
-                update_q_value(q_table, exp_state, exp_action, exp_reward, exp_next_state, exp_done)
+    if replay_buffer is not None:
+        replay_learning(replay_buffer, q_table, q_table_a, q_table_b, monitor=monitor,
+                        alpha=alpha, gamma=gamma, optimistic_value=optimistic_value,
+                        rng=rng, profiler=profiler)
     
     return total_reward, action_counts
 
 
-def train(env, episodes: int, convergence_window: int = 100, convergence_threshold: float = 0.01) -> Tuple[Dict, float, Dict]:
+def train(
+    env,
+    episodes: int,
+    convergence_window: int = 100,
+    convergence_threshold: float = 0.01,
+    episode_callback: Optional[Callable[[int, float, float], None]] = None,
+    stopping_rules: Optional[List] = None,
+    replay: Optional[str] = None,
+    rng: Optional[random.Random] = None,
+    initial_q_table: Optional[Dict] = None,
+    epsilon_start: float = EPSILON_START,
+    profiler: Optional[PhaseProfiler] = None,
+    td_method: str = "one_step",
+    n_step: int = N_STEP,
+    trace_lambda: float = TRACE_LAMBDA,
+    planning_steps: int = 0,
+) -> Tuple[Dict, float, Dict]:
     """
     Train agent for specified number of episodes with convergence detection.
     
@@ -255,6 +399,26 @@ def train(env, episodes: int, convergence_window: int = 100, convergence_thresho
         episodes: Maximum number of episodes to train
         convergence_window: Window size for checking convergence
         convergence_threshold: Max reward stddev for convergence
+        stopping_rules: Stopping rules from src.agent.convergence (defaults to
+                        RewardPlateauRule(convergence_window, convergence_threshold)).
+                        Greedy-policy tracking (a lookup after every Q update)
+                        is only installed for a PolicyStableRule, and Q updates
+                        only reach the monitor when a rule uses them
+        replay: Optional experience replay ("uniform" or "prioritized");
+                None keeps pure online updates
+        rng: Random stream for all training randomness (default: global `random`);
+             the same seeded rng always yields the same Q-table
+        initial_q_table: Optional Q-table to continue from (warm start); copied,
+                         never modified
+        epsilon_start: Initial exploration rate (lower for a warm start)
+        profiler: Optional PhaseProfiler for per-phase timing / episode-range tracing
+        td_method: "one_step", "n_step" or "q_lambda" (see src.agent.multistep)
+        n_step: Rewards per n-step return
+        trace_lambda: Eligibility trace decay for Q(λ)
+        planning_steps: Dyna-Q planning updates per real step (0 = no model)
+        episode_callback: Optional hook called after every episode with
+                          (episode_index, episode_reward, epsilon), e.g. for
+                          progress reporting. Must not modify training state.
     
     Returns:
         Tuple of (trained_q_table, average_reward, training_stats) where:
@@ -266,6 +430,8 @@ def train(env, episodes: int, convergence_window: int = 100, convergence_thresho
             - final_epsilon: Final exploration rate
             - q_table_size: Number of state-action pairs learned
             - reward_history: List of episode rewards
+            - stop_rule / stop_reason: Rule that stopped training (None if it ran to the end)
+            - real_updates / planned_updates: Dyna-Q counters (only with planning_steps)
     
     Rules:
         - Does NOT serialize policy
@@ -274,8 +440,27 @@ def train(env, episodes: int, convergence_window: int = 100, convergence_thresho
         - Uses exponential epsilon decay for exploration
         - Can converge early if reward stabilizes
     """
-    q_table = initialize_q_table()
-    epsilon = EPSILON_START
+    from src.agent.multistep import make_episode_fn
+    episode_fn = make_episode_fn(td_method, n_step, trace_lambda)
+    planner = None
+    if planning_steps:
+        from src.agent.dyna import DynaPlanner
+        planner = DynaPlanner(planning_steps)
+    
+    q_table = initialize_q_table() if initial_q_table is None else dict(initial_q_table)
+    epsilon = epsilon_start
+    
+    replay_buffer = None
+    if replay is not None:
+        from src.agent.double_q_learning import create_replay_buffer
+        replay_buffer = create_replay_buffer(replay, REPLAY_BUFFER_SIZE, REPLAY_BATCH_SIZE, REPLAY_START_SIZE)
+    
+    if stopping_rules is None:
+        stopping_rules = [RewardPlateauRule(convergence_window, convergence_threshold)]
+    tracks_greedy = any(isinstance(rule, PolicyStableRule) for rule in stopping_rules)
+    monitor = ConvergenceMonitor(stopping_rules,
+                                 greedy_fn=greedy_single_q(q_table, ACTIONS) if tracks_greedy else None)
+    update_monitor = monitor if monitor.tracks_updates else None
     
     episode_rewards = []
     converged = False
@@ -283,20 +468,24 @@ def train(env, episodes: int, convergence_window: int = 100, convergence_thresho
     
     for episode in range(episodes):
         # Train one episode
-        reward, _ = train_episode(env, q_table, epsilon)
+        if profiler is not None:
+            profiler.begin_episode(episode)
+        reward, _ = episode_fn(env, q_table, epsilon, replay_buffer=replay_buffer, monitor=update_monitor,
+                               rng=rng, profiler=profiler, planner=planner)
+        if profiler is not None:
+            profiler.end_episode(episode)
         episode_rewards.append(reward)
         episodes_trained = episode + 1
         
-        # Check for convergence (after sufficient episodes)
-        if episode >= convergence_window:
-            recent_rewards = episode_rewards[-convergence_window:]
-            reward_stddev = (sum((r - sum(recent_rewards)/len(recent_rewards))**2 
-                               for r in recent_rewards) / len(recent_rewards)) ** 0.5
-            
-            if reward_stddev < convergence_threshold:
-                converged = True
-                print(f"  ✓ Converged at episode {episode} (stddev: {reward_stddev:.4f})")
-                break
+        if episode_callback is not None:
+            episode_callback(episode, reward, epsilon)
+        
+        # Check stopping rules (O(1) rolling statistics)
+        decision = monitor.end_episode(reward)
+        if decision is not None:
+            converged = True
+            print(f"  ✓ Converged at episode {episode} ({decision.reason})")
+            break
         
         # Decay exploration rate
         epsilon = max(EPSILON_END, epsilon * EPSILON_DECAY)
@@ -312,7 +501,12 @@ def train(env, episodes: int, convergence_window: int = 100, convergence_thresho
         'q_table_size': len(q_table),
         'reward_history': episode_rewards,
         'avg_reward': avg_reward,
-        'final_reward': episode_rewards[-1] if episode_rewards else 0.0
+        'final_reward': episode_rewards[-1] if episode_rewards else 0.0,
+        'stop_rule': monitor.decision.rule if monitor.decision else None,
+        'stop_reason': monitor.decision.reason if monitor.decision else None,
     }
+    if planner is not None:
+        training_stats['real_updates'] = planner.real_updates
+        training_stats['planned_updates'] = planner.planned_updates
     
     return q_table, avg_reward, training_stats
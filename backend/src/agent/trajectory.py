@@ -0,0 +1,127 @@
+"""
+Trajectory Digests
+
+Fingerprint of one greedy episode, step by step.
+
+ROLLING HASH:
+    h_0 = SHA-256(b"policyledger-trajectory-v1")
+    h_t = SHA-256(h_{t-1} || state_index || action || reward)
+
+    state_index  uint16  flat cyber state index (np.ravel_multi_index);
+                         other state spaces hash their int32 tuple
+    action       uint8
+    reward       float64 (exact bits, no rounding)
+
+- h_t commits to the whole prefix up to step t, so two replays that diverge
+  at step k disagree at every step >= k. That monotonicity is what makes
+  bisection for the first divergent step valid.
+- A TrajectoryDigest keeps the full final hash plus a short prefix of every
+  step hash (TRAJECTORY_STEP_HASH_CHARS hex chars): compact enough to ship
+  with a claim, enough to locate a divergence.
+"""
+
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+import hashlib
+import struct
+
+import numpy as np
+
+from src.agent.state import CYBER_STATE_SHAPE
+from src.shared.config import TRAJECTORY_STEP_HASH_CHARS
+
+
+_INITIAL_HASH = hashlib.sha256(b"policyledger-trajectory-v1").digest()
+
+
+def _encode_state(state: Tuple) -> bytes:
+    if len(state) == len(CYBER_STATE_SHAPE):
+        return struct.pack("<H", int(np.ravel_multi_index(tuple(state), CYBER_STATE_SHAPE)))
+    return struct.pack(f"<{len(state)}i", *state)
+
+
+class TrajectoryDigest(NamedTuple):
+    """
+    Compact fingerprint of one greedy episode.
+
+    Attributes:
+        steps: Number of steps in the episode
+        final_hash: Full rolling hash after the last step (hex)
+        step_hashes: Truncated rolling hash after each step (hex prefixes)
+    """
+    steps: int
+    final_hash: str
+    step_hashes: Tuple[str, ...]
+
+    def matches(self, other: "TrajectoryDigest") -> bool:
+        return self.steps == other.steps and self.final_hash == other.final_hash
+
+    def step_hash(self, step: int) -> Optional[str]:
+        """Truncated hash after `step` (1-based), or None past the end of the episode."""
+        if 1 <= step <= self.steps:
+            return self.step_hashes[step - 1]
+        return None
+
+    def to_dict(self) -> Dict:
+        return {"steps": self.steps, "final_hash": self.final_hash, "step_hashes": list(self.step_hashes)}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "TrajectoryDigest":
+        return cls(data["steps"], data["final_hash"], tuple(data["step_hashes"]))
+
+
+class TrajectoryRecorder:
+    """
+    Accumulates the rolling hash of an episode as it is played.
+
+    Attributes:
+        last_step: (state, action, reward) of the most recent step
+    """
+
+    def __init__(self):
+        self._hash = _INITIAL_HASH
+        self._step_hashes: List[str] = []
+        self.last_step: Optional[Tuple[Tuple, int, float]] = None
+
+    def record(self, state: Tuple, action: int, reward: float) -> None:
+        """Fold one (state, action, reward) step into the rolling hash."""
+        step = _encode_state(state) + struct.pack("<Bd", action, reward)
+        self._hash = hashlib.sha256(self._hash + step).digest()
+        self._step_hashes.append(self._hash.hex()[:TRAJECTORY_STEP_HASH_CHARS])
+        self.last_step = (tuple(state), action, reward)
+
+    @property
+    def steps(self) -> int:
+        return len(self._step_hashes)
+
+    def digest(self) -> TrajectoryDigest:
+        return TrajectoryDigest(self.steps, self._hash.hex(), tuple(self._step_hashes))
+
+
+def first_divergence(
+    steps: int,
+    reference: Callable[[int], Optional[str]],
+    probe: Callable[[int], Optional[str]]
+) -> Optional[int]:
+    """
+    Bisect for the first step at which two rolling-hash sequences differ.
+
+    Relies on prefix monotonicity: once the hashes differ they stay different.
+
+    Args:
+        steps: Last step to consider
+        reference: Step (1-based) → expected hash
+        probe: Step (1-based) → observed hash (e.g. by replaying that prefix)
+
+    Returns:
+        First divergent step, or None if the sequences agree up to `steps`
+    """
+    if steps < 1 or reference(steps) == probe(steps):
+        return None
+    low, high = 1, steps  # Invariant: divergence happens at or before `high`
+    while low < high:
+        middle = (low + high) // 2
+        if reference(middle) == probe(middle):
+            low = middle + 1
+        else:
+            high = middle
+    return low
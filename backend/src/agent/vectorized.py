@@ -0,0 +1,297 @@
+"""
+vectorized.py
+
+Synchronous vectorized Double Q-Learning over a batch of environments.
+
+Detailed description:
+- Steps N cyber defense episodes in lockstep (BatchCyberDefenseEnv)
+- Keeps both Q-tables as dense (108, 5) arrays instead of dicts
+- Selects epsilon-greedy actions for the whole batch with array ops
+- Applies Double-Q updates as a batched scatter-add
+
+Conflict resolution:
+    All TD errors of one lockstep step are computed from the tables as they
+    were before the step (synchronous update). When several episodes update
+    the same (table, state, action) cell in one step, their TD errors are
+    summed with np.add.at and divided by the number of contributions, so the
+    cell moves by alpha × mean TD error. The result does not depend on the
+    order of episodes in the batch beyond float summation order, which
+    np.add.at fixes (ascending batch index).
+
+Compatibility:
+    merge_q_arrays() returns a {(state, action): q} dict containing exactly
+    the pairs that were updated, like merge_q_tables() on the dict tables,
+    so extract_policy() produces the usual policy artifact.
+
+Main Components:
+- initialize_q_arrays(): Dense optimistic Q-tables
+- select_actions_batch(): Vectorized epsilon-greedy on averaged tables
+- update_double_q_batch(): Batched Double-Q scatter-add update
+- run_lockstep_round(): One reset-to-termination pass over the batch
+- train_vectorized(): Full training loop over a batch env
+- merge_q_arrays(): Convert to dict Q-table for extract_policy()
+
+Dependencies:
+- src.environments.batch_env: BatchCyberDefenseEnv
+- src.agent.state: Flat cyber state encoding
+"""
+
+from typing import Dict, Optional, Tuple
+import time
+import numpy as np
+
+from src.shared.config import (
+    ALPHA,
+    GAMMA,
+    EPSILON_START,
+    EPSILON_END,
+    EPSILON_DECAY,
+    OPTIMISTIC_INIT,
+)
+from src.agent.state import NUM_CYBER_STATES, encode_cyber_states, decode_cyber_state
+from src.environments.batch_env import BatchCyberDefenseEnv
+
+
+NUM_ACTIONS = BatchCyberDefenseEnv.NUM_ACTIONS
+
+
+def initialize_q_arrays(
+    num_states: int = NUM_CYBER_STATES,
+    num_actions: int = NUM_ACTIONS,
+    optimistic_value: float = OPTIMISTIC_INIT,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Create dense Double-Q tables.
+
+    Every cell starts at optimistic_value, which is what the dict tables
+    return for unseen pairs.
+
+    Returns:
+        Tuple of (q_a, q_b, visits) where visits counts updates per (state, action)
+    """
+    q_a = np.full((num_states, num_actions), optimistic_value, dtype=np.float64)
+    q_b = np.full((num_states, num_actions), optimistic_value, dtype=np.float64)
+    visits = np.zeros((num_states, num_actions), dtype=np.int64)
+    return q_a, q_b, visits
+
+
+def select_actions_batch(
+    states: np.ndarray,
+    q_a: np.ndarray,
+    q_b: np.ndarray,
+    epsilon: float,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """
+    Epsilon-greedy action selection for a batch of states.
+
+    Greedy actions maximize the average of both tables; ties go to the
+    lowest action, as in select_action_double_q().
+
+    Args:
+        states: (N,) flat state indices
+        q_a, q_b: Dense Q-tables
+        epsilon: Exploration rate
+        rng: Random generator (explore coin, then random action, per episode)
+
+    Returns:
+        (N,) int64 actions
+    """
+    n = len(states)
+    explore = rng.random(n) < epsilon
+    random_actions = rng.integers(0, q_a.shape[1], size=n)
+    greedy = np.argmax((q_a[states] + q_b[states]) / 2, axis=1)
+    return np.where(explore, random_actions, greedy)
+
+
+def _scatter_mean_update(
+    table: np.ndarray,
+    states: np.ndarray,
+    actions: np.ndarray,
+    td_errors: np.ndarray,
+    alpha: float,
+) -> None:
+    """Move each touched cell by alpha × mean TD error of its contributions."""
+    num_actions = table.shape[1]
+    cells = states * num_actions + actions
+    td_sum = np.zeros(table.size, dtype=np.float64)
+    counts = np.zeros(table.size, dtype=np.int64)
+    np.add.at(td_sum, cells, td_errors)
+    np.add.at(counts, cells, 1)
+    touched = counts > 0
+    flat = table.reshape(-1)
+    flat[touched] += alpha * (td_sum[touched] / counts[touched])
+
+
+def update_double_q_batch(
+    q_a: np.ndarray,
+    q_b: np.ndarray,
+    states: np.ndarray,
+    actions: np.ndarray,
+    rewards: np.ndarray,
+    next_states: np.ndarray,
+    dones: np.ndarray,
+    rng: np.random.Generator,
+    alpha: float = ALPHA,
+    gamma: float = GAMMA,
+    visits: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Batched Double Q-Learning update (see update_double_q_tables).
+
+    Each transition flips a coin to update Q_A (action chosen by Q_A,
+    evaluated by Q_B) or Q_B (vice versa). Conflicting updates to the same
+    cell are averaged; see module docstring.
+
+    Args:
+        q_a, q_b: Dense Q-tables (updated in place)
+        states, actions, rewards, next_states, dones: (M,) transition arrays
+        rng: Random generator for the table coin flips
+        alpha: Learning rate
+        gamma: Discount factor
+        visits: Optional (states, actions) counter, incremented per transition
+
+    Returns:
+        (M,) TD errors, computed before the update
+    """
+    update_a = rng.random(len(states)) < 0.5
+    not_done = ~dones
+
+    # Q_A targets: argmax by Q_A, value from Q_B (and symmetric for Q_B)
+    best_a = np.argmax(q_a[next_states], axis=1)
+    best_b = np.argmax(q_b[next_states], axis=1)
+    next_q = np.where(
+        update_a,
+        q_b[next_states, best_a],
+        q_a[next_states, best_b],
+    )
+    current_q = np.where(update_a, q_a[states, actions], q_b[states, actions])
+    td_errors = rewards + gamma * next_q * not_done - current_q
+
+    _scatter_mean_update(q_a, states[update_a], actions[update_a], td_errors[update_a], alpha)
+    _scatter_mean_update(q_b, states[~update_a], actions[~update_a], td_errors[~update_a], alpha)
+
+    if visits is not None:
+        np.add.at(visits, (states, actions), 1)
+
+    return td_errors
+
+
+def run_lockstep_round(
+    batch_env: BatchCyberDefenseEnv,
+    q_a: np.ndarray,
+    q_b: np.ndarray,
+    visits: np.ndarray,
+    epsilon: float,
+    rng: np.random.Generator,
+    alpha: float = ALPHA,
+    gamma: float = GAMMA,
+) -> Tuple[float, int]:
+    """
+    Reset the batch and run every episode to termination, updating in place.
+
+    Returns:
+        Tuple of (mean episode reward, transitions processed)
+    """
+    states = encode_cyber_states(batch_env.reset())
+    episode_rewards = np.zeros(batch_env.num_envs, dtype=np.float64)
+    transitions = 0
+
+    while not batch_env.done.all():
+        active = ~batch_env.done
+        actions = select_actions_batch(states, q_a, q_b, epsilon, rng)
+        obs, rewards, dones = batch_env.step(actions)
+        next_states = encode_cyber_states(obs)
+
+        update_double_q_batch(
+            q_a, q_b,
+            states[active], actions[active], rewards[active],
+            next_states[active], dones[active],
+            rng, alpha=alpha, gamma=gamma, visits=visits,
+        )
+
+        episode_rewards += rewards
+        transitions += int(active.sum())
+        states = next_states
+
+    return float(episode_rewards.mean()), transitions
+
+
+def train_vectorized(
+    batch_env: BatchCyberDefenseEnv,
+    episodes: int,
+    seed: int = 0,
+    alpha: float = ALPHA,
+    gamma: float = GAMMA,
+    epsilon_start: float = EPSILON_START,
+    epsilon_end: float = EPSILON_END,
+    epsilon_decay: float = EPSILON_DECAY,
+) -> Tuple[np.ndarray, np.ndarray, Dict]:
+    """
+    Train Double-Q tables on a batch of environments.
+
+    One round resets the batch and runs all N episodes to termination, so
+    `episodes` is rounded up to a multiple of batch_env.num_envs. Every
+    lockstep episode of a round shares one epsilon, which then decays by
+    epsilon_decay ** N: the schedule is per episode, exactly like train(),
+    so the same episode budget ends at the same exploration rate.
+
+    Args:
+        batch_env: Batched environments (e.g. BatchCyberDefenseEnv.from_seeds)
+        episodes: Total episodes to run across the batch
+        seed: Seed for exploration and Double-Q coin flips
+        alpha: Learning rate
+        gamma: Discount factor
+        epsilon_start, epsilon_end, epsilon_decay: Exploration schedule
+
+    Returns:
+        Tuple of (q_a, q_b, training_stats) where training_stats contains
+        episodes_trained, transitions, transitions_per_second, final_epsilon,
+        reward_history (mean episode reward per round) and visits
+    """
+    rng = np.random.default_rng(seed)
+    q_a, q_b, visits = initialize_q_arrays()
+    n = batch_env.num_envs
+    rounds = max(1, -(-episodes // n))
+
+    epsilon = epsilon_start
+    reward_history = []
+    transitions = 0
+    start = time.perf_counter()
+
+    for _ in range(rounds):
+        mean_reward, round_transitions = run_lockstep_round(
+            batch_env, q_a, q_b, visits, epsilon, rng, alpha=alpha, gamma=gamma
+        )
+        reward_history.append(mean_reward)
+        transitions += round_transitions
+        epsilon = max(epsilon_end, epsilon * epsilon_decay ** n)  # One decay per finished episode
+
+    elapsed = time.perf_counter() - start
+    training_stats = {
+        'episodes_trained': rounds * n,
+        'transitions': transitions,
+        'transitions_per_second': transitions / elapsed if elapsed > 0 else 0.0,
+        'final_epsilon': epsilon,
+        'reward_history': reward_history,
+        'visits': visits,
+    }
+    return q_a, q_b, training_stats
+
+
+def merge_q_arrays(
+    q_a: np.ndarray,
+    q_b: np.ndarray,
+    visits: np.ndarray,
+) -> Dict[Tuple[Tuple[int, int, int, int, int], int], float]:
+    """
+    Convert dense tables to a dict Q-table (like merge_q_tables).
+
+    Only (state, action) pairs that were updated are included, matching the
+    lazily-populated dict tables, so extract_policy() sees the same keys.
+    """
+    merged = {}
+    averaged = (q_a + q_b) / 2
+    for state_index, action in zip(*np.nonzero(visits)):
+        merged[(decode_cyber_state(int(state_index)), int(action))] = float(averaged[state_index, action])
+    return merged
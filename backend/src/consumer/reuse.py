@@ -15,12 +15,12 @@ Main Components:
 - reuse_best_policy(): Convenience function to load and execute the best policy from marketplace
 
 Dependencies:
-- json: For policy artifact serialization
+- src.ledger.policy_store: PolicyStore for policy artifacts
 - pathlib: For file system operations
 - typing: For type hints
 - enum: For BaselinePolicy enumeration
 - random: For baseline policy randomization
-- src.environments.cyber_env: CyberDefenseEnv for simulated cyber defense
+- src.environments.env_spec: Cached CyberDefenseEnv instances for simulated cyber defense
 - src.agent.state: discretize_state for state processing
 - src.marketplace.ranking: BestPolicyReference for policy selection
 
@@ -33,15 +33,16 @@ TODO: Google Cloud Integration
 - Cloud Functions: Trigger policy execution on marketplace updates
 """
 
-import json
 from pathlib import Path
 from typing import Dict, Tuple, Optional
 from enum import Enum
 import random
 
-from src.environments.cyber_env import CyberDefenseEnv
+from src.environments.env_spec import EnvSpec, env_registry
+from src.shared.config import DEFAULT_TIME_HORIZON
 from src.agent.state import discretize_state
 from src.marketplace.ranking import BestPolicyReference
+from src.ledger.policy_store import PolicyStore
 from .stats import ExecutionStats
 
 
@@ -89,15 +90,16 @@ class PolicyConsumer:
         policy_store_dir: Path to directory containing policy artifacts
     """
 
-    def __init__(self, policy_store_dir: str = "policies"):
+    def __init__(self, policy_store_dir: Optional[str] = None):
         """
         Initialize consumer with policy storage location.
 
         Args:
             policy_store_dir: Path to directory containing policy artifacts.
-                Defaults to "policies" in current working directory.
+                Defaults to the shared store (backend/policies).
         """
-        self.policy_store_dir = Path(policy_store_dir)
+        self.store = PolicyStore(policy_store_dir)
+        self.policy_store_dir = self.store.root
     
     def load_policy(self, policy_hash: str) -> Dict:
         """
@@ -114,27 +116,10 @@ class PolicyConsumer:
             ValueError: If policy is invalid/corrupted
             
         Design:
-            Fallback implementation uses local JSON storage.
+            Fallback implementation uses the local PolicyStore (sharded JSON).
             Google-first version would fetch from Firebase.
         """
-        policy_path = self.policy_store_dir / f"{policy_hash}.json"
-        
-        if not policy_path.exists():
-            raise FileNotFoundError(
-                f"Policy artifact not found: {policy_path}\n"
-                f"Expected policy hash: {policy_hash}"
-            )
-        
-        try:
-            with open(policy_path, 'r') as f:
-                data = json.load(f)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Corrupted policy artifact: {e}")
-        
-        # Validate structure
-        if "policy" not in data:
-            raise ValueError("Invalid policy artifact: missing 'policy' key")
-        
+        data = self.store.get(policy_hash)  # FileNotFoundError / ValueError
         policy = data["policy"]
         
         if not isinstance(policy, dict):
@@ -171,7 +156,7 @@ class PolicyConsumer:
             Execute verified defense policy in simulation.
             No learning. Just follow the decision rules.
         """
-        env = CyberDefenseEnv(seed=seed)
+        env = env_registry.make(EnvSpec.cyber(seed, DEFAULT_TIME_HORIZON))
         total_reward = 0.0
         total_actions = 0
         action_counts = {0: 0, 1: 0, 2: 0, 3: 0, 4: 0}  # IGNORE, MONITOR, RATE_LIMIT, BLOCK_IP, ISOLATE_SERVICE
@@ -283,7 +268,7 @@ class PolicyConsumer:
         Raises:
             ValueError: If baseline type is not recognized
         """
-        env = CyberDefenseEnv(seed=seed)
+        env = env_registry.make(EnvSpec.cyber(seed, DEFAULT_TIME_HORIZON))
         total_reward = 0.0
         total_actions = 0
         action_counts = {0: 0, 1: 0, 2: 0, 3: 0, 4: 0}
@@ -391,7 +376,7 @@ class PolicyConsumer:
 # Convenience function for simple use cases
 def reuse_best_policy(
     best_policy_ref: BestPolicyReference,
-    policy_store_dir: str = "policies",
+    policy_store_dir: Optional[str] = None,
     episodes: int = 100,
     baseline: BaselinePolicy = BaselinePolicy.RANDOM,
     seed: Optional[int] = None
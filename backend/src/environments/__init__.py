@@ -6,6 +6,22 @@ verification, and reuse. All environments follow a common interface pattern.
 """
 
 from src.environments.cyber_env import CyberDefenseEnv
+from src.environments.streaming_env import StreamingCyberDefenseEnv
+from src.environments.batch_env import BatchCyberDefenseEnv, BatchEnergySlotEnv
+from src.environments.scenario_bank import ScenarioBank, build_scenario_bank
 from src.environments.base_env import BaseEnv
+from src.environments.env_spec import EnvSpec, EnvRegistry, env_registry, register_env
 
-__all__ = ["CyberDefenseEnv", "BaseEnv"]
+__all__ = [
+    "CyberDefenseEnv",
+    "StreamingCyberDefenseEnv",
+    "BatchCyberDefenseEnv",
+    "BatchEnergySlotEnv",
+    "ScenarioBank",
+    "build_scenario_bank",
+    "BaseEnv",
+    "EnvSpec",
+    "EnvRegistry",
+    "env_registry",
+    "register_env",
+]
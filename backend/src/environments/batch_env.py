@@ -0,0 +1,436 @@
+"""
+Batched Environments — N Episodes Stepped as Arrays
+
+Steps N independent CyberDefenseEnv (or legacy EnergySlotEnv) episodes in
+lockstep using numpy arrays for the schedule lookup, rewards, state
+transitions and termination.
+
+DETERMINISM:
+    - Each episode keeps its own RandomState for the system dynamics and
+      draws from it in exactly the same order as the scalar environment,
+      so episode i reproduces CyberDefenseEnv(time_horizon, seeds[i])
+      step for step (same states, same float rewards)
+    - Rewards come from a lookup table built by calling the scalar
+      _calculate_reward, so the arithmetic is shared, not re-implemented
+    - For training throughput, BatchCyberDefenseEnv can instead draw the
+      dynamics of all episodes from one shared Generator (dynamics_seed);
+      scenarios are unchanged but trajectories no longer match the scalar env
+
+Finished episodes are frozen: they keep their terminal observation and
+report zero reward until the next reset().
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from src.environments.cyber_env import CyberDefenseEnv
+from src.environments.energy_env import EnergySlotEnv
+
+
+# Observation columns (match CyberDefenseEnv._get_state ordering)
+OBS_SEVERITY = 0
+OBS_ATTACK_TYPE = 1
+OBS_SYSTEM_HEALTH = 2
+OBS_CONFIDENCE = 3
+OBS_TIME_UNDER_ATTACK = 4
+
+_REWARD_TABLE: Optional[np.ndarray] = None
+_DAMAGE_TABLE: Optional[np.ndarray] = None
+
+
+def _reward_tables() -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Build (once) reward and damage lookup tables from the scalar env.
+
+    Returns:
+        Tuple of (reward, damage) arrays indexed [action, severity, attack_type, confidence]
+    """
+    global _REWARD_TABLE, _DAMAGE_TABLE
+    if _REWARD_TABLE is None:
+        scratch = CyberDefenseEnv(time_horizon=1, seed=0)
+        rewards = np.zeros((5, 3, 3, 2), dtype=np.float64)
+        damage = np.zeros((5, 3, 3, 2), dtype=np.float64)
+        for action in range(5):
+            for severity in range(3):
+                for attack_type in range(3):
+                    for confidence in range(2):
+                        scratch.damage_accumulated = 0.0
+                        rewards[action, severity, attack_type, confidence] = (
+                            scratch._calculate_reward(action, severity, attack_type, confidence)
+                        )
+                        damage[action, severity, attack_type, confidence] = scratch.damage_accumulated
+        _REWARD_TABLE, _DAMAGE_TABLE = rewards, damage
+    return _REWARD_TABLE, _DAMAGE_TABLE
+
+
+class BatchCyberDefenseEnv:
+    """
+    N cyber defense episodes stepped together.
+
+    Observations are (N, 5) int8 arrays with columns
+    (attack_severity, attack_type, system_health, alert_confidence, time_under_attack).
+    """
+
+    NUM_ACTIONS = 5
+
+    def __init__(
+        self,
+        schedules: np.ndarray,
+        rngs: Optional[List[np.random.RandomState]],
+        seeds: Sequence[int],
+        time_horizon: int,
+        dynamics_rng: Optional[np.random.Generator] = None,
+    ):
+        """
+        Initialize from pre-generated scenarios.
+
+        Prefer the from_seeds() / from_envs() constructors or
+        ScenarioBank.make_batch_env().
+
+        Args:
+            schedules: (N, 3, time_horizon) int array of (severity, attack_type, confidence)
+            rngs: One dynamics RandomState per episode (scalar-identical dynamics)
+            seeds: Seed of each episode (for identification)
+            time_horizon: Number of time steps per episode
+            dynamics_rng: Shared Generator for all dynamics draws (used instead
+                          of rngs; fully vectorized, not scalar-identical)
+        """
+        if schedules.ndim != 3 or schedules.shape[1] != 3:
+            raise ValueError(f"schedules must have shape (N, 3, horizon), got {schedules.shape}")
+        if (rngs is None) == (dynamics_rng is None):
+            raise ValueError("Provide exactly one of rngs or dynamics_rng")
+        if (rngs is not None and len(rngs) != schedules.shape[0]) or len(seeds) != schedules.shape[0]:
+            raise ValueError("schedules, rngs and seeds must have the same length")
+
+        self.schedules = schedules
+        self.time_horizon = time_horizon
+        self.seeds = list(seeds)
+        self.num_envs = schedules.shape[0]
+        self._rngs = rngs
+        self._dynamics_rng = dynamics_rng
+        self._rows = np.arange(self.num_envs)
+        self._reward_table, self._damage_table = _reward_tables()
+
+        self.reset()
+
+    # -----------------------------
+    # Constructors
+    # -----------------------------
+
+    @classmethod
+    def from_envs(cls, envs: Sequence[CyberDefenseEnv]) -> "BatchCyberDefenseEnv":
+        """
+        Batch existing scalar environments.
+
+        Schedules are copied; each env's dynamics RNG is cloned so the scalar
+        envs are left untouched.
+        """
+        if not envs:
+            raise ValueError("At least one environment is required")
+        horizon = envs[0].time_horizon
+        if any(env.time_horizon != horizon for env in envs):
+            raise ValueError("All environments must share the same time_horizon")
+
+        schedules = np.empty((len(envs), 3, horizon), dtype=np.int8)
+        rngs = []
+        for i, env in enumerate(envs):
+            schedules[i, 0] = env.severity_schedule[:horizon]
+            schedules[i, 1] = env.attack_type_schedule[:horizon]
+            schedules[i, 2] = env.confidence_schedule[:horizon]
+            rng = np.random.RandomState(env.seed)
+            rng.set_state(env._rng.get_state())
+            rngs.append(rng)
+
+        return cls(schedules, rngs, [env.seed for env in envs], horizon)
+
+    @classmethod
+    def from_seeds(
+        cls,
+        seeds: Sequence[int],
+        time_horizon: int = 24,
+        dynamics_seed: Optional[int] = None,
+    ) -> "BatchCyberDefenseEnv":
+        """
+        Generate scenarios for each seed exactly as CyberDefenseEnv does.
+
+        Args:
+            seeds: One seed per episode
+            time_horizon: Number of time steps per episode
+            dynamics_seed: If set, draw all dynamics from one shared Generator
+                           seeded with this value (faster; for training only)
+        """
+        batch = cls.from_envs([CyberDefenseEnv(time_horizon=time_horizon, seed=s) for s in seeds])
+        if dynamics_seed is not None:
+            batch._rngs = None
+            batch._dynamics_rng = np.random.default_rng(dynamics_seed)
+        return batch
+
+    # -----------------------------
+    # Public API
+    # -----------------------------
+
+    def reset(self) -> np.ndarray:
+        """
+        Reset all episodes to their initial state.
+
+        Returns:
+            (N, 5) int8 observation array
+        """
+        n = self.num_envs
+        self.current_step = np.zeros(n, dtype=np.int64)
+        self.system_health = np.full(n, CyberDefenseEnv.HEALTH_HEALTHY, dtype=np.int8)
+        self.time_under_attack = np.full(n, CyberDefenseEnv.TIME_SHORT, dtype=np.int8)
+        self.consecutive_attacks = np.zeros(n, dtype=np.int64)
+        self.damage_accumulated = np.zeros(n, dtype=np.float64)
+        self.done = np.zeros(n, dtype=bool)
+        return self._get_obs()
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Apply one action per episode and advance all running episodes.
+
+        Args:
+            actions: (N,) int array of defense actions (0-4); ignored for finished episodes
+
+        Returns:
+            Tuple of (obs, rewards, dones)
+            - obs: (N, 5) int8 observation array
+            - rewards: (N,) float64 rewards (0.0 for already-finished episodes)
+            - dones: (N,) bool termination flags
+
+        Raises:
+            RuntimeError: If every episode has already terminated
+            ValueError: If any action is invalid
+        """
+        if self.done.all():
+            raise RuntimeError("All episodes have terminated. Call reset().")
+
+        actions = np.asarray(actions, dtype=np.int64)
+        if actions.shape != (self.num_envs,):
+            raise ValueError(f"Expected {self.num_envs} actions, got shape {actions.shape}")
+        active = ~self.done
+        if ((actions[active] < 0) | (actions[active] >= self.NUM_ACTIONS)).any():
+            raise ValueError(f"Invalid action in batch: {actions[active]}")
+
+        step_idx = np.minimum(self.current_step, self.time_horizon - 1)
+        severity = self.schedules[self._rows, 0, step_idx].astype(np.int64)
+        attack_type = self.schedules[self._rows, 1, step_idx].astype(np.int64)
+        confidence = self.schedules[self._rows, 2, step_idx].astype(np.int64)
+        safe_actions = np.where(active, actions, 0)
+
+        rewards = self._reward_table[safe_actions, severity, attack_type, confidence].copy()
+        self.damage_accumulated += np.where(
+            active, self._damage_table[safe_actions, severity, attack_type, confidence], 0.0
+        )
+
+        self._update_system_state(active, safe_actions, severity)
+
+        # Track attack duration
+        attacked = active & (severity >= CyberDefenseEnv.SEVERITY_MEDIUM)
+        calm = active & ~attacked
+        self.consecutive_attacks[attacked] += 1
+        self.time_under_attack[attacked & (self.consecutive_attacks >= 3)] = CyberDefenseEnv.TIME_LONG
+        self.consecutive_attacks[calm] = 0
+        self.time_under_attack[calm] = CyberDefenseEnv.TIME_SHORT
+
+        # Advance time
+        self.current_step[active] += 1
+
+        # Terminal conditions (same precedence as the scalar env)
+        critical = active & (self.system_health == CyberDefenseEnv.HEALTH_CRITICAL)
+        finished = active & ~critical & (self.current_step >= self.time_horizon)
+        rewards[critical] -= 10.0
+        rewards[finished & (self.system_health == CyberDefenseEnv.HEALTH_HEALTHY)] += 5.0
+        rewards[finished & (self.system_health == CyberDefenseEnv.HEALTH_DEGRADED)] += 2.0
+        self.done |= critical | finished
+
+        rewards[~active] = 0.0
+        return self._get_obs(), rewards, self.done.copy()
+
+    # -----------------------------
+    # Internal helpers
+    # -----------------------------
+
+    def _draw(self, mask: np.ndarray) -> np.ndarray:
+        """Draw one uniform sample from each masked episode's own RNG."""
+        if self._dynamics_rng is not None:
+            return self._dynamics_rng.random(self.num_envs)
+        draws = np.ones(self.num_envs, dtype=np.float64)
+        for i in np.flatnonzero(mask):
+            draws[i] = self._rngs[i].random_sample()
+        return draws
+
+    def _update_system_state(self, active: np.ndarray, actions: np.ndarray, severity: np.ndarray) -> None:
+        """
+        Vectorized CyberDefenseEnv._update_system_state.
+
+        RNG draws are taken per episode in the same order and under the same
+        conditions as the scalar implementation.
+        """
+        healthy = self.system_health == CyberDefenseEnv.HEALTH_HEALTHY
+        degraded = self.system_health == CyberDefenseEnv.HEALTH_DEGRADED
+        high = active & (severity == CyberDefenseEnv.SEVERITY_HIGH)
+        medium = active & (severity == CyberDefenseEnv.SEVERITY_MEDIUM)
+        low = active & (severity == CyberDefenseEnv.SEVERITY_LOW)
+        strong = (actions == CyberDefenseEnv.BLOCK_IP) | (actions == CyberDefenseEnv.ISOLATE_SERVICE)
+        ignored = actions == CyberDefenseEnv.IGNORE
+
+        # HIGH severity: strong actions get a 70% chance to fully defend
+        first = self._draw(high & strong)
+        breached = high & ~(strong & (first < 0.7))
+        # Breached + DEGRADED needs a (second, for strong actions) draw for critical risk
+        critical_draw = self._draw(breached & degraded)
+        new_health = self.system_health.copy()
+        new_health[breached & healthy] = CyberDefenseEnv.HEALTH_DEGRADED
+        new_health[breached & degraded & (critical_draw < 0.4)] = CyberDefenseEnv.HEALTH_CRITICAL
+
+        # MEDIUM severity: acting may recover, ignoring may degrade
+        recover_draw = self._draw(medium & ~ignored & degraded)
+        new_health[medium & ~ignored & degraded & (recover_draw < 0.3)] = CyberDefenseEnv.HEALTH_HEALTHY
+        degrade_draw = self._draw(medium & ignored & healthy)
+        new_health[medium & ignored & healthy & (degrade_draw < 0.2)] = CyberDefenseEnv.HEALTH_DEGRADED
+
+        # LOW severity: natural recovery
+        natural_draw = self._draw(low & degraded)
+        new_health[low & degraded & (natural_draw < 0.4)] = CyberDefenseEnv.HEALTH_HEALTHY
+
+        self.system_health = new_health
+
+    def _get_obs(self) -> np.ndarray:
+        """Current observations; terminal steps report zero attack indicators."""
+        in_horizon = self.current_step < self.time_horizon
+        step_idx = np.minimum(self.current_step, self.time_horizon - 1)
+        obs = np.zeros((self.num_envs, 5), dtype=np.int8)
+        for field, column in ((0, OBS_SEVERITY), (1, OBS_ATTACK_TYPE), (2, OBS_CONFIDENCE)):
+            obs[:, column] = np.where(in_horizon, self.schedules[self._rows, field, step_idx], 0)
+        obs[:, OBS_SYSTEM_HEALTH] = self.system_health
+        obs[:, OBS_TIME_UNDER_ATTACK] = self.time_under_attack
+        return obs
+
+
+class BatchEnergySlotEnv:
+    """
+    N legacy energy scheduling episodes stepped together.
+
+    Battery levels are never recomputed with array arithmetic: the scalar env
+    subtracts energy_cost once per USE, so the level after k uses is looked up
+    from a table built by the same repeated subtraction (and the same Python
+    round() for the observed value). Observations are dicts of (N,) arrays
+    with the scalar keys, ready for discretize_energy_states().
+    """
+
+    NUM_ACTIONS = 2
+
+    def __init__(
+        self,
+        seeds: Sequence[int],
+        time_slots: int = 24,
+        battery_capacity: float = 1.0,
+        energy_cost: float = 0.1,
+    ):
+        """
+        Initialize N energy episodes.
+
+        Args:
+            seeds: One seed per episode (demand schedule identical to EnergySlotEnv(seed=...))
+            time_slots: Number of time slots per episode
+            battery_capacity: Initial battery level
+            energy_cost: Battery drained per USE action
+        """
+        if len(seeds) == 0:
+            raise ValueError("At least one seed is required")
+
+        self.seeds = list(seeds)
+        self.num_envs = len(self.seeds)
+        self.time_slots = time_slots
+        self.battery_capacity = battery_capacity
+        self.energy_cost = energy_cost
+        self._rows = np.arange(self.num_envs)
+
+        self.demand_schedule = np.empty((self.num_envs, time_slots), dtype=np.int8)
+        for i, seed in enumerate(self.seeds):
+            # Same generator and call as EnergySlotEnv._generate_demand
+            rng = np.random.RandomState(seed)
+            self.demand_schedule[i] = rng.choice([0, 1], size=time_slots, p=[0.5, 0.5])
+
+        # Battery level after k USE actions (at most one use per slot)
+        levels = [battery_capacity]
+        for _ in range(time_slots):
+            levels.append(levels[-1] - energy_cost)
+        self._battery_table = np.array(levels, dtype=np.float64)
+        self._observed_battery_table = np.array([round(level, 3) for level in levels], dtype=np.float64)
+
+        self.reset()
+
+    def reset(self) -> Dict[str, np.ndarray]:
+        """
+        Reset all episodes to their initial state.
+
+        Returns:
+            Observation dict of (N,) arrays
+        """
+        n = self.num_envs
+        self.current_step = np.zeros(n, dtype=np.int64)
+        self.uses = np.zeros(n, dtype=np.int64)
+        self.done = np.zeros(n, dtype=bool)
+        return self._get_obs()
+
+    @property
+    def battery_level(self) -> np.ndarray:
+        """Exact (unrounded) battery level of each episode."""
+        return self._battery_table[self.uses]
+
+    def step(self, actions: np.ndarray) -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray]:
+        """
+        Apply one action per episode and advance all running episodes.
+
+        Args:
+            actions: (N,) int array of SAVE (0) / USE (1); ignored for finished episodes
+
+        Returns:
+            Tuple of (obs, rewards, dones)
+
+        Raises:
+            RuntimeError: If every episode has already terminated
+            ValueError: If any action is invalid
+        """
+        if self.done.all():
+            raise RuntimeError("All episodes have terminated. Call reset().")
+
+        actions = np.asarray(actions, dtype=np.int64)
+        if actions.shape != (self.num_envs,):
+            raise ValueError(f"Expected {self.num_envs} actions, got shape {actions.shape}")
+        active = ~self.done
+        if ((actions[active] < 0) | (actions[active] >= self.NUM_ACTIONS)).any():
+            raise ValueError(f"Invalid action in batch: {actions[active]}")
+
+        step_idx = np.minimum(self.current_step, self.time_slots - 1)
+        demand = self.demand_schedule[self._rows, step_idx]
+
+        # Apply action: USE drains the battery and is rewarded if there is demand
+        use = active & (actions == EnergySlotEnv.USE)
+        rewards = np.zeros(self.num_envs, dtype=np.float64)
+        rewards[use & (demand == 1)] = 1.0
+        rewards[use & (demand != 1)] = -1.0
+        self.uses[use] += 1
+
+        # Battery exhaustion ends the episode without advancing time
+        exhausted = active & (self.battery_level <= 0)
+        rewards[exhausted] -= 2.0
+
+        advancing = active & ~exhausted
+        self.current_step[advancing] += 1
+        finished = advancing & (self.current_step >= self.time_slots)
+        rewards[finished] += 5.0
+
+        self.done |= exhausted | finished
+        return self._get_obs(), rewards, self.done.copy()
+
+    def _get_obs(self) -> Dict[str, np.ndarray]:
+        """Current observations (same keys and values as EnergySlotEnv._get_state)."""
+        in_horizon = self.current_step < self.time_slots
+        step_idx = np.minimum(self.current_step, self.time_slots - 1)
+        return {
+            "time_slot": self.current_step.copy(),
+            "battery_level": self._observed_battery_table[self.uses],
+            "demand": np.where(in_horizon, self.demand_schedule[self._rows, step_idx], 0).astype(np.int64),
+        }
@@ -8,11 +8,30 @@ attack indicators to maximize damage prevention while minimizing operational cos
 This is a SIMULATION for demonstrating RL policy verification, not a real defense system.
 """
 
-from typing import Dict, Tuple
+from typing import Dict, NamedTuple, Tuple
 import numpy as np
 from src.environments.base_env import BaseEnv
 
 
+class AttackDynamics(NamedTuple):
+    """
+    Parameters of attack scenario generation.
+
+    Attributes:
+        severity_probs: P(LOW, MEDIUM, HIGH) of each step's base severity
+        escalation_prob: Probability a HIGH step is followed by another HIGH step
+        attack_type_probs: P(SCAN, BRUTE_FORCE, DOS)
+        confidence_probs: P(HIGH alert confidence) for (LOW, MEDIUM, HIGH) severity
+    """
+    severity_probs: Tuple[float, float, float] = (0.5, 0.3, 0.2)
+    escalation_prob: float = 0.6
+    attack_type_probs: Tuple[float, float, float] = (0.4, 0.4, 0.2)
+    confidence_probs: Tuple[float, float, float] = (0.3, 0.5, 0.8)
+
+
+DEFAULT_ATTACK_DYNAMICS = AttackDynamics()
+
+
 class CyberDefenseEnv(BaseEnv):
     """
     Deterministic cybersecurity decision-policy simulation.
@@ -42,8 +61,13 @@ class CyberDefenseEnv(BaseEnv):
     
     DETERMINISM:
         - Fixed seed controls all randomness
-        - Same seed + same actions = same trajectory
+        - Same seed + same dynamics + same actions = same trajectory
         - Critical for verification replay
+    
+    DYNAMICS:
+        AttackDynamics sets how severe, persistent and detectable attacks are.
+        The defaults produce the original scenarios; environment presets
+        (env_presets.py) use their own.
     """
     
     # Action constants
@@ -76,6 +100,7 @@ class CyberDefenseEnv(BaseEnv):
         self,
         time_horizon: int = 24,
         seed: int = 42,
+        dynamics: AttackDynamics = DEFAULT_ATTACK_DYNAMICS,
     ):
         """
         Initialize cyber defense environment.
@@ -83,9 +108,11 @@ class CyberDefenseEnv(BaseEnv):
         Args:
             time_horizon: Number of time steps in episode (simulation duration)
             seed: Random seed for deterministic behavior
+            dynamics: Attack scenario parameters
         """
         self.time_horizon = time_horizon
         self.seed = seed
+        self.dynamics = dynamics
         
         # Initialize RNG for deterministic randomness
         self._rng = np.random.RandomState(seed)
@@ -96,6 +123,49 @@ class CyberDefenseEnv(BaseEnv):
         # Reset to initial state
         self.reset()
     
+    @classmethod
+    def from_schedule(
+        cls,
+        time_horizon: int,
+        seed: int,
+        severity_schedule: np.ndarray,
+        attack_type_schedule: np.ndarray,
+        confidence_schedule: np.ndarray,
+        rng_state: tuple,
+        dynamics: AttackDynamics = DEFAULT_ATTACK_DYNAMICS,
+    ) -> "CyberDefenseEnv":
+        """
+        Build an environment from a pre-generated scenario.
+        
+        Skips scenario generation entirely; the schedules are used as-is
+        (array views such as numpy.memmap slices are not copied). Together
+        with the post-generation RNG state this reproduces exactly the
+        trajectory of CyberDefenseEnv(time_horizon, seed).
+        
+        Args:
+            time_horizon: Number of time steps in episode
+            seed: Seed the scenario was generated from (kept for identification)
+            severity_schedule: Attack severity per step
+            attack_type_schedule: Attack type per step
+            confidence_schedule: Alert confidence per step
+            rng_state: RandomState.get_state() captured after generation
+            dynamics: Parameters the scenario was generated with (informational)
+        
+        Returns:
+            Ready-to-use environment (already reset)
+        """
+        env = cls.__new__(cls)
+        env.time_horizon = time_horizon
+        env.seed = seed
+        env.dynamics = dynamics
+        env._rng = np.random.RandomState(seed)
+        env._rng.set_state(rng_state)
+        env.severity_schedule = severity_schedule
+        env.attack_type_schedule = attack_type_schedule
+        env.confidence_schedule = confidence_schedule
+        env.reset()
+        return env
+    
     def _generate_attack_scenario(self) -> None:
         """
         Generate a deterministic attack scenario based on seed.
@@ -111,30 +181,48 @@ class CyberDefenseEnv(BaseEnv):
             - Same seed → same scenario
             - No randomness after initialization
         """
+        dynamics = self.dynamics
+        
         # Generate attack severity progression (0=LOW, 1=MEDIUM, 2=HIGH)
         # Start low, potentially escalate
-        severity_base = self._rng.choice([0, 1, 2], size=self.time_horizon, p=[0.5, 0.3, 0.2])
+        severity_base = self._rng.choice([0, 1, 2], size=self.time_horizon, p=list(dynamics.severity_probs))
         self.severity_schedule = severity_base.copy()
         
         # Add escalation patterns (attacks can intensify if not addressed)
         for i in range(1, self.time_horizon):
             if self.severity_schedule[i-1] == 2:  # Previous was HIGH
-                if self._rng.random() < 0.6:  # 60% chance to stay HIGH
+                if self._rng.random() < dynamics.escalation_prob:  # Chance to stay HIGH
                     self.severity_schedule[i] = 2
         
         # Generate attack types (0=SCAN, 1=BRUTE_FORCE, 2=DOS)
-        self.attack_type_schedule = self._rng.choice([0, 1, 2], size=self.time_horizon, p=[0.4, 0.4, 0.2])
+        self.attack_type_schedule = self._rng.choice([0, 1, 2], size=self.time_horizon,
+                                                     p=list(dynamics.attack_type_probs))
         
         # Generate alert confidence (0=LOW, 1=HIGH)
         # Higher severity attacks have higher confidence
         self.confidence_schedule = np.zeros(self.time_horizon, dtype=int)
         for i in range(self.time_horizon):
-            if self.severity_schedule[i] == 2:  # HIGH severity
-                self.confidence_schedule[i] = 1 if self._rng.random() < 0.8 else 0
-            elif self.severity_schedule[i] == 1:  # MEDIUM severity
-                self.confidence_schedule[i] = 1 if self._rng.random() < 0.5 else 0
-            else:  # LOW severity
-                self.confidence_schedule[i] = 1 if self._rng.random() < 0.3 else 0
+            high_confidence = dynamics.confidence_probs[self.severity_schedule[i]]
+            self.confidence_schedule[i] = 1 if self._rng.random() < high_confidence else 0
+    
+    def _scenario_at(self, step: int) -> Tuple[int, int, int]:
+        """
+        Look up the attack indicators scheduled for a time step.
+        
+        Subclasses that do not materialize the full schedule (e.g. the
+        streaming scenario mode) override this single hook.
+        
+        Args:
+            step: Time step index (0 <= step < time_horizon)
+        
+        Returns:
+            Tuple of (severity, attack_type, confidence)
+        """
+        return (
+            int(self.severity_schedule[step]),
+            int(self.attack_type_schedule[step]),
+            int(self.confidence_schedule[step]),
+        )
     
     def reset(self) -> Dict:
         """
@@ -174,9 +262,7 @@ class CyberDefenseEnv(BaseEnv):
             raise ValueError(f"Invalid action: {action}")
         
         # Get current attack state
-        severity = self.severity_schedule[self.current_step]
-        attack_type = self.attack_type_schedule[self.current_step]
-        confidence = self.confidence_schedule[self.current_step]
+        severity, attack_type, confidence = self._scenario_at(self.current_step)
         
         # Calculate reward based on action appropriateness
         reward = self._calculate_reward(action, severity, attack_type, confidence)
@@ -350,9 +436,7 @@ class CyberDefenseEnv(BaseEnv):
             - time_under_attack: Attack duration indicator (0-1)
         """
         if self.current_step < self.time_horizon:
-            severity = int(self.severity_schedule[self.current_step])
-            attack_type = int(self.attack_type_schedule[self.current_step])
-            confidence = int(self.confidence_schedule[self.current_step])
+            severity, attack_type, confidence = self._scenario_at(self.current_step)
         else:
             # Terminal state
             severity = 0
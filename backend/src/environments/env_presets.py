@@ -3,11 +3,19 @@ Environment Configuration Presets
 
 Define different environment configurations to segregate agents by training difficulty
 and scenario type. This enables fair comparisons within environment categories.
+
+Presets differ in episode length and in attack dynamics (AttackDynamics):
+how often attacks are severe, how long HIGH severity persists, the attack
+type mix and how reliable alerts are. Presets with non-default dynamics are
+distinct environment classes with their own env id prefix (see env_spec.py),
+so their claims replay under the same dynamics.
 """
 
 from typing import Dict
 from dataclasses import dataclass, asdict
 
+from src.environments.cyber_env import AttackDynamics, DEFAULT_ATTACK_DYNAMICS
+
 
 @dataclass
 class EnvironmentConfig:
@@ -16,10 +24,11 @@ class EnvironmentConfig:
     display_name: str  # Human-readable name
     time_horizon: int  # Episode length
     description: str  # Description of environment characteristics
-    seed_base: int  # Base seed for this environment type
+    seed_base: int  # Base seed for this environment type (population run i uses seed_base + i)
+    dynamics: AttackDynamics = DEFAULT_ATTACK_DYNAMICS  # Attack scenario parameters
     
     def to_dict(self) -> Dict:
-        return asdict(self)
+        return dict(asdict(self), dynamics=self.dynamics._asdict())
 
 
 # =============================================================================
@@ -39,16 +48,28 @@ ENV_PRESETS = {
         env_type="short_burst",
         display_name="Short Burst",
         time_horizon=12,
-        description="Quick response scenarios, 12-step episodes",
-        seed_base=100
+        description="Quick response scenarios, 12-step episodes of fast-escalating, DoS-heavy bursts",
+        seed_base=100,
+        dynamics=AttackDynamics(
+            severity_probs=(0.35, 0.35, 0.3),
+            escalation_prob=0.75,
+            attack_type_probs=(0.2, 0.3, 0.5),
+            confidence_probs=(0.3, 0.6, 0.85),
+        )
     ),
     
     "extended": EnvironmentConfig(
         env_type="extended",
         display_name="Extended Duration",
         time_horizon=48,
-        description="Long-term defense scenarios, 48-step episodes",
-        seed_base=200
+        description="Long-term defense scenarios, 48-step episodes with persistent brute-force campaigns",
+        seed_base=200,
+        dynamics=AttackDynamics(
+            severity_probs=(0.55, 0.3, 0.15),
+            escalation_prob=0.8,
+            attack_type_probs=(0.3, 0.5, 0.2),
+            confidence_probs=(0.25, 0.5, 0.75),
+        )
     ),
     
     "high_pressure": EnvironmentConfig(
@@ -56,7 +77,13 @@ ENV_PRESETS = {
         display_name="High Pressure",
         time_horizon=24,
         description="Frequent high-severity attacks, testing aggressive defense",
-        seed_base=300
+        seed_base=300,
+        dynamics=AttackDynamics(
+            severity_probs=(0.2, 0.35, 0.45),
+            escalation_prob=0.8,
+            attack_type_probs=(0.3, 0.3, 0.4),
+            confidence_probs=(0.3, 0.6, 0.9),
+        )
     ),
     
     "sparse_attacks": EnvironmentConfig(
@@ -64,7 +91,13 @@ ENV_PRESETS = {
         display_name="Sparse Attacks",
         time_horizon=24,
         description="Rare but critical attacks, testing vigilance",
-        seed_base=400
+        seed_base=400,
+        dynamics=AttackDynamics(
+            severity_probs=(0.8, 0.12, 0.08),
+            escalation_prob=0.4,
+            attack_type_probs=(0.5, 0.3, 0.2),
+            confidence_probs=(0.2, 0.4, 0.7),
+        )
     ),
 }
 
@@ -0,0 +1,272 @@
+"""
+Environment Specs and Cached Environment Factories
+
+An EnvSpec names one deterministic environment configuration: which
+environment class, its seed and horizon, and (optionally) the preset it was
+chosen from. Everything that needs "the environment of this claim" — the
+runner, the live trainer, the verifier, the consumer and the executor —
+builds it from a spec instead of constructing classes or parsing ids by hand.
+
+ENV IDS:
+    "{id_prefix}_seed_{seed}_horizon_{horizon}", e.g.
+    "cyber_defense_env_seed_42_horizon_24" (the format claims always used)
+
+    The preset name is not part of the id. A preset with its own attack
+    dynamics maps to its own env class ("cyber_defense_<preset>", id prefix
+    "cyber_defense_<preset>_env"), so the dynamics are; presets with the
+    default dynamics use the plain cyber_defense class. Two specs that differ
+    only in preset name therefore replay identically.
+
+REGISTRY:
+    register_env() maps an env class name to a factory (seed, horizon) → env.
+    The verifier replays any registered environment without code changes.
+
+CACHE (EnvRegistry):
+    - One pristine template per spec, built once; make() hands out a copy
+      (no scenario regeneration)
+    - acquire()/release() recycle instances per spec: a released env is
+      restored to its post-construction RNG state and reset, so it replays
+      exactly like a freshly constructed one
+    - Thread-safe; at most ENV_CACHE_MAX_SPECS specs are kept (oldest out)
+"""
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional
+import copy
+import re
+import threading
+
+from src.environments.base_env import BaseEnv
+from src.environments.cyber_env import CyberDefenseEnv, DEFAULT_ATTACK_DYNAMICS
+from src.environments.energy_env import EnergySlotEnv
+from src.environments.env_presets import ENV_PRESETS
+from src.shared.config import ENV_CACHE_MAX_SPECS, ENV_POOL_MAX_IDLE
+
+
+class EnvFactory(NamedTuple):
+    """
+    How to build one environment class.
+
+    Attributes:
+        name: Env class name used in specs (e.g. "cyber_defense")
+        id_prefix: Env id prefix (e.g. "cyber_defense_env")
+        build: (seed, horizon) → fresh environment
+        state_size: Length of a discretized state tuple
+        num_actions: Valid actions are 0 .. num_actions - 1
+    """
+    name: str
+    id_prefix: str
+    build: Callable[[int, int], BaseEnv]
+    state_size: int
+    num_actions: int
+
+
+ENV_FACTORIES: Dict[str, EnvFactory] = {}
+
+_ENV_ID_PATTERN = re.compile(r"^(?P<prefix>.+)_seed_(?P<seed>-?\d+)_horizon_(?P<horizon>\d+)$")
+
+
+def register_env(
+    name: str,
+    id_prefix: str,
+    build: Callable[[int, int], BaseEnv],
+    state_size: int,
+    num_actions: int
+) -> None:
+    """
+    Register an environment class for specs, env ids and replay.
+
+    Raises:
+        ValueError: If the name or id prefix is already registered
+    """
+    for factory in ENV_FACTORIES.values():
+        if factory.name == name or factory.id_prefix == id_prefix:
+            raise ValueError(f"Environment '{name}' ({id_prefix}) is already registered")
+    ENV_FACTORIES[name] = EnvFactory(name, id_prefix, build, state_size, num_actions)
+
+
+register_env("cyber_defense", "cyber_defense_env",
+             lambda seed, horizon: CyberDefenseEnv(time_horizon=horizon, seed=seed),
+             state_size=5, num_actions=5)  # discretize_cyber_state; IGNORE .. ISOLATE_SERVICE
+register_env("energy_slot", "energy_slot_env",
+             lambda seed, horizon: EnergySlotEnv(time_slots=horizon, seed=seed),
+             state_size=3, num_actions=2)  # discretize_energy_state; SAVE, USE
+
+# Preset → env class of its attack dynamics (presets not listed use "cyber_defense")
+PRESET_ENV_CLASSES: Dict[str, str] = {}
+
+for _preset in ENV_PRESETS.values():
+    if _preset.dynamics != DEFAULT_ATTACK_DYNAMICS:
+        register_env(f"cyber_defense_{_preset.env_type}", f"cyber_defense_{_preset.env_type}_env",
+                     lambda seed, horizon, dynamics=_preset.dynamics:
+                         CyberDefenseEnv(time_horizon=horizon, seed=seed, dynamics=dynamics),
+                     state_size=5, num_actions=5)
+        PRESET_ENV_CLASSES[_preset.env_type] = f"cyber_defense_{_preset.env_type}"
+
+
+class EnvSpec(NamedTuple):
+    """
+    Typed, hashable identity of a deterministic environment.
+
+    Attributes:
+        env_class: Registered env class name (see ENV_FACTORIES)
+        seed: Environment seed
+        horizon: Episode length (time steps)
+        preset: ENV_PRESETS key it came from (informational; its dynamics are
+                carried by env_class)
+    """
+    env_class: str
+    seed: int
+    horizon: int
+    preset: Optional[str] = None
+
+    @property
+    def factory(self) -> EnvFactory:
+        try:
+            return ENV_FACTORIES[self.env_class]
+        except KeyError:
+            raise ValueError(f"Unknown environment class: {self.env_class}") from None
+
+    @property
+    def env_id(self) -> str:
+        return f"{self.factory.id_prefix}_seed_{self.seed}_horizon_{self.horizon}"
+
+    @property
+    def replay_key(self) -> "EnvSpec":
+        """The spec without its preset: specs with equal keys replay identically."""
+        return self._replace(preset=None)
+
+    @classmethod
+    def cyber(cls, seed: int, horizon: int, preset: Optional[str] = None) -> "EnvSpec":
+        """Cyber defense spec; the preset selects its attack dynamics (unknown presets: defaults)."""
+        return cls(PRESET_ENV_CLASSES.get(preset, "cyber_defense"), seed, horizon, preset)
+
+    @classmethod
+    def parse(cls, env_id: str) -> "EnvSpec":
+        """
+        Spec of an env id.
+
+        Raises:
+            ValueError: If the id is malformed or names an unregistered env
+        """
+        match = _ENV_ID_PATTERN.match(env_id)
+        if match is not None:
+            for factory in ENV_FACTORIES.values():
+                if factory.id_prefix == match.group("prefix"):
+                    return cls(factory.name, int(match.group("seed")), int(match.group("horizon")))
+        raise ValueError(f"Invalid environment ID format: {env_id}")
+
+    @classmethod
+    def from_env_config(cls, seed: int, env_config: Dict) -> "EnvSpec":
+        """Spec of a live training session (seed + EnvironmentConfig dict)."""
+        return cls.cyber(seed, env_config.get('time_horizon', 24), env_config.get('env_type'))
+
+
+def preset_of_env_id(env_id: str) -> Optional[str]:
+    """
+    ENV_PRESETS key an env id replays (None for non-cyber or malformed ids).
+
+    Preset env classes are "cyber_defense_<preset>"; the plain cyber_defense
+    class has the default dynamics, i.e. the standard preset.
+    """
+    try:
+        env_class = EnvSpec.parse(env_id).env_class
+    except ValueError:
+        return None
+    if env_class == "cyber_defense":
+        return "standard"
+    for preset, preset_class in PRESET_ENV_CLASSES.items():
+        if preset_class == env_class:
+            return preset
+    return None
+
+
+class EnvRegistry:
+    """
+    Per-spec cache of pristine environments and recycled instances.
+
+    Attributes:
+        max_specs: Specs kept before the least recently used is dropped
+        max_idle: Released instances kept per spec
+        built: Environments constructed through a factory (cache misses)
+    """
+
+    def __init__(self, max_specs: int = ENV_CACHE_MAX_SPECS, max_idle: int = ENV_POOL_MAX_IDLE):
+        self.max_specs = max_specs
+        self.max_idle = max_idle
+        self.built = 0
+        self._templates: "OrderedDict[EnvSpec, tuple]" = OrderedDict()  # spec → (template env, rng state)
+        self._idle: Dict[EnvSpec, List[BaseEnv]] = {}
+        self._lock = threading.Lock()
+
+    def _template(self, spec: EnvSpec) -> tuple:
+        """(pristine env, its RNG state); caller holds the lock."""
+        key = spec.replay_key
+        entry = self._templates.get(key)
+        if entry is None:
+            env = spec.factory.build(spec.seed, spec.horizon)
+            self.built += 1
+            rng = getattr(env, "_rng", None)
+            entry = (env, rng.get_state() if rng is not None else None)
+            self._templates[key] = entry
+            while len(self._templates) > self.max_specs:
+                dropped, _ = self._templates.popitem(last=False)
+                self._idle.pop(dropped, None)
+        else:
+            self._templates.move_to_end(key)
+        return entry
+
+    def make(self, spec: EnvSpec) -> BaseEnv:
+        """A fresh, reset environment the caller owns (a copy of the cached template)."""
+        with self._lock:
+            template, _ = self._template(spec)
+            env = copy.deepcopy(template)
+        env.reset()
+        return env
+
+    def acquire(self, spec: EnvSpec) -> BaseEnv:
+        """A pristine environment for one replay; hand it back with release()."""
+        with self._lock:
+            template, rng_state = self._template(spec)
+            idle = self._idle.get(spec.replay_key)
+            env = idle.pop() if idle else copy.deepcopy(template)
+        if rng_state is not None:
+            env._rng.set_state(rng_state)
+        env.reset()
+        return env
+
+    def release(self, spec: EnvSpec, env: BaseEnv) -> None:
+        """Return an acquired environment for reuse (restored on the next acquire)."""
+        with self._lock:
+            if spec.replay_key not in self._templates:
+                return
+            idle = self._idle.setdefault(spec.replay_key, [])
+            if len(idle) < self.max_idle:
+                idle.append(env)
+
+    @contextmanager
+    def env(self, spec: EnvSpec) -> Iterator[BaseEnv]:
+        """Acquire for the duration of a `with` block."""
+        env = self.acquire(spec)
+        try:
+            yield env
+        finally:
+            self.release(spec, env)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._templates.clear()
+            self._idle.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "specs": len(self._templates),
+                "idle": sum(len(v) for v in self._idle.values()),
+                "built": self.built,
+            }
+
+
+# Process-wide registry used by runner, trainer, verifier, consumer and executor
+env_registry = EnvRegistry()
@@ -0,0 +1,286 @@
+"""
+Scenario Bank — Pre-generated Attack Schedules on Disk
+
+Marketplace-wide evaluations replay the same seeds over and over, and every
+CyberDefenseEnv construction regenerates its scenario in Python. A scenario
+bank generates the schedules for a seed range once and stores them in a
+compact binary file that any process can open with numpy.memmap at
+near-zero cost.
+
+FILE LAYOUT (little-endian):
+    magic           8 bytes   b"PLSCBNK1"
+    header_len      uint32
+    header          JSON (utf-8): version, time_horizon, seeds, fields, offsets
+    padding         to 64-byte alignment
+    schedules       int8    (num_seeds, 3, time_horizon)  severity/attack_type/confidence
+    rng_keys        uint32  (num_seeds, 624)              MT19937 state after generation
+    rng_pos         int32   (num_seeds,)
+
+The RNG state captured after scenario generation is stored alongside the
+schedule, so an environment opened from the bank reproduces the trajectory of
+CyberDefenseEnv(time_horizon, seed) exactly — verification results do not
+change when a bank is used.
+
+Usage:
+    python -m src.environments.scenario_bank build scenarios.bank --seeds 0:10000 --horizon 24
+
+    bank = ScenarioBank("scenarios.bank")
+    env = bank.make_env(42)
+    batch = bank.make_batch_env(range(0, 1000))
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence
+from pathlib import Path
+import argparse
+import json
+import struct
+import numpy as np
+
+from src.environments.cyber_env import CyberDefenseEnv
+from src.environments.batch_env import BatchCyberDefenseEnv
+
+
+BANK_MAGIC = b"PLSCBNK1"
+BANK_VERSION = 1
+SCHEDULE_FIELDS = ["attack_severity", "attack_type", "alert_confidence"]
+_MT_KEY_SIZE = 624
+_ALIGNMENT = 64
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def build_scenario_bank(path: str, seeds: Iterable[int], time_horizon: int = 24) -> Path:
+    """
+    Pre-generate attack scenarios for a set of seeds into a bank file.
+
+    Scenarios are produced by CyberDefenseEnv itself, so the bank can never
+    drift from the environment's generation rules.
+
+    Args:
+        path: Output file path (overwritten atomically)
+        seeds: Seeds to generate (order defines row order; duplicates rejected)
+        time_horizon: Episode length for every scenario
+
+    Returns:
+        Path to the written bank file
+    """
+    seeds = [int(s) for s in seeds]
+    if not seeds:
+        raise ValueError("At least one seed is required")
+    if len(set(seeds)) != len(seeds):
+        raise ValueError("Duplicate seeds in scenario bank")
+
+    n = len(seeds)
+    # Offsets depend on header length, which depends on offsets; fix the
+    # header size by reserving the data offset field after a first pass
+    header = {
+        "version": BANK_VERSION,
+        "time_horizon": time_horizon,
+        "seeds": seeds,
+        "fields": SCHEDULE_FIELDS,
+        "schedules_offset": 0,
+        "rng_keys_offset": 0,
+        "rng_pos_offset": 0,
+    }
+    preamble = len(BANK_MAGIC) + 4
+    header_bytes = json.dumps(header, sort_keys=True).encode("utf-8")
+    # Offsets are at most ~20 digits each; pad so re-encoding never grows past the reserve
+    reserve = len(header_bytes) + 64
+    schedules_offset = _align(preamble + reserve)
+    rng_keys_offset = _align(schedules_offset + n * 3 * time_horizon)
+    rng_pos_offset = _align(rng_keys_offset + n * _MT_KEY_SIZE * 4)
+    total_size = rng_pos_offset + n * 4
+
+    header.update(
+        schedules_offset=schedules_offset,
+        rng_keys_offset=rng_keys_offset,
+        rng_pos_offset=rng_pos_offset,
+    )
+    header_bytes = json.dumps(header, sort_keys=True).encode("utf-8").ljust(reserve, b" ")
+
+    path = Path(path)
+    temp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(temp_path, "wb") as f:
+        f.write(BANK_MAGIC)
+        f.write(struct.pack("<I", len(header_bytes)))
+        f.write(header_bytes)
+        f.truncate(total_size)
+
+    schedules = np.memmap(temp_path, dtype=np.int8, mode="r+",
+                          offset=schedules_offset, shape=(n, 3, time_horizon))
+    rng_keys = np.memmap(temp_path, dtype="<u4", mode="r+",
+                         offset=rng_keys_offset, shape=(n, _MT_KEY_SIZE))
+    rng_pos = np.memmap(temp_path, dtype="<i4", mode="r+",
+                        offset=rng_pos_offset, shape=(n,))
+
+    for row, seed in enumerate(seeds):
+        env = CyberDefenseEnv(time_horizon=time_horizon, seed=seed)
+        schedules[row, 0] = env.severity_schedule
+        schedules[row, 1] = env.attack_type_schedule
+        schedules[row, 2] = env.confidence_schedule
+        _, keys, pos, has_gauss, _ = env._rng.get_state()
+        if has_gauss:
+            # Scenario generation never draws gaussians; refuse silently-lossy banks
+            raise RuntimeError(f"Unexpected cached gaussian in RNG state for seed {seed}")
+        rng_keys[row] = keys
+        rng_pos[row] = pos
+
+    schedules.flush()
+    rng_keys.flush()
+    rng_pos.flush()
+    del schedules, rng_keys, rng_pos
+
+    temp_path.replace(path)
+    return path
+
+
+class ScenarioBank:
+    """
+    Read-only, memory-mapped view of a scenario bank file.
+
+    Opening a bank only parses the JSON header; schedule data is paged in by
+    the OS on access and shared between processes mapping the same file.
+
+    Attributes:
+        path: Bank file path
+        time_horizon: Episode length of every scenario
+        seeds: Seeds in row order
+    """
+
+    def __init__(self, path: str):
+        """
+        Open a scenario bank.
+
+        Args:
+            path: Path to a file produced by build_scenario_bank()
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+            ValueError: If the file is not a valid scenario bank
+        """
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            magic = f.read(len(BANK_MAGIC))
+            if magic != BANK_MAGIC:
+                raise ValueError(f"Not a scenario bank: {self.path}")
+            (header_len,) = struct.unpack("<I", f.read(4))
+            header = json.loads(f.read(header_len).decode("utf-8"))
+
+        if header.get("version") != BANK_VERSION:
+            raise ValueError(f"Unsupported scenario bank version: {header.get('version')}")
+
+        self.time_horizon: int = header["time_horizon"]
+        self.seeds: List[int] = header["seeds"]
+        self._index: Dict[int, int] = {seed: row for row, seed in enumerate(self.seeds)}
+
+        n = len(self.seeds)
+        self.schedules = np.memmap(self.path, dtype=np.int8, mode="r",
+                                   offset=header["schedules_offset"], shape=(n, 3, self.time_horizon))
+        self._rng_keys = np.memmap(self.path, dtype="<u4", mode="r",
+                                   offset=header["rng_keys_offset"], shape=(n, _MT_KEY_SIZE))
+        self._rng_pos = np.memmap(self.path, dtype="<i4", mode="r",
+                                  offset=header["rng_pos_offset"], shape=(n,))
+
+    def __len__(self) -> int:
+        return len(self.seeds)
+
+    def __contains__(self, seed: int) -> bool:
+        return seed in self._index
+
+    def covers(self, seed: int, time_horizon: int) -> bool:
+        """Whether this bank can serve the given (seed, horizon) scenario."""
+        return time_horizon == self.time_horizon and seed in self._index
+
+    def row_of(self, seed: int) -> int:
+        """Row index of a seed (KeyError if not in the bank)."""
+        try:
+            return self._index[seed]
+        except KeyError:
+            raise KeyError(f"Seed {seed} not in scenario bank {self.path}") from None
+
+    def rng_state(self, seed: int) -> tuple:
+        """Dynamics RNG state captured right after the scenario was generated."""
+        row = self.row_of(seed)
+        return ("MT19937", np.array(self._rng_keys[row], dtype=np.uint32), int(self._rng_pos[row]), 0, 0.0)
+
+    def make_env(self, seed: int) -> CyberDefenseEnv:
+        """
+        Create a CyberDefenseEnv backed by the bank (schedules are memmap views).
+
+        Equivalent to CyberDefenseEnv(time_horizon=self.time_horizon, seed=seed).
+        """
+        row = self.row_of(seed)
+        schedule = self.schedules[row]
+        return CyberDefenseEnv.from_schedule(
+            time_horizon=self.time_horizon,
+            seed=seed,
+            severity_schedule=schedule[0],
+            attack_type_schedule=schedule[1],
+            confidence_schedule=schedule[2],
+            rng_state=self.rng_state(seed),
+        )
+
+    def make_batch_env(self, seeds: Optional[Sequence[int]] = None) -> BatchCyberDefenseEnv:
+        """
+        Create a BatchCyberDefenseEnv over several banked seeds.
+
+        A run of consecutive rows is passed as a memmap slice (no copy);
+        arbitrary seed sets are gathered into a compact array.
+
+        Args:
+            seeds: Seeds to batch (defaults to every seed in the bank)
+        """
+        seeds = list(self.seeds if seeds is None else seeds)
+        rows = np.array([self.row_of(s) for s in seeds], dtype=np.int64)
+        if len(rows) and (np.diff(rows) == 1).all():
+            schedules = self.schedules[rows[0]:rows[-1] + 1]
+        else:
+            schedules = self.schedules[rows]
+
+        rngs = []
+        for seed in seeds:
+            rng = np.random.RandomState(seed)
+            rng.set_state(self.rng_state(seed))
+            rngs.append(rng)
+
+        return BatchCyberDefenseEnv(schedules, rngs, seeds, self.time_horizon)
+
+
+def _parse_seed_range(spec: str) -> List[int]:
+    """Parse "start:stop" (exclusive) or a comma-separated list of seeds."""
+    if ":" in spec:
+        start, stop = spec.split(":", 1)
+        return list(range(int(start), int(stop)))
+    return [int(s) for s in spec.split(",") if s]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Build or inspect PolicyLedger scenario banks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Pre-generate scenarios into a bank file")
+    build.add_argument("path")
+    build.add_argument("--seeds", required=True, help='Seed range "start:stop" or list "1,2,3"')
+    build.add_argument("--horizon", type=int, default=24)
+
+    info = sub.add_parser("info", help="Show bank header")
+    info.add_argument("path")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        seeds = _parse_seed_range(args.seeds)
+        path = build_scenario_bank(args.path, seeds, args.horizon)
+        print(f"✓ Wrote {len(seeds)} scenarios (horizon {args.horizon}) to {path} "
+              f"({path.stat().st_size / 1024:.1f} KiB)")
+    else:
+        bank = ScenarioBank(args.path)
+        print(f"Scenario bank: {bank.path}")
+        print(f"  Seeds: {len(bank)} ({bank.seeds[0]} .. {bank.seeds[-1]})")
+        print(f"  Horizon: {bank.time_horizon}")
+
+
+if __name__ == "__main__":
+    main()
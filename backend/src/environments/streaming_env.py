@@ -0,0 +1,150 @@
+"""
+Streaming Cyber Defense Environment — Chunked Scenario Generation
+
+CyberDefenseEnv materializes the whole attack schedule at construction time,
+which is fine for 24-48 step episodes but not for soak executions that run a
+policy for millions of steps. This variant generates the schedule lazily in
+fixed-size chunks, so memory stays O(chunk_size) regardless of the horizon.
+
+DETERMINISM:
+    - Chunk k is generated from its own RNG seeded with (seed, k)
+    - Escalation carries over chunk boundaries via the last severity of chunk k-1
+    - Same seed + same chunk_size + same dynamics + same actions = same trajectory
+    - Rewinding (reset) regenerates from chunk 0, so replays are identical
+
+NOTE: Scenarios differ from CyberDefenseEnv for the same seed (the fixed env
+draws the whole schedule from one RNG stream). Verification keeps using the
+fixed env; this mode is for long-horizon execution and burn-in testing.
+"""
+
+from typing import Optional, Tuple
+import numpy as np
+from src.environments.cyber_env import AttackDynamics, CyberDefenseEnv, DEFAULT_ATTACK_DYNAMICS
+
+
+class StreamingCyberDefenseEnv(CyberDefenseEnv):
+    """
+    CyberDefenseEnv with on-demand, chunked attack schedule generation.
+
+    Only the chunk containing the current step is held in memory. Chunks are
+    produced sequentially as the episode advances; the reward function, system
+    dynamics and observable state are inherited unchanged, and chunks follow
+    the same AttackDynamics as the fixed env.
+    """
+
+    DEFAULT_CHUNK_SIZE = 1024
+
+    def __init__(
+        self,
+        time_horizon: int = 24,
+        seed: int = 42,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        dynamics: AttackDynamics = DEFAULT_ATTACK_DYNAMICS,
+    ):
+        """
+        Initialize streaming cyber defense environment.
+
+        Args:
+            time_horizon: Number of time steps in episode (may be very large)
+            seed: Random seed for deterministic behavior
+            chunk_size: Number of schedule steps generated at a time
+            dynamics: Attack scenario parameters (default: the original scenarios)
+        """
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+        self.chunk_size = chunk_size
+        # Per-severity P(HIGH confidence) as an array, indexed by whole severity chunks
+        self._confidence_probs = np.array(dynamics.confidence_probs)
+        super().__init__(time_horizon=time_horizon, seed=seed, dynamics=dynamics)
+
+    def _generate_attack_scenario(self) -> None:
+        """
+        Prepare the chunk stream instead of materializing the full schedule.
+
+        The base RNG (self._rng) is left untouched here and drives only the
+        system dynamics; each chunk uses an independent RNG.
+        """
+        self._chunk_index = -1
+        self._chunk_start = 0
+        self._chunk_len = 0
+        self._chunk_severity: Optional[np.ndarray] = None
+        self._chunk_attack_type: Optional[np.ndarray] = None
+        self._chunk_confidence: Optional[np.ndarray] = None
+        self._load_chunk(0, prev_severity=None)
+
+    def _generate_chunk(
+        self,
+        chunk_index: int,
+        prev_severity: Optional[int],
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Generate one chunk of the attack schedule.
+
+        Mirrors the rules of CyberDefenseEnv._generate_attack_scenario, with
+        the probabilities taken from self.dynamics:
+        - Base severity drawn with severity_probs
+        - A HIGH step stays HIGH on the next step with escalation_prob
+        - Attack type drawn with attack_type_probs
+        - Alert confidence depends on severity (confidence_probs)
+
+        Args:
+            chunk_index: Index of the chunk to generate
+            prev_severity: Final severity of the previous chunk (None for chunk 0)
+
+        Returns:
+            Tuple of (severity, attack_type, confidence) int8 arrays
+        """
+        start = chunk_index * self.chunk_size
+        size = min(self.chunk_size, self.time_horizon - start)
+        rng = np.random.RandomState([self.seed, chunk_index])
+        dynamics = self.dynamics
+
+        severity = rng.choice([0, 1, 2], size=size, p=list(dynamics.severity_probs)).astype(np.int8)
+
+        # Escalation draws are taken up front so the stream does not depend on
+        # how many HIGH steps the chunk happens to contain
+        escalate = rng.random_sample(size) < dynamics.escalation_prob
+        previous = prev_severity
+        for i in range(size):
+            if previous == self.SEVERITY_HIGH and escalate[i]:
+                severity[i] = self.SEVERITY_HIGH
+            previous = severity[i]
+
+        attack_type = rng.choice([0, 1, 2], size=size, p=list(dynamics.attack_type_probs)).astype(np.int8)
+
+        confidence = (
+            rng.random_sample(size) < self._confidence_probs[severity]
+        ).astype(np.int8)
+
+        return severity, attack_type, confidence
+
+    def _load_chunk(self, chunk_index: int, prev_severity: Optional[int]) -> None:
+        """Generate a chunk and make it the resident one."""
+        severity, attack_type, confidence = self._generate_chunk(chunk_index, prev_severity)
+        self._chunk_index = chunk_index
+        self._chunk_start = chunk_index * self.chunk_size
+        self._chunk_len = len(severity)
+        self._chunk_severity = severity
+        self._chunk_attack_type = attack_type
+        self._chunk_confidence = confidence
+
+    def _scenario_at(self, step: int) -> Tuple[int, int, int]:
+        """
+        Look up attack indicators, generating chunks on demand.
+
+        Forward access advances chunk by chunk (carrying escalation state);
+        backward access restarts from chunk 0.
+        """
+        if step < self._chunk_start:
+            self._load_chunk(0, prev_severity=None)
+
+        while step >= self._chunk_start + self._chunk_len:
+            carry = int(self._chunk_severity[-1])
+            self._load_chunk(self._chunk_index + 1, prev_severity=carry)
+
+        offset = step - self._chunk_start
+        return (
+            int(self._chunk_severity[offset]),
+            int(self._chunk_attack_type[offset]),
+            int(self._chunk_confidence[offset]),
+        )
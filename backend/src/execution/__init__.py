@@ -6,6 +6,7 @@ from .live_executor import (
     LivePolicyExecutor,
     ExecutionConfig,
     ExecutionStep,
+    create_execution_env,
     AdaptiveEnvironmentPressure,
     PartialObservabilityFilter,
     PolicyConfidenceCalculator
@@ -15,6 +16,7 @@ __all__ = [
     "LivePolicyExecutor",
     "ExecutionConfig",
     "ExecutionStep",
+    "create_execution_env",
     "AdaptiveEnvironmentPressure",
     "PartialObservabilityFilter",
     "PolicyConfidenceCalculator"
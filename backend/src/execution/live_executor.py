@@ -37,6 +37,33 @@ class ExecutionConfig:
     adaptive_pressure: bool = False  # Escalate difficulty over time
     partial_observability: bool = False  # POMDP-like execution
     pressure_rate: float = 1.0  # How fast pressure increases
+    scenario_mode: str = "fixed"  # "fixed" (pre-generated) or "streaming" (chunked, O(chunk) memory)
+    scenario_chunk_size: int = 1024  # Steps generated per chunk in streaming mode
+    retain_steps: bool = True  # Keep every ExecutionStep in memory (disable for soak runs)
+
+
+def create_execution_env(seed: int, config: ExecutionConfig):
+    """
+    Build the environment for an execution run.
+    
+    In "fixed" mode this is the standard CyberDefenseEnv (episode ends at its
+    default time horizon). In "streaming" mode the attack schedule is generated
+    lazily in chunks and the horizon is stretched to max_steps, so very long
+    soak executions run with bounded memory.
+    """
+    from src.environments.env_spec import EnvSpec, env_registry
+    from src.environments.streaming_env import StreamingCyberDefenseEnv
+    from src.shared.config import DEFAULT_TIME_HORIZON
+    
+    if config.scenario_mode == "streaming":
+        return StreamingCyberDefenseEnv(
+            time_horizon=config.max_steps,
+            seed=seed,
+            chunk_size=config.scenario_chunk_size
+        )
+    if config.scenario_mode != "fixed":
+        raise ValueError(f"Unknown scenario_mode: {config.scenario_mode}")
+    return env_registry.make(EnvSpec.cyber(seed, DEFAULT_TIME_HORIZON))
 
 
 class AdaptiveEnvironmentPressure:
@@ -269,6 +296,12 @@ class LivePolicyExecutor:
         # Execution state
         self.steps: List[ExecutionStep] = []
         self.start_time = None
+        
+        # Running aggregates (kept even when steps are not retained)
+        self.total_steps = 0
+        self.cumulative_reward = 0.0
+        self._confidence_sum = 0.0
+        self._entropy_sum = 0.0
     
     def _discretize_state(self, state) -> Tuple[int, ...]:
         """Convert continuous state to discrete bins"""
@@ -381,6 +414,25 @@ class LivePolicyExecutor:
         
         return execution_step, next_state, done
     
+    def _record_step(self, execution_step: ExecutionStep) -> None:
+        """Update running aggregates and optionally retain the step"""
+        self.total_steps += 1
+        self.cumulative_reward = execution_step.cumulative_reward
+        self._confidence_sum += execution_step.confidence
+        self._entropy_sum += execution_step.entropy
+        if self.config.retain_steps:
+            self.steps.append(execution_step)
+    
+    def get_summary(self) -> Dict[str, Any]:
+        """Summary of the run so far, computed from running aggregates"""
+        return {
+            "total_steps": self.total_steps,
+            "final_reward": self.cumulative_reward,
+            "avg_confidence": self._confidence_sum / self.total_steps if self.total_steps else 0.0,
+            "avg_entropy": self._entropy_sum / self.total_steps if self.total_steps else 0.0,
+            "execution_time": time.time() - self.start_time if self.start_time else 0.0
+        }
+    
     async def execute_streaming(self, websocket):
         """Execute policy and stream results via WebSocket"""
         self.start_time = time.time()
@@ -395,7 +447,8 @@ class LivePolicyExecutor:
                 "max_steps": self.config.max_steps,
                 "adaptive_pressure": self.config.adaptive_pressure,
                 "partial_observability": self.config.partial_observability,
-                "speed_ms": self.config.speed_ms
+                "speed_ms": self.config.speed_ms,
+                "scenario_mode": self.config.scenario_mode
             }
         })
         
@@ -403,7 +456,7 @@ class LivePolicyExecutor:
             # Execute step
             execution_step, state, done = self.execute_step(step, state, cumulative_reward)
             cumulative_reward = execution_step.cumulative_reward
-            self.steps.append(execution_step)
+            self._record_step(execution_step)
             
             # Stream step data
             await websocket.send_json({
@@ -420,17 +473,16 @@ class LivePolicyExecutor:
         # Send completion
         await websocket.send_json({
             "type": "execution_complete",
-            "summary": {
-                "total_steps": len(self.steps),
-                "final_reward": cumulative_reward,
-                "avg_confidence": float(np.mean([s.confidence for s in self.steps])),
-                "avg_entropy": float(np.mean([s.entropy for s in self.steps])),
-                "execution_time": time.time() - self.start_time
-            }
+            "summary": self.get_summary()
         })
     
     def execute_batch(self) -> List[ExecutionStep]:
-        """Execute full episode and return all steps (for replay)"""
+        """
+        Execute full episode and return all steps (for replay).
+        
+        With retain_steps disabled the returned list is empty; use
+        get_summary() for the aggregate results.
+        """
         self.start_time = time.time()
         state = self.env.reset()
         cumulative_reward = 0.0
@@ -438,7 +490,7 @@ class LivePolicyExecutor:
         for step in range(self.config.max_steps):
             execution_step, state, done = self.execute_step(step, state, cumulative_reward)
             cumulative_reward = execution_step.cumulative_reward
-            self.steps.append(execution_step)
+            self._record_step(execution_step)
             
             if done:
                 break
@@ -8,6 +8,11 @@ Public Exports:
 - LedgerEntry
 - PolicyLedger
 - verify_chain_integrity
+- SqlitePolicyLedger: Same ledger stored in SQLite (WAL, indexed queries)
+- migrate_json_ledger: Copy a ledger.json into a new SQLite ledger
+- PolicyStore: Content-addressed, sharded policy artifact storage
+- GCResult
+- PolicyPack: Memory-mapped pack of every policy's action table
 
 Usage:
     from src.ledger import LedgerEntry, PolicyLedger
@@ -18,9 +23,20 @@ from src.ledger.ledger import (
     PolicyLedger,
     verify_chain_integrity
 )
+from src.ledger.sqlite_ledger import SqlitePolicyLedger, migrate_json_ledger
+from src.ledger.policy_store import PolicyStore, GCResult, default_policy_store
+from src.ledger.policy_pack import PolicyPack, pack_policies, unpack_policies
 
 __all__ = [
     "LedgerEntry",
     "PolicyLedger",
-    "verify_chain_integrity"
+    "verify_chain_integrity",
+    "SqlitePolicyLedger",
+    "migrate_json_ledger",
+    "PolicyStore",
+    "GCResult",
+    "default_policy_store",
+    "PolicyPack",
+    "pack_policies",
+    "unpack_policies"
 ]
@@ -12,7 +12,9 @@ Main Components:
 - LedgerEntry: Immutable data structure for policy verification records
 - PolicyLedger: Main class with append-only operations and integrity verification
 - verify_chain_integrity(): Function for tamper detection through hash chain validation
+- ChainChecker: The same validation fed one entry at a time (streaming callers)
 - compute_entry_hash(): Function for SHA-256 hash computation of entries
+  (versioned: version 2 also covers env_config, version 1 entries still verify)
 
 Dependencies:
 - hashlib: For cryptographic hash functions
@@ -31,10 +33,12 @@ TODO: Google Cloud Integration
 - Cloud Logging: Audit all ledger operations with structured logs
 """
 
-from typing import List, NamedTuple, Optional, Dict
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional
 from datetime import datetime
 import hashlib
+import itertools
 import json
+import threading
 from pathlib import Path
 
 
@@ -54,6 +58,8 @@ class LedgerEntry(NamedTuple):
         previous_hash: SHA-256 hash of the previous ledger entry (or "genesis")
         current_hash: SHA-256 hash of this entry for chain verification
         env_config: Environment configuration used for training (optional for backward compatibility)
+        hash_version: Hash input format (1 = legacy, env_config not covered;
+            2 = env_config covered, see compute_entry_hash)
 
     Note:
         This structure contains ONLY verified information - no training metadata,
@@ -67,6 +73,12 @@ class LedgerEntry(NamedTuple):
     previous_hash: str
     current_hash: str
     env_config: Optional[Dict] = None
+    hash_version: int = 1
+    
+    @property
+    def env_authenticated(self) -> bool:
+        """Whether env_config is covered by current_hash (legacy entries: no)."""
+        return self.env_config is None or self.hash_version >= 2
     
     def __repr__(self) -> str:
         return (
@@ -85,12 +97,17 @@ class LedgerEntry(NamedTuple):
 # HASH CHAIN LOGIC
 # =============================================================================
 
+LEDGER_HASH_VERSION = 2  # Hash input format of new entries
+
+
 def compute_entry_hash(
     policy_hash: str,
     verified_reward: float,
     agent_id: str,
     timestamp: str,
-    previous_hash: str
+    previous_hash: str,
+    env_config: Optional[Dict] = None,
+    hash_version: int = 1
 ) -> str:
     """
     Compute deterministic hash for ledger entry.
@@ -105,10 +122,16 @@ def compute_entry_hash(
         agent_id: Unique identifier of the agent
         timestamp: ISO 8601 formatted timestamp
         previous_hash: SHA-256 hash of the previous ledger entry
+        env_config: Environment configuration (hashed from version 2 on)
+        hash_version: 1 = legacy format (entries written before env_config
+            was hashed), 2 = also covers env_config as canonical JSON
 
     Returns:
         SHA-256 hash as 64-character hexadecimal string
 
+    Raises:
+        ValueError: If hash_version is unknown
+
     Note:
         Hash is computed deterministically from all entry fields.
         Same inputs always produce the same hash.
@@ -116,12 +139,31 @@ def compute_entry_hash(
     # Create deterministic string representation
     # Format: "field1|field2|field3|..." for clarity
     hash_input = f"{policy_hash}|{verified_reward:.6f}|{agent_id}|{timestamp}|{previous_hash}"
+    if hash_version == 2:
+        # Version prefix: a v2 input can never collide with a v1 input
+        env_json = json.dumps(env_config, sort_keys=True, separators=(",", ":"))
+        hash_input = f"v2|{hash_input}|{env_json}"
+    elif hash_version != 1:
+        raise ValueError(f"Unknown ledger hash version: {hash_version}")
     
     # Compute SHA-256 hash
     return hashlib.sha256(hash_input.encode('utf-8')).hexdigest()
 
 
-def verify_chain_integrity(entries: List[LedgerEntry]) -> tuple[bool, Optional[str]]:
+def hash_entry(entry: LedgerEntry) -> str:
+    """compute_entry_hash() of an entry's own fields (what current_hash must equal)."""
+    return compute_entry_hash(
+        entry.policy_hash,
+        entry.verified_reward,
+        entry.agent_id,
+        entry.timestamp,
+        entry.previous_hash,
+        entry.env_config,
+        entry.hash_version
+    )
+
+
+def verify_chain_integrity(entries: Iterable[LedgerEntry]) -> tuple[bool, Optional[str]]:
     """
     Verify that a list of ledger entries forms a valid hash chain.
 
@@ -135,7 +177,8 @@ def verify_chain_integrity(entries: List[LedgerEntry]) -> tuple[bool, Optional[s
         4. Chain continuity is maintained throughout
 
     Args:
-        entries: List of LedgerEntry objects in chronological order
+        entries: LedgerEntry objects in chronological order (any iterable;
+            checked in one pass, so a stream from disk is never materialized)
 
     Returns:
         Tuple of (is_valid, error_message) where:
@@ -147,54 +190,81 @@ def verify_chain_integrity(entries: List[LedgerEntry]) -> tuple[bool, Optional[s
         Can detect: modified entries, deleted entries, reordered entries,
         and any other form of tampering that breaks the hash chain.
     """
-    if len(entries) == 0:
-        return True, None  # Empty ledger is valid
-    
-    # Check first entry
-    first = entries[0]
-    if first.previous_hash != "genesis":
-        return False, f"First entry must have previous_hash='genesis', got '{first.previous_hash}'"
-    
-    # Verify first entry's hash
-    expected_hash = compute_entry_hash(
-        first.policy_hash,
-        first.verified_reward,
-        first.agent_id,
-        first.timestamp,
-        first.previous_hash
-    )
-    if first.current_hash != expected_hash:
-        return False, f"Entry 0 hash mismatch: expected {expected_hash[:16]}..., got {first.current_hash[:16]}..."
-    
-    # Check chain continuity
-    for i in range(1, len(entries)):
-        entry = entries[i]
-        prev_entry = entries[i - 1]
-        
-        # Check previous_hash points to previous entry
-        if entry.previous_hash != prev_entry.current_hash:
-            return False, (
+    checker = ChainChecker()  # Empty ledger is valid
+    for entry in entries:
+        if not checker.feed(entry):
+            return False, checker.error
+    return True, None
+
+
+class ChainChecker:
+    """
+    verify_chain_integrity() one entry at a time, for callers that already
+    stream the ledger for another purpose (e.g. the audit).
+
+    Attributes:
+        error: First validation failure (None while the chain is intact)
+        checked: Entries fed so far
+    """
+
+    def __init__(self):
+        self.error: Optional[str] = None
+        self.checked = 0
+        self._prev_entry: Optional[LedgerEntry] = None
+
+    def feed(self, entry: LedgerEntry) -> bool:
+        """Check the next entry in chronological order; returns whether the chain is still intact."""
+        i = self.checked
+        self.checked += 1
+        if self.error is None:
+            self.error = self._check(i, entry)
+            self._prev_entry = entry
+        return self.error is None
+
+    def _check(self, i: int, entry: LedgerEntry) -> Optional[str]:
+        if self._prev_entry is None:
+            # Check first entry
+            if entry.previous_hash != "genesis":
+                return f"First entry must have previous_hash='genesis', got '{entry.previous_hash}'"
+        elif entry.previous_hash != self._prev_entry.current_hash:
+            # Check previous_hash points to previous entry
+            return (
                 f"Chain break at entry {i}: "
                 f"previous_hash={entry.previous_hash[:16]}... "
-                f"but prev current_hash={prev_entry.current_hash[:16]}..."
+                f"but prev current_hash={self._prev_entry.current_hash[:16]}..."
             )
         
         # Verify current entry's hash
-        expected_hash = compute_entry_hash(
-            entry.policy_hash,
-            entry.verified_reward,
-            entry.agent_id,
-            entry.timestamp,
-            entry.previous_hash
-        )
+        try:
+            expected_hash = hash_entry(entry)
+        except ValueError as e:
+            return f"Entry {i}: {e}"
         if entry.current_hash != expected_hash:
-            return False, (
+            return (
                 f"Entry {i} hash mismatch: "
                 f"expected {expected_hash[:16]}..., "
                 f"got {entry.current_hash[:16]}..."
             )
-    
-    return True, None
+        return None
+
+
+def entry_env_type(env_config: Optional[Dict]) -> Optional[str]:
+    """
+    Environment type of an entry (None for legacy entries).
+
+    Entries recorded with only an env_id (e.g. via /ledger/add) get it from
+    the id's env class.
+    """
+    env_config = env_config or {}
+    if env_config.get("env_type") is not None:
+        return env_config["env_type"]
+    if env_config.get("env_id") is None:
+        return None
+    from src.environments.env_spec import preset_of_env_id  # Local: the ledger must not pull in environments at import
+    return preset_of_env_id(env_config["env_id"])
+
+
+LEDGER_QUERY_ORDERS = ("seq", "verified_reward")  # Append order, or reward (ties in append order)
 
 
 # =============================================================================
@@ -241,6 +311,7 @@ class PolicyLedger:
         """
         self.storage_path = Path(storage_path or "ledger.json")
         self._entries: List[LedgerEntry] = []
+        self._lock = threading.RLock()  # Appends arrive from request handlers and worker threads
         self._load_from_storage()
     
     # =========================================================================
@@ -280,43 +351,70 @@ class PolicyLedger:
         Note:
             This method trusts the caller (verification layer) completely.
             It performs no validation of the provided data.
+            Thread-safe: concurrent appends never share a previous_hash.
         """
-        # Get previous entry hash
-        if len(self._entries) == 0:
-            previous_hash = "genesis"
-        else:
-            previous_hash = self._entries[-1].current_hash
+        with self._lock:  # Tip read → append → save must not interleave
+            # Get previous entry hash
+            if len(self._entries) == 0:
+                previous_hash = "genesis"
+            else:
+                previous_hash = self._entries[-1].current_hash
         
-        # Generate timestamp
-        timestamp = datetime.now().isoformat()
+            # Generate timestamp
+            timestamp = datetime.now().isoformat()
         
-        # Compute current hash
-        current_hash = compute_entry_hash(
-            policy_hash,
-            verified_reward,
-            agent_id,
-            timestamp,
-            previous_hash
-        )
+            # Compute current hash (covers env_config)
+            current_hash = compute_entry_hash(
+                policy_hash,
+                verified_reward,
+                agent_id,
+                timestamp,
+                previous_hash,
+                env_config,
+                LEDGER_HASH_VERSION
+            )
         
-        # Create entry
-        entry = LedgerEntry(
-            policy_hash=policy_hash,
-            verified_reward=verified_reward,
-            agent_id=agent_id,
-            timestamp=timestamp,
-            previous_hash=previous_hash,
-            current_hash=current_hash,
-            env_config=env_config
-        )
+            # Create entry
+            entry = LedgerEntry(
+                policy_hash=policy_hash,
+                verified_reward=verified_reward,
+                agent_id=agent_id,
+                timestamp=timestamp,
+                previous_hash=previous_hash,
+                current_hash=current_hash,
+                env_config=env_config,
+                hash_version=LEDGER_HASH_VERSION
+            )
         
-        # Append to memory
-        self._entries.append(entry)
+            # Append to memory
+            self._entries.append(entry)
         
-        # Persist to storage
-        self._save_to_storage()
+            # Persist to storage
+            self._save_to_storage()
         
-        return entry
+            return entry
+    
+    def append_if_absent(
+        self,
+        policy_hash: str,
+        verified_reward: float,
+        agent_id: str,
+        env_config: Optional[Dict] = None
+    ) -> tuple[LedgerEntry, bool]:
+        """
+        Append unless this agent's policy is already recorded (atomic check + append).
+
+        Several paths verify the same session (REST, /ws/verify, /ws/train);
+        whichever finishes second must not record it again.
+
+        Returns:
+            (entry, appended): the new entry, or the existing one and False
+        """
+        with self._lock:
+            for entry in self._entries:
+                if entry.agent_id == agent_id and entry.policy_hash == policy_hash:
+                    return entry, False
+            return self.append(policy_hash, verified_reward, agent_id, env_config), True
     
     # =========================================================================
     # RESPONSIBILITY 2: READ LEDGER
@@ -339,6 +437,17 @@ class PolicyLedger:
         """
         return self._entries.copy()
     
+    def iter_entries(self) -> Iterator[LedgerEntry]:
+        """
+        Entries in chronological order, without copying the list.
+
+        Entries appended while iterating are not included (same interface as
+        SqlitePolicyLedger.iter_entries).
+        """
+        with self._lock:
+            entries, count = self._entries, len(self._entries)
+        return itertools.islice(entries, count)
+    
     def get_latest(self) -> Optional[LedgerEntry]:
         """
         Get the most recent ledger entry.
@@ -354,6 +463,63 @@ class PolicyLedger:
         """Get total number of entries."""
         return len(self._entries)
     
+    def query(
+        self,
+        agent_id: Optional[str] = None,
+        policy_hash: Optional[str] = None,
+        env_type: Optional[str] = None,
+        min_reward: Optional[float] = None,
+        max_reward: Optional[float] = None,
+        order_by: str = "seq",
+        descending: bool = False,
+        limit: int = 100,
+        offset: int = 0
+    ) -> List[LedgerEntry]:
+        """
+        One page of entries matching every given filter.
+        
+        Args:
+            agent_id / policy_hash / env_type: Exact-match filters (None = any);
+                env_type of legacy entries (hash_version 1) is not covered by
+                their hash (see LedgerEntry.env_authenticated)
+            min_reward / max_reward: Inclusive verified_reward bounds
+            order_by: "seq" (append order) or "verified_reward"
+            descending: Reverse the order (reward ties stay in append order)
+            limit / offset: Page size and start
+        
+        Raises:
+            ValueError: If order_by is not in LEDGER_QUERY_ORDERS
+        """
+        if order_by not in LEDGER_QUERY_ORDERS:
+            raise ValueError(f"order_by must be one of {LEDGER_QUERY_ORDERS}, got '{order_by}'")
+        matches = self._matching(agent_id, policy_hash, env_type, min_reward, max_reward)
+        if order_by == "verified_reward":
+            matches.sort(key=lambda e: e.verified_reward, reverse=descending)
+        elif descending:
+            matches.reverse()
+        return matches[offset:offset + limit]
+    
+    def count_matching(
+        self,
+        agent_id: Optional[str] = None,
+        policy_hash: Optional[str] = None,
+        env_type: Optional[str] = None,
+        min_reward: Optional[float] = None,
+        max_reward: Optional[float] = None
+    ) -> int:
+        """Number of entries query() pages through for the same filters."""
+        return len(self._matching(agent_id, policy_hash, env_type, min_reward, max_reward))
+    
+    def _matching(self, agent_id, policy_hash, env_type, min_reward, max_reward) -> List[LedgerEntry]:
+        return [
+            e for e in self._entries
+            if (agent_id is None or e.agent_id == agent_id)
+            and (policy_hash is None or e.policy_hash == policy_hash)
+            and (env_type is None or entry_env_type(e.env_config) == env_type)
+            and (min_reward is None or e.verified_reward >= min_reward)
+            and (max_reward is None or e.verified_reward <= max_reward)
+        ]
+    
     # =========================================================================
     # CHAIN VERIFICATION
     # =========================================================================
@@ -409,7 +575,9 @@ class PolicyLedger:
                     agent_id=entry_data["agent_id"],
                     timestamp=entry_data["timestamp"],
                     previous_hash=entry_data["previous_hash"],
-                    current_hash=entry_data["current_hash"]
+                    current_hash=entry_data["current_hash"],
+                    env_config=entry_data.get("env_config"),
+                    hash_version=entry_data.get("hash_version", 1)
                 )
                 entries.append(entry)
             
@@ -449,7 +617,9 @@ class PolicyLedger:
                 "agent_id": entry.agent_id,
                 "timestamp": entry.timestamp,
                 "previous_hash": entry.previous_hash,
-                "current_hash": entry.current_hash
+                "current_hash": entry.current_hash,
+                "env_config": entry.env_config,
+                "hash_version": entry.hash_version  # 1: env_config not hashed (legacy entries)
             })
         
         # Write to file with atomic write
@@ -0,0 +1,355 @@
+"""
+Policy Pack — All Policy Action Tables in One Memory-Mapped File
+
+Loading a policy from the store means opening and parsing one JSON file.
+Marketplace-wide work (ranking, tournaments, explainability over the top-k)
+does that for every policy. A pack stores each policy as one fixed-size
+record — raw hash plus one int8 action per cyber state — so any policy, or
+all of them as a K x 108 matrix, is read straight from the mapped file
+without parsing.
+
+FILE LAYOUT (little-endian):
+    magic           8 bytes   b"PLPOLPK1"
+    header_len      uint32
+    header          JSON (utf-8): version, state_shape, record_size
+    padding         to 64-byte alignment
+    records         K x (hash uint8[32], actions int8[NUM_CYBER_STATES])
+
+- actions[i] is the policy's action in state decode_cyber_state(i), or -1
+  when the policy has no entry for that state
+- Records are appended; the record count is (file size - data offset) /
+  record_size, so a torn final record from a crash is simply ignored
+- Record i always stays at the same offset, so a hash → row index built
+  once at open gives O(1) lookups; refresh() picks up records appended by
+  other processes
+- A pack that was replaced (new inode) or shrank is re-indexed from
+  scratch, and every lookup checks the hash stored in its row, so a stale
+  index never returns another policy's actions
+- Only cyber-defense policies fit the fixed state space; others are skipped
+  by the packing tools (they stay readable from the JSON store)
+
+Usage:
+    python -m src.ledger.policy_pack pack policies/policies.pack --store policies
+    python -m src.ledger.policy_pack unpack policies/policies.pack --store restored
+    python -m src.ledger.policy_pack info policies/policies.pack
+
+    pack = PolicyPack("policies/policies.pack")
+    policy = pack.policy(policy_hash)
+    matrix = pack.matrix()          # (K, 108) int8, zero-copy
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+from pathlib import Path
+import argparse
+import json
+import os
+import struct
+
+import numpy as np
+
+from src.agent.policy import Policy, hash_policy, serialize_policy
+from src.agent.state import CYBER_STATE_SHAPE, NUM_CYBER_STATES, decode_cyber_state
+
+
+PACK_MAGIC = b"PLPOLPK1"
+PACK_VERSION = 1
+HASH_BYTES = 32
+MISSING_ACTION = -1
+_ALIGNMENT = 64
+
+RECORD_DTYPE = np.dtype([("hash", np.uint8, (HASH_BYTES,)), ("actions", np.int8, (NUM_CYBER_STATES,))])
+
+# Cyber state tuples by flat index and back (cheaper than (un)ravel_multi_index per state)
+_STATES: List[Tuple[int, ...]] = [decode_cyber_state(i) for i in range(NUM_CYBER_STATES)]
+_STATE_INDEX: Dict[Tuple[int, ...], int] = {state: i for i, state in enumerate(_STATES)}
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def encode_policy_actions(policy: Policy) -> np.ndarray:
+    """
+    Dense action row for a cyber policy.
+
+    Raises:
+        ValueError: If a state is outside the cyber state space or an action
+                    does not fit in int8
+    """
+    row = np.full(NUM_CYBER_STATES, MISSING_ACTION, dtype=np.int8)
+    for state, action in policy.items():
+        index = _STATE_INDEX.get(tuple(state))
+        if index is None:
+            raise ValueError(f"State {state} is not in the cyber state space {CYBER_STATE_SHAPE}")
+        if not 0 <= action <= 127:
+            raise ValueError(f"Action {action} does not fit in a policy pack")
+        row[index] = action
+    return row
+
+
+def decode_policy_actions(row: np.ndarray) -> Policy:
+    """Inverse of encode_policy_actions()."""
+    actions = row.tolist()
+    return {_STATES[i]: action for i, action in enumerate(actions) if action != MISSING_ACTION}
+
+
+def _write_header(path: Path) -> None:
+    header = {
+        "version": PACK_VERSION,
+        "state_shape": list(CYBER_STATE_SHAPE),
+        "record_size": RECORD_DTYPE.itemsize,
+    }
+    header_bytes = json.dumps(header, sort_keys=True).encode("utf-8")
+    preamble = len(PACK_MAGIC) + 4
+    header_bytes = header_bytes.ljust(_align(preamble + len(header_bytes)) - preamble, b" ")
+    temp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(temp_path, "wb") as f:
+        f.write(PACK_MAGIC)
+        f.write(struct.pack("<I", len(header_bytes)))
+        f.write(header_bytes)
+        f.flush()
+        os.fsync(f.fileno())
+    temp_path.replace(path)
+
+
+class PolicyPack:
+    """
+    Appendable, memory-mapped pack of cyber policies.
+
+    One writer per process at a time; any number of readers. Appends from
+    other processes become visible after refresh().
+
+    Attributes:
+        path: Pack file path
+    """
+
+    def __init__(self, path: str, create: bool = True):
+        """
+        Open (or create) a policy pack.
+
+        Args:
+            path: Pack file path
+            create: Create an empty pack if the file does not exist
+
+        Raises:
+            FileNotFoundError: If the file does not exist and create is False
+            ValueError: If the file is not a compatible policy pack
+        """
+        self.path = Path(path)
+        if not self.path.exists():
+            if not create:
+                raise FileNotFoundError(f"Policy pack not found: {self.path}")
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            _write_header(self.path)
+
+        self._identity: Optional[Tuple[int, int]] = None  # (st_dev, st_ino) the index was built from
+        self.data_offset = self._read_header()
+        self._index: Dict[str, int] = {}
+        self._hashes: List[str] = []
+        self._records = np.zeros(0, dtype=RECORD_DTYPE)
+        self.refresh()
+
+    def _read_header(self) -> int:
+        """Validate the header; returns the offset of the first record."""
+        with open(self.path, "rb") as f:
+            if f.read(len(PACK_MAGIC)) != PACK_MAGIC:
+                raise ValueError(f"Not a policy pack: {self.path}")
+            (header_len,) = struct.unpack("<I", f.read(4))
+            header = json.loads(f.read(header_len).decode("utf-8"))
+
+        if header.get("version") != PACK_VERSION:
+            raise ValueError(f"Unsupported policy pack version: {header.get('version')}")
+        if tuple(header["state_shape"]) != CYBER_STATE_SHAPE or header["record_size"] != RECORD_DTYPE.itemsize:
+            raise ValueError(f"Policy pack {self.path} was built for a different state space")
+        return len(PACK_MAGIC) + 4 + header_len
+
+    def refresh(self, rebuild: bool = False) -> int:
+        """
+        Map records appended since the last refresh; returns the record count.
+
+        Args:
+            rebuild: Re-index every record (also done automatically when the
+                     file was replaced or shrank)
+        """
+        stat = os.stat(self.path)
+        identity = (stat.st_dev, stat.st_ino)
+        count = (stat.st_size - self.data_offset) // RECORD_DTYPE.itemsize
+        if rebuild or identity != self._identity or count < len(self._hashes):
+            self.data_offset = self._read_header()
+            count = (stat.st_size - self.data_offset) // RECORD_DTYPE.itemsize
+            self._index = {}
+            self._hashes = []
+            self._records = np.zeros(0, dtype=RECORD_DTYPE)
+            self._identity = identity
+        if count != len(self._records):
+            self._records = (np.memmap(self.path, dtype=RECORD_DTYPE, mode="r", offset=self.data_offset,
+                                       shape=(count,))
+                             if count else np.zeros(0, dtype=RECORD_DTYPE))
+            start = len(self._hashes)
+            hex_digits = np.ascontiguousarray(self._records["hash"][start:count]).tobytes().hex()
+            width = 2 * HASH_BYTES
+            for row in range(start, count):
+                offset = (row - start) * width
+                policy_hash = hex_digits[offset:offset + width]
+                self._hashes.append(policy_hash)
+                self._index.setdefault(policy_hash, row)  # Concurrent duplicate appends: first row wins
+        return count
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, policy_hash: str) -> bool:
+        return policy_hash in self._index
+
+    @property
+    def hashes(self) -> List[str]:
+        """Policy hashes in row order."""
+        return list(self._hashes)
+
+    def row_of(self, policy_hash: str) -> int:
+        """Row of a policy (KeyError if it is not packed)."""
+        try:
+            return self._index[policy_hash]
+        except KeyError:
+            raise KeyError(f"Policy {policy_hash} is not in pack {self.path}") from None
+
+    def _checked_row(self, policy_hash: str) -> int:
+        """
+        Row of a policy whose stored hash matches (re-indexes once if it does not).
+
+        Raises:
+            KeyError: If the policy is not packed
+        """
+        row = self.row_of(policy_hash)
+        if self._records[row]["hash"].tobytes().hex() != policy_hash:
+            self.refresh(rebuild=True)  # Pack rewritten under the same name and size
+            row = self.row_of(policy_hash)
+        return row
+
+    def actions(self, policy_hash: str) -> np.ndarray:
+        """(NUM_CYBER_STATES,) int8 action row, MISSING_ACTION where undefined (a view)."""
+        return self._records[self._checked_row(policy_hash)]["actions"]
+
+    def policy(self, policy_hash: str) -> Policy:
+        """Policy dict {state: action}, identical to the one that was packed."""
+        return decode_policy_actions(self.actions(policy_hash))
+
+    def matrix(self, policy_hashes: Optional[Sequence[str]] = None) -> np.ndarray:
+        """
+        Action tables as a (K, NUM_CYBER_STATES) int8 matrix.
+
+        Args:
+            policy_hashes: Rows to select, in this order (default: every row,
+                           as a zero-copy view)
+        """
+        if policy_hashes is None:
+            return self._records["actions"]
+        return self._records["actions"][[self._checked_row(h) for h in policy_hashes]]
+
+    def append(self, policy_hash: str, policy: Policy) -> bool:
+        """
+        Add a policy if it is not already packed.
+
+        Returns:
+            True if a record was written, False if the hash was already packed
+
+        Raises:
+            ValueError: If the hash is not a SHA-256 hex digest or the policy
+                        does not fit the cyber state space
+        """
+        self.refresh()
+        if policy_hash in self._index:
+            return False
+        try:
+            raw_hash = bytes.fromhex(policy_hash)
+        except ValueError:
+            raw_hash = b""
+        if len(raw_hash) != HASH_BYTES:
+            raise ValueError(f"Invalid policy hash for a pack: {policy_hash!r}")
+
+        record = np.zeros(1, dtype=RECORD_DTYPE)
+        record["hash"][0] = np.frombuffer(raw_hash, dtype=np.uint8)
+        record["actions"][0] = encode_policy_actions(policy)
+        with open(self.path, "ab") as f:
+            f.write(record.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        self.refresh()
+        return True
+
+
+def pack_policies(store, pack_path: str) -> Tuple[int, List[str]]:
+    """
+    Append every cyber policy of a PolicyStore to a pack.
+
+    Returns:
+        Tuple of (records written, hashes skipped because they do not fit a pack)
+    """
+    pack = PolicyPack(pack_path)
+    written = 0
+    skipped = []
+    for policy_hash in sorted(store.iter_hashes()):
+        if policy_hash in pack:
+            continue
+        try:
+            written += pack.append(policy_hash, store.load_policy(policy_hash))
+        except (ValueError, SyntaxError):  # Non-cyber state space, corrupt artifact or non-hash name
+            skipped.append(policy_hash)
+    return written, skipped
+
+
+def unpack_policies(pack_path: str, store) -> int:
+    """
+    Write every packed policy back into a PolicyStore as a JSON artifact.
+
+    Packs hold no metadata, so restored artifacts only record their origin.
+
+    Returns:
+        Number of artifacts written (already-stored hashes are left alone)
+    """
+    pack = PolicyPack(pack_path, create=False)
+    written = 0
+    for policy_hash in pack.hashes:
+        policy = pack.policy(policy_hash)
+        if hash_policy(serialize_policy(policy)) != policy_hash:
+            raise ValueError(f"Packed policy {policy_hash[:16]}... does not match its hash")
+        metadata = {"policy_hash": policy_hash, "unpacked_from": str(pack.path)}
+        written += store.put_policy(policy, policy_hash, metadata)
+    return written
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from src.ledger.policy_store import DEFAULT_POLICY_DIR, PolicyStore
+
+    parser = argparse.ArgumentParser(description="Build, restore or inspect PolicyLedger policy packs")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    pack_cmd = sub.add_parser("pack", help="Append every policy artifact of a store to a pack")
+    pack_cmd.add_argument("path")
+    pack_cmd.add_argument("--store", default=str(DEFAULT_POLICY_DIR), help="Policy store directory")
+
+    unpack_cmd = sub.add_parser("unpack", help="Write packed policies back as JSON artifacts")
+    unpack_cmd.add_argument("path")
+    unpack_cmd.add_argument("--store", default=str(DEFAULT_POLICY_DIR), help="Policy store directory")
+
+    info = sub.add_parser("info", help="Show pack size")
+    info.add_argument("path")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "pack":
+        written, skipped = pack_policies(PolicyStore(args.store), args.path)
+        print(f"✓ Packed {written} policies into {args.path}"
+              + (f" ({len(skipped)} skipped: not cyber-defense policies)" if skipped else ""))
+    elif args.command == "unpack":
+        written = unpack_policies(args.path, PolicyStore(args.store))
+        print(f"✓ Restored {written} policy artifacts into {args.store}")
+    else:
+        pack = PolicyPack(args.path, create=False)
+        print(f"Policy pack: {pack.path}")
+        print(f"  Policies: {len(pack)} ({len(pack._index)} distinct)")
+        print(f"  Size: {pack.path.stat().st_size / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
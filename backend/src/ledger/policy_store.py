@@ -0,0 +1,324 @@
+"""
+policy_store.py
+
+Content-addressed storage for policy artifacts.
+
+Detailed description:
+- Artifacts are addressed by policy hash (SHA-256 of serialize_policy())
+- Sharded fan-out by hash prefix keeps directories small at tens of
+  thousands of policies: policies/3f/3f6a62...json
+- Writes go to a temp file in the shard, are fsynced, then renamed over
+  the final path, so readers never see a partial artifact
+- Identical hashes are stored once (the first artifact's metadata wins)
+- Reference counts come from the ledger; garbage collection removes
+  artifacts no ledger entry references, after a grace period that protects
+  freshly trained policies still waiting for verification
+- Artifacts written before sharding (policies/<hash>.json) are still read,
+  counted and collected; migrate_flat() moves them into their shards
+- With a pack file (src.ledger.policy_pack), new cyber policies are also
+  appended to it and load_policy() reads them from the mapped pack instead
+  of parsing JSON; the pack is append-only, so rebuild it after GC
+
+Artifact format (unchanged):
+    {"policy": {"(s0, s1, ...)": action, ...}, "metadata": {...}}
+
+Main Components:
+- PolicyStore: put / get / load_policy / artifact_bytes / refcounts / collect_garbage
+- GCResult: Outcome of a garbage collection pass
+- default_policy_store(): Store rooted at backend/policies
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, NamedTuple, Optional
+import ast
+import json
+import os
+import tempfile
+import time
+
+from src.agent.policy import Policy, hash_policy
+from src.ledger.policy_pack import PolicyPack
+from src.shared.config import POLICY_STORE_SHARD_CHARS, POLICY_GC_GRACE_SECONDS, POLICY_PACK_FILENAME
+
+
+DEFAULT_POLICY_DIR = Path(__file__).parent.parent.parent / "policies"
+
+_HEX_DIGITS = set("0123456789abcdef")
+
+
+class GCResult(NamedTuple):
+    """
+    Outcome of PolicyStore.collect_garbage().
+
+    Attributes:
+        scanned: Artifacts examined
+        referenced: Kept because the ledger (or a pin) references them
+        recent: Unreferenced but kept inside the grace period
+        deleted: Hashes removed (or that would be, on a dry run)
+        bytes_freed: Size of the deleted artifacts
+        dry_run: Whether anything was actually deleted
+    """
+    scanned: int
+    referenced: int
+    recent: int
+    deleted: list
+    bytes_freed: int
+    dry_run: bool
+
+    def to_dict(self) -> Dict:
+        return self._asdict()
+
+
+class PolicyStore:
+    """
+    Sharded, content-addressed policy artifact directory.
+
+    Safe for concurrent writers in separate processes: every write is an
+    atomic rename and identical content has an identical name.
+    """
+
+    def __init__(self, root: Optional[Path] = None, shard_chars: int = POLICY_STORE_SHARD_CHARS,
+                 pack_path: Optional[Path] = None):
+        """
+        Args:
+            root: Store directory (default: backend/policies)
+            shard_chars: Hash prefix length used as the shard directory name
+                         (2 = 256 shards)
+            pack_path: Optional policy pack kept in sync with new artifacts
+        """
+        self.root = Path(root) if root is not None else DEFAULT_POLICY_DIR
+        self.shard_chars = shard_chars
+        self.pack_path = Path(pack_path) if pack_path is not None else None
+        self._pack: Optional[PolicyPack] = None
+
+    @property
+    def pack(self) -> Optional[PolicyPack]:
+        """The store's policy pack, opened (or created) on first use."""
+        if self._pack is None and self.pack_path is not None:
+            self._pack = PolicyPack(self.pack_path)
+        return self._pack
+
+    # ------------------------------------------------------------------
+    # Paths
+    # ------------------------------------------------------------------
+
+    def path_for(self, policy_hash: str) -> Path:
+        """Sharded location of an artifact (whether or not it exists)."""
+        self._check_hash(policy_hash)
+        return self.root / policy_hash[:self.shard_chars] / f"{policy_hash}.json"
+
+    def locate(self, policy_hash: str) -> Optional[Path]:
+        """Existing artifact path (sharded, else legacy flat), or None."""
+        if self._valid_hash(policy_hash):
+            path = self.path_for(policy_hash)
+            if path.exists():
+                return path
+        elif not policy_hash or policy_hash.startswith(".") or "/" in policy_hash or "\\" in policy_hash:
+            return None  # Never resolve outside the store
+        legacy = self.root / f"{policy_hash}.json"
+        return legacy if legacy.exists() else None
+
+    def __contains__(self, policy_hash: str) -> bool:
+        return self.locate(policy_hash) is not None
+
+    # ------------------------------------------------------------------
+    # Write
+    # ------------------------------------------------------------------
+
+    def put(self, policy_hash: str, serializable_policy: Dict[str, int], metadata: Dict,
+            verify: bool = True) -> bool:
+        """
+        Store an artifact under its hash.
+
+        Args:
+            policy_hash: Hash of serialize_policy(policy)
+            serializable_policy: Policy with string state keys ({str(state): action})
+            metadata: Artifact metadata (agent_id, claimed_reward, ...)
+            verify: Check that the hash matches the policy content
+
+        Returns:
+            True if the artifact was written, False if it was already stored
+
+        Raises:
+            ValueError: If the hash is malformed or does not match the content
+        """
+        path = self.path_for(policy_hash)
+        if verify:
+            actual = hash_policy(json.dumps(serializable_policy, sort_keys=True).encode('utf-8'))
+            if actual != policy_hash:
+                raise ValueError(f"Policy content hashes to {actual[:16]}..., not {policy_hash[:16]}...")
+        if path.exists() or (self.root / f"{policy_hash}.json").exists():
+            return False
+
+        data = json.dumps({"policy": serializable_policy, "metadata": metadata}, separators=(",", ":"))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{policy_hash[:16]}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_name, path)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+        return True
+
+    def put_policy(self, policy: Policy, policy_hash: str, metadata: Dict) -> bool:
+        """put() for a policy with tuple state keys; also appends it to the pack, if any."""
+        written = self.put(policy_hash, {str(state): action for state, action in policy.items()}, metadata)
+        if written and self.pack is not None:
+            try:
+                self.pack.append(policy_hash, policy)
+            except ValueError:
+                pass  # Not a cyber-defense policy: JSON only
+        return written
+
+    # ------------------------------------------------------------------
+    # Read
+    # ------------------------------------------------------------------
+
+    def get(self, policy_hash: str) -> Dict:
+        """
+        Load a full artifact.
+
+        Returns:
+            {"policy": {...}, "metadata": {...}}
+
+        Raises:
+            FileNotFoundError: If no artifact has this hash
+            ValueError: If the artifact is corrupted
+        """
+        path = self.locate(policy_hash)
+        if path is None:
+            raise FileNotFoundError(f"Policy artifact not found: {policy_hash}")
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Corrupted policy artifact {policy_hash}: {e}")
+        if not isinstance(data, dict) or "policy" not in data:
+            raise ValueError("Invalid policy artifact: missing 'policy' key")
+        return data
+
+    def load_policy(self, policy_hash: str) -> Policy:
+        """Load the policy with tuple state keys (ready for execution)."""
+        pack = self.pack
+        if pack is not None and self.locate(policy_hash) is not None:
+            if policy_hash not in pack:
+                pack.refresh()  # Packed by another store instance or process since we last looked
+            if policy_hash in pack:
+                try:
+                    return pack.policy(policy_hash)
+                except KeyError:
+                    pass  # Pack was rebuilt without it; the JSON artifact is authoritative
+        return {
+            ast.literal_eval(state): action
+            for state, action in self.get(policy_hash)["policy"].items()
+        }
+
+    def artifact_bytes(self, policy_hash: str) -> bytes:
+        """The serialized policy exactly as hashed during training (for verification)."""
+        return json.dumps(self.get(policy_hash)["policy"], sort_keys=True).encode('utf-8')
+
+    def iter_hashes(self) -> Iterator[str]:
+        """Every stored hash (sharded and legacy flat), one directory listing per shard."""
+        if not self.root.exists():
+            return
+        with os.scandir(self.root) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    with os.scandir(entry.path) as shard:
+                        for item in shard:
+                            if item.name.endswith(".json") and not item.name.startswith("."):
+                                yield item.name[:-5]
+                elif entry.name.endswith(".json"):
+                    yield entry.name[:-5]
+
+    # ------------------------------------------------------------------
+    # Reference counting and garbage collection
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def refcounts(ledger) -> Dict[str, int]:
+        """Number of ledger entries referencing each policy hash."""
+        counts: Dict[str, int] = {}
+        for entry in ledger.read_all():
+            counts[entry.policy_hash] = counts.get(entry.policy_hash, 0) + 1
+        return counts
+
+    def collect_garbage(
+        self,
+        ledger,
+        pinned: Iterable[str] = (),
+        grace_seconds: float = POLICY_GC_GRACE_SECONDS,
+        dry_run: bool = False,
+    ) -> GCResult:
+        """
+        Delete artifacts with no ledger reference.
+
+        Args:
+            ledger: PolicyLedger whose entries hold the references
+            pinned: Extra hashes to keep (e.g. sessions awaiting verification)
+            grace_seconds: Keep unreferenced artifacts younger than this
+            dry_run: Report what would be deleted without deleting
+
+        Returns:
+            GCResult
+        """
+        keep = set(self.refcounts(ledger)) | set(pinned)
+        cutoff = time.time() - grace_seconds
+        scanned = referenced = recent = bytes_freed = 0
+        deleted = []
+
+        for policy_hash in list(self.iter_hashes()):
+            scanned += 1
+            if policy_hash in keep:
+                referenced += 1
+                continue
+            path = self.locate(policy_hash) if self._valid_hash(policy_hash) else None
+            if path is None:  # Not a hash-named artifact, or removed concurrently
+                continue
+            stat = path.stat()
+            if stat.st_mtime > cutoff:
+                recent += 1
+                continue
+            if not dry_run:
+                path.unlink()
+            deleted.append(policy_hash)
+            bytes_freed += stat.st_size
+
+        if deleted:
+            print(f"🧹 Policy GC: {'would delete' if dry_run else 'deleted'} {len(deleted)} "
+                  f"unreferenced artifacts ({bytes_freed} bytes)")
+        return GCResult(scanned, referenced, recent, deleted, bytes_freed, dry_run)
+
+    def migrate_flat(self) -> int:
+        """Move legacy flat artifacts into their shards; returns how many moved."""
+        if not self.root.exists():
+            return 0
+        moved = 0
+        for path in list(self.root.glob("*.json")):
+            policy_hash = path.stem
+            if not self._valid_hash(policy_hash):
+                continue
+            target = self.path_for(policy_hash)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(path, target)
+            moved += 1
+        return moved
+
+    # ------------------------------------------------------------------
+
+    def _valid_hash(self, policy_hash: str) -> bool:
+        return len(policy_hash) > self.shard_chars and set(policy_hash) <= _HEX_DIGITS
+
+    def _check_hash(self, policy_hash: str) -> None:
+        if not self._valid_hash(policy_hash):
+            raise ValueError(f"Invalid policy hash: {policy_hash!r}")
+
+
+def default_policy_store() -> PolicyStore:
+    """Store rooted at backend/policies (the directory every component shares), with its pack."""
+    return PolicyStore(DEFAULT_POLICY_DIR, pack_path=DEFAULT_POLICY_DIR / POLICY_PACK_FILENAME)
@@ -0,0 +1,421 @@
+"""
+SQLite Ledger — Indexed, Incrementally-Written PolicyLedger
+
+PolicyLedger keeps every entry in a Python list and rewrites the whole JSON
+file on each append, so appends cost O(n) and every lookup is a scan.
+SqlitePolicyLedger stores the same hash chain in one SQLite table with the
+same interface (append, read_all, get_latest, count, verify_integrity,
+query, count_matching).
+
+STORAGE:
+    entries(seq INTEGER PRIMARY KEY, policy_hash, verified_reward, agent_id,
+            timestamp, previous_hash, current_hash UNIQUE, env_type, env_config)
+
+    - seq is append order (1..n); the chain is read back in seq order
+    - env_type is copied out of env_config so it can be indexed
+    - Hashes are computed exactly like PolicyLedger (compute_entry_hash,
+      including env_config and hash_version), so
+      entries move between backends unchanged
+
+INDEXES:
+    agent_id, policy_hash, (env_type, verified_reward), verified_reward
+
+WRITES:
+    - WAL journal: readers never block the writer and an append is one
+      small WAL write instead of a file rewrite
+    - append() reads the chain tip and inserts inside BEGIN IMMEDIATE, so
+      concurrent writers (threads or processes) cannot fork the chain
+    - All SQL is constant, parameterized text: sqlite3 compiles each
+      statement once per connection and reuses it (prepared statements)
+
+RULES (same as PolicyLedger):
+    - The chain is verified on open; corruption halts (never auto-repair)
+    - Entries are never updated or deleted
+
+Usage:
+    ledger = SqlitePolicyLedger("ledger.db")
+    ledger.append(policy_hash, reward, agent_id, env_config={"env_type": "standard"})
+    top = ledger.query(env_type="standard", order_by="verified_reward", descending=True, limit=10)
+
+    python -m src.ledger.sqlite_ledger ledger.json ledger.db   # migrate a JSON ledger
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+import argparse
+import json
+import sqlite3
+import threading
+
+from src.ledger.ledger import (
+    LEDGER_HASH_VERSION, LEDGER_QUERY_ORDERS, LedgerEntry, PolicyLedger, compute_entry_hash, entry_env_type,
+    hash_entry, verify_chain_integrity
+)
+from src.shared.config import LEDGER_SQLITE_READ_BATCH, LEDGER_SQLITE_SYNCHRONOUS
+
+
+SCHEMA_VERSION = 3  # 2: hash_version column; 3: env_type also derived from env_id
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    seq INTEGER PRIMARY KEY,
+    policy_hash TEXT NOT NULL,
+    verified_reward REAL NOT NULL,
+    agent_id TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    previous_hash TEXT NOT NULL,
+    current_hash TEXT NOT NULL UNIQUE,
+    env_type TEXT,
+    env_config TEXT,
+    hash_version INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_entries_agent_id ON entries(agent_id);
+CREATE INDEX IF NOT EXISTS idx_entries_policy_hash ON entries(policy_hash);
+CREATE INDEX IF NOT EXISTS idx_entries_env_type ON entries(env_type, verified_reward);
+CREATE INDEX IF NOT EXISTS idx_entries_verified_reward ON entries(verified_reward);
+"""
+
+_COLUMNS = "policy_hash, verified_reward, agent_id, timestamp, previous_hash, current_hash, env_config, hash_version"
+_INSERT = f"INSERT INTO entries ({_COLUMNS}, env_type) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+_SELECT_TIP = "SELECT current_hash FROM entries ORDER BY seq DESC LIMIT 1"
+_SELECT_RECORDED = f"SELECT {_COLUMNS} FROM entries WHERE agent_id = ? AND policy_hash = ? ORDER BY seq LIMIT 1"
+_SELECT_LATEST = f"SELECT {_COLUMNS} FROM entries ORDER BY seq DESC LIMIT 1"
+_SELECT_BATCH = f"SELECT seq, {_COLUMNS} FROM entries WHERE seq > ? ORDER BY seq LIMIT ?"
+_COUNT = "SELECT COUNT(*) FROM entries"
+
+
+def _row_to_entry(row) -> LedgerEntry:
+    policy_hash, verified_reward, agent_id, timestamp, previous_hash, current_hash, env_config, hash_version = row
+    return LedgerEntry(
+        policy_hash=policy_hash,
+        verified_reward=verified_reward,
+        agent_id=agent_id,
+        timestamp=timestamp,
+        previous_hash=previous_hash,
+        current_hash=current_hash,
+        env_config=json.loads(env_config) if env_config is not None else None,
+        hash_version=hash_version
+    )
+
+
+def _entry_to_row(entry: LedgerEntry) -> tuple:
+    env_config = json.dumps(entry.env_config) if entry.env_config is not None else None
+    return (entry.policy_hash, entry.verified_reward, entry.agent_id, entry.timestamp,
+            entry.previous_hash, entry.current_hash, env_config, entry.hash_version,
+            entry_env_type(entry.env_config))
+
+
+class SqlitePolicyLedger:
+    """
+    Tamper-evident, append-only policy ledger stored in SQLite.
+
+    Drop-in replacement for PolicyLedger (same entries, same hashes).
+
+    Attributes:
+        storage_path: SQLite database file
+    """
+
+    def __init__(self, storage_path: Optional[str] = None, verify_on_open: bool = True):
+        """
+        Open (or create) a ledger database.
+
+        Args:
+            storage_path: Database file (default "ledger.db" in the current directory)
+            verify_on_open: Check the whole chain before use (streamed in batches)
+
+        Raises:
+            RuntimeError: If the stored chain is broken
+        """
+        self.storage_path = Path(storage_path or "ledger.db")
+        self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # Autocommit mode: transactions are opened explicitly (BEGIN IMMEDIATE)
+        self._conn = sqlite3.connect(str(self.storage_path), isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={LEDGER_SQLITE_SYNCHRONOUS}")
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(entries)")}
+        if "hash_version" not in columns:  # Schema 1 database: every entry is a legacy (v1) hash
+            self._conn.execute("ALTER TABLE entries ADD COLUMN hash_version INTEGER NOT NULL DEFAULT 1")
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] < 3:
+            self._backfill_env_types()
+        self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+        if verify_on_open:
+            is_valid, error = self.verify_integrity()
+            if not is_valid:
+                self.close()
+                raise RuntimeError(
+                    f"LEDGER CORRUPTION DETECTED: {error}\n"
+                    f"Trust preserved by halting. Never auto-repair ledger."
+                )
+
+    def _backfill_env_types(self) -> None:
+        """Index env_type of entries recorded with only an env_id (not hashed, safe to rewrite)."""
+        rows = self._conn.execute(
+            "SELECT seq, env_config FROM entries WHERE env_type IS NULL AND env_config IS NOT NULL"
+        ).fetchall()
+        updates = [(entry_env_type(json.loads(env_config)), seq) for seq, env_config in rows]
+        updates = [(env_type, seq) for env_type, seq in updates if env_type is not None]
+        if updates:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany("UPDATE entries SET env_type = ? WHERE seq = ?", updates)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    # =========================================================================
+    # APPEND
+    # =========================================================================
+
+    def append(
+        self,
+        policy_hash: str,
+        verified_reward: float,
+        agent_id: str,
+        env_config: Optional[Dict] = None
+    ) -> LedgerEntry:
+        """
+        Append a verified policy claim (see PolicyLedger.append).
+
+        Returns:
+            The newly created LedgerEntry
+        """
+        return self._append(policy_hash, verified_reward, agent_id, env_config, unique=False)[0]
+
+    def append_if_absent(
+        self,
+        policy_hash: str,
+        verified_reward: float,
+        agent_id: str,
+        env_config: Optional[Dict] = None
+    ) -> tuple[LedgerEntry, bool]:
+        """
+        Append unless this agent's policy is already recorded (see PolicyLedger.append_if_absent).
+
+        Returns:
+            (entry, appended): the new entry, or the existing one and False
+        """
+        return self._append(policy_hash, verified_reward, agent_id, env_config, unique=True)
+
+    def _append(self, policy_hash, verified_reward, agent_id, env_config, unique: bool) -> tuple[LedgerEntry, bool]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if unique:
+                    row = self._conn.execute(_SELECT_RECORDED, (agent_id, policy_hash)).fetchone()
+                    if row is not None:
+                        self._conn.execute("COMMIT")
+                        return _row_to_entry(row), False
+                tip = self._conn.execute(_SELECT_TIP).fetchone()
+                previous_hash = tip[0] if tip is not None else "genesis"
+                timestamp = datetime.now().isoformat()
+                entry = LedgerEntry(
+                    policy_hash=policy_hash,
+                    verified_reward=verified_reward,
+                    agent_id=agent_id,
+                    timestamp=timestamp,
+                    previous_hash=previous_hash,
+                    current_hash=compute_entry_hash(policy_hash, verified_reward, agent_id, timestamp,
+                                                    previous_hash, env_config, LEDGER_HASH_VERSION),
+                    env_config=env_config,
+                    hash_version=LEDGER_HASH_VERSION
+                )
+                self._conn.execute(_INSERT, _entry_to_row(entry))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return entry, True
+
+    def import_entries(self, entries: Iterable[LedgerEntry]) -> int:
+        """
+        Append already-chained entries verbatim (timestamps and hashes kept).
+
+        Used to migrate a ledger between backends. All-or-nothing: one
+        transaction, rolled back unless every entry continues the chain.
+
+        Returns:
+            Number of entries imported
+
+        Raises:
+            ValueError: If an entry does not extend the chain or its hash is wrong
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                tip = self._conn.execute(_SELECT_TIP).fetchone()
+                state = {"previous_hash": tip[0] if tip is not None else "genesis", "count": 0}
+
+                def rows() -> Iterator[tuple]:
+                    for entry in entries:
+                        expected = hash_entry(entry)
+                        if entry.previous_hash != state["previous_hash"] or entry.current_hash != expected:
+                            raise ValueError(f"Entry {state['count']} does not continue the ledger chain")
+                        state["previous_hash"] = entry.current_hash
+                        state["count"] += 1
+                        yield _entry_to_row(entry)
+
+                self._conn.executemany(_INSERT, rows())
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return state["count"]
+
+    # =========================================================================
+    # READ
+    # =========================================================================
+
+    def iter_entries(self, batch_size: int = LEDGER_SQLITE_READ_BATCH) -> Iterator[LedgerEntry]:
+        """Every entry in append order, fetched batch_size rows at a time."""
+        last_seq = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(_SELECT_BATCH, (last_seq, batch_size)).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield _row_to_entry(row[1:])
+            last_seq = rows[-1][0]
+
+    def read_all(self) -> List[LedgerEntry]:
+        """All entries in chronological order (oldest first)."""
+        return list(self.iter_entries())
+
+    def get_latest(self) -> Optional[LedgerEntry]:
+        """Latest LedgerEntry or None if the ledger is empty."""
+        with self._lock:
+            row = self._conn.execute(_SELECT_LATEST).fetchone()
+        return _row_to_entry(row) if row is not None else None
+
+    def count(self) -> int:
+        """Get total number of entries."""
+        with self._lock:
+            return self._conn.execute(_COUNT).fetchone()[0]
+
+    def query(
+        self,
+        agent_id: Optional[str] = None,
+        policy_hash: Optional[str] = None,
+        env_type: Optional[str] = None,
+        min_reward: Optional[float] = None,
+        max_reward: Optional[float] = None,
+        order_by: str = "seq",
+        descending: bool = False,
+        limit: int = 100,
+        offset: int = 0
+    ) -> List[LedgerEntry]:
+        """
+        One page of entries matching every given filter (see PolicyLedger.query).
+
+        Raises:
+            ValueError: If order_by is not in LEDGER_QUERY_ORDERS
+        """
+        if order_by not in LEDGER_QUERY_ORDERS:
+            raise ValueError(f"order_by must be one of {LEDGER_QUERY_ORDERS}, got '{order_by}'")
+        where, params = self._where(agent_id, policy_hash, env_type, min_reward, max_reward)
+        direction = " DESC" if descending else ""
+        order = f"seq{direction}" if order_by == "seq" else f"verified_reward{direction}, seq"
+        sql = f"SELECT {_COLUMNS} FROM entries{where} ORDER BY {order} LIMIT ? OFFSET ?"
+        with self._lock:
+            rows = self._conn.execute(sql, (*params, limit, offset)).fetchall()
+        return [_row_to_entry(row) for row in rows]
+
+    def count_matching(
+        self,
+        agent_id: Optional[str] = None,
+        policy_hash: Optional[str] = None,
+        env_type: Optional[str] = None,
+        min_reward: Optional[float] = None,
+        max_reward: Optional[float] = None
+    ) -> int:
+        """Number of entries query() pages through for the same filters."""
+        where, params = self._where(agent_id, policy_hash, env_type, min_reward, max_reward)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM entries{where}", params).fetchone()[0]
+
+    @staticmethod
+    def _where(agent_id, policy_hash, env_type, min_reward, max_reward) -> tuple:
+        """(WHERE clause, parameters); only the clause shape varies, never the SQL values."""
+        clauses, params = [], []
+        for condition, value in (
+            ("agent_id = ?", agent_id),
+            ("policy_hash = ?", policy_hash),
+            ("env_type = ?", env_type),
+            ("verified_reward >= ?", min_reward),
+            ("verified_reward <= ?", max_reward),
+        ):
+            if value is not None:
+                clauses.append(condition)
+                params.append(value)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), tuple(params)
+
+    # =========================================================================
+    # CHAIN VERIFICATION
+    # =========================================================================
+
+    def verify_integrity(self) -> tuple[bool, Optional[str]]:
+        """Verify the hash chain, streaming entries instead of loading them all."""
+        return verify_chain_integrity(self.iter_entries())
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __repr__(self) -> str:
+        return (
+            f"SqlitePolicyLedger(\n"
+            f"  total_entries={self.count()},\n"
+            f"  storage='{self.storage_path}'\n"
+            f")"
+        )
+
+
+# =============================================================================
+# MIGRATION
+# =============================================================================
+
+def migrate_json_ledger(json_path: str, db_path: str) -> int:
+    """
+    Copy a JSON ledger into a new SQLite ledger, entry for entry.
+
+    Args:
+        json_path: Existing ledger.json (verified while loading)
+        db_path: SQLite database to create; must be empty
+
+    Returns:
+        Number of entries migrated
+
+    Raises:
+        ValueError: If the database already holds entries
+        RuntimeError: If either chain fails verification
+    """
+    source = PolicyLedger(json_path)
+    target = SqlitePolicyLedger(db_path)
+    try:
+        if target.count() > 0:
+            raise ValueError(f"Refusing to migrate into non-empty ledger {db_path}")
+        migrated = target.import_entries(source.read_all())
+        is_valid, error = target.verify_integrity()
+        if not is_valid:
+            raise RuntimeError(f"Migrated ledger failed verification: {error}")
+    finally:
+        target.close()
+    print(f"✓ Migrated {migrated} ledger entries: {json_path} → {db_path}")
+    return migrated
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Migrate a JSON policy ledger to SQLite")
+    parser.add_argument("json_path", help="Existing ledger.json")
+    parser.add_argument("db_path", help="SQLite database to create")
+    args = parser.parse_args(argv)
+    migrate_json_ledger(args.json_path, args.db_path)
+
+
+if __name__ == "__main__":
+    main()
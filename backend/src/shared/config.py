@@ -22,6 +22,61 @@ REPLAY_BUFFER_SIZE = 10000  # Maximum experiences to store
 REPLAY_BATCH_SIZE = 64  # Batch size for experience replay - increased
 REPLAY_START_SIZE = 200  # Minimum experiences before replay starts
 
+# Prioritized Experience Replay (proportional variant)
+PER_ALPHA = 0.6  # Priority exponent (0 = uniform sampling)
+PER_BETA_START = 0.4  # Initial importance-sampling exponent
+PER_BETA_INCREMENT = 0.001  # Beta annealing per sampled batch (towards 1.0)
+PER_EPSILON = 1e-3  # Added to |TD error| so no transition gets zero priority
+
+# Multi-step TD (td_method "n_step" / "q_lambda")
+N_STEP = 3  # Rewards per n-step return
+TRACE_LAMBDA = 0.8  # Eligibility trace decay (λ) for Watkins Q(λ)
+TRACE_CUTOFF = 1e-3  # Traces below this are dropped
+
+# Dyna-Q planning (per-session "planning_steps")
+DYNA_PLANNING_STEPS = 10  # Suggested simulated updates per real step (0 = no planning)
+
+# Convergence Detection (live training sessions)
+POLICY_STABLE_PATIENCE = 100  # Stop after this many episodes without a greedy-action change
+POLICY_STABLE_MAX_CHANGES = 0  # Changed states per episode still counted as "unchanged"
+
+# Checkpointing (live training sessions)
+CHECKPOINT_EVERY_EPISODES = 500  # Periodic checkpoint interval (0 = only on demand / pause)
+
+# Warm Start (seed training from a ledger policy or a checkpoint)
+WARM_START_EPSILON = 0.2  # Initial exploration rate for a warm-started run
+WARM_START_MARGIN = 1.0  # Q-value gap between a seeded policy's action and the alternatives
+
+# Policy Store (content-addressed artifacts under backend/policies)
+POLICY_STORE_SHARD_CHARS = 2  # Hash prefix length of the shard directory (2 = 256 shards)
+POLICY_GC_GRACE_SECONDS = 24 * 3600  # Unreferenced artifacts younger than this survive GC
+POLICY_PACK_FILENAME = "policies.pack"  # Memory-mapped pack of every cyber policy, inside the store
+
+# Verification cache (replay results keyed by policy hash, env, episodes, verifier version)
+VERIFICATION_CACHE_MAX_ENTRIES = 10000  # Oldest results are evicted beyond this
+
+# Sequential verification (stop once a confidence interval decides the claim)
+VERIFY_SEQUENTIAL_ERROR_RATE = 0.01  # Overall chance of a wrong early decision
+VERIFY_BATCH_EPISODES = 4  # Replay episodes between checks
+VERIFY_MIN_EPISODES = 4  # Episodes before the first check
+VERIFY_MAX_EPISODES = 100  # Episode budget (fixed-episode rule decides at the budget)
+
+# SQLite ledger backend (LEDGER_BACKEND=sqlite)
+LEDGER_SQLITE_SYNCHRONOUS = "NORMAL"  # With WAL: crash-safe, may lose the last appends on power loss
+LEDGER_SQLITE_READ_BATCH = 5000  # Rows fetched per batch when streaming the chain
+
+# Ledger audit (offline replay of every ledger entry against its artifact)
+AUDIT_REPLAY_EPISODES = 4  # Replay episodes per entry (replays are deterministic)
+AUDIT_REWARD_TOLERANCE = 1e-6  # Largest accepted |replayed - recorded| reward
+AUDIT_INFLIGHT_PER_WORKER = 4  # Entries queued per worker process (bounds memory)
+
+# Environment cache (pristine env per EnvSpec, recycled replay instances)
+ENV_CACHE_MAX_SPECS = 256  # Specs kept before the least recently used is dropped
+ENV_POOL_MAX_IDLE = 4  # Released instances kept per spec
+
+# Trajectory digests (rolling per-step hash of a greedy episode, shipped with claims)
+TRAJECTORY_STEP_HASH_CHARS = 16  # Hex chars kept per step hash (64 bits)
+
 # Discretization Configuration
 # State space bucketing for Q-table in cyber defense environment
 ATTACK_SEVERITY_BUCKETS = 3  # LOW, MEDIUM, HIGH
@@ -32,6 +32,7 @@ from datetime import datetime
 import json
 import os
 from src.agent.runner import PolicyClaim
+from src.agent.trajectory import TrajectoryDigest
 
 
 class Submission(NamedTuple):
@@ -186,7 +187,8 @@ class SubmissionCollector:
                 "env_id": sub.claim.env_id,
                 "policy_hash": sub.claim.policy_hash,
                 "policy_artifact": sub.claim.policy_artifact.hex(),  # Serialize policy artifact to hex string for JSON compatibility
-                "claimed_reward": sub.claim.claimed_reward
+                "claimed_reward": sub.claim.claimed_reward,
+                "trajectory": sub.claim.trajectory.to_dict() if sub.claim.trajectory else None
             })
         
         # Write to file
@@ -225,7 +227,8 @@ class SubmissionCollector:
                 env_id=sub_data["env_id"],
                 policy_hash=sub_data["policy_hash"],
                 policy_artifact=bytes.fromhex(sub_data["policy_artifact"]),
-                claimed_reward=sub_data["claimed_reward"]
+                claimed_reward=sub_data["claimed_reward"],
+                trajectory=TrajectoryDigest.from_dict(sub_data["trajectory"]) if sub_data.get("trajectory") else None
             )
             
             # Reconstruct Submission
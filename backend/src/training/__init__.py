@@ -1,5 +1,17 @@
 """Training module for real-time RL training"""
 
 from .live_trainer import LiveTrainingManager, TrainingMetrics, TrainingState, training_manager
+from .population import PopulationTrainer, PopulationMember, PopulationResult, build_population
+from .checkpoint import build_checkpoint, write_checkpoint, read_checkpoint
+from .sweep import SweepEngine, SweepResult, expand_search_space
+from .federated import FederatedTrainer, FederatedResult, aggregate_deltas
+from .warm_start import WarmStart, load_warm_start, warm_start_from_policy, warm_start_from_checkpoint
 
-__all__ = ['LiveTrainingManager', 'TrainingMetrics', 'TrainingState', 'training_manager']
+__all__ = [
+    'LiveTrainingManager', 'TrainingMetrics', 'TrainingState', 'training_manager',
+    'PopulationTrainer', 'PopulationMember', 'PopulationResult', 'build_population',
+    'build_checkpoint', 'write_checkpoint', 'read_checkpoint',
+    'SweepEngine', 'SweepResult', 'expand_search_space',
+    'FederatedTrainer', 'FederatedResult', 'aggregate_deltas',
+    'WarmStart', 'load_warm_start', 'warm_start_from_policy', 'warm_start_from_checkpoint',
+]
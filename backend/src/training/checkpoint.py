@@ -0,0 +1,255 @@
+"""
+Training Checkpoints — Save and Resume Live Sessions
+
+A live session keeps everything in memory: both Double-Q tables, the replay
+buffer, the environment RNG, epsilon and the episode counter. This module
+turns that state into a single .npz file and back, so a session survives a
+server restart and can be paused to free memory.
+
+FORMAT (one uncompressed .npz, no pickled objects):
+    q_a_keys, q_b_keys        (M, 6) int8   state (5) + action, in dict order
+    q_a_values, q_b_values    (M,)  float64
+    replay_states/_next       (K, 5) int8   oldest experience first
+    replay_actions            (K,)  int8
+    replay_rewards            (K,)  float64
+    replay_dones              (K,)  bool
+    replay_priorities         (K,)  float64 sum-tree leaves (prioritized replay only)
+    env_rng_keys              (624,) uint32 MT19937 key of the env RandomState
+    py_random_state           (625,) uint32 session random.Random state (key + position)
+    meta                      JSON bytes: episode counter, epsilon, config,
+                              env config, monitor and reward-window state,
+                              the last metrics, remaining scalar RNG fields
+
+BIT-EXACT RESUME:
+    - Checkpoints are taken between episodes, when the env is about to reset
+    - Dict insertion order and the replay buffer order are preserved
+    - Floats are stored as float64 / JSON repr, which round-trip exactly
+    - Each session draws from its own random.Random, whose state is saved,
+      so concurrent sessions do not affect a resumed trajectory
+
+I/O:
+    - build_checkpoint() copies state into arrays on the caller's thread
+      (cheap, keeps the snapshot consistent)
+    - write_checkpoint() is meant for asyncio.to_thread(); it writes to a
+      temporary file and renames it, so a crash never leaves a torn file
+"""
+
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+import io
+import json
+import os
+
+import numpy as np
+
+from src.agent.double_q_learning import ExperienceReplay, PrioritizedExperienceReplay
+from src.environments.env_spec import EnvSpec, env_registry
+
+
+CHECKPOINT_VERSION = 3
+
+HISTORY_TAIL = 100  # Metrics entries kept in a checkpoint (rolling-average window)
+
+
+def encode_q_table(q_table: Dict) -> Tuple[np.ndarray, np.ndarray]:
+    """Dict Q-table → ((M, 6) int8 keys, (M,) float64 values), insertion order kept."""
+    keys = np.array([state + (action,) for state, action in q_table], dtype=np.int8).reshape(-1, 6)
+    values = np.fromiter(q_table.values(), dtype=np.float64, count=len(q_table))
+    return keys, values
+
+
+def decode_q_table(keys: np.ndarray, values: np.ndarray) -> Dict:
+    """Inverse of encode_q_table()."""
+    return {
+        (tuple(row[:5]), row[5]): value
+        for row, value in zip(keys.tolist(), values.tolist())
+    }
+
+
+def encode_replay(replay_buffer: ExperienceReplay) -> Dict[str, np.ndarray]:
+    """
+    Replay buffer → column arrays.
+    
+    Uniform buffers are stored oldest experience first; prioritized buffers
+    in slot order, plus their leaf priorities.
+    """
+    experiences = list(replay_buffer.buffer)
+    size = len(experiences)
+    if size:
+        states, actions, rewards, next_states, dones = zip(*experiences)
+    else:
+        states = actions = rewards = next_states = dones = ()
+    arrays = {
+        'replay_states': np.array(states, dtype=np.int8).reshape(size, 5),
+        'replay_actions': np.array(actions, dtype=np.int8),
+        'replay_rewards': np.array(rewards, dtype=np.float64),
+        'replay_next_states': np.array(next_states, dtype=np.int8).reshape(size, 5),
+        'replay_dones': np.array(dones, dtype=bool),
+    }
+    if isinstance(replay_buffer, PrioritizedExperienceReplay):
+        arrays['replay_priorities'] = np.array(replay_buffer.tree.leaves(size), dtype=np.float64)
+    return arrays
+
+
+def replay_meta(replay_buffer) -> Dict[str, Any]:
+    """Scalar replay settings/state stored alongside encode_replay()."""
+    if isinstance(replay_buffer, PrioritizedExperienceReplay):
+        return {
+            'kind': 'prioritized',
+            'max_size': replay_buffer.max_size,
+            'batch_size': replay_buffer.batch_size,
+            'min_size': replay_buffer.min_size,
+            'alpha': replay_buffer.alpha,
+            'beta': replay_buffer.beta,
+            'beta_increment': replay_buffer.beta_increment,
+            'epsilon': replay_buffer.epsilon,
+            'position': replay_buffer.position,
+            'max_priority': replay_buffer.max_priority,
+        }
+    return {
+        'kind': 'uniform',
+        'max_size': replay_buffer.buffer.maxlen,
+        'batch_size': replay_buffer.batch_size,
+        'min_size': replay_buffer.min_size,
+    }
+
+
+def decode_replay(arrays: Dict[str, np.ndarray], meta: Dict[str, Any]):
+    """Inverse of encode_replay() / replay_meta()."""
+    experiences = zip(
+        map(tuple, arrays['replay_states'].tolist()),
+        arrays['replay_actions'].tolist(),
+        arrays['replay_rewards'].tolist(),
+        map(tuple, arrays['replay_next_states'].tolist()),
+        arrays['replay_dones'].tolist(),
+    )
+    if meta['kind'] == 'prioritized':
+        replay_buffer = PrioritizedExperienceReplay(
+            max_size=meta['max_size'], batch_size=meta['batch_size'], min_size=meta['min_size'],
+            alpha=meta['alpha'], beta_start=meta['beta'],
+            beta_increment=meta['beta_increment'], epsilon=meta['epsilon']
+        )
+        replay_buffer.buffer = list(experiences)
+        replay_buffer.position = meta['position']
+        replay_buffer.max_priority = meta['max_priority']
+        replay_buffer.tree.rebuild(arrays['replay_priorities'].tolist())
+        return replay_buffer
+
+    replay_buffer = ExperienceReplay(max_size=meta['max_size'], batch_size=meta['batch_size'], min_size=meta['min_size'])
+    replay_buffer.buffer = deque(experiences, maxlen=meta['max_size'])
+    return replay_buffer
+
+
+def build_checkpoint(state) -> Dict[str, np.ndarray]:
+    """
+    Snapshot a live TrainingState into checkpoint arrays.
+
+    Must be called between episodes, on the thread that runs the training
+    loop.
+
+    Args:
+        state: TrainingState (its monitor/rewards_window may be None)
+
+    Returns:
+        Dict of arrays ready for write_checkpoint()
+    """
+    arrays: Dict[str, np.ndarray] = {}
+    arrays['q_a_keys'], arrays['q_a_values'] = encode_q_table(state.q_table_a)
+    arrays['q_b_keys'], arrays['q_b_values'] = encode_q_table(state.q_table_b)
+    arrays.update(encode_replay(state.replay_buffer))
+
+    _, env_keys, env_pos, env_has_gauss, env_cached_gaussian = state.env._rng.get_state()
+    arrays['env_rng_keys'] = np.asarray(env_keys, dtype=np.uint32)
+
+    py_version, py_internal, py_gauss_next = state.rng.getstate()
+    arrays['py_random_state'] = np.array(py_internal, dtype=np.uint32)
+
+    meta = {
+        'version': CHECKPOINT_VERSION,
+        'agent_id': state.agent_id,
+        'seed': state.seed,
+        'status': state.status,
+        'episode': state.episode,
+        'episodes_completed': state.episodes_completed,
+        'total_episodes': state.total_episodes,
+        'epsilon': state.epsilon,
+        'config': state.config,
+        'env_type': state.env_type,
+        'env_config': state.env_config,
+        'time_horizon': state.env.time_horizon,
+        'env_rng': [env_pos, env_has_gauss, env_cached_gaussian],
+        'py_random': [py_version, py_gauss_next],
+        'replay': replay_meta(state.replay_buffer),
+        'rewards_window': state.rewards_window.state_dict() if state.rewards_window else None,
+        'monitor': state.monitor.state_dict() if state.monitor else None,
+        'metrics_tail': [m.to_dict() for m in state.metrics_history[-HISTORY_TAIL:]],
+        'stop_reason': state.stop_reason,
+        'warm_start': state.warm_start,
+        'planner': state.planner.state_dict() if state.planner else None,
+    }
+    arrays['meta'] = np.frombuffer(json.dumps(meta).encode('utf-8'), dtype=np.uint8)
+    return arrays
+
+
+def write_checkpoint(path: Path, arrays: Dict[str, np.ndarray]) -> int:
+    """
+    Atomically write checkpoint arrays to `path`.
+
+    Returns:
+        Size of the written file in bytes
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    buffer = io.BytesIO()
+    np.savez(buffer, **arrays)
+    data = buffer.getvalue()
+
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return len(data)
+
+
+def read_checkpoint(path: Path) -> Dict[str, Any]:
+    """
+    Load a checkpoint and rebuild the live objects.
+
+    Returns:
+        Dict with q_table_a, q_table_b, replay_buffer, env, py_random_state
+        (a random.Random.setstate() tuple) and meta (the JSON metadata)
+
+    Raises:
+        FileNotFoundError: If the checkpoint does not exist
+        ValueError: If the checkpoint version is not supported
+    """
+    with np.load(Path(path), allow_pickle=False) as data:
+        arrays = {name: data[name] for name in data.files}
+
+    meta = json.loads(arrays['meta'].tobytes().decode('utf-8'))
+    if meta.get('version') != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version: {meta.get('version')}")
+
+    env = env_registry.make(EnvSpec.cyber(meta['seed'], meta['time_horizon'], meta.get('env_type')))
+    env_pos, env_has_gauss, env_cached_gaussian = meta['env_rng']
+    env._rng.set_state(('MT19937', arrays['env_rng_keys'], env_pos, env_has_gauss, env_cached_gaussian))
+
+    py_version, py_gauss_next = meta['py_random']
+    py_random_state = (py_version, tuple(arrays['py_random_state'].tolist()), py_gauss_next)
+
+    return {
+        'q_table_a': decode_q_table(arrays['q_a_keys'], arrays['q_a_values']),
+        'q_table_b': decode_q_table(arrays['q_b_keys'], arrays['q_b_values']),
+        'replay_buffer': decode_replay(arrays, meta['replay']),
+        'env': env,
+        'py_random_state': py_random_state,
+        'meta': meta,
+    }
+
+
+def tracked_states(q_table_a: Dict, q_table_b: Dict) -> List:
+    """States present in either Q-table, in first-seen order."""
+    return list(dict.fromkeys(state for state, _ in list(q_table_a) + list(q_table_b)))
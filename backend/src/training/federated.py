@@ -0,0 +1,409 @@
+"""
+Federated Training — Visit-Weighted Q-Table Averaging Across Workers
+
+Population training shares nothing until the final policies. Here every
+worker (a local process standing in for an edge agent) trains on its own
+seed, and after each round of local episodes pushes what it learned to an
+aggregator, which averages it into a global table and broadcasts the
+result back.
+
+PROTOCOL (synchronous rounds):
+    1. Each worker runs `episodes_per_round` local episodes on dense
+       (108, 5) Double-Q arrays (see src.agent.vectorized)
+    2. It sends a QTableDelta: only the cells it updated, as flat indices,
+       value deltas against the last global table, and local visit counts
+    3. Once every worker has reported, the aggregator moves each cell by
+       the visit-weighted mean of the worker deltas:
+           global[c] += Σ_w visits_w[c] · delta_w[c] / Σ_w visits_w[c]
+    4. It broadcasts a GlobalUpdate with the new values of the changed
+       cells; workers overwrite those cells in both tables
+
+WIRE FORMAT:
+    Deltas and updates carry int32 cell indices plus float64 values (and
+    int32 visits upstream) — a few KB per round instead of full tables or
+    pickled dicts. Bytes sent each way are reported per round.
+
+SCALING:
+    - Aggregation is a handful of vectorized np.add.at calls over the
+      concatenated deltas, so its cost grows with changed cells, not workers
+    - Workers share one upstream queue; each has its own downstream queue
+    - Deltas are aggregated in worker order, so results do not depend on
+      which worker finishes first
+"""
+
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+from queue import Empty
+import multiprocessing
+import time
+
+import numpy as np
+
+from src.agent.policy import extract_policy_arrays
+from src.agent.state import NUM_CYBER_STATES
+from src.agent.vectorized import NUM_ACTIONS, initialize_q_arrays, merge_q_arrays, run_lockstep_round
+from src.environments.batch_env import BatchCyberDefenseEnv
+from src.shared.config import (
+    ALPHA, GAMMA, EPSILON_START, EPSILON_END, EPSILON_DECAY, OPTIMISTIC_INIT
+)
+
+
+DEFAULT_ROUNDS = 10
+DEFAULT_EPISODES_PER_ROUND = 20
+WORKER_TIMEOUT_SECONDS = 120.0  # Max wait for a round's deltas before giving up
+
+
+class QTableDelta(NamedTuple):
+    """
+    Worker → aggregator: the cells a worker changed in one round.
+
+    Attributes:
+        worker_id: Index of the sending worker
+        round: Round number
+        cells: (K,) int32 flat indices (state_index * NUM_ACTIONS + action)
+        deltas: (K,) float64 change against the last global table
+        visits: (K,) int32 local updates per cell this round
+        mean_reward: Mean episode reward over the round
+        transitions: Environment transitions processed this round
+    """
+    worker_id: int
+    round: int
+    cells: np.ndarray
+    deltas: np.ndarray
+    visits: np.ndarray
+    mean_reward: float
+    transitions: int
+
+    @property
+    def nbytes(self) -> int:
+        return self.cells.nbytes + self.deltas.nbytes + self.visits.nbytes
+
+
+class GlobalUpdate(NamedTuple):
+    """
+    Aggregator → workers: new global values of the cells changed this round.
+
+    Attributes:
+        round: Round number
+        cells: (K,) int32 flat indices
+        values: (K,) float64 new global Q-values
+    """
+    round: int
+    cells: np.ndarray
+    values: np.ndarray
+
+    @property
+    def nbytes(self) -> int:
+        return self.cells.nbytes + self.values.nbytes
+
+
+def encode_delta(
+    worker_id: int,
+    round_index: int,
+    local_q: np.ndarray,
+    base_q: np.ndarray,
+    visits: np.ndarray,
+    mean_reward: float = 0.0,
+    transitions: int = 0,
+) -> QTableDelta:
+    """
+    Diff a worker's merged table against the last global table.
+
+    Args:
+        local_q: Worker's (states, actions) merged Q-values
+        base_q: Global Q-values the worker last received
+        visits: Per-cell update counts since the last sync
+
+    Returns:
+        QTableDelta with only the visited or changed cells
+    """
+    flat_visits = visits.reshape(-1)
+    diff = (local_q - base_q).reshape(-1)
+    cells = np.flatnonzero((flat_visits > 0) | (diff != 0)).astype(np.int32)
+    return QTableDelta(
+        worker_id=worker_id,
+        round=round_index,
+        cells=cells,
+        deltas=diff[cells],
+        visits=flat_visits[cells].astype(np.int32),
+        mean_reward=mean_reward,
+        transitions=transitions,
+    )
+
+
+def aggregate_deltas(
+    global_q: np.ndarray,
+    global_visits: np.ndarray,
+    deltas: Sequence[QTableDelta],
+) -> GlobalUpdate:
+    """
+    Apply the visit-weighted mean of worker deltas to the global table.
+
+    A cell reported with zero visits (changed only indirectly) counts with
+    weight 1, so no reported change is dropped.
+
+    Args:
+        global_q: (states, actions) global Q-values (updated in place)
+        global_visits: (states, actions) cumulative visit counts (updated in place)
+        deltas: One QTableDelta per worker for this round
+
+    Returns:
+        GlobalUpdate for the changed cells
+    """
+    deltas = sorted(deltas, key=lambda d: d.worker_id)
+    round_index = deltas[0].round if deltas else 0
+    if not deltas or not any(len(d.cells) for d in deltas):
+        return GlobalUpdate(round_index, np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float64))
+
+    cells = np.concatenate([d.cells for d in deltas])
+    values = np.concatenate([d.deltas for d in deltas])
+    visits = np.concatenate([d.visits for d in deltas])
+    weights = np.maximum(visits, 1).astype(np.float64)
+
+    size = global_q.size
+    weighted_sum = np.zeros(size, dtype=np.float64)
+    weight_total = np.zeros(size, dtype=np.float64)
+    np.add.at(weighted_sum, cells, weights * values)
+    np.add.at(weight_total, cells, weights)
+    np.add.at(global_visits.reshape(-1), cells, visits)
+
+    changed = np.flatnonzero(weight_total > 0).astype(np.int32)
+    flat_q = global_q.reshape(-1)
+    flat_q[changed] += weighted_sum[changed] / weight_total[changed]
+    return GlobalUpdate(round_index, changed, flat_q[changed].copy())
+
+
+def _federated_worker(
+    worker_id: int,
+    seed: int,
+    settings: Dict,
+    upstream,
+    downstream,
+) -> None:
+    """
+    Worker process: train locally, push deltas, apply global updates.
+
+    Runs in its own process, so it must be a module-level function.
+    """
+    batch_env = BatchCyberDefenseEnv.from_seeds(
+        [seed] * settings['envs_per_worker'], settings['time_horizon'], dynamics_seed=seed
+    )
+    rng = np.random.default_rng(seed)
+    q_a, q_b, visits = initialize_q_arrays(optimistic_value=settings['optimistic_value'])
+    base_q = (q_a + q_b) / 2
+    epsilon = settings['epsilon_start']
+
+    for round_index in range(settings['rounds']):
+        rewards = []
+        transitions = 0
+        visits[:] = 0
+        for _ in range(settings['episodes_per_round']):
+            mean_reward, round_transitions = run_lockstep_round(
+                batch_env, q_a, q_b, visits, epsilon, rng,
+                alpha=settings['alpha'], gamma=settings['gamma']
+            )
+            rewards.append(mean_reward)
+            transitions += round_transitions
+            epsilon = max(settings['epsilon_end'], epsilon * settings['epsilon_decay'])
+
+        upstream.put(encode_delta(
+            worker_id, round_index, (q_a + q_b) / 2, base_q, visits,
+            mean_reward=float(np.mean(rewards)), transitions=transitions,
+        ))
+
+        update: GlobalUpdate = downstream.get()
+        q_a.reshape(-1)[update.cells] = update.values
+        q_b.reshape(-1)[update.cells] = update.values
+        base_q.reshape(-1)[update.cells] = update.values
+
+
+class RoundStats(NamedTuple):
+    """Per-round aggregation statistics."""
+    round: int
+    mean_reward: float
+    cells_changed: int
+    bytes_up: int
+    bytes_down: int
+    transitions: int
+    aggregate_seconds: float
+
+
+class FederatedResult(NamedTuple):
+    """
+    Outcome of a federated run.
+
+    Attributes:
+        q_values: (states, actions) final global Q-values
+        visits: (states, actions) cumulative visit counts across workers
+        rounds: RoundStats per round
+        seeds: Worker seeds
+        wall_time: Wall-clock seconds for the whole run
+    """
+    q_values: np.ndarray
+    visits: np.ndarray
+    rounds: List[RoundStats]
+    seeds: List[int]
+    wall_time: float
+
+    def q_table(self) -> Dict:
+        """Dict Q-table of the visited cells (extract_policy() compatible)."""
+        return merge_q_arrays(self.q_values, self.q_values, self.visits)
+
+    def policy(self) -> Dict:
+        """Greedy policy of the global table."""
+        return extract_policy_arrays(self.q_values, self.visits)
+
+    def summary(self) -> Dict:
+        """JSON-friendly summary."""
+        return {
+            "workers": len(self.seeds),
+            "rounds": len(self.rounds),
+            "wall_time": self.wall_time,
+            "states_visited": int((self.visits.sum(axis=1) > 0).sum()),
+            "bytes_up": sum(r.bytes_up for r in self.rounds),
+            "bytes_down": sum(r.bytes_down for r in self.rounds),
+            "transitions": sum(r.transitions for r in self.rounds),
+            "history": [r._asdict() for r in self.rounds],
+        }
+
+
+class FederatedTrainer:
+    """
+    Runs federated Q-learning over local worker processes.
+
+    Usage:
+        trainer = FederatedTrainer(rounds=10, episodes_per_round=20)
+        result = trainer.run(seeds=range(24), on_round=print)
+        policy = result.policy()
+    """
+
+    def __init__(
+        self,
+        rounds: int = DEFAULT_ROUNDS,
+        episodes_per_round: int = DEFAULT_EPISODES_PER_ROUND,
+        envs_per_worker: int = 1,
+        time_horizon: int = 24,
+        alpha: float = ALPHA,
+        gamma: float = GAMMA,
+        epsilon_start: float = EPSILON_START,
+        epsilon_end: float = EPSILON_END,
+        epsilon_decay: float = EPSILON_DECAY,
+        optimistic_value: float = OPTIMISTIC_INIT,
+    ):
+        """
+        Initialize federated trainer.
+
+        Args:
+            rounds: Synchronization rounds
+            episodes_per_round: Local lockstep rounds each worker runs between syncs
+            envs_per_worker: Episodes each worker steps in lockstep per local round
+            time_horizon: Episode length
+            alpha, gamma: Learning rate and discount factor
+            epsilon_start, epsilon_end, epsilon_decay: Local exploration schedule
+            optimistic_value: Initial Q-value of every cell
+        """
+        if rounds <= 0 or episodes_per_round <= 0 or envs_per_worker <= 0:
+            raise ValueError("rounds, episodes_per_round and envs_per_worker must be positive")
+        self.settings = {
+            'rounds': rounds,
+            'episodes_per_round': episodes_per_round,
+            'envs_per_worker': envs_per_worker,
+            'time_horizon': time_horizon,
+            'alpha': alpha,
+            'gamma': gamma,
+            'epsilon_start': epsilon_start,
+            'epsilon_end': epsilon_end,
+            'epsilon_decay': epsilon_decay,
+            'optimistic_value': optimistic_value,
+        }
+
+    def run(
+        self,
+        seeds: Sequence[int],
+        on_round: Optional[Callable[[Dict], None]] = None,
+    ) -> FederatedResult:
+        """
+        Train one worker per seed and aggregate every round.
+
+        Args:
+            seeds: One environment seed per worker
+            on_round: Optional callback with each round's stats as a dict
+
+        Returns:
+            FederatedResult with the final global table and per-round stats
+
+        Raises:
+            RuntimeError: If a worker dies or does not report in time
+        """
+        seeds = list(seeds)
+        if not seeds:
+            raise ValueError("At least one worker seed is required")
+
+        settings = self.settings
+        global_q = np.full((NUM_CYBER_STATES, NUM_ACTIONS), settings['optimistic_value'], dtype=np.float64)
+        global_visits = np.zeros((NUM_CYBER_STATES, NUM_ACTIONS), dtype=np.int64)
+        history: List[RoundStats] = []
+
+        ctx = multiprocessing.get_context()
+        upstream = ctx.Queue()
+        downstreams = [ctx.Queue() for _ in seeds]
+        workers = [
+            ctx.Process(target=_federated_worker, args=(i, seed, settings, upstream, downstreams[i]), daemon=True)
+            for i, seed in enumerate(seeds)
+        ]
+
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+
+        try:
+            for round_index in range(settings['rounds']):
+                deltas = [self._receive(upstream, workers) for _ in seeds]
+
+                aggregate_start = time.perf_counter()
+                update = aggregate_deltas(global_q, global_visits, deltas)
+                aggregate_seconds = time.perf_counter() - aggregate_start
+
+                for downstream in downstreams:
+                    downstream.put(update)
+
+                stats = RoundStats(
+                    round=round_index,
+                    mean_reward=float(np.mean([d.mean_reward for d in deltas])),
+                    cells_changed=len(update.cells),
+                    bytes_up=sum(d.nbytes for d in deltas),
+                    bytes_down=update.nbytes * len(seeds),
+                    transitions=sum(d.transitions for d in deltas),
+                    aggregate_seconds=aggregate_seconds,
+                )
+                history.append(stats)
+                if on_round is not None:
+                    on_round(stats._asdict())
+
+            for worker in workers:
+                worker.join(timeout=WORKER_TIMEOUT_SECONDS)
+        finally:
+            for worker in workers:
+                if worker.is_alive():
+                    worker.terminate()
+
+        return FederatedResult(
+            q_values=global_q,
+            visits=global_visits,
+            rounds=history,
+            seeds=seeds,
+            wall_time=time.perf_counter() - start,
+        )
+
+    @staticmethod
+    def _receive(upstream, workers) -> QTableDelta:
+        """Next delta from any worker; fail fast if a worker died."""
+        deadline = time.monotonic() + WORKER_TIMEOUT_SECONDS
+        while True:
+            try:
+                return upstream.get(timeout=0.5)
+            except Empty:
+                dead = [w for w in workers if w.exitcode not in (None, 0)]
+                if dead:
+                    raise RuntimeError(f"{len(dead)} federated worker(s) exited with an error")
+                if time.monotonic() > deadline:
+                    raise RuntimeError("Timed out waiting for federated worker deltas")
@@ -9,25 +9,49 @@ Features:
 - Real-time episode-by-episode updates
 - Training metrics streaming
 - Start/stop controls from frontend
+- Automatic stop once the greedy policy stops changing (convergence monitor)
+- Periodic / on-demand checkpoints, pause and bit-exact resume
 """
 
 import asyncio
 from typing import Dict, Optional, Callable
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
+from pathlib import Path
+import hashlib
+import random
+import re
 import time
 from datetime import datetime
 
-from src.agent.trainer import initialize_q_table, train_episode, select_action
+from src.agent.trainer import initialize_q_table, select_action
+from src.agent.profiling import PhaseProfiler, check_trace_episodes
+from src.agent.multistep import make_episode_fn
+from src.agent.dyna import DynaPlanner
 from src.agent.state import discretize_state
+from src.agent.trajectory import TrajectoryDigest, TrajectoryRecorder
 from src.agent.double_q_learning import (
     initialize_double_q_tables, 
     ExperienceReplay, 
+    create_replay_buffer,
     merge_q_tables
 )
+from src.agent.convergence import (
+    ConvergenceMonitor,
+    PolicyStableRule,
+    RewardPlateauRule,
+    TDErrorRule,
+    RollingStats,
+    greedy_double_q
+)
 from src.environments.cyber_env import CyberDefenseEnv
+from src.environments.env_spec import EnvSpec, env_registry
+from src.training.checkpoint import build_checkpoint, write_checkpoint, read_checkpoint, tracked_states
+from src.training.warm_start import episodes_saved
 from src.shared.config import (
     EPSILON_START, EPSILON_END, EPSILON_DECAY,
-    REPLAY_BUFFER_SIZE, REPLAY_BATCH_SIZE, REPLAY_START_SIZE
+    REPLAY_BUFFER_SIZE, REPLAY_BATCH_SIZE, REPLAY_START_SIZE,
+    POLICY_STABLE_PATIENCE, POLICY_STABLE_MAX_CHANGES,
+    CHECKPOINT_EVERY_EPISODES, N_STEP, TRACE_LAMBDA
 )
 
 
@@ -42,6 +66,8 @@ class TrainingMetrics:
     actions_taken: Dict[str, int]
     timestamp: str
     training_time: float
+    real_updates: int = 0  # Real transitions seen by the Dyna-Q model so far
+    planned_updates: int = 0  # Simulated Dyna-Q updates so far
     
     def to_dict(self):
         return asdict(self)
@@ -59,10 +85,59 @@ class TrainingState:
     q_table: Dict
     q_table_a: Dict  # First Q-table for Double Q-Learning
     q_table_b: Dict  # Second Q-table for Double Q-Learning
-    replay_buffer: ExperienceReplay  # Experience replay buffer
+    replay_buffer: ExperienceReplay  # Experience replay buffer (or PrioritizedExperienceReplay)
     env: CyberDefenseEnv
     seed: int
     env_config: Dict  # Environment configuration (time_horizon, difficulty, etc.)
+    stop_reason: Optional[str] = None  # Why the session stopped (rule, user, max episodes)
+    stopped_at_episode: Optional[int] = None  # Episodes completed when it stopped
+    
+    # Loop state (kept here so checkpoints capture everything needed to resume)
+    rng: random.Random = field(default_factory=random.Random)  # Session-private random stream
+    config: Dict = field(default_factory=dict)
+    env_type: str = "standard"
+    epsilon: float = EPSILON_START
+    episodes_completed: int = 0
+    rewards_window: Optional[RollingStats] = None
+    monitor: Optional[ConvergenceMonitor] = None
+    warm_start: Optional[Dict] = None  # Warm-start provenance (+ episodes_saved), None for a cold start
+    profiler: Optional[PhaseProfiler] = None  # Per-phase hot-path timing (config "profile")
+    planner: Optional[DynaPlanner] = None  # Dyna-Q model + planning (config "planning_steps")
+    final_trajectory: Optional[TrajectoryDigest] = None  # Digest of the deterministic evaluation episode
+    
+    # Checkpoint bookkeeping
+    checkpoint_path: Optional[str] = None
+    checkpoint_requested: bool = False
+    checkpoints_written: int = 0
+    checkpoint_bytes: int = 0  # Size of the last checkpoint
+    checkpoint_write_seconds: float = 0.0  # Write latency of the last checkpoint
+    checkpoint_snapshot_seconds: float = 0.0  # Time spent copying state on the event loop
+    
+    def checkpoint_stats(self) -> Dict:
+        return {
+            "checkpoint_path": self.checkpoint_path,
+            "checkpoints_written": self.checkpoints_written,
+            "checkpoint_bytes": self.checkpoint_bytes,
+            "checkpoint_write_ms": self.checkpoint_write_seconds * 1000,
+            "checkpoint_snapshot_ms": self.checkpoint_snapshot_seconds * 1000
+        }
+
+
+# Agent ids used verbatim in file names: no separators, no leading dot
+_SAFE_AGENT_ID = re.compile(r"[A-Za-z0-9][A-Za-z0-9_.-]{0,127}")
+
+
+def agent_file_stem(agent_id: str) -> str:
+    """
+    File name stem for an agent's files (checkpoints, profile traces).
+    
+    Safe ids are used as they are; any other id (path separators, "..",
+    unusual characters) becomes "~" + SHA-256 of the id, which no safe id
+    can collide with and which never leaves the target directory.
+    """
+    if _SAFE_AGENT_ID.fullmatch(agent_id):
+        return agent_id
+    return "~" + hashlib.sha256(agent_id.encode("utf-8")).hexdigest()
 
 
 class LiveTrainingManager:
@@ -73,9 +148,16 @@ class LiveTrainingManager:
     updates to connected WebSocket clients.
     """
     
-    def __init__(self):
+    def __init__(self, checkpoint_dir: Optional[Path] = None, profile_dir: Optional[Path] = None):
+        """
+        Args:
+            checkpoint_dir: Where session checkpoints go (default: backend/checkpoints)
+            profile_dir: Where cProfile traces go (default: backend/profiles)
+        """
         self.sessions: Dict[str, TrainingState] = {}
         self.callbacks: Dict[str, Callable] = {}
+        self.checkpoint_dir = Path(checkpoint_dir) if checkpoint_dir else Path(__file__).parent.parent.parent / "checkpoints"
+        self.profile_dir = Path(profile_dir) if profile_dir else Path(__file__).parent.parent.parent / "profiles"
     
     async def start_training(
         self,
@@ -84,7 +166,8 @@ class LiveTrainingManager:
         max_episodes: Optional[int],
         callback: Callable,
         config: Dict,
-        env_type: str = "standard"
+        env_type: str = "standard",
+        warm_start=None
     ) -> None:
         """
         Start a new training session with real-time updates.
@@ -95,6 +178,17 @@ class LiveTrainingManager:
             max_episodes: Maximum episodes (None = infinite until stopped)
             callback: Async function to call with each update
             config: Training configuration (learning rate, epsilon, etc.)
+                checkpoint_every: Episodes between checkpoints (0 = disabled)
+                replay: "uniform" (default) or "prioritized" experience replay
+                td_method: "one_step" (default), "n_step" or "q_lambda"
+                n_step / trace_lambda: Multi-step settings (see src.agent.multistep)
+                planning_steps: Dyna-Q planning updates per real step (default 0 = off)
+                profile: Record per-phase timing (default False)
+                profile_trace_episodes: Optional [start, end) episodes to run cProfile over
+            env_type: Environment preset name
+            warm_start: Optional WarmStart (src.training.warm_start) seeding the
+                        Q-tables; training starts at the lower of its epsilon and
+                        the configured one
         """
         # Get environment configuration
         from src.environments.env_presets import get_env_config
@@ -104,19 +198,31 @@ class LiveTrainingManager:
         print(f"   Environment: {env_config.display_name} ({env_config.description})")
         print(f"   Seed: {seed}, Max Episodes: {max_episodes}")
         print(f"   Config: {config}")
-        print(f"   🚀 Using Double Q-Learning with Experience Replay")
+        print(f"   🚀 Using Double Q-Learning with Experience Replay (TD: {config.get('td_method', 'one_step')})")
         
         # Initialize environment with preset configuration
-        env = CyberDefenseEnv(
-            seed=seed,
-            time_horizon=env_config.time_horizon
-        )
+        env = env_registry.make(EnvSpec.cyber(seed, env_config.time_horizon, env_type))
         
-        # Initialize Double Q-Learning tables
-        q_table_a, q_table_b = initialize_double_q_tables()
+        # Initialize Double Q-Learning tables (seeded on a warm start)
+        epsilon = config.get('epsilon_start', EPSILON_START)
+        warm_start_info = None
+        if warm_start is None:
+            q_table_a, q_table_b = initialize_double_q_tables()
+        else:
+            q_table_a, q_table_b = warm_start.copy_tables()
+            cold_epsilon = epsilon
+            epsilon = min(epsilon, warm_start.epsilon_start)
+            warm_start_info = dict(warm_start.provenance, episodes_saved=episodes_saved(
+                epsilon, cold_epsilon,
+                config.get('epsilon_end', EPSILON_END),
+                config.get('epsilon_decay', EPSILON_DECAY)
+            ))
+            print(f"   🔥 Warm start from {warm_start.provenance['source']} "
+                  f"({warm_start.provenance['states_seeded']} states, ε={epsilon})")
         
-        # Initialize Experience Replay buffer
-        replay_buffer = ExperienceReplay(
+        # Initialize Experience Replay buffer (uniform or prioritized)
+        replay_buffer = create_replay_buffer(
+            config.get('replay', 'uniform'),
             max_size=REPLAY_BUFFER_SIZE,
             batch_size=REPLAY_BATCH_SIZE,
             min_size=REPLAY_START_SIZE
@@ -139,8 +245,18 @@ class LiveTrainingManager:
             replay_buffer=replay_buffer,
             env=env,
             seed=seed,
-            env_config=env_config.to_dict()
+            env_config=env_config.to_dict(),
+            rng=random.Random(seed),
+            config=dict(config),
+            env_type=env_type,
+            epsilon=epsilon,
+            warm_start=warm_start_info
         )
+        state.rewards_window = RollingStats(100)  # For rolling average
+        state.monitor = self._build_convergence_monitor(state, config)
+        state.profiler = self._build_profiler(state, config)
+        if config.get('planning_steps'):
+            state.planner = DynaPlanner(config['planning_steps'])
         
         self.sessions[agent_id] = state
         self.callbacks[agent_id] = callback
@@ -148,23 +264,167 @@ class LiveTrainingManager:
         print(f"✓ Session created for {agent_id}")
         
         # Start training loop
-        await self._training_loop(agent_id, config)
+        await self._training_loop(agent_id)
+        
+        print(f"🏁 Training loop ended for {agent_id}")
+    
+    async def resume_training(
+        self,
+        agent_id: str,
+        callback: Callable,
+        checkpoint_path: Optional[str] = None,
+        max_episodes: Optional[int] = None,
+        config: Optional[Dict] = None
+    ) -> None:
+        """
+        Resume a session from its checkpoint.
+        
+        Training continues exactly where the checkpoint was taken: same
+        Q-tables, replay buffer, epsilon, RNG states and episode counter.
+        
+        Args:
+            agent_id: Agent whose session to resume
+            callback: Async function to call with each update
+            checkpoint_path: Checkpoint file (default: the session's last one)
+            max_episodes: New total episode limit (default: the checkpointed one)
+            config: Config overrides (e.g. {"auto_stop": False})
+        
+        Raises:
+            ValueError: If the session is currently running
+            FileNotFoundError: If no checkpoint exists
+        """
+        existing = self.sessions.get(agent_id)
+        if existing and existing.status == "running":
+            raise ValueError(f"Agent {agent_id} is already training")
+        
+        if checkpoint_path is None:
+            checkpoint_path = (existing.checkpoint_path if existing and existing.checkpoint_path
+                               else str(self.checkpoint_path_for(agent_id)))
+        
+        loaded = await asyncio.to_thread(read_checkpoint, checkpoint_path)
+        meta = loaded['meta']
+        session_config = dict(meta['config'])
+        session_config.update(config or {})
+        
+        print(f"⏯ Resuming {agent_id} from {checkpoint_path} (episode {meta['episodes_completed']})")
+        
+        state = TrainingState(
+            agent_id=agent_id,
+            status="running",
+            episode=meta['episode'],
+            total_episodes=max_episodes if max_episodes is not None else meta['total_episodes'],
+            start_time=time.time(),
+            metrics_history=[TrainingMetrics(**m) for m in meta['metrics_tail']],
+            q_table=merge_q_tables(loaded['q_table_a'], loaded['q_table_b']),
+            q_table_a=loaded['q_table_a'],
+            q_table_b=loaded['q_table_b'],
+            replay_buffer=loaded['replay_buffer'],
+            env=loaded['env'],
+            seed=meta['seed'],
+            env_config=meta['env_config'],
+            config=session_config,
+            env_type=meta['env_type'],
+            epsilon=meta['epsilon'],
+            episodes_completed=meta['episodes_completed'],
+            warm_start=meta.get('warm_start'),
+            checkpoint_path=str(checkpoint_path)
+        )
+        state.rewards_window = (RollingStats.from_state_dict(meta['rewards_window'])
+                                if meta['rewards_window'] else RollingStats(100))
+        state.monitor = self._build_convergence_monitor(state, session_config)
+        if meta['monitor']:
+            state.monitor.load_state_dict(meta['monitor'], tracked_states(state.q_table_a, state.q_table_b))
+        state.profiler = self._build_profiler(state, session_config)
+        if meta.get('planner'):
+            state.planner = DynaPlanner.from_state_dict(meta['planner'])
+        elif session_config.get('planning_steps'):
+            state.planner = DynaPlanner(session_config['planning_steps'])
+        
+        # Continue the session's own random stream exactly
+        state.rng.setstate(loaded['py_random_state'])
+        
+        self.sessions[agent_id] = state
+        self.callbacks[agent_id] = callback
+        
+        await self._training_loop(agent_id)
         
         print(f"🏁 Training loop ended for {agent_id}")
     
-    async def _training_loop(self, agent_id: str, config: Dict):
+    def checkpoint_path_for(self, agent_id: str) -> Path:
+        """Default checkpoint file of an agent (always inside checkpoint_dir)."""
+        return self.checkpoint_dir / f"{agent_file_stem(agent_id)}.npz"
+    
+    async def _write_checkpoint(self, state: TrainingState) -> None:
+        """Snapshot on the event loop, write in a worker thread, record size/latency."""
+        snapshot_start = time.perf_counter()
+        arrays = build_checkpoint(state)
+        state.checkpoint_snapshot_seconds = time.perf_counter() - snapshot_start
+        
+        path = Path(state.checkpoint_path) if state.checkpoint_path else self.checkpoint_path_for(state.agent_id)
+        write_start = time.perf_counter()
+        state.checkpoint_bytes = await asyncio.to_thread(write_checkpoint, path, arrays)
+        state.checkpoint_write_seconds = time.perf_counter() - write_start
+        state.checkpoint_path = str(path)
+        state.checkpoints_written += 1
+        state.checkpoint_requested = False
+    
+    @staticmethod
+    def _build_convergence_monitor(state: TrainingState, config: Dict) -> ConvergenceMonitor:
+        """
+        Create the session's convergence monitor from its config.
+        
+        Config keys:
+            auto_stop: Enable automatic stopping (default True)
+            convergence_patience: Episodes without greedy change before stopping
+            convergence_max_changes: Changed states per episode tolerated as "unchanged"
+            td_error_threshold: Optional mean |TD error| stopping threshold
+            reward_plateau_threshold: Optional reward stddev stopping threshold
+        """
+        rules = []
+        if config.get('auto_stop', True):
+            rules.append(PolicyStableRule(
+                config.get('convergence_patience', POLICY_STABLE_PATIENCE),
+                config.get('convergence_max_changes', POLICY_STABLE_MAX_CHANGES)
+            ))
+            if config.get('td_error_threshold') is not None:
+                rules.append(TDErrorRule(config['td_error_threshold']))
+            if config.get('reward_plateau_threshold') is not None:
+                rules.append(RewardPlateauRule(threshold=config['reward_plateau_threshold']))
+        
+        return ConvergenceMonitor(rules, greedy_fn=greedy_double_q(state.q_table_a, state.q_table_b))
+    
+    def _build_profiler(self, state: TrainingState, config: Dict) -> Optional[PhaseProfiler]:
+        """Create the session's phase profiler if config["profile"] or a trace range is set."""
+        trace_episodes = config.get('profile_trace_episodes')
+        if trace_episodes is None:
+            return PhaseProfiler() if config.get('profile') else None
+        start, end = check_trace_episodes(trace_episodes)
+        return PhaseProfiler(
+            trace_episodes=(start, end),
+            trace_path=self.profile_dir / f"{agent_file_stem(state.agent_id)}_episodes_{start}_{end}.prof"
+        )
+    
+    async def _training_loop(self, agent_id: str):
         """Main training loop with real-time updates"""
         print(f"🔁 Entering training loop for {agent_id}")
         state = self.sessions[agent_id]
-        epsilon = config.get('epsilon_start', EPSILON_START)
+        config = state.config
         epsilon_end = config.get('epsilon_end', EPSILON_END)
         epsilon_decay = config.get('epsilon_decay', EPSILON_DECAY)
+        checkpoint_every = config.get('checkpoint_every', CHECKPOINT_EVERY_EPISODES)
         
-        print(f"   Epsilon: {epsilon} → {epsilon_end} (decay: {epsilon_decay})")
+        print(f"   Epsilon: {state.epsilon} → {epsilon_end} (decay: {epsilon_decay})")
         
-        episode = 0
-        rewards_window = []  # For rolling average
-        window_size = 100
+        episode = state.episodes_completed
+        rewards_window = state.rewards_window
+        monitor = state.monitor
+        profiler = state.profiler
+        planner = state.planner
+        episode_fn = make_episode_fn(
+            config.get('td_method', 'one_step'),
+            config.get('n_step', N_STEP),
+            config.get('trace_lambda', TRACE_LAMBDA)
+        )
         
         try:
             print(f"   Initial status: {state.status}")
@@ -174,40 +434,54 @@ class LiveTrainingManager:
                 # Check if we've reached max episodes
                 if state.total_episodes and episode >= state.total_episodes:
                     state.status = "completed"
+                    state.stop_reason = "max_episodes reached"
                     break
                 
                 # Train one episode with Double Q-Learning
+                if profiler is not None:
+                    profiler.begin_episode(episode)
                 episode_start = time.time()
-                reward, actions = train_episode(
+                reward, actions = episode_fn(
                     state.env,
                     state.q_table,
-                    epsilon,
+                    state.epsilon,
                     discretize_state,
                     q_table_a=state.q_table_a,
                     q_table_b=state.q_table_b,
-                    replay_buffer=state.replay_buffer
+                    replay_buffer=state.replay_buffer,
+                    monitor=monitor,
+                    rng=state.rng,
+                    profiler=profiler,
+                    planner=planner
                 )
                 episode_time = time.time() - episode_start
                 
                 # Update merged Q-table for metrics
+                if profiler is not None:
+                    phase_start = time.perf_counter()
                 state.q_table = merge_q_tables(state.q_table_a, state.q_table_b)
+                if profiler is not None:
+                    profiler.lap("merge_q_tables", phase_start)
                 
                 # Update rolling average
-                rewards_window.append(reward)
-                if len(rewards_window) > window_size:
-                    rewards_window.pop(0)
-                avg_reward = sum(rewards_window) / len(rewards_window)
+                rewards_window.push(reward)
+                avg_reward = rewards_window.mean
+                
+                # Convergence check (O(1) statistics + greedy change counter)
+                decision = monitor.end_episode(reward)
                 
                 # Create metrics
                 metrics = TrainingMetrics(
                     episode=episode,
                     reward=reward,
                     avg_reward=avg_reward,
-                    epsilon=epsilon,
+                    epsilon=state.epsilon,
                     q_table_size=len(state.q_table),
                     actions_taken=actions,
                     timestamp=datetime.now().isoformat(),
-                    training_time=time.time() - state.start_time
+                    training_time=time.time() - state.start_time,
+                    real_updates=planner.real_updates if planner is not None else 0,
+                    planned_updates=planner.planned_updates if planner is not None else 0
                 )
                 
                 # Store metrics
@@ -215,6 +489,9 @@ class LiveTrainingManager:
                 state.episode = episode
                 
                 # Send update to frontend
+                if profiler is not None:
+                    profiler.pause_trace()  # Don't trace other sessions while awaiting
+                    phase_start = time.perf_counter()
                 callback = self.callbacks.get(agent_id)
                 if callback:
                     try:
@@ -222,22 +499,39 @@ class LiveTrainingManager:
                             "type": "training_update",
                             "agent_id": agent_id,
                             "metrics": metrics.to_dict(),
+                            "convergence": monitor.snapshot(),
                             "status": state.status
                         })
                     except Exception as cb_err:
                         print(f"   ⚠ Callback error for {agent_id}: {cb_err}")
                         # Don't stop training, just continue without sending updates
                         pass
+                if profiler is not None:
+                    profiler.lap("broadcast", phase_start)
+                    profiler.end_episode(episode)
                 
                 # Decay epsilon
-                epsilon = max(epsilon_end, epsilon * epsilon_decay)
+                state.epsilon = max(epsilon_end, state.epsilon * epsilon_decay)
                 
                 episode += 1
+                state.episodes_completed = episode
+                
+                if decision is not None:
+                    state.status = "completed"
+                    state.stop_reason = f"{decision.rule}: {decision.reason}"
+                    print(f"   ✓ {agent_id} converged after {episode} episodes ({decision.reason})")
+                    break
+                
+                # Periodic or requested checkpoint (between episodes)
+                if state.checkpoint_requested or (checkpoint_every and episode % checkpoint_every == 0):
+                    await self._write_checkpoint(state)
                 
                 # Small delay to prevent overwhelming the frontend
                 await asyncio.sleep(0.01)
         
         except Exception as e:
+            if profiler is not None:
+                profiler.pause_trace()
             print(f"❌ ERROR in training loop for {agent_id}: {e}")
             import traceback
             traceback.print_exc()
@@ -253,12 +547,47 @@ class LiveTrainingManager:
                     print(f"   Failed to send error to callback")
         
         finally:
+            state.stopped_at_episode = episode
+            if profiler is not None:
+                profiler.finish_trace()  # Stopped inside the trace range
+            if state.status == "stopped" and state.stop_reason is None:
+                state.stop_reason = "stopped by user"
+            
+            # Final checkpoint so the session can be resumed later
+            if state.status == "paused" or (
+                state.status in ["completed", "stopped"] and checkpoint_every and episode > 0
+            ):
+                try:
+                    await self._write_checkpoint(state)
+                    print(f"💾 Checkpoint written for {agent_id}: {state.checkpoint_path} ({state.checkpoint_bytes} bytes)")
+                except Exception as e:
+                    print(f"❌ Error writing checkpoint for {agent_id}: {e}")
+                    if state.status == "paused":
+                        # Nothing on disk to resume from: keep the state in memory
+                        state.status = "error"
+                        state.stop_reason = f"checkpoint failed: {e}"
+                    if agent_id in self.callbacks:
+                        try:
+                            await self.callbacks[agent_id]({
+                                "type": "error",
+                                "agent_id": agent_id,
+                                "error": f"checkpoint failed: {e}"
+                            })
+                        except Exception:
+                            print(f"   Failed to send error to callback")
+            
+            if state.status == "paused":
+                # Checkpoint is on disk: free the heavy state; resume_training() reloads it
+                state.q_table_a = {}
+                state.q_table_b = {}
+                state.replay_buffer = None
+                state.monitor = None
+            
             # Save policy and add to ledger if training completed successfully
             if state.status in ["completed", "stopped"] and episode > 0:
                 try:
                     from src.agent.policy import extract_policy, serialize_policy, hash_policy
-                    from pathlib import Path
-                    import json
+                    from src.ledger.policy_store import default_policy_store
                     
                     # Extract policy from Q-table
                     policy = extract_policy(state.q_table)
@@ -267,18 +596,6 @@ class LiveTrainingManager:
                     policy_bytes = serialize_policy(policy)
                     policy_hash = hash_policy(policy_bytes)
                     
-                    # Save policy to disk as JSON
-                    backend_dir = Path(__file__).parent.parent.parent
-                    policy_dir = backend_dir / "policies"
-                    policy_dir.mkdir(exist_ok=True)
-                    policy_path = policy_dir / f"{policy_hash}.json"
-                    
-                    # Convert policy to JSON-serializable format
-                    serializable_policy = {
-                        str(state): action
-                        for state, action in policy.items()
-                    }
-                    
                     # === DETERMINISTIC EVALUATION ===
                     # Run policy without exploration to get true performance
                     # This must match what the verifier will do
@@ -287,43 +604,44 @@ class LiveTrainingManager:
                     # Run multiple episodes to average out randomness
                     num_eval_episodes = 20
                     episode_rewards = []
+                    eval_spec = EnvSpec.from_env_config(state.seed, state.env_config)
+                    
+                    recorder = TrajectoryRecorder()  # First episode: the claim's trajectory digest
                     
                     for eval_ep in range(num_eval_episodes):
-                        # Re-create environment with same seed as used in verification
-                        eval_env = CyberDefenseEnv(
-                            time_horizon=state.env.time_horizon,
-                            seed=state.seed
-                        )
-                        
-                        episode_reward = 0.0
-                        obs = eval_env.reset()
-                        current_state = discretize_state(obs)
-                        
-                        steps = 0
-                        max_steps = state.env.time_horizon * 2
-                        
-                        while not eval_env.done and steps < max_steps:
-                            # Use policy deterministically (no exploration)
-                            if current_state not in policy:
-                                # Default to IGNORE if state not seen
-                                action = 0
-                            else:
-                                action = policy[current_state]
-                            
-                            # Handle both 3-value and 4-value returns from step()
-                            step_result = eval_env.step(action)
-                            if len(step_result) == 4:
-                                obs, reward, done, _ = step_result
-                            else:
-                                obs, reward, done = step_result
-                            
-                            episode_reward += reward
-                            steps += 1
+                        # Pristine environment with same seed as used in verification
+                        with env_registry.env(eval_spec) as eval_env:
+                            episode_reward = 0.0
+                            obs = eval_env.reset()
+                            current_state = discretize_state(obs)
                             
-                            if done:
-                                break
+                            steps = 0
+                            max_steps = state.env.time_horizon * 2
                             
-                            current_state = discretize_state(obs)
+                            while not eval_env.done and steps < max_steps:
+                                # Use policy deterministically (no exploration)
+                                if current_state not in policy:
+                                    # Default to IGNORE if state not seen
+                                    action = 0
+                                else:
+                                    action = policy[current_state]
+                                
+                                # Handle both 3-value and 4-value returns from step()
+                                step_result = eval_env.step(action)
+                                if len(step_result) == 4:
+                                    obs, reward, done, _ = step_result
+                                else:
+                                    obs, reward, done = step_result
+                                
+                                if eval_ep == 0:
+                                    recorder.record(current_state, action, reward)
+                                episode_reward += reward
+                                steps += 1
+                                
+                                if done:
+                                    break
+                                
+                                current_state = discretize_state(obs)
                         
                         episode_rewards.append(episode_reward)
                     
@@ -340,23 +658,22 @@ class LiveTrainingManager:
                     print(f"   Training avg (with exploration): {training_avg:.2f}")
                     print(f"   Deterministic evaluation: {deterministic_reward:.2f}")
                     
-                    # Create artifact with proper structure
-                    artifact = {
-                        "policy": serializable_policy,
-                        "metadata": {
-                            "agent_id": state.agent_id,
-                            "claimed_reward": deterministic_reward,
-                            "policy_hash": policy_hash,
-                            "training_avg_reward": training_avg
-                        }
+                    # Store the artifact (content-addressed; identical policies are kept once)
+                    metadata = {
+                        "agent_id": state.agent_id,
+                        "claimed_reward": deterministic_reward,
+                        "policy_hash": policy_hash,
+                        "training_avg_reward": training_avg
                     }
+                    if state.warm_start is not None:
+                        metadata["warm_start"] = state.warm_start
                     
-                    with open(policy_path, 'w') as f:
-                        json.dump(artifact, f, indent=2)
+                    default_policy_store().put_policy(policy, policy_hash, metadata)
                     
                     # Store for potential ledger addition
                     state.final_policy_hash = policy_hash
                     state.final_reward = deterministic_reward
+                    state.final_trajectory = recorder.digest()
                     
                     print(f"✓ Policy saved: {policy_hash[:16]}... (claimed reward: {deterministic_reward:.2f})")
                     
@@ -372,8 +689,16 @@ class LiveTrainingManager:
                     "agent_id": agent_id,
                     "status": state.status,
                     "total_episodes": episode,
-                    "total_time": time.time() - state.start_time
+                    "total_time": time.time() - state.start_time,
+                    "stop_reason": state.stop_reason,
+                    "stopped_at_episode": state.stopped_at_episode,
+                    **state.checkpoint_stats()
                 }
+                if state.warm_start is not None:
+                    final_data["warm_start"] = state.warm_start
+                    final_data["episodes_saved"] = state.warm_start["episodes_saved"]
+                if state.planner is not None:
+                    final_data["planning"] = state.planner.stats()
                 
                 # Include policy info if saved
                 if hasattr(state, 'final_policy_hash'):
@@ -390,6 +715,22 @@ class LiveTrainingManager:
             return True
         return False
     
+    def pause_training(self, agent_id: str) -> bool:
+        """Pause a running session: checkpoint it and release its memory"""
+        state = self.sessions.get(agent_id)
+        if state and state.status == "running":
+            state.status = "paused"
+            return True
+        return False
+    
+    def request_checkpoint(self, agent_id: str) -> bool:
+        """Ask a running session to checkpoint after its current episode"""
+        state = self.sessions.get(agent_id)
+        if state and state.status == "running":
+            state.checkpoint_requested = True
+            return True
+        return False
+    
     def get_session_state(self, agent_id: str) -> Optional[TrainingState]:
         """Get current state of a training session"""
         return self.sessions.get(agent_id)
@@ -409,7 +750,9 @@ class LiveTrainingManager:
                 "total_episodes": state.total_episodes,
                 "running_time": time.time() - state.start_time,
                 "claimed_reward": avg_reward,
-                "policy_hash": getattr(state, 'final_policy_hash', None)
+                "policy_hash": getattr(state, 'final_policy_hash', None),
+                "stop_reason": state.stop_reason,
+                **state.checkpoint_stats()
             }
         return sessions
     
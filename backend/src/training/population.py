@@ -0,0 +1,311 @@
+"""
+Population Training — Many Agents Across a Process Pool
+
+run_agent() trains one agent for one seed in-process. This module fans a
+grid of (seed offset × ENV_PRESETS entry) agents out over a ProcessPoolExecutor,
+streams per-agent progress back to the caller, and collects the resulting
+PolicyClaims into a SubmissionCollector.
+
+SCALING:
+    - Agents are independent (own env, own Q-table), so throughput scales
+      with the number of worker processes up to the core count
+    - Progress is reported every `progress_every` episodes through a manager
+      queue to keep IPC off the training hot path
+
+SEEDS:
+    - Seeds are offsets from each preset's seed_base: offset i on a preset
+      trains on seed seed_base + i, so presets never share a scenario
+    - Each agent trains under its preset's horizon and attack dynamics
+
+DETERMINISM:
+    - Each agent trains with its own random.Random(seed) (see run_agent), so
+      a population run is reproducible regardless of scheduling order
+    - Claims are submitted to the collector in grid order, not completion order
+"""
+
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from queue import Empty
+import multiprocessing
+import os
+import time
+
+from src.agent.runner import run_agent, PolicyClaim
+from src.environments.env_presets import ENV_PRESETS
+from src.submission.collector import SubmissionCollector
+from src.shared.config import DEFAULT_EPISODES
+
+
+DEFAULT_PROGRESS_EVERY = 10
+
+
+class PopulationMember(NamedTuple):
+    """One agent in the population grid."""
+    agent_id: str
+    seed: int
+    env_type: str
+    time_horizon: int
+    episodes: int
+
+
+class MemberResult(NamedTuple):
+    """
+    Outcome of training one population member.
+
+    Attributes:
+        member: The grid entry that was trained
+        claim: Resulting PolicyClaim (None if training failed)
+        episodes_trained: Episodes actually run (early convergence may stop sooner)
+        training_time: Wall-clock seconds spent in the worker
+        error: Error message if training failed
+    """
+    member: PopulationMember
+    claim: Optional[PolicyClaim]
+    episodes_trained: int
+    training_time: float
+    error: Optional[str] = None
+
+
+class PopulationResult(NamedTuple):
+    """
+    Aggregate outcome of a population run.
+
+    Attributes:
+        results: One MemberResult per member, in grid order
+        collector: SubmissionCollector holding every successful claim
+        wall_time: Wall-clock seconds for the whole run
+        total_episodes: Episodes trained across all members
+        episodes_per_second: Aggregate throughput (total_episodes / wall_time)
+    """
+    results: List[MemberResult]
+    collector: SubmissionCollector
+    wall_time: float
+    total_episodes: int
+    episodes_per_second: float
+
+    def summary(self) -> Dict:
+        """JSON-friendly summary (no policy artifacts)."""
+        return {
+            "agents": len(self.results),
+            "succeeded": sum(1 for r in self.results if r.claim is not None),
+            "failed": sum(1 for r in self.results if r.claim is None),
+            "total_episodes": self.total_episodes,
+            "wall_time": self.wall_time,
+            "episodes_per_second": self.episodes_per_second,
+            "members": [
+                {
+                    "agent_id": r.member.agent_id,
+                    "seed": r.member.seed,
+                    "env_type": r.member.env_type,
+                    "episodes_trained": r.episodes_trained,
+                    "training_time": r.training_time,
+                    "claimed_reward": r.claim.claimed_reward if r.claim else None,
+                    "policy_hash": r.claim.policy_hash if r.claim else None,
+                    "error": r.error,
+                }
+                for r in self.results
+            ],
+        }
+
+
+def build_population(
+    seeds: Sequence[int],
+    env_types: Optional[Sequence[str]] = None,
+    episodes: int = DEFAULT_EPISODES,
+    agent_prefix: str = "pop",
+) -> List[PopulationMember]:
+    """
+    Build the (seed offset × env preset) grid of agents.
+
+    Args:
+        seeds: Seed offsets; a member's seed is its preset's seed_base + offset
+        env_types: ENV_PRESETS keys (defaults to every preset)
+        episodes: Training episodes per agent
+        agent_prefix: Prefix for generated agent IDs
+
+    Returns:
+        List of PopulationMember, env type major, seed minor
+
+    Raises:
+        ValueError: If an env type is not a known preset
+    """
+    env_types = list(ENV_PRESETS.keys()) if env_types is None else list(env_types)
+    unknown = [t for t in env_types if t not in ENV_PRESETS]
+    if unknown:
+        raise ValueError(f"Unknown env_type(s): {unknown}. Available: {list(ENV_PRESETS.keys())}")
+
+    return [
+        PopulationMember(
+            agent_id=f"{agent_prefix}_{env_type}_seed_{ENV_PRESETS[env_type].seed_base + offset}",
+            seed=ENV_PRESETS[env_type].seed_base + offset,
+            env_type=env_type,
+            time_horizon=ENV_PRESETS[env_type].time_horizon,
+            episodes=episodes,
+        )
+        for env_type in env_types
+        for offset in seeds
+    ]
+
+
+def _train_member(member: PopulationMember, progress_queue, progress_every: int) -> MemberResult:
+    """
+    Worker entry point: train one member and report progress.
+
+    Runs in a pool process, so it must be a module-level function.
+    """
+    start = time.perf_counter()
+    episodes_seen = 0
+
+    def on_episode(episode: int, reward: float, epsilon: float) -> None:
+        nonlocal episodes_seen
+        episodes_seen = episode + 1
+        if progress_queue is not None and episodes_seen % progress_every == 0:
+            progress_queue.put({
+                "type": "progress",
+                "agent_id": member.agent_id,
+                "episode": episodes_seen,
+                "episodes": member.episodes,
+                "reward": reward,
+                "epsilon": epsilon,
+            })
+
+    try:
+        claim = run_agent(
+            agent_id=member.agent_id,
+            seed=member.seed,
+            episodes=member.episodes,
+            time_horizon=member.time_horizon,
+            episode_callback=on_episode,
+            preset=member.env_type,
+        )
+        error = None
+    except Exception as e:
+        claim = None
+        error = str(e)
+
+    return MemberResult(
+        member=member,
+        claim=claim,
+        episodes_trained=episodes_seen,
+        training_time=time.perf_counter() - start,
+        error=error,
+    )
+
+
+class PopulationTrainer:
+    """
+    Trains a population of agents in parallel worker processes.
+
+    Usage:
+        trainer = PopulationTrainer(max_workers=8)
+        members = build_population(seeds=range(16), env_types=["standard", "extended"])
+        result = trainer.run(members, on_progress=print)
+        print(result.episodes_per_second)
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        progress_every: int = DEFAULT_PROGRESS_EVERY,
+    ):
+        """
+        Initialize population trainer.
+
+        Args:
+            max_workers: Worker processes (defaults to os.cpu_count())
+            progress_every: Report progress every N episodes per agent
+        """
+        if progress_every <= 0:
+            raise ValueError(f"progress_every must be positive, got {progress_every}")
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.progress_every = progress_every
+
+    def run(
+        self,
+        members: Sequence[PopulationMember],
+        on_progress: Optional[Callable[[Dict], None]] = None,
+        collector: Optional[SubmissionCollector] = None,
+    ) -> PopulationResult:
+        """
+        Train every member and collect the claims.
+
+        Progress events are delivered to on_progress from the calling thread:
+            {"type": "progress", "agent_id", "episode", "episodes", "reward", "epsilon"}
+            {"type": "agent_complete", "agent_id", "episodes_trained", "claimed_reward", "error", ...}
+
+        Args:
+            members: Population grid (see build_population)
+            on_progress: Optional progress callback
+            collector: Collector to submit claims to (a new one by default)
+
+        Returns:
+            PopulationResult with per-agent results and throughput
+        """
+        collector = collector if collector is not None else SubmissionCollector()
+        results: List[Optional[MemberResult]] = [None] * len(members)
+        emit = on_progress or (lambda event: None)
+
+        start = time.perf_counter()
+        workers = max(1, min(self.max_workers, len(members)))
+
+        with multiprocessing.Manager() as mp_manager:
+            progress_queue = mp_manager.Queue() if on_progress is not None else None
+
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {
+                    pool.submit(_train_member, member, progress_queue, self.progress_every): index
+                    for index, member in enumerate(members)
+                }
+                pending = set(futures)
+                completed = 0
+
+                while pending:
+                    done, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                    self._drain(progress_queue, emit)
+
+                    for future in done:
+                        index = futures[future]
+                        result = future.result()
+                        results[index] = result
+                        completed += 1
+                        emit({
+                            "type": "agent_complete",
+                            "agent_id": result.member.agent_id,
+                            "episodes_trained": result.episodes_trained,
+                            "training_time": result.training_time,
+                            "claimed_reward": result.claim.claimed_reward if result.claim else None,
+                            "policy_hash": result.claim.policy_hash if result.claim else None,
+                            "error": result.error,
+                            "completed": completed,
+                            "total": len(members),
+                        })
+
+            self._drain(progress_queue, emit)
+
+        wall_time = time.perf_counter() - start
+
+        # Submit in grid order so submission IDs do not depend on scheduling
+        for result in results:
+            if result.claim is not None:
+                collector.submit(result.claim)
+
+        total_episodes = sum(r.episodes_trained for r in results)
+        return PopulationResult(
+            results=results,
+            collector=collector,
+            wall_time=wall_time,
+            total_episodes=total_episodes,
+            episodes_per_second=total_episodes / wall_time if wall_time > 0 else 0.0,
+        )
+
+    @staticmethod
+    def _drain(progress_queue, emit: Callable[[Dict], None]) -> None:
+        """Forward every queued progress event to the callback."""
+        if progress_queue is None:
+            return
+        while True:
+            try:
+                event = progress_queue.get_nowait()
+            except Empty:
+                return
+            emit(event)
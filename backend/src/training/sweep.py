@@ -0,0 +1,434 @@
+"""
+Hyperparameter Sweeps — Successive Halving over a Process Pool
+
+The learning constants in src/shared/config.py (ALPHA, GAMMA, EPSILON_*,
+OPTIMISTIC_INIT, replay sizes) are defaults, not tuned values. This module
+searches over them with the live-session learner (Double Q-Learning +
+experience replay via train_episode()).
+
+SUCCESSIVE HALVING:
+    - Every trial trains to the first rung budget (e.g. 200 episodes)
+    - Each trial's greedy policy is scored by deterministic replay, exactly
+      as the verifier would (PolicyVerifier.replay)
+    - The best 1/eta trials continue training to the next rung (budget × eta),
+      picking up their Q-tables, replay buffer, epsilon and RNG state;
+      the rest are eliminated
+    - Repeats until max_episodes or a single trial remains
+
+DETERMINISM:
+    - Each trial has its own random.Random seeded from the sweep seed and its
+      trial index, carried between rungs, so results do not depend on how
+      trials are scheduled across workers
+    - Ties in score are broken by trial index
+
+OUTPUT:
+    - SweepResult.save() writes a JSON results file (parameters, per-rung
+      scores, elimination rung, best trial)
+    - Optionally, the surviving trials' policies are submitted as PolicyClaims
+
+Usage (from backend/):
+    python -m src.training.sweep --space space.json --trials 27 --out sweep_results.json
+"""
+
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import time
+
+from src.agent.double_q_learning import create_replay_buffer, initialize_double_q_tables, merge_q_tables
+from src.agent.policy import extract_policy, serialize_policy, hash_policy
+from src.agent.runner import PolicyClaim
+from src.agent.state import discretize_state
+from src.agent.trainer import train_episode
+from src.environments.env_spec import EnvSpec, env_registry
+from src.submission.collector import SubmissionCollector
+from src.verifier.verifier import PolicyVerifier
+from src.shared.config import (
+    ALPHA, GAMMA, EPSILON_START, EPSILON_END, EPSILON_DECAY, OPTIMISTIC_INIT,
+    REPLAY_BUFFER_SIZE, REPLAY_BATCH_SIZE, REPLAY_START_SIZE,
+    DEFAULT_TIME_HORIZON
+)
+
+
+# Searchable hyperparameters and their defaults
+DEFAULT_HYPERPARAMS = {
+    'alpha': ALPHA,
+    'gamma': GAMMA,
+    'epsilon_start': EPSILON_START,
+    'epsilon_end': EPSILON_END,
+    'epsilon_decay': EPSILON_DECAY,
+    'optimistic_init': OPTIMISTIC_INIT,
+    'replay': 'uniform',
+    'replay_buffer_size': REPLAY_BUFFER_SIZE,
+    'replay_batch_size': REPLAY_BATCH_SIZE,
+    'replay_start_size': REPLAY_START_SIZE,
+}
+
+
+class SweepTrial(NamedTuple):
+    """One hyperparameter configuration to evaluate."""
+    trial_id: int
+    params: Dict
+    seed: int  # Environment seed
+    time_horizon: int
+
+    @property
+    def env_spec(self) -> EnvSpec:
+        return EnvSpec.cyber(self.seed, self.time_horizon)
+
+    @property
+    def env_id(self) -> str:
+        return self.env_spec.env_id
+
+
+class TrialResult(NamedTuple):
+    """
+    Outcome of one trial.
+
+    Attributes:
+        trial: The configuration
+        episodes_trained: Episodes trained before elimination / at the end
+        scores: Deterministic replay reward at each rung reached
+        eliminated_at_rung: Rung index where the trial was dropped (None = survived)
+        training_time: Seconds spent training this trial (all rungs)
+        claim: PolicyClaim for surviving trials when claims were requested
+    """
+    trial: SweepTrial
+    episodes_trained: int
+    scores: List[float]
+    eliminated_at_rung: Optional[int]
+    training_time: float
+    claim: Optional[PolicyClaim] = None
+
+    @property
+    def final_score(self) -> float:
+        return self.scores[-1] if self.scores else float('-inf')
+
+
+class SweepResult(NamedTuple):
+    """All trials of a sweep, best first."""
+    results: List[TrialResult]
+    rungs: List[int]
+    wall_time: float
+
+    @property
+    def best(self) -> TrialResult:
+        return self.results[0]
+
+    def summary(self) -> Dict:
+        """JSON-friendly summary (no policy artifacts)."""
+        return {
+            "rungs": self.rungs,
+            "wall_time": self.wall_time,
+            "total_episodes": sum(r.episodes_trained for r in self.results),
+            "best": {"trial_id": self.best.trial.trial_id, "params": self.best.trial.params,
+                     "score": self.best.final_score},
+            "trials": [
+                {
+                    "trial_id": r.trial.trial_id,
+                    "params": r.trial.params,
+                    "env_id": r.trial.env_id,
+                    "episodes_trained": r.episodes_trained,
+                    "scores": r.scores,
+                    "final_score": r.final_score,
+                    "eliminated_at_rung": r.eliminated_at_rung,
+                    "training_time": r.training_time,
+                    "policy_hash": r.claim.policy_hash if r.claim else None,
+                }
+                for r in self.results
+            ],
+        }
+
+    def save(self, path: str) -> None:
+        """Write summary() to a JSON results file."""
+        with open(path, 'w') as f:
+            json.dump(self.summary(), f, indent=2)
+
+
+def expand_search_space(
+    space: Dict[str, Sequence],
+    num_trials: Optional[int] = None,
+    seed: int = 0,
+) -> List[Dict]:
+    """
+    Turn a search space into concrete hyperparameter sets.
+
+    Args:
+        space: {param: [candidate values]} over DEFAULT_HYPERPARAMS keys
+        num_trials: Sample this many grid points (None = full grid)
+        seed: Seed for sampling
+
+    Returns:
+        List of complete parameter dicts (unspecified params keep defaults)
+
+    Raises:
+        ValueError: If a parameter is unknown or has no candidates
+    """
+    unknown = [name for name in space if name not in DEFAULT_HYPERPARAMS]
+    if unknown:
+        raise ValueError(f"Unknown hyperparameter(s): {unknown}. Available: {list(DEFAULT_HYPERPARAMS)}")
+    empty = [name for name, values in space.items() if len(values) == 0]
+    if empty:
+        raise ValueError(f"No candidate values for: {empty}")
+
+    names = sorted(space)
+    grid = [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+    if num_trials is not None and num_trials < len(grid):
+        grid = random.Random(seed).sample(grid, num_trials)
+    return [{**DEFAULT_HYPERPARAMS, **combo} for combo in grid]
+
+
+def halving_schedule(min_episodes: int, max_episodes: int, eta: int) -> List[int]:
+    """Cumulative episode budgets per rung, e.g. (200, 1800, 3) → [200, 600, 1800]."""
+    if min_episodes <= 0 or max_episodes < min_episodes:
+        raise ValueError(f"Need 0 < min_episodes <= max_episodes, got {min_episodes}, {max_episodes}")
+    if eta < 2:
+        raise ValueError(f"eta must be at least 2, got {eta}")
+    rungs = [min_episodes]
+    while rungs[-1] < max_episodes:
+        rungs.append(min(rungs[-1] * eta, max_episodes))
+    return rungs
+
+
+@dataclass
+class _TrialState:
+    """Learner state carried from one rung to the next."""
+    q_table_a: Dict
+    q_table_b: Dict
+    replay_buffer: object
+    epsilon: float
+    rng: random.Random
+    episodes_trained: int = 0
+    training_time: float = 0.0
+    scores: List[float] = field(default_factory=list)
+
+
+def _run_rung(trial: SweepTrial, state: Optional[_TrialState], target_episodes: int, sweep_seed: int) -> _TrialState:
+    """
+    Worker entry point: train a trial up to target_episodes and score it.
+
+    Runs in a pool process, so it must be a module-level function.
+    """
+    params = trial.params
+    if state is None:
+        q_table_a, q_table_b = initialize_double_q_tables(params['optimistic_init'])
+        state = _TrialState(
+            q_table_a=q_table_a,
+            q_table_b=q_table_b,
+            replay_buffer=create_replay_buffer(
+                params['replay'], params['replay_buffer_size'],
+                params['replay_batch_size'], params['replay_start_size']
+            ),
+            epsilon=params['epsilon_start'],
+            rng=random.Random(sweep_seed * 1_000_003 + trial.trial_id),
+        )
+
+    env = env_registry.make(trial.env_spec)
+
+    start = time.perf_counter()
+    while state.episodes_trained < target_episodes:
+        train_episode(
+            env, {}, state.epsilon, discretize_state,
+            q_table_a=state.q_table_a, q_table_b=state.q_table_b,
+            replay_buffer=state.replay_buffer,
+            alpha=params['alpha'], gamma=params['gamma'],
+            optimistic_value=params['optimistic_init'],
+            rng=state.rng
+        )
+        state.epsilon = max(params['epsilon_end'], state.epsilon * params['epsilon_decay'])
+        state.episodes_trained += 1
+    state.training_time += time.perf_counter() - start
+
+    policy = extract_policy(merge_q_tables(state.q_table_a, state.q_table_b, params['optimistic_init']))
+    state.scores.append(PolicyVerifier().replay(trial.env_id, policy))
+    return state
+
+
+def _claim_for(trial: SweepTrial, state: _TrialState, agent_prefix: str) -> PolicyClaim:
+    """PolicyClaim for a trial's current greedy policy."""
+    policy = extract_policy(merge_q_tables(state.q_table_a, state.q_table_b, trial.params['optimistic_init']))
+    policy_bytes = serialize_policy(policy)
+    return PolicyClaim(
+        agent_id=f"{agent_prefix}_trial_{trial.trial_id}",
+        env_id=trial.env_id,
+        policy_hash=hash_policy(policy_bytes),
+        policy_artifact=policy_bytes,
+        claimed_reward=state.scores[-1],
+    )
+
+
+class SweepEngine:
+    """
+    Successive-halving hyperparameter search.
+
+    Usage:
+        engine = SweepEngine(min_episodes=200, max_episodes=1800, eta=3)
+        trials = engine.build_trials(expand_search_space({"alpha": [0.1, 0.3, 0.5]}))
+        result = engine.run(trials, results_path="sweep_results.json")
+        print(result.best.trial.params)
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        min_episodes: int = 200,
+        max_episodes: int = 1800,
+        eta: int = 3,
+        seed: int = 0,
+    ):
+        """
+        Args:
+            max_workers: Worker processes (defaults to os.cpu_count())
+            min_episodes: Budget of the first rung
+            max_episodes: Budget of the final rung
+            eta: Keep the best 1/eta trials at each rung; budgets grow by eta
+            seed: Sweep seed (trial RNG streams derive from it)
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.rungs = halving_schedule(min_episodes, max_episodes, eta)
+        self.eta = eta
+        self.seed = seed
+
+    @staticmethod
+    def build_trials(
+        param_sets: Sequence[Dict],
+        env_seed: int = 42,
+        time_horizon: int = DEFAULT_TIME_HORIZON,
+    ) -> List[SweepTrial]:
+        """Wrap parameter sets as trials on one environment."""
+        return [
+            SweepTrial(trial_id=i, params=dict(params), seed=env_seed, time_horizon=time_horizon)
+            for i, params in enumerate(param_sets)
+        ]
+
+    def run(
+        self,
+        trials: Sequence[SweepTrial],
+        collector: Optional[SubmissionCollector] = None,
+        results_path: Optional[str] = None,
+        on_progress: Optional[Callable[[Dict], None]] = None,
+        agent_prefix: str = "sweep",
+    ) -> SweepResult:
+        """
+        Run the sweep.
+
+        Progress events (from the calling process):
+            {"type": "rung_complete", "rung", "episodes", "survivors", "eliminated", "best_score"}
+
+        Args:
+            trials: Configurations to evaluate (see build_trials)
+            collector: If given, surviving trials are submitted as PolicyClaims
+            results_path: If given, the JSON results file is written here
+            on_progress: Optional progress callback
+            agent_prefix: Prefix for claim agent IDs
+
+        Returns:
+            SweepResult with every trial, best first
+        """
+        emit = on_progress or (lambda event: None)
+        start = time.perf_counter()
+
+        states: Dict[int, Optional[_TrialState]] = {t.trial_id: None for t in trials}
+        by_id = {t.trial_id: t for t in trials}
+        alive = [t.trial_id for t in trials]
+        eliminated: Dict[int, int] = {}
+
+        workers = max(1, min(self.max_workers, len(trials)))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for rung, budget in enumerate(self.rungs):
+                futures = {
+                    trial_id: pool.submit(_run_rung, by_id[trial_id], states[trial_id], budget, self.seed)
+                    for trial_id in alive
+                }
+                for trial_id, future in futures.items():
+                    states[trial_id] = future.result()
+
+                ranked = sorted(alive, key=lambda trial_id: (-states[trial_id].scores[-1], trial_id))
+                last_rung = rung == len(self.rungs) - 1
+                keep = len(ranked) if last_rung else max(1, math.ceil(len(ranked) / self.eta))
+                for trial_id in ranked[keep:]:
+                    eliminated[trial_id] = rung
+                alive = ranked[:keep]
+
+                emit({
+                    "type": "rung_complete",
+                    "rung": rung,
+                    "episodes": budget,
+                    "survivors": list(alive),
+                    "eliminated": ranked[keep:],
+                    "best_score": states[ranked[0]].scores[-1],
+                })
+                if len(alive) == 1:
+                    break
+
+        results = []
+        for trial in trials:
+            state = states[trial.trial_id]
+            claim = None
+            if collector is not None and trial.trial_id in alive:
+                claim = _claim_for(trial, state, agent_prefix)
+                collector.submit(claim)
+            results.append(TrialResult(
+                trial=trial,
+                episodes_trained=state.episodes_trained,
+                scores=list(state.scores),
+                eliminated_at_rung=eliminated.get(trial.trial_id),
+                training_time=state.training_time,
+                claim=claim,
+            ))
+
+        # Survivors first (by score), then eliminated trials by how far they got
+        results.sort(key=lambda r: (r.eliminated_at_rung is not None,
+                                    -(r.eliminated_at_rung or 0), -r.final_score, r.trial.trial_id))
+        sweep = SweepResult(results=results, rungs=self.rungs, wall_time=time.perf_counter() - start)
+        if results_path is not None:
+            sweep.save(results_path)
+        return sweep
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Successive-halving hyperparameter sweep")
+    parser.add_argument("--space", required=True, help='JSON file: {"alpha": [0.1, 0.5], ...}')
+    parser.add_argument("--trials", type=int, default=None, help="Sample this many configurations (default: full grid)")
+    parser.add_argument("--min-episodes", type=int, default=200)
+    parser.add_argument("--max-episodes", type=int, default=1800)
+    parser.add_argument("--eta", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0, help="Sweep seed")
+    parser.add_argument("--env-seed", type=int, default=42)
+    parser.add_argument("--horizon", type=int, default=DEFAULT_TIME_HORIZON)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", default="sweep_results.json")
+    parser.add_argument("--claims", default=None, help="Also save surviving claims to this JSON file")
+    args = parser.parse_args(argv)
+
+    with open(args.space) as f:
+        space = json.load(f)
+
+    engine = SweepEngine(args.workers, args.min_episodes, args.max_episodes, args.eta, args.seed)
+    trials = engine.build_trials(expand_search_space(space, args.trials, args.seed), args.env_seed, args.horizon)
+    collector = SubmissionCollector() if args.claims else None
+
+    print(f"🔬 Sweeping {len(trials)} configurations, rungs {engine.rungs}")
+    result = engine.run(
+        trials,
+        collector=collector,
+        results_path=args.out,
+        on_progress=lambda e: print(f"   Rung {e['rung']} ({e['episodes']} episodes): "
+                                    f"{len(e['survivors'])} survive, best {e['best_score']:.2f}"),
+    )
+    if collector is not None:
+        collector.save_to_json(args.claims)
+
+    print(f"✓ Best: {result.best.trial.params} (score {result.best.final_score:.2f})")
+    print(f"✓ Results written to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
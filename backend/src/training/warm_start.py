@@ -0,0 +1,255 @@
+"""
+Warm Start — Seed Training from a Verified Policy or a Checkpoint
+
+Training normally starts from empty Q-tables with optimistic values and
+explores from epsilon = 1.0. When a verified policy for the same
+environment already sits in the ledger (or a session checkpoint exists),
+training can start from it instead.
+
+SOURCES:
+    - Policy hash: the policy must be in the ledger (when one is given) and
+      its artifact in the policy store. A policy has no Q-values, so each
+      state's chosen action gets OPTIMISTIC_INIT and the other actions
+      OPTIMISTIC_INIT - WARM_START_MARGIN: greedy play follows the policy
+      and learning can still overturn it.
+    - Checkpoint: the Q-tables of a checkpointed session (see checkpoint.py)
+      are copied as they are.
+
+EXPLORATION:
+    A warm start begins at WARM_START_EPSILON instead of EPSILON_START.
+    With exponential decay the number of episodes until epsilon reaches
+    EPSILON_END is ceil(log(end / start) / log(decay)), so the episodes
+    saved versus a cold start is the difference of the two.
+
+ENVIRONMENT CHECK:
+    Q-values only transfer within one environment class (same state space,
+    action space and attack dynamics — presets with their own dynamics are
+    their own class). The source environment comes from the ledger entry's
+    env_config (policies) or the checkpoint metadata; with a target spec,
+    load_warm_start() rejects a source from another env class and any
+    table whose states or actions do not fit the target's spaces. The seed
+    and horizon may differ: transferring across seeds is the point.
+
+PROVENANCE:
+    WarmStart.provenance is a JSON-friendly record of the source; it is
+    stored in the resulting policy artifact metadata.
+"""
+
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional, Sequence, Tuple
+import math
+
+from src.agent.double_q_learning import merge_q_tables
+from src.environments.env_spec import EnvSpec
+from src.ledger.policy_store import PolicyStore
+from src.training.checkpoint import read_checkpoint
+from src.shared.config import (
+    EPSILON_START, EPSILON_END, EPSILON_DECAY, OPTIMISTIC_INIT,
+    WARM_START_EPSILON, WARM_START_MARGIN
+)
+
+
+class WarmStart(NamedTuple):
+    """
+    Initial learner state for a warm-started run.
+
+    Attributes:
+        q_table_a: Initial Double-Q table A
+        q_table_b: Initial Double-Q table B
+        epsilon_start: Exploration rate to start from
+        provenance: Where the tables came from (stored in artifact metadata)
+        source_spec: Environment the source was trained on (None if unrecorded)
+    """
+    q_table_a: Dict
+    q_table_b: Dict
+    epsilon_start: float
+    provenance: Dict
+    source_spec: Optional[EnvSpec] = None
+
+    def single_q_table(self) -> Dict:
+        """Merged table for the single-table trainer (train())."""
+        return merge_q_tables(self.q_table_a, self.q_table_b)
+
+    def copy_tables(self) -> Tuple[Dict, Dict]:
+        """Fresh copies of both tables (the WarmStart can be reused)."""
+        return dict(self.q_table_a), dict(self.q_table_b)
+
+
+def exploration_episodes(
+    epsilon_start: float,
+    epsilon_end: float = EPSILON_END,
+    epsilon_decay: float = EPSILON_DECAY,
+) -> int:
+    """Episodes until exponential decay takes epsilon_start down to epsilon_end."""
+    if epsilon_start <= epsilon_end:
+        return 0
+    return math.ceil(math.log(epsilon_end / epsilon_start) / math.log(epsilon_decay))
+
+
+def episodes_saved(
+    warm_epsilon: float,
+    cold_epsilon: float = EPSILON_START,
+    epsilon_end: float = EPSILON_END,
+    epsilon_decay: float = EPSILON_DECAY,
+) -> int:
+    """Exploration episodes a warm start skips compared with a cold start."""
+    return (exploration_episodes(cold_epsilon, epsilon_end, epsilon_decay)
+            - exploration_episodes(warm_epsilon, epsilon_end, epsilon_decay))
+
+
+def policy_to_q_tables(
+    policy: Dict,
+    actions: Sequence[int] = (0, 1, 2, 3, 4),
+    base_value: float = OPTIMISTIC_INIT,
+    margin: float = WARM_START_MARGIN,
+) -> Tuple[Dict, Dict]:
+    """
+    Build Double-Q tables whose greedy policy is `policy`.
+
+    Args:
+        policy: {state tuple: action}
+        actions: Action space
+        base_value: Q-value of the policy's action
+        margin: How far below base_value the other actions start
+
+    Returns:
+        Tuple of (q_table_a, q_table_b), identical
+    """
+    q_table = {}
+    for state, chosen in policy.items():
+        for action in actions:
+            q_table[(state, action)] = base_value if action == chosen else base_value - margin
+    return q_table, dict(q_table)
+
+
+def _spec_from_env_config(env_config: Optional[Dict], seed: int = 0) -> Optional[EnvSpec]:
+    """Environment a ledger entry / checkpoint recorded (None if it recorded none)."""
+    if not env_config:
+        return None
+    if env_config.get('env_id'):
+        return EnvSpec.parse(env_config['env_id'])
+    if 'env_type' in env_config or 'time_horizon' in env_config:
+        return EnvSpec.from_env_config(seed, env_config)
+    return None
+
+
+def check_warm_start_env(warm_start: WarmStart, target: EnvSpec) -> None:
+    """
+    Check that a warm start can seed training on `target`.
+
+    Raises:
+        ValueError: If the source was trained on another env class, or its
+                    Q-table states/actions do not fit the target's spaces
+    """
+    source = warm_start.source_spec
+    if source is not None and source.env_class != target.env_class:
+        raise ValueError(f"Warm-start source was trained on {source.env_id}, "
+                         f"which is a different environment than {target.env_id}")
+
+    factory = target.factory
+    for state, action in list(warm_start.q_table_a) + list(warm_start.q_table_b):
+        if len(state) != factory.state_size or not 0 <= action < factory.num_actions:
+            raise ValueError(f"Warm-start Q-table entry {(state, action)} does not fit {target.env_id} "
+                             f"(state size {factory.state_size}, {factory.num_actions} actions)")
+
+
+def warm_start_from_policy(
+    policy_hash: str,
+    ledger=None,
+    policy_dir: Optional[Path] = None,
+    epsilon_start: float = WARM_START_EPSILON,
+) -> WarmStart:
+    """
+    Warm start from a stored policy artifact.
+
+    Args:
+        policy_hash: Hash of the policy to start from
+        ledger: PolicyLedger; if given, the hash must have a ledger entry
+        policy_dir: Policy artifact directory (default: backend/policies)
+        epsilon_start: Exploration rate to start from
+
+    Raises:
+        ValueError: If the policy is not in the ledger or the artifact is invalid
+        FileNotFoundError: If the artifact does not exist
+    """
+    provenance = {"source": "policy", "policy_hash": policy_hash, "epsilon_start": epsilon_start}
+    source_spec = None
+
+    if ledger is not None:
+        entry = next((e for e in ledger.read_all() if e.policy_hash == policy_hash), None)
+        if entry is None:
+            raise ValueError(f"Policy {policy_hash} is not in the ledger")
+        provenance.update({
+            "ledger_entry_hash": entry.current_hash,
+            "verified_reward": entry.verified_reward,
+            "agent_id": entry.agent_id,
+            "env_config": entry.env_config,
+        })
+        source_spec = _spec_from_env_config(entry.env_config)
+
+    policy = PolicyStore(policy_dir).load_policy(policy_hash)
+    q_table_a, q_table_b = policy_to_q_tables(policy)
+    provenance["states_seeded"] = len(policy)
+
+    return WarmStart(q_table_a, q_table_b, epsilon_start, provenance, source_spec)
+
+
+def warm_start_from_checkpoint(
+    checkpoint_path: str,
+    epsilon_start: float = WARM_START_EPSILON,
+) -> WarmStart:
+    """
+    Warm start from the Q-tables of a session checkpoint.
+
+    Raises:
+        FileNotFoundError: If the checkpoint does not exist
+        ValueError: If the checkpoint version is not supported
+    """
+    loaded = read_checkpoint(checkpoint_path)
+    meta = loaded['meta']
+    provenance = {
+        "source": "checkpoint",
+        "checkpoint_path": str(checkpoint_path),
+        "agent_id": meta['agent_id'],
+        "episodes_completed": meta['episodes_completed'],
+        "env_config": meta['env_config'],
+        "epsilon_start": epsilon_start,
+        "states_seeded": len({state for state, _ in list(loaded['q_table_a']) + list(loaded['q_table_b'])}),
+    }
+    source_spec = EnvSpec.cyber(meta['seed'], meta['time_horizon'], meta.get('env_type'))
+    return WarmStart(loaded['q_table_a'], loaded['q_table_b'], epsilon_start, provenance, source_spec)
+
+
+def load_warm_start(
+    policy_hash: Optional[str] = None,
+    checkpoint_path: Optional[str] = None,
+    ledger=None,
+    policy_dir: Optional[Path] = None,
+    epsilon_start: float = WARM_START_EPSILON,
+    target: Optional[EnvSpec] = None,
+) -> Optional[WarmStart]:
+    """
+    Resolve a warm-start source (at most one of policy_hash / checkpoint_path).
+
+    Args:
+        target: Environment the warm-started run trains on; if given, the
+                source must match it (see check_warm_start_env)
+
+    Returns:
+        WarmStart, or None if neither source is given
+
+    Raises:
+        ValueError: If both sources are given, the source is invalid, or it
+                    does not match the target environment
+    """
+    if policy_hash and checkpoint_path:
+        raise ValueError("Give either a policy hash or a checkpoint to warm-start from, not both")
+    if policy_hash:
+        warm_start = warm_start_from_policy(policy_hash, ledger, policy_dir, epsilon_start)
+    elif checkpoint_path:
+        warm_start = warm_start_from_checkpoint(checkpoint_path, epsilon_start)
+    else:
+        return None
+    if target is not None:
+        check_warm_start_env(warm_start, target)
+    return warm_start
@@ -8,12 +8,27 @@ from src.verifier.verifier import (
     VerificationResult,
     VerificationStatus,
     PolicyVerifier,
-    verify_claim
+    verify_claim,
+    VerificationCancelled,
+    VERIFIER_VERSION
 )
+from src.verifier.cache import VerificationCache
+from src.verifier.sequential import SequentialTest
+from src.verifier.jobs import VerificationJobManager
+from src.verifier.audit import AuditRecord, AuditSummary, audit_entries, run_audit
 
 __all__ = [
     "VerificationResult",
     "VerificationStatus",
     "PolicyVerifier",
-    "verify_claim"
+    "verify_claim",
+    "VerificationCancelled",
+    "VERIFIER_VERSION",
+    "VerificationCache",
+    "SequentialTest",
+    "VerificationJobManager",
+    "AuditRecord",
+    "AuditSummary",
+    "audit_entries",
+    "run_audit"
 ]
@@ -0,0 +1,338 @@
+"""
+Ledger Audit — Re-verify Every Ledger Entry From Its Artifact
+
+verify_chain_integrity() proves nobody edited the ledger; it does not prove
+each verified_reward still reproduces. An audit replays every entry's policy
+artifact under its recorded environment and compares the rewards.
+
+PER ENTRY:
+    1. Locate the artifact in the PolicyStore (or its pack)
+    2. Check SHA-256(artifact) == entry.policy_hash
+    3. Replay under env_config["env_id"] (recorded at append time)
+    4. |replayed - verified_reward| <= tolerance
+
+STATUSES:
+    ok                 reward reproduced
+    reward_mismatch    replay disagrees with the recorded reward
+    hash_mismatch      artifact bytes do not hash to the recorded hash
+    missing_artifact   no artifact for the hash in the store
+    no_env             entry predates recorded env ids (cannot be replayed)
+    replay_error       artifact unreadable or replay failed
+
+ENV AUTHENTICATION:
+    Legacy (hash_version 1) entries hash without env_config, so their
+    recorded env_id is not tamper-evident: an edited env_id still passes
+    verify_chain_integrity. Such records carry env_authenticated=False and
+    are counted in AuditSummary.unauthenticated_env.
+
+SCALING:
+    - Entries are replayed on a process pool; each worker opens its own
+      PolicyStore and verifier once
+    - At most max_workers * AUDIT_INFLIGHT_PER_WORKER entries are in flight,
+      and every result is written to the JSONL report as it completes, so
+      memory stays bounded however large the ledger is
+    - Results stream in completion order; each record carries its ledger index
+    - The chain check runs in the same pass over the entries, so a ledger
+      streamed from disk (iter_entries) is never materialized
+
+Usage:
+    python -m src.verifier.audit ledger.json --store policies --report audit.jsonl --workers 8
+
+    summary = run_audit(ledger.iter_entries(), "policies", report_path="audit.jsonl")
+    print(summary.counts, summary.entries_per_second)
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+import argparse
+import json
+import os
+import time
+
+from src.agent.policy import hash_policy
+from src.ledger.ledger import ChainChecker, LedgerEntry
+from src.shared.config import (
+    AUDIT_REPLAY_EPISODES, AUDIT_REWARD_TOLERANCE, AUDIT_INFLIGHT_PER_WORKER, POLICY_PACK_FILENAME
+)
+
+
+AUDIT_STATUSES = ["ok", "reward_mismatch", "hash_mismatch", "missing_artifact", "no_env", "replay_error"]
+
+
+class AuditRecord(NamedTuple):
+    """Audit outcome of one ledger entry."""
+    index: int  # Position in the ledger
+    agent_id: str
+    policy_hash: str
+    env_id: Optional[str]
+    status: str  # One of AUDIT_STATUSES
+    recorded_reward: float
+    replayed_reward: Optional[float]
+    detail: str = ""
+    env_authenticated: bool = True  # False: env_id is not covered by the entry hash
+
+    def to_dict(self) -> Dict:
+        return self._asdict()
+
+
+class AuditSummary(NamedTuple):
+    """
+    Totals of an audit run.
+
+    Attributes:
+        total: Entries audited
+        counts: Entries per status
+        chain_intact: Result of verify_chain_integrity (None if not checked)
+        wall_time: Seconds from start to last result
+        entries_per_second: Audit throughput
+        episodes_replayed: Replay episodes run across all workers
+        report_path: JSONL report (None if not written)
+        unauthenticated_env: Entries replayed under an env_id the chain does
+                             not protect (legacy hash_version 1)
+    """
+    total: int
+    counts: Dict[str, int]
+    chain_intact: Optional[bool]
+    wall_time: float
+    entries_per_second: float
+    episodes_replayed: int
+    report_path: Optional[str]
+    unauthenticated_env: int = 0
+
+    @property
+    def clean(self) -> bool:
+        """True when every entry reproduced."""
+        return self.counts.get("ok", 0) == self.total
+
+    def to_dict(self) -> Dict:
+        return dict(self._asdict(), clean=self.clean)
+
+
+# Task sent to a worker: (index, agent_id, policy_hash, verified_reward, env_id, env_authenticated)
+_AuditTask = Tuple[int, str, str, float, Optional[str], bool]
+
+_worker_state: Dict = {}
+
+
+def _init_worker(store_root: str, pack_path: Optional[str], episodes: int, tolerance: float) -> None:
+    from src.ledger.policy_store import PolicyStore
+    from src.verifier.verifier import PolicyVerifier
+
+    _worker_state.update(
+        store=PolicyStore(store_root, pack_path=pack_path),
+        verifier=PolicyVerifier(),
+        episodes=episodes,
+        tolerance=tolerance,
+    )
+
+
+def _audit_entry(task: _AuditTask) -> AuditRecord:
+    """Audit one entry with the worker's store and verifier (runs in the worker)."""
+    from src.environments.env_spec import EnvSpec
+
+    index, agent_id, policy_hash, recorded, env_id, env_authenticated = task
+    record = AuditRecord(index, agent_id, policy_hash, env_id, "ok", recorded, None,
+                         env_authenticated=env_authenticated)
+    if env_id is None:
+        return record._replace(status="no_env", detail="Ledger entry has no recorded env_id")
+
+    store, verifier = _worker_state["store"], _worker_state["verifier"]
+    try:
+        artifact = store.artifact_bytes(policy_hash)
+    except (FileNotFoundError, ValueError):
+        return record._replace(status="missing_artifact", detail="No artifact in the policy store")
+
+    actual_hash = hash_policy(artifact)
+    if actual_hash != policy_hash:
+        return record._replace(status="hash_mismatch", detail=f"Artifact hashes to {actual_hash}")
+
+    try:
+        policy = verifier._load_policy(artifact, EnvSpec.parse(env_id))
+        replayed = verifier.replay(env_id, policy, episodes=_worker_state["episodes"])
+    except Exception as e:
+        return record._replace(status="replay_error", detail=str(e))
+
+    record = record._replace(replayed_reward=replayed)
+    if abs(replayed - recorded) > _worker_state["tolerance"]:
+        return record._replace(status="reward_mismatch", detail=f"Difference: {replayed - recorded:+.6f}")
+    return record
+
+
+def _tasks(entries: Iterable[LedgerEntry]) -> Iterator[_AuditTask]:
+    for index, entry in enumerate(entries):
+        env_id = (entry.env_config or {}).get("env_id")
+        yield (index, entry.agent_id, entry.policy_hash, entry.verified_reward, env_id, entry.env_authenticated)
+
+
+def _chain_checked(entries: Iterable[LedgerEntry], checker: ChainChecker) -> Iterator[LedgerEntry]:
+    for entry in entries:
+        checker.feed(entry)
+        yield entry
+
+
+def audit_entries(
+    entries: Iterable[LedgerEntry],
+    store_root: str,
+    pack_path: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    episodes: int = AUDIT_REPLAY_EPISODES,
+    tolerance: float = AUDIT_REWARD_TOLERANCE,
+) -> Iterator[AuditRecord]:
+    """
+    Audit ledger entries, yielding one AuditRecord per entry as it completes.
+
+    Args:
+        entries: Ledger entries (any iterable; consumed lazily)
+        store_root: PolicyStore directory holding the artifacts
+        pack_path: Optional policy pack the store reads from
+        max_workers: Worker processes (default os.cpu_count(); 1 = in-process)
+        episodes: Replay episodes per entry
+        tolerance: Largest accepted |replayed - recorded| reward difference
+    """
+    workers = max_workers or os.cpu_count() or 1
+    init_args = (str(store_root), str(pack_path) if pack_path else None, episodes, tolerance)
+
+    if workers == 1:
+        _init_worker(*init_args)
+        for task in _tasks(entries):
+            yield _audit_entry(task)
+        return
+
+    window = workers * AUDIT_INFLIGHT_PER_WORKER
+    tasks = _tasks(entries)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init_args) as pool:
+        pending = set()
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < window:
+                task = next(tasks, None)
+                if task is None:
+                    exhausted = True
+                else:
+                    pending.add(pool.submit(_audit_entry, task))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def run_audit(
+    entries: Iterable[LedgerEntry],
+    store_root: str,
+    pack_path: Optional[str] = None,
+    report_path: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    episodes: int = AUDIT_REPLAY_EPISODES,
+    tolerance: float = AUDIT_REWARD_TOLERANCE,
+    mismatches_only: bool = False,
+    check_chain: bool = True,
+    on_record: Optional[Callable[[AuditRecord], None]] = None,
+) -> AuditSummary:
+    """
+    Audit a ledger and write a JSONL report.
+
+    Args:
+        entries: Ledger entries in ledger order (any iterable; consumed once)
+        report_path: JSONL file, one record per line plus a final
+                     {"summary": ...} line (None = no report)
+        mismatches_only: Only write records whose status is not "ok"
+        check_chain: Also verify the hash chain of `entries` (same pass)
+        on_record: Optional callback for every record (streaming consumers)
+        (other args: see audit_entries)
+
+    Returns:
+        AuditSummary with per-status counts and throughput
+    """
+    checker = ChainChecker() if check_chain else None
+    if checker is not None:
+        entries = _chain_checked(entries, checker)
+
+    counts = {status: 0 for status in AUDIT_STATUSES}
+    total = 0
+    replays = 0
+    unauthenticated = 0
+    start = time.perf_counter()
+
+    report = None
+    if report_path is not None:
+        Path(report_path).parent.mkdir(parents=True, exist_ok=True)
+        report = open(report_path, "w")
+    try:
+        for record in audit_entries(entries, store_root, pack_path, max_workers, episodes, tolerance):
+            total += 1
+            counts[record.status] += 1
+            if record.env_id is not None and not record.env_authenticated:
+                unauthenticated += 1
+            if record.replayed_reward is not None:
+                replays += episodes
+            if report is not None and (record.status != "ok" or not mismatches_only):
+                report.write(json.dumps(record.to_dict()) + "\n")
+            if on_record is not None:
+                on_record(record)
+
+        wall_time = time.perf_counter() - start
+        chain_intact = None
+        if checker is not None:
+            chain_intact = checker.error is None
+            if not chain_intact:
+                print(f"⚠ Ledger chain broken: {checker.error}")
+        summary = AuditSummary(
+            total=total,
+            counts=counts,
+            chain_intact=chain_intact,
+            wall_time=wall_time,
+            entries_per_second=total / wall_time if wall_time > 0 else 0.0,
+            episodes_replayed=replays,
+            report_path=str(report_path) if report_path is not None else None,
+            unauthenticated_env=unauthenticated,
+        )
+        if report is not None:
+            report.write(json.dumps({"summary": summary.to_dict()}) + "\n")
+    finally:
+        if report is not None:
+            report.close()
+
+    status = "✓ clean" if summary.clean else "✗ mismatches found"
+    print(f"🔎 Ledger audit: {total} entries in {summary.wall_time:.1f}s "
+          f"({summary.entries_per_second:.1f}/s) — {status}")
+    if unauthenticated:
+        print(f"⚠ {unauthenticated} entries predate env hashing (hash_version 1): "
+              f"their env_id is not tamper-evident")
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from src.ledger.ledger import PolicyLedger
+    from src.ledger.policy_store import DEFAULT_POLICY_DIR
+    from src.ledger.sqlite_ledger import SqlitePolicyLedger
+
+    parser = argparse.ArgumentParser(description="Replay every ledger entry and report reward mismatches")
+    parser.add_argument("ledger", help="Ledger file (ledger.json, or a SQLite ledger ending in .db)")
+    parser.add_argument("--store", default=str(DEFAULT_POLICY_DIR), help="Policy store directory")
+    parser.add_argument("--report", default="ledger_audit.jsonl", help="JSONL report path")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--episodes", type=int, default=AUDIT_REPLAY_EPISODES, help="Replay episodes per entry")
+    parser.add_argument("--tolerance", type=float, default=AUDIT_REWARD_TOLERANCE)
+    parser.add_argument("--mismatches-only", action="store_true", help="Only report entries that failed")
+    args = parser.parse_args(argv)
+
+    pack_path = Path(args.store) / POLICY_PACK_FILENAME
+    ledger = SqlitePolicyLedger(args.ledger) if args.ledger.endswith(".db") else PolicyLedger(args.ledger)
+    summary = run_audit(
+        ledger.iter_entries(),
+        args.store,
+        pack_path=pack_path if pack_path.exists() else None,
+        report_path=args.report,
+        max_workers=args.workers,
+        episodes=args.episodes,
+        tolerance=args.tolerance,
+        mismatches_only=args.mismatches_only,
+    )
+    print(json.dumps(summary.to_dict(), indent=2))
+    raise SystemExit(0 if summary.clean else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Verification Cache
+
+Replaying a policy is deterministic: the same policy bytes, environment and
+episode count always produce the same verified reward under the same
+verifier logic. The cache remembers that reward so repeated verification
+(re-submitted sessions, identical policies from different agents) only
+re-runs the cheap claim comparison.
+
+KEY:
+    (policy_hash, env_id, episodes, verifier_version)
+
+- Fixed-episode verification caches the mean reward of its episodes
+- Sequential verification caches the individual episode rewards
+  (episodes = "sequential"), so a later claim resumes from them
+
+- Only successful replays are cached; failures are always re-examined
+- VERIFIER_VERSION is part of the key, so bumping it when replay logic
+  changes makes every older entry unreachable; invalidate() removes
+  entries explicitly (all, one policy, or stale versions)
+- Persisted as a JSON file (written atomically), like the ledger
+
+PROPERTIES:
+    - Never changes a decision: the claim is still compared against the
+      (cached) verified reward with the verifier's own threshold
+    - Thread-safe (one lock around the in-memory map and file writes)
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+import json
+import os
+import threading
+
+from src.shared.config import VERIFICATION_CACHE_MAX_ENTRIES
+
+
+SEQUENTIAL_EPISODES = "sequential"  # Episodes key of per-episode reward entries
+
+
+class VerificationCache:
+    """
+    Persistent map of deterministic replay results.
+
+    Attributes:
+        verifier_version: Version whose entries this cache serves
+        hits / misses / stores: Counters since construction
+    """
+
+    def __init__(
+        self,
+        storage_path: Optional[str] = None,
+        verifier_version: Optional[str] = None,
+        max_entries: int = VERIFICATION_CACHE_MAX_ENTRIES,
+    ):
+        """
+        Args:
+            storage_path: JSON file to persist to (None = in-memory only)
+            verifier_version: Verifier logic version (default: VERIFIER_VERSION)
+            max_entries: Oldest entries are evicted beyond this size
+        """
+        if verifier_version is None:
+            from src.verifier.verifier import VERIFIER_VERSION
+            verifier_version = VERIFIER_VERSION
+        self.storage_path = Path(storage_path) if storage_path else None
+        self.verifier_version = verifier_version
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self._entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def make_key(policy_hash: str, env_id: str, episodes, verifier_version: str) -> str:
+        return f"{policy_hash}|{env_id}|{episodes}|{verifier_version}"
+
+    def get(self, policy_hash: str, env_id: str, episodes: int) -> Optional[float]:
+        """Cached verified reward, or None (counts a hit or a miss)."""
+        key = self.make_key(policy_hash, env_id, episodes, self.verifier_version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry["verified_reward"]
+
+    def put(self, policy_hash: str, env_id: str, episodes, verified_reward: float, **extra) -> None:
+        """Remember a successful replay."""
+        key = self.make_key(policy_hash, env_id, episodes, self.verifier_version)
+        with self._lock:
+            self._entries.pop(key, None)  # Re-insert at the end (newest)
+            self._entries[key] = {
+                **extra,
+                "policy_hash": policy_hash,
+                "env_id": env_id,
+                "episodes": episodes,
+                "verifier_version": self.verifier_version,
+                "verified_reward": verified_reward,
+                "cached_at": datetime.now().isoformat(),
+            }
+            while len(self._entries) > self.max_entries:
+                del self._entries[next(iter(self._entries))]
+            self.stores += 1
+            self._save()
+
+    def get_episode_rewards(self, policy_hash: str, env_id: str) -> Optional[List[float]]:
+        """Cached per-episode rewards from sequential verification, or None."""
+        key = self.make_key(policy_hash, env_id, SEQUENTIAL_EPISODES, self.verifier_version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return list(entry["rewards"])
+
+    def put_episode_rewards(self, policy_hash: str, env_id: str, rewards: List[float]) -> None:
+        """Remember the episode rewards of a sequential verification."""
+        self.put(policy_hash, env_id, SEQUENTIAL_EPISODES, sum(rewards) / len(rewards), rewards=list(rewards))
+
+    def invalidate(self, policy_hash: Optional[str] = None, stale_only: bool = False) -> int:
+        """
+        Drop cached results.
+
+        Args:
+            policy_hash: Only entries for this policy (default: all policies)
+            stale_only: Only entries from other verifier versions
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            doomed = [
+                key for key, entry in self._entries.items()
+                if (policy_hash is None or entry["policy_hash"] == policy_hash)
+                and (not stale_only or entry["verifier_version"] != self.verifier_version)
+            ]
+            for key in doomed:
+                del self._entries[key]
+            if doomed:
+                self._save()
+        if doomed:
+            print(f"🗑 Verification cache: invalidated {len(doomed)} entries")
+        return len(doomed)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict:
+        """Hit metrics and size."""
+        lookups = self.hits + self.misses
+        return {
+            "verifier_version": self.verifier_version,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _load(self) -> None:
+        if self.storage_path is None or not self.storage_path.exists():
+            return
+        try:
+            with open(self.storage_path, "r") as f:
+                data = json.load(f)
+            entries = data.get("entries", [])
+        except (json.JSONDecodeError, AttributeError) as e:
+            print(f"⚠ Ignoring unreadable verification cache {self.storage_path}: {e}")
+            return
+        for entry in entries:
+            key = self.make_key(entry["policy_hash"], entry["env_id"], entry["episodes"], entry["verifier_version"])
+            self._entries[key] = entry
+
+    def _save(self) -> None:
+        """Write-then-rename; caller holds the lock."""
+        if self.storage_path is None:
+            return
+        self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.storage_path.with_name(self.storage_path.name + ".tmp")
+        with open(temp_path, "w") as f:
+            json.dump({"entries": list(self._entries.values())}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.storage_path)
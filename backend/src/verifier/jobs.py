@@ -0,0 +1,192 @@
+"""
+Verification Jobs — Observable, Cancellable Verification Runs
+
+A verification replays many episodes, which blocks for a while once
+sequential verification needs more batches or horizons grow. A job runs
+PolicyVerifier.verify() on a worker thread, off the event loop, and fans its
+progress out to any number of observers.
+
+EVENTS (JSON-serializable dicts, in order):
+    verification_started    agent_id, policy_hash, claimed_reward
+    verification_progress   episodes, max_episodes, running_mean,
+                            ci_lower, ci_upper, elapsed_seconds, eta_seconds
+    verification_complete   result (VerificationResult as a dict)
+    verification_cancelled  (terminal, instead of complete)
+    verification_error      message (terminal, instead of complete)
+
+RULES:
+    - One job per agent: starting a verification that is already running for
+      the same agent and policy joins it instead of replaying again
+    - Late observers first receive the latest progress event (and the
+      terminal event if the job already finished)
+    - Cancellation stops replay at the next episode; nothing is recorded
+    - eta_seconds assumes the current pace and the full episode budget;
+      sequential verification usually stops earlier
+"""
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Set
+import asyncio
+import threading
+import time
+
+from src.agent.runner import PolicyClaim
+from src.verifier.verifier import PolicyVerifier, VerificationCancelled, VerificationResult
+
+
+def result_to_dict(result: VerificationResult) -> Dict:
+    """VerificationResult as a JSON-serializable dict."""
+    return {
+        "agent_id": result.agent_id,
+        "policy_hash": result.policy_hash,
+        "verified_reward": result.verified_reward,
+        "status": result.status.value,
+        "reason": result.reason,
+        "episodes": result.episodes,
+        "confidence_interval": list(result.confidence_interval) if result.confidence_interval else None,
+        "divergence": result.divergence.to_dict() if result.divergence else None,
+    }
+
+
+@dataclass
+class VerificationJob:
+    """One verification run and its observers."""
+    claim: PolicyClaim
+    status: str = "running"  # running | completed | cancelled | failed
+    started_at: float = field(default_factory=time.time)
+    latest: Optional[Dict] = None  # Most recent started/progress event
+    final: Optional[Dict] = None  # Terminal event once finished
+    result: Optional[VerificationResult] = None
+    cancel_event: threading.Event = field(default_factory=threading.Event)
+    subscribers: Set[asyncio.Queue] = field(default_factory=set)
+    task: Optional[asyncio.Task] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status != "running"
+
+    def subscribe(self) -> asyncio.Queue:
+        """Queue of events for one observer, starting with a catch-up of the current state."""
+        queue: asyncio.Queue = asyncio.Queue()
+        for event in (self.latest, self.final):
+            if event is not None:
+                queue.put_nowait(event)
+        if not self.done:
+            self.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self.subscribers.discard(queue)
+
+    def publish(self, event: Dict) -> None:
+        """Deliver an event to every observer (event loop thread only)."""
+        if self.done:
+            return  # Progress scheduled just before a cancellation
+        self.latest = event
+        for queue in self.subscribers:
+            queue.put_nowait(event)
+
+    def finish(self, status: str, event: Dict) -> None:
+        self.status = status
+        self.final = event
+        for queue in self.subscribers:
+            queue.put_nowait(event)
+        self.subscribers.clear()
+
+
+class VerificationJobManager:
+    """
+    Runs verifications as shared background jobs, keyed by agent.
+
+    Attributes:
+        verifier: PolicyVerifier every job uses
+    """
+
+    def __init__(self, verifier: PolicyVerifier):
+        self.verifier = verifier
+        self.jobs: Dict[str, VerificationJob] = {}
+
+    def start(
+        self,
+        claim: PolicyClaim,
+        on_result: Optional[Callable[[VerificationResult], None]] = None
+    ) -> VerificationJob:
+        """
+        Start verifying a claim, or join the running job for it.
+
+        Must be called from the event loop.
+
+        Args:
+            claim: Claim to verify
+            on_result: Optional hook run on the worker thread with the result
+                       before observers are told (e.g. append to the ledger)
+
+        Returns:
+            The (possibly already running) job
+        """
+        existing = self.jobs.get(claim.agent_id)
+        if existing is not None and not existing.done and existing.claim.policy_hash == claim.policy_hash:
+            return existing
+        if existing is not None and not existing.done:
+            existing.cancel_event.set()  # Superseded by a newer policy for this agent
+
+        job = VerificationJob(claim=claim)
+        job.publish({
+            "type": "verification_started",
+            "agent_id": claim.agent_id,
+            "policy_hash": claim.policy_hash,
+            "claimed_reward": claim.claimed_reward,
+        })
+        self.jobs[claim.agent_id] = job
+        job.task = asyncio.create_task(self._run(job, on_result))
+        return job
+
+    def get(self, agent_id: str) -> Optional[VerificationJob]:
+        return self.jobs.get(agent_id)
+
+    def cancel(self, agent_id: str) -> bool:
+        """Ask a running job to stop; returns False if none is running."""
+        job = self.jobs.get(agent_id)
+        if job is None or job.done:
+            return False
+        job.cancel_event.set()
+        return True
+
+    async def _run(self, job: VerificationJob, on_result: Optional[Callable[[VerificationResult], None]]) -> None:
+        loop = asyncio.get_running_loop()
+
+        def progress(update: Dict) -> None:
+            # Called on the worker thread; hop back onto the event loop
+            elapsed = time.time() - job.started_at
+            remaining = update["max_episodes"] - update["episodes"]
+            event = {
+                "type": "verification_progress",
+                "agent_id": job.claim.agent_id,
+                **update,
+                "elapsed_seconds": elapsed,
+                "eta_seconds": elapsed / update["episodes"] * remaining,
+            }
+            loop.call_soon_threadsafe(job.publish, event)
+
+        def run() -> VerificationResult:
+            result = self.verifier.verify(job.claim, progress, job.cancel_event)
+            if on_result is not None:
+                on_result(result)
+            return result
+
+        agent_id = job.claim.agent_id
+        try:
+            job.result = await asyncio.to_thread(run)
+        except VerificationCancelled:
+            print(f"⏹ Verification cancelled for {agent_id}")
+            job.finish("cancelled", {"type": "verification_cancelled", "agent_id": agent_id})
+        except Exception as e:
+            print(f"⚠ Verification job failed for {agent_id}: {e}")
+            job.finish("failed", {"type": "verification_error", "agent_id": agent_id, "message": str(e)})
+        else:
+            job.finish("completed", {
+                "type": "verification_complete",
+                "agent_id": agent_id,
+                "elapsed_seconds": time.time() - job.started_at,
+                "result": result_to_dict(job.result),
+            })
@@ -0,0 +1,131 @@
+"""
+Sequential Verification
+
+Decide a claim with as few replay episodes as the evidence allows.
+
+HOW IT WORKS:
+    Replay episodes in batches. After each batch, build a Student-t
+    confidence interval on the mean episode reward and compare it with the
+    acceptance band [claimed - threshold, claimed + threshold]:
+
+    - interval entirely inside the band   → VALID, stop
+    - interval entirely outside the band  → INVALID, stop
+    - otherwise                           → run another batch
+
+    At the episode budget the decision falls back to the fixed-episode rule
+    (|claimed - mean| <= threshold).
+
+ERROR RATE:
+    Looking at the data after every batch inflates the error rate of a
+    single test, so the error budget is split evenly over the possible
+    looks (Bonferroni): each interval uses error_rate / max_looks.
+
+PROPERTIES:
+    - Deterministic: same policy, env and settings → same decision and
+      episode count
+    - A replay whose episodes all score the same (zero variance) is decided
+      after min_episodes
+"""
+
+from statistics import NormalDist
+from typing import List, NamedTuple, Optional, Tuple
+import math
+
+from src.shared.config import (
+    VERIFY_SEQUENTIAL_ERROR_RATE, VERIFY_BATCH_EPISODES, VERIFY_MIN_EPISODES, VERIFY_MAX_EPISODES
+)
+
+
+class SequentialTest(NamedTuple):
+    """
+    Settings for sequential verification.
+
+    Attributes:
+        error_rate: Overall probability of a wrong early decision
+        batch_episodes: Episodes replayed between checks
+        min_episodes: Episodes before the first check
+        max_episodes: Episode budget; the fixed rule decides at the budget
+    """
+    error_rate: float = VERIFY_SEQUENTIAL_ERROR_RATE
+    batch_episodes: int = VERIFY_BATCH_EPISODES
+    min_episodes: int = VERIFY_MIN_EPISODES
+    max_episodes: int = VERIFY_MAX_EPISODES
+
+    @property
+    def max_looks(self) -> int:
+        """Number of checks the budget allows."""
+        after_first = max(0, self.max_episodes - self.min_episodes)
+        return 1 + math.ceil(after_first / self.batch_episodes)
+
+    def validate(self) -> None:
+        if not 0 < self.error_rate < 1:
+            raise ValueError(f"error_rate must be in (0, 1), got {self.error_rate}")
+        if self.batch_episodes < 1 or self.min_episodes < 2 or self.max_episodes < self.min_episodes:
+            raise ValueError(f"Invalid sequential verification budget: {self}")
+
+
+class SequentialDecision(NamedTuple):
+    """
+    Outcome of one check.
+
+    Attributes:
+        decided: Whether the test stopped
+        valid: Decision (None while undecided)
+        interval: (lower, upper) confidence interval on the mean reward
+    """
+    decided: bool
+    valid: Optional[bool]
+    interval: Tuple[float, float]
+
+
+def t_quantile(p: float, df: int) -> float:
+    """
+    Student-t quantile without scipy.
+
+    Exact for df = 1, 2; Cornish-Fisher expansion otherwise (error well
+    below 1e-3 for df >= 3 at the tail probabilities used here).
+    """
+    if df == 1:
+        return math.tan(math.pi * (p - 0.5))
+    if df == 2:
+        return (2 * p - 1) / math.sqrt(2 * p * (1 - p))
+    z = NormalDist().inv_cdf(p)
+    z2 = z * z
+    g1 = (z2 + 1) * z / 4
+    g2 = ((5 * z2 + 16) * z2 + 3) * z / 96
+    g3 = (((3 * z2 + 19) * z2 + 17) * z2 - 15) * z / 384
+    g4 = ((((79 * z2 + 776) * z2 + 1482) * z2 - 1920) * z2 - 945) * z / 92160
+    return z + g1 / df + g2 / df ** 2 + g3 / df ** 3 + g4 / df ** 4
+
+
+def confidence_interval(rewards: List[float], alpha: float) -> Tuple[float, float]:
+    """Two-sided (1 - alpha) Student-t interval on the mean of `rewards` (at least 2)."""
+    n = len(rewards)
+    mean = sum(rewards) / n
+    variance = sum((r - mean) ** 2 for r in rewards) / (n - 1)
+    half_width = t_quantile(1 - alpha / 2, n - 1) * math.sqrt(variance / n)
+    return mean - half_width, mean + half_width
+
+
+def check(rewards: List[float], claimed_reward: float, threshold: float, test: SequentialTest) -> SequentialDecision:
+    """
+    Compare the confidence interval of `rewards` with the acceptance band.
+
+    Args:
+        rewards: Episode rewards so far (at least 2)
+        claimed_reward: Claimed mean reward
+        threshold: Half-width of the acceptance band
+        test: Sequential settings (error rate and budget)
+    """
+    n = len(rewards)
+    mean = sum(rewards) / n
+    lower, upper = confidence_interval(rewards, test.error_rate / test.max_looks)
+
+    band_low, band_high = claimed_reward - threshold, claimed_reward + threshold
+    if band_low <= lower and upper <= band_high:
+        return SequentialDecision(True, True, (lower, upper))
+    if upper < band_low or lower > band_high:
+        return SequentialDecision(True, False, (lower, upper))
+    if n >= test.max_episodes:
+        return SequentialDecision(True, abs(claimed_reward - mean) <= threshold, (lower, upper))
+    return SequentialDecision(False, None, (lower, upper))
@@ -24,14 +24,36 @@ TODO: Google Cloud Integration
 - Cloud Logging: Structured verification audit logs
 """
 
-from typing import NamedTuple, Optional
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
 from enum import Enum
 import hashlib
+import threading
 
 from src.agent.runner import PolicyClaim
 from src.agent.policy import deserialize_policy, Policy
 from src.agent.state import discretize_state
-from src.environments.cyber_env import CyberDefenseEnv
+from src.agent.trajectory import TrajectoryDigest, TrajectoryRecorder, first_divergence
+from src.environments.base_env import BaseEnv
+from src.environments.env_spec import EnvSpec, env_registry
+from src.verifier.sequential import SequentialTest, check as sequential_check, confidence_interval
+from src.shared.config import VERIFY_SEQUENTIAL_ERROR_RATE, VERIFY_BATCH_EPISODES
+
+
+# Bump whenever replay logic changes (episodes, discretization, defaults for
+# unseen states, ...): cached verification results of older versions no
+# longer apply
+VERIFIER_VERSION = "1"
+
+# Replay episodes averaged per verification
+VERIFICATION_EPISODES = 20
+
+
+# Progress callback: receives one dict per replay batch (see PolicyVerifier.verify)
+ProgressCallback = Callable[[Dict], None]
+
+
+class VerificationCancelled(Exception):
+    """Raised by verify() when its cancel event is set mid-replay."""
 
 
 class VerificationStatus(Enum):
@@ -40,6 +62,24 @@ class VerificationStatus(Enum):
     INVALID = "INVALID"
 
 
+class Divergence(NamedTuple):
+    """
+    First step at which a replay departs from a claimed trajectory.
+    
+    state/action/reward are what the verifier's replay did at that step
+    (None if the replay ended before it).
+    """
+    step: int  # 1-based
+    expected_hash: Optional[str]  # Claimed step hash (None past the claimed episode)
+    actual_hash: Optional[str]  # Replayed step hash (None past the replayed episode)
+    state: Optional[Tuple]
+    action: Optional[int]
+    reward: Optional[float]
+    
+    def to_dict(self) -> Dict:
+        return dict(self._asdict(), state=list(self.state) if self.state is not None else None)
+
+
 class VerificationResult(NamedTuple):
     """
     Authoritative verification result.
@@ -51,6 +91,9 @@ class VerificationResult(NamedTuple):
     verified_reward: Optional[float]  # None if verification failed before replay
     status: VerificationStatus
     reason: str  # Human-readable explanation
+    episodes: Optional[int] = None  # Replay episodes consumed (0 = cached replay)
+    confidence_interval: Optional[Tuple[float, float]] = None  # Sequential mode only
+    divergence: Optional[Divergence] = None  # INVALID claims with a trajectory digest only
     
     def __repr__(self) -> str:
         return (
@@ -59,11 +102,34 @@ class VerificationResult(NamedTuple):
             f"  policy_hash='{self.policy_hash[:16]}...',\n"
             f"  status={self.status.value},\n"
             f"  verified_reward={self.verified_reward},\n"
+            f"  episodes={self.episodes},\n"
             f"  reason='{self.reason}'\n"
             f")"
         )
 
 
+def _check_cancelled(cancel: Optional[threading.Event]) -> None:
+    if cancel is not None and cancel.is_set():
+        raise VerificationCancelled("Verification cancelled")
+
+
+def _report_progress(
+    progress: Optional[ProgressCallback],
+    rewards: List[float],
+    max_episodes: int,
+    interval: Optional[Tuple[float, float]]
+) -> None:
+    if progress is None:
+        return
+    progress({
+        "episodes": len(rewards),
+        "max_episodes": max_episodes,
+        "running_mean": sum(rewards) / len(rewards),
+        "ci_lower": interval[0] if interval else None,
+        "ci_upper": interval[1] if interval else None,
+    })
+
+
 class PolicyVerifier:
     """
     Deterministic policy verifier.
@@ -79,13 +145,15 @@ class PolicyVerifier:
     - Does NOT write to ledger directly
     - Does NOT retry failed claims automatically
     - Does NOT ask agents for clarification
-    - Does NOT store verification history
+    - Does NOT store verification history (an optional cache keeps
+      replay rewards only; every claim is still compared afresh)
     - Does NOT adjust thresholds dynamically
     
     Verifier is a judge, not a coach.
     """
     
-    def __init__(self, reward_threshold: float = 1e-6):
+    def __init__(self, reward_threshold: float = 1e-6, scenario_bank=None, cache=None,
+                 sequential: Optional[SequentialTest] = None):
         """
         Initialize verifier.
         
@@ -96,10 +164,30 @@ class PolicyVerifier:
                             Recommendations:
                             - Fully deterministic env: 0.0
                             - Floating-point noise: 1e-6
+            scenario_bank: Optional ScenarioBank with pre-generated scenarios.
+                          Seeds it covers are replayed from the bank (identical
+                          results, no per-episode scenario generation).
+            cache: Optional VerificationCache; a replay already done for the
+                   same (policy hash, env, episodes, verifier version) is
+                   reused and only the claim comparison is re-run
+            sequential: Optional SequentialTest; replay in batches and stop as
+                        soon as a confidence interval on the mean reward lies
+                        entirely inside or outside claimed ± reward_threshold
+                        (see src.verifier.sequential)
         """
+        if sequential is not None:
+            sequential.validate()
         self.reward_threshold = reward_threshold
+        self.scenario_bank = scenario_bank
+        self.cache = cache
+        self.sequential = sequential
     
-    def verify(self, claim: PolicyClaim) -> VerificationResult:
+    def verify(
+        self,
+        claim: PolicyClaim,
+        progress: Optional[ProgressCallback] = None,
+        cancel: Optional[threading.Event] = None
+    ) -> VerificationResult:
         """
         Verify a policy claim.
         
@@ -107,10 +195,17 @@ class PolicyVerifier:
         
         Args:
             claim: PolicyClaim from submission collector
+            progress: Optional callback, called after every replay batch with
+                      {"episodes", "max_episodes", "running_mean",
+                       "ci_lower", "ci_upper"} (episodes include cached ones)
+            cancel: Optional event; once set, replay stops at the next episode
         
         Returns:
             VerificationResult with binary decision
         
+        Raises:
+            VerificationCancelled: If `cancel` was set before the decision
+        
         Process:
             1. Validate policy hash
             2. Load policy artifact
@@ -123,9 +218,13 @@ class PolicyVerifier:
         if hash_result is not None:
             return hash_result
         
-        # Step 2: Load policy artifact
+        # Step 2: Load policy artifact (validated against the env's state space)
         try:
-            policy = self._load_policy(claim.policy_artifact)
+            spec = EnvSpec.parse(claim.env_id)
+        except ValueError:
+            spec = None  # Reported as a replay failure below
+        try:
+            policy = self._load_policy(claim.policy_artifact, spec)
         except Exception as e:
             return VerificationResult(
                 agent_id=claim.agent_id,
@@ -135,9 +234,31 @@ class PolicyVerifier:
                 reason=f"Policy cannot be deterministically replayed: {str(e)}"
             )
         
-        # Step 3: Replay policy in environment
+        # Step 3: Replay policy in environment (or reuse an identical replay)
+        cached_reward = None
+        if self.cache is not None and self.sequential is None:
+            cached_reward = self.cache.get(claim.policy_hash, claim.env_id, VERIFICATION_EPISODES)
+        episodes = 0
         try:
-            verified_reward = self._replay_policy(claim.env_id, policy)
+            if self.sequential is not None:
+                return self._with_divergence(claim, self._verify_sequential(claim, policy, progress, cancel))
+            if cached_reward is not None:
+                verified_reward = cached_reward
+            else:
+                on_episode = None
+                if progress is not None or cancel is not None:
+                    def on_episode(rewards: List[float]) -> None:
+                        _check_cancelled(cancel)
+                        if len(rewards) % VERIFY_BATCH_EPISODES == 0 or len(rewards) == VERIFICATION_EPISODES:
+                            _report_progress(progress, rewards, VERIFICATION_EPISODES,
+                                             confidence_interval(rewards, VERIFY_SEQUENTIAL_ERROR_RATE)
+                                             if len(rewards) > 1 else None)
+                verified_reward = self._replay_policy(claim.env_id, policy, on_episode)
+                episodes = VERIFICATION_EPISODES
+                if self.cache is not None:
+                    self.cache.put(claim.policy_hash, claim.env_id, VERIFICATION_EPISODES, verified_reward)
+        except VerificationCancelled:
+            raise
         except Exception as e:
             return VerificationResult(
                 agent_id=claim.agent_id,
@@ -147,12 +268,74 @@ class PolicyVerifier:
                 reason=f"Replay failed: {str(e)}"
             )
         
-        # Step 4: Compare rewards
-        return self._compare_rewards(
+        # Step 4: Compare rewards (INVALID: locate where the claimed episode went another way)
+        return self._with_divergence(claim, self._compare_rewards(
             claim.agent_id,
             claim.policy_hash,
             claim.claimed_reward,
             verified_reward
+        )._replace(episodes=episodes))
+    
+    def _verify_sequential(
+        self,
+        claim: PolicyClaim,
+        policy: Policy,
+        progress: Optional[ProgressCallback] = None,
+        cancel: Optional[threading.Event] = None
+    ) -> VerificationResult:
+        """
+        Replay in batches until the confidence interval decides the claim.
+        
+        Episode rewards are cached per (policy, env): a later claim starts
+        from them and only replays more episodes if they do not decide it.
+        
+        Raises:
+            Exception if replay fails (handled by verify())
+        """
+        test = self.sequential
+        spec = EnvSpec.parse(claim.env_id)
+        rewards: List[float] = []
+        if self.cache is not None:
+            rewards = list(self.cache.get_episode_rewards(claim.policy_hash, claim.env_id) or [])
+        cached_episodes = len(rewards)
+        target = max(test.min_episodes, cached_episodes)
+        while True:
+            while len(rewards) < target:
+                _check_cancelled(cancel)
+                rewards.append(self._replay_episode(spec, policy))
+            decision = sequential_check(rewards, claim.claimed_reward, self.reward_threshold, test)
+            _report_progress(progress, rewards, test.max_episodes, decision.interval)
+            if decision.decided:
+                break
+            target = min(target + test.batch_episodes, test.max_episodes)
+        
+        if self.cache is not None and len(rewards) > cached_episodes:
+            self.cache.put_episode_rewards(claim.policy_hash, claim.env_id, rewards)
+        
+        verified_reward = sum(rewards) / len(rewards)
+        lower, upper = decision.interval
+        if decision.valid:
+            status = VerificationStatus.VALID
+            reason = (
+                f"Claimed reward reproducible under deterministic replay "
+                f"({len(rewards)} episodes, mean interval [{lower:.3f}, {upper:.3f}] "
+                f"within {claim.claimed_reward:.3f} ± {self.reward_threshold})"
+            )
+        else:
+            status = VerificationStatus.INVALID
+            reason = (
+                f"Claimed reward not reproducible under deterministic replay "
+                f"({len(rewards)} episodes). Claimed: {claim.claimed_reward:.3f}, "
+                f"Verified: {verified_reward:.3f}, interval [{lower:.3f}, {upper:.3f}]"
+            )
+        return VerificationResult(
+            agent_id=claim.agent_id,
+            policy_hash=claim.policy_hash,
+            verified_reward=verified_reward,
+            status=status,
+            reason=reason,
+            episodes=len(rewards) - cached_episodes,
+            confidence_interval=(lower, upper)
         )
     
     # =========================================================================
@@ -188,7 +371,7 @@ class PolicyVerifier:
         
         return None  # Hash is valid
     
-    def _load_policy(self, policy_artifact: bytes) -> Policy:
+    def _load_policy(self, policy_artifact: bytes, spec: Optional[EnvSpec] = None) -> Policy:
         """
         Turn submitted policy artifact into executable decision function.
         
@@ -209,6 +392,7 @@ class PolicyVerifier:
         
         Args:
             policy_artifact: Serialized policy bytes
+            spec: Environment the policy claims to act in (default: cyber defense)
         
         Returns:
             Reconstructed policy {state: action}
@@ -226,14 +410,14 @@ class PolicyVerifier:
         if len(policy) == 0:
             raise ValueError("Policy cannot be empty")
         
-        # Validate policy entries
+        # Validate policy entries against the environment's state/action space
+        # (cyber defense: 5-tuples, actions 0-4 IGNORE .. ISOLATE_SERVICE)
+        factory = (spec or EnvSpec.cyber(0, 1)).factory
         for state, action in policy.items():
-            # State must be tuple of 5 integers for cyber defense environment
-            if not isinstance(state, tuple) or len(state) != 5:
+            if not isinstance(state, tuple) or len(state) != factory.state_size:
                 raise ValueError(f"Invalid state format: {state}")
             
-            # Action must be 0-4 (IGNORE, MONITOR, RATE_LIMIT, BLOCK_IP, ISOLATE_SERVICE)
-            if action not in [0, 1, 2, 3, 4]:
+            if action not in range(factory.num_actions):
                 raise ValueError(f"Invalid action: {action}")
         
         return policy
@@ -242,7 +426,29 @@ class PolicyVerifier:
     # COMPONENT 2: REPLAY ENGINE (MOST IMPORTANT)
     # =========================================================================
     
-    def _replay_policy(self, env_id: str, policy: Policy) -> float:
+    def replay(self, env_id: str, policy: Policy, episodes: Optional[int] = None) -> float:
+        """
+        Deterministic replay reward of a policy (no claim, no threshold).
+        
+        Same replay as verify() uses, for callers that score policies
+        before claiming them (e.g. hyperparameter sweeps) or re-check
+        recorded rewards (ledger audits).
+        
+        Args:
+            episodes: Episodes to average (default: VERIFICATION_EPISODES)
+        """
+        if episodes is None:
+            return self._replay_policy(env_id, policy)
+        spec = EnvSpec.parse(env_id)
+        rewards = [self._replay_episode(spec, policy) for _ in range(episodes)]
+        return sum(rewards) / len(rewards)
+    
+    def _replay_policy(
+        self,
+        env_id: str,
+        policy: Policy,
+        on_episode: Optional[Callable[[List[float]], None]] = None
+    ) -> float:
         """
         Re-run simulated cyber defense environment using only the policy.
         
@@ -270,6 +476,8 @@ class PolicyVerifier:
         Args:
             env_id: Environment identifier (contains seed and config)
             policy: Loaded policy {state: action}
+            on_episode: Optional hook called with the rewards so far after
+                        each episode (may raise to abort the replay)
         
         Returns:
             Average accumulated reward across 20 episodes
@@ -277,84 +485,100 @@ class PolicyVerifier:
         Raises:
             Exception if replay fails or policy is incomplete
         """
-        # Parse environment ID to extract configuration
-        # Format: "cyber_defense_env_seed_{seed}_horizon_{time_horizon}"
-        seed, time_horizon = self._parse_env_id(env_id)
+        # Environment configuration (any registered env class, see EnvSpec)
+        spec = EnvSpec.parse(env_id)
         
         # Run multiple episodes to average out randomness
-        num_verification_episodes = 20
         episode_rewards = []
-        
-        for episode_num in range(num_verification_episodes):
-            # Create environment with exact same configuration
-            env = CyberDefenseEnv(
-                time_horizon=time_horizon,
-                seed=seed
-            )
-            
-            # Reset environment to initial state
-            state_dict = env.reset()
-            
-            # Accumulate total reward for this episode
-            episode_reward = 0.0
-            steps = 0
-            max_steps = time_horizon * 2  # Safety limit
-            
-            # Replay loop
-            while not env.done and steps < max_steps:
-                # Convert state dict to state tuple (discretized)
-                state_tuple = self._discretize_state(state_dict)
-                
-                # Ask policy for action
-                if state_tuple not in policy:
-                    # Default to IGNORE (action 0) for unseen states
-                    # This matches the behavior during deterministic evaluation in training
-                    action = 0
-                else:
-                    action = policy[state_tuple]
-                
-                # Apply action and observe result
-                state_dict, reward, done = env.step(action)
-                
-                # Accumulate reward
-                episode_reward += reward
-                steps += 1
-            
-            episode_rewards.append(episode_reward)
+        for _ in range(VERIFICATION_EPISODES):
+            episode_rewards.append(self._replay_episode(spec, policy))
+            if on_episode is not None:
+                on_episode(episode_rewards)
         
         # Return average reward across all episodes
         average_reward = sum(episode_rewards) / len(episode_rewards)
         return average_reward
     
-    def _parse_env_id(self, env_id: str) -> tuple[int, int]:
+    def _replay_episode(
+        self,
+        spec: EnvSpec,
+        policy: Policy,
+        recorder: Optional[TrajectoryRecorder] = None,
+        step_limit: Optional[int] = None
+    ) -> float:
         """
-        Parse environment ID to extract configuration.
+        Replay one episode greedily; returns its total reward.
         
         Args:
-            env_id: Environment identifier
-                   Format: "cyber_defense_env_seed_{seed}_horizon_{time_horizon}"
-        
-        Returns:
-            (seed, time_horizon)
-        
-        Raises:
-            ValueError if env_id format is invalid
+            spec: Environment to replay in
+            recorder: Optional TrajectoryRecorder fed every step
+            step_limit: Stop after this many steps (replay a prefix only)
         """
+        # Pristine environment with exact same configuration
+        env = self._acquire_env(spec)
         try:
-            # Example: "cyber_defense_env_seed_42_horizon_24"
-            parts = env_id.split("_")
+            return self._run_episode(env, spec, policy, recorder, step_limit)
+        finally:
+            if not self._banked(spec):
+                env_registry.release(spec, env)
+    
+    def _run_episode(
+        self,
+        env: BaseEnv,
+        spec: EnvSpec,
+        policy: Policy,
+        recorder: Optional[TrajectoryRecorder],
+        step_limit: Optional[int]
+    ) -> float:
+        # Reset environment to initial state
+        state_dict = env.reset()
+        
+        # Accumulate total reward for this episode
+        episode_reward = 0.0
+        steps = 0
+        max_steps = spec.horizon * 2  # Safety limit
+        if step_limit is not None:
+            max_steps = min(max_steps, step_limit)
+        
+        # Replay loop
+        while not env.done and steps < max_steps:
+            # Convert state dict to state tuple (discretized)
+            state_tuple = self._discretize_state(state_dict)
             
-            # Extract seed
-            seed_idx = parts.index("seed") + 1
-            seed = int(parts[seed_idx])
+            # Ask policy for action
+            if state_tuple not in policy:
+                # Default to IGNORE (action 0) for unseen states
+                # This matches the behavior during deterministic evaluation in training
+                action = 0
+            else:
+                action = policy[state_tuple]
             
-            # Extract time_horizon
-            horizon_idx = parts.index("horizon") + 1
-            time_horizon = int(parts[horizon_idx])
+            # Apply action and observe result
+            state_dict, reward, done = env.step(action)
+            if recorder is not None:
+                recorder.record(state_tuple, action, reward)
             
-            return seed, time_horizon
-        except (ValueError, IndexError) as e:
-            raise ValueError(f"Invalid environment ID format: {env_id}") from e
+            # Accumulate reward
+            episode_reward += reward
+            steps += 1
+        
+        return episode_reward
+    
+    def trajectory_digest(self, env_id: str, policy: Policy) -> TrajectoryDigest:
+        """Digest of one greedy replay episode."""
+        recorder = TrajectoryRecorder()
+        self._replay_episode(EnvSpec.parse(env_id), policy, recorder)
+        return recorder.digest()
+    
+    def _banked(self, spec: EnvSpec) -> bool:
+        return (self.scenario_bank is not None and spec.env_class == "cyber_defense"
+                and self.scenario_bank.covers(spec.seed, spec.horizon))
+    
+    def _acquire_env(self, spec: EnvSpec) -> BaseEnv:
+        """Pristine replay environment: from the scenario bank when it covers the spec, else the env cache."""
+        if self._banked(spec):
+            return self.scenario_bank.make_env(spec.seed)
+        return env_registry.acquire(spec)
     
     def _discretize_state(self, state_dict: dict) -> tuple:
         """
@@ -437,25 +661,97 @@ class PolicyVerifier:
         Verify that replay is deterministic by running multiple times.
         
         This is a sanity check, not part of normal verification flow.
+        Each run replays ONE episode and compares trajectory digests, which
+        catches any step-level difference (not just a different total).
         
         Args:
             claim: PolicyClaim to verify
             num_runs: Number of replay runs
         
         Returns:
-            True if all runs produce identical reward, False otherwise
+            True if all runs produce identical trajectories, False otherwise
         """
         # Load policy once
-        policy = self._load_policy(claim.policy_artifact)
+        policy = self._load_policy(claim.policy_artifact, EnvSpec.parse(claim.env_id))
         
-        # Run replay multiple times
-        rewards = []
-        for _ in range(num_runs):
-            reward = self._replay_policy(claim.env_id, policy)
-            rewards.append(reward)
+        first = self.trajectory_digest(claim.env_id, policy)
+        return all(
+            self.trajectory_digest(claim.env_id, policy).matches(first)
+            for _ in range(num_runs - 1)
+        )
+    
+    def _with_divergence(self, claim: PolicyClaim, result: VerificationResult) -> VerificationResult:
+        """
+        Explain an INVALID result with the claim's trajectory digest, if it has one.
         
-        # Check if all rewards are identical
-        return len(set(rewards)) == 1
+        Either the replay departs from the claimed episode (the divergent step
+        is attached), or it reproduces the episode and only the claimed
+        reward is wrong.
+        """
+        if result.status != VerificationStatus.INVALID or claim.trajectory is None:
+            return result
+        try:
+            divergence = self.locate_divergence(claim)
+        except Exception as e:
+            print(f"⚠ Could not locate divergence for {claim.agent_id}: {e}")
+            return result
+        if divergence is None:
+            return result._replace(reason=f"{result.reason}. Replay reproduces the claimed trajectory; "
+                                          f"only the claimed reward differs")
+        return result._replace(
+            reason=f"{result.reason}. Replay first diverges from the claimed trajectory at step {divergence.step}",
+            divergence=divergence
+        )
+    
+    def locate_divergence(self, claim: PolicyClaim) -> Optional[Divergence]:
+        """
+        Find the first step where replay departs from the claimed trajectory.
+        
+        Bisects over the claim's per-step hashes; every probe replays only
+        the prefix up to the probed step.
+        
+        Args:
+            claim: PolicyClaim carrying a trajectory digest
+        
+        Returns:
+            None if replay reproduces the claimed trajectory, else the
+            first divergent step
+        
+        Raises:
+            ValueError: If the claim has no trajectory digest
+        """
+        if claim.trajectory is None:
+            raise ValueError(f"Claim from {claim.agent_id} carries no trajectory digest")
+        spec = EnvSpec.parse(claim.env_id)
+        policy = self._load_policy(claim.policy_artifact, spec)
+        prefixes: dict = {}
+        
+        def replay_prefix(step: int) -> TrajectoryRecorder:
+            if step not in prefixes:
+                recorder = TrajectoryRecorder()
+                self._replay_episode(spec, policy, recorder, step_limit=step)
+                prefixes[step] = recorder
+            return prefixes[step]
+        
+        def probe(step: int) -> Optional[str]:
+            return replay_prefix(step).digest().step_hash(step)
+        
+        steps = claim.trajectory.steps
+        step = first_divergence(steps, claim.trajectory.step_hash, probe)
+        if step is None:
+            if replay_prefix(steps + 1).steps == steps:
+                return None  # Same steps and the replay ends where the claim does
+            step = steps + 1  # Replay runs past the end of the claimed episode
+        recorder = replay_prefix(step)
+        state, action, reward = recorder.last_step if recorder.steps == step else (None, None, None)
+        return Divergence(
+            step=step,
+            expected_hash=claim.trajectory.step_hash(step),
+            actual_hash=recorder.digest().step_hash(step),
+            state=state,
+            action=action,
+            reward=reward
+        )
 
 
 # =============================================================================
@@ -0,0 +1,45 @@
+"""
+Shared Test Helpers
+
+- ChainEnv: tiny deterministic environment for TD/planning update tests
+  (import it: `from conftest import ChainEnv`)
+- no_sleep: fixture that makes asyncio.sleep return immediately, so live
+  training sessions run without their per-episode pacing delay
+- yield_only: like no_sleep, but still yields to the event loop, so
+  concurrent sessions interleave every episode
+"""
+
+import asyncio
+
+import pytest
+
+
+class ChainEnv:
+    """Three steps, reward 10 on the last one; states are the step index."""
+
+    def reset(self):
+        self.t = 0
+        return 0
+
+    def step(self, action):
+        self.t += 1
+        done = self.t == 3
+        return self.t, (10.0 if done else 0.0), done
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    async def _no_sleep(_delay):
+        return None
+
+    monkeypatch.setattr(asyncio, "sleep", _no_sleep)
+
+
+@pytest.fixture
+def yield_only(monkeypatch):
+    real_sleep = asyncio.sleep
+
+    async def _yield_only(_delay):
+        await real_sleep(0)  # Still switch tasks every episode
+
+    monkeypatch.setattr(asyncio, "sleep", _yield_only)
@@ -0,0 +1,147 @@
+"""
+Training Checkpoint Tests
+
+Tests for saving, pausing and resuming live training sessions.
+
+Test coverage:
+1. Q-tables and replay buffer round-trip exactly (order included)
+2. Checkpoint + resume reproduces an uninterrupted run bit-exactly
+3. Pause writes a checkpoint, frees memory and can be resumed
+4. Checkpoint size and write latency are reported
+5. Agent ids cannot place checkpoints outside the checkpoint directory
+6. A failed pause checkpoint keeps the session in memory and reports the error
+"""
+
+import asyncio
+import random
+
+from src.agent.double_q_learning import ExperienceReplay
+from src.training.checkpoint import decode_q_table, decode_replay, encode_q_table, encode_replay, replay_meta
+from src.training import live_trainer
+from src.training.live_trainer import LiveTrainingManager, agent_file_stem
+
+
+CONFIG = {"auto_stop": False, "checkpoint_every": 0}
+
+
+async def _ignore(_data):
+    return None
+
+
+def _run(manager, seed=5, max_episodes=40, config=CONFIG):
+    asyncio.run(manager.start_training(
+        agent_id="ckpt_agent", seed=seed, max_episodes=max_episodes,
+        callback=_ignore, config=dict(config), env_type="short_burst",
+    ))
+    return manager.get_session_state("ckpt_agent")
+
+
+def test_tables_and_replay_round_trip():
+    """Encoding keeps values, types and order."""
+    q_table = {((2, 0, 1, 1, 0), 3): 1.25, ((0, 0, 0, 0, 1), 0): -7.5}
+    restored = decode_q_table(*encode_q_table(q_table))
+    assert list(restored.items()) == list(q_table.items())
+
+    buffer = ExperienceReplay(max_size=3, batch_size=2, min_size=1)
+    for i in range(5):
+        buffer.add((i % 3, 0, 1, 0, 1), i % 5, i * 0.1, (0, 1, 2, 1, 0), i == 4)
+    restored = decode_replay(encode_replay(buffer), replay_meta(buffer))
+    assert list(restored.buffer) == list(buffer.buffer)
+    assert restored.buffer.maxlen == 3
+
+
+def test_resume_is_bit_exact(tmp_path, no_sleep):
+    """20 + 20 episodes via checkpoint == 40 episodes straight."""
+
+    straight = _run(LiveTrainingManager(tmp_path / "a"), max_episodes=40)
+
+    manager = LiveTrainingManager(tmp_path / "b")
+    first = _run(manager, max_episodes=20, config={**CONFIG, "checkpoint_every": 20})
+    assert first.checkpoints_written >= 1
+
+    random.seed(999)  # The global RNG must not matter
+    asyncio.run(manager.resume_training("ckpt_agent", _ignore, max_episodes=40))
+    resumed = manager.get_session_state("ckpt_agent")
+
+    assert resumed.episodes_completed == 40
+    assert list(resumed.q_table_a.items()) == list(straight.q_table_a.items())
+    assert list(resumed.q_table_b.items()) == list(straight.q_table_b.items())
+    assert list(resumed.replay_buffer.buffer) == list(straight.replay_buffer.buffer)
+    assert resumed.epsilon == straight.epsilon
+    assert [m.reward for m in resumed.metrics_history[-20:]] == [m.reward for m in straight.metrics_history[-20:]]
+
+
+def test_pause_frees_memory_and_resumes(tmp_path, no_sleep):
+    """Pausing checkpoints the session; resume picks up the episode counter."""
+    manager = LiveTrainingManager(tmp_path)
+
+    async def pause_after_ten(data):
+        if data["type"] == "training_update" and data["metrics"]["episode"] == 9:
+            manager.pause_training("ckpt_agent")
+
+    asyncio.run(manager.start_training(
+        agent_id="ckpt_agent", seed=1, max_episodes=None,
+        callback=pause_after_ten, config=dict(CONFIG),
+    ))
+    paused = manager.get_session_state("ckpt_agent")
+    assert paused.status == "paused"
+    assert paused.replay_buffer is None and paused.q_table_a == {}
+    assert paused.checkpoints_written == 1
+
+    asyncio.run(manager.resume_training("ckpt_agent", _ignore, max_episodes=15))
+    resumed = manager.get_session_state("ckpt_agent")
+    assert resumed.status == "completed"
+    assert resumed.episodes_completed == 15
+    assert resumed.metrics_history[-1].episode == 14
+
+
+def test_checkpoint_stats_reported(tmp_path, no_sleep):
+    """Sessions report checkpoint size and write latency."""
+    manager = LiveTrainingManager(tmp_path)
+    state = _run(manager, max_episodes=10, config={**CONFIG, "checkpoint_every": 5})
+
+    stats = manager.get_all_sessions()["ckpt_agent"]
+    assert stats["checkpoints_written"] == state.checkpoints_written >= 2
+    assert stats["checkpoint_bytes"] == (tmp_path / "ckpt_agent.npz").stat().st_size
+    assert stats["checkpoint_write_ms"] > 0
+
+
+def test_checkpoint_paths_stay_in_checkpoint_dir(tmp_path):
+    """Unsafe agent ids are hashed; safe ones keep their readable file name."""
+    manager = LiveTrainingManager(tmp_path / "checkpoints")
+    assert manager.checkpoint_path_for("agent_7.v2").name == "agent_7.v2.npz"
+
+    for agent_id in ("../../etc/passwd", "..", "/tmp/x", "a/b", "a\\..\\b", ".hidden", "", "x" * 200):
+        path = manager.checkpoint_path_for(agent_id)
+        assert path.parent == manager.checkpoint_dir, agent_id
+        assert path.name.startswith("~")
+    assert agent_file_stem("../a") != agent_file_stem("../b")
+
+
+def test_failed_pause_checkpoint_keeps_state(tmp_path, no_sleep, monkeypatch):
+    """Without a checkpoint on disk the session is not freed; the error reaches the client."""
+    manager = LiveTrainingManager(tmp_path)
+    messages = []
+
+    def failing_write(path, arrays):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(live_trainer, "write_checkpoint", failing_write)
+
+    async def pause_after_five(data):
+        messages.append(data)
+        if data["type"] == "training_update" and data["metrics"]["episode"] == 4:
+            manager.pause_training("ckpt_agent")
+
+    asyncio.run(manager.start_training(
+        agent_id="ckpt_agent", seed=1, max_episodes=None,
+        callback=pause_after_five, config=dict(CONFIG),
+    ))
+    state = manager.get_session_state("ckpt_agent")
+    assert state.status == "error"
+    assert "disk full" in state.stop_reason
+    assert state.q_table_a and state.replay_buffer is not None and state.monitor is not None
+    assert state.checkpoints_written == 0
+    errors = [m for m in messages if m["type"] == "error"]
+    assert len(errors) == 1 and "disk full" in errors[0]["error"]
+    assert messages[-1]["type"] == "training_complete" and messages[-1]["status"] == "error"
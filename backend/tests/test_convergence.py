@@ -0,0 +1,173 @@
+"""
+Convergence Monitor Tests
+
+Tests for O(1) rolling statistics and pluggable stopping rules.
+
+Test coverage:
+1. RollingStats matches a from-scratch mean/stddev over the window
+2. Greedy change tracker counts flips and stable streaks
+3. Each stopping rule fires on its own signal and reports a reason
+4. train() reports which rule stopped it; greedy tracking is only installed when a rule needs it
+5. Live sessions stop on policy stability and record the reason
+"""
+
+import asyncio
+import random
+
+import pytest
+
+from src.agent.convergence import (
+    ConvergenceMonitor,
+    GreedyChangeTracker,
+    PolicyStableRule,
+    RewardPlateauRule,
+    RollingStats,
+    TDErrorRule,
+    greedy_single_q,
+)
+from src.agent import trainer
+from src.agent.trainer import train
+from src.environments.cyber_env import CyberDefenseEnv
+from src.training.live_trainer import LiveTrainingManager
+
+
+def test_rolling_stats_match_recomputation():
+    """Windowed Welford equals the two-pass formula at every step."""
+    rng = random.Random(0)
+    stats = RollingStats(window=25)
+    values = []
+
+    for _ in range(300):
+        value = rng.uniform(-50, 50)
+        values.append(value)
+        stats.push(value)
+
+        recent = values[-25:]
+        mean = sum(recent) / len(recent)
+        std = (sum((v - mean) ** 2 for v in recent) / len(recent)) ** 0.5
+        assert stats.mean == pytest.approx(mean, abs=1e-9)
+        assert stats.std == pytest.approx(std, abs=1e-9)
+
+    assert stats.count == 25 and stats.full
+
+
+def test_greedy_change_tracker():
+    """Only updates that flip the greedy action count as changes."""
+    q_table = {}
+    tracker = GreedyChangeTracker(greedy_single_q(q_table, [0, 1]))
+
+    q_table[("s", 0)] = 1.0
+    tracker.after_update("s")        # first sighting counts
+    q_table[("s", 0)] = 2.0
+    tracker.after_update("s")        # still action 0
+    assert tracker.end_episode() == 1
+
+    q_table[("s", 1)] = 5.0
+    tracker.after_update("s")        # flips to action 1
+    assert tracker.end_episode() == 1
+
+    q_table[("s", 0)] = 9.0
+    tracker.after_update("s")        # flips to 0 ...
+    q_table[("s", 0)] = 0.0
+    tracker.after_update("s")        # ... and back to 1 within the episode
+    assert tracker.end_episode() == 0
+    assert tracker.end_episode() == 0
+    assert tracker.stable_episodes == 2
+    assert tracker.total_flips == 4
+
+
+def test_stopping_rules_fire_with_reason():
+    """Each rule triggers on its own signal."""
+    plateau = ConvergenceMonitor([RewardPlateauRule(window=5, threshold=0.01)])
+    decisions = [plateau.end_episode(3.0) for _ in range(6)]
+    assert decisions[:5] == [None] * 5
+    assert decisions[5].rule == "reward_plateau"
+
+    td = ConvergenceMonitor([TDErrorRule(threshold=0.5, window=3)])
+    for error in (2.0, 0.1, 0.1):
+        td.record_update("s", error)
+        assert td.end_episode(0.0) is None
+    td.record_update("s", 0.1)
+    td.record_update("s", -0.2)
+    decision = td.end_episode(0.0)
+    assert decision is not None and decision.rule == "td_error"
+    assert decision.episode == 4
+
+    q_table = {("s", 0): 1.0}
+    stable = ConvergenceMonitor([PolicyStableRule(patience=3)], greedy_fn=greedy_single_q(q_table, [0, 1]))
+    stable.record_update("s", 0.0)
+    results = [stable.end_episode(0.0)]
+    for _ in range(3):
+        stable.record_update("s", 0.0)
+        results.append(stable.end_episode(0.0))
+    assert results[:3] == [None, None, None]
+    assert results[3].rule == "policy_stable"
+    assert "unchanged" in results[3].reason
+
+
+def test_train_reports_stop_reason():
+    """train() stops on a custom rule and says why."""
+    random.seed(0)
+    env = CyberDefenseEnv(time_horizon=12, seed=1)
+
+    _, _, stats = train(env, 500, stopping_rules=[PolicyStableRule(patience=3)])
+
+    assert stats["converged"]
+    assert stats["stop_rule"] == "policy_stable"
+    assert stats["episodes_trained"] < 500
+
+
+def test_train_tracks_greedy_policy_only_on_request(monkeypatch):
+    """The default reward-plateau rule runs without greedy tracking; learning is unaffected."""
+    calls = []
+
+    def counting_greedy(q_table, actions):
+        calls.append(len(q_table))
+        return greedy_single_q(q_table, actions)
+
+    monkeypatch.setattr(trainer, "greedy_single_q", counting_greedy)
+    plain, _, _ = train(CyberDefenseEnv(time_horizon=12, seed=1), 40, rng=random.Random(4))
+    assert calls == []
+
+    tracked, _, stats = train(CyberDefenseEnv(time_horizon=12, seed=1), 40, rng=random.Random(4),
+                              stopping_rules=[RewardPlateauRule(100, 0.01), PolicyStableRule(patience=1000)])
+    assert len(calls) == 1 and stats["episodes_trained"] == 40
+    assert tracked == plain
+
+
+def test_train_without_stop_has_no_reason():
+    """Running to the episode limit leaves stop_reason empty."""
+    env = CyberDefenseEnv(time_horizon=12, seed=1)
+
+    _, _, stats = train(env, 5)
+
+    assert not stats["converged"]
+    assert stats["stop_reason"] is None
+
+
+def test_live_session_auto_stops(tmp_path, no_sleep):
+    """A live session ends early once the policy is (tolerably) stable."""
+    manager = LiveTrainingManager(tmp_path)
+    updates = []
+
+    async def callback(data):
+        updates.append(data)
+
+    async def run():
+        await manager.start_training(
+            agent_id="auto_stop_agent",
+            seed=3,
+            max_episodes=2000,
+            callback=callback,
+            config={"convergence_patience": 3, "convergence_max_changes": 10},
+            env_type="short_burst",
+        )
+
+    asyncio.run(run())
+
+    state = manager.get_session_state("auto_stop_agent")
+    assert state.status == "completed"
+    assert state.stop_reason.startswith("policy_stable")
+    assert state.stopped_at_episode < 2000
+    assert updates[-1]["type"] == "training_complete"
+    assert updates[-1]["stop_reason"] == state.stop_reason
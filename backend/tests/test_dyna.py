@@ -0,0 +1,97 @@
+"""
+Dyna-Q Planning Tests
+
+Tests for the learned tabular model and simulated planning updates.
+
+Test coverage:
+1. The model keeps visit counts, mean rewards and outcome frequencies
+2. Planning moves a terminal reward further back than one-step updates alone
+3. Live sessions report real vs planned updates and resume the model from checkpoints
+"""
+
+import asyncio
+import random
+
+from src.agent.dyna import DynaPlanner, TabularModel
+from src.agent.multistep import MultiStepLearner
+from src.agent.trainer import train, train_episode
+from src.environments.cyber_env import CyberDefenseEnv
+from src.training.checkpoint import read_checkpoint
+from src.training.live_trainer import LiveTrainingManager
+
+from conftest import ChainEnv
+
+
+def test_model_statistics_and_sampling():
+    """Mean reward per pair; outcomes sampled in proportion to their counts."""
+    model = TabularModel()
+    model.observe((0,), 1, 2.0, (1,), False)
+    model.observe((0,), 1, 4.0, (1,), False)
+    model.observe((0,), 1, 0.0, (2,), True)
+    model.observe((5,), 0, 1.0, (5,), False)
+
+    assert len(model) == 2
+    assert model.visits == [3, 1]
+    assert model.outcome_counts[0] == [2, 1]
+
+    rng = random.Random(0)
+    samples = [model.sample(rng) for _ in range(4000)]
+    from_zero = [s for s in samples if s[0] == (0,)]
+    assert all(s[2] == 2.0 for s in from_zero)
+    terminal_share = sum(1 for s in from_zero if s[4]) / len(from_zero)
+    assert 0.28 < terminal_share < 0.39
+
+    restored = TabularModel.from_state_dict(model.state_dict())
+    assert restored.pairs == model.pairs and restored.outcomes == model.outcomes
+
+
+def test_planning_propagates_reward():
+    """One real episode plus planning reaches state 0; one-step alone does not."""
+    def value(q_table, state):
+        return max(q_table.get((state, a), 0.0) for a in (0, 1))
+
+    q_table = {}
+    train_episode(ChainEnv(), q_table, 0.0, discretize_fn=lambda s: s, alpha=1.0, gamma=1.0,
+                  rng=random.Random(0))
+    assert value(q_table, 0) == 0.0
+
+    for episode_fn in (train_episode, MultiStepLearner("n_step", n_step=1).run_episode):
+        planner = DynaPlanner(50)
+        q_table = {}
+        for _ in range(2):
+            episode_fn(ChainEnv(), q_table, 0.0, discretize_fn=lambda s: s, alpha=1.0, gamma=1.0,
+                       rng=random.Random(0), planner=planner)
+        assert value(q_table, 0) == 10.0
+        assert planner.real_updates == 6 and planner.planned_updates == 300
+
+    _, _, stats = train(CyberDefenseEnv(time_horizon=12, seed=1), 10, stopping_rules=[],
+                        rng=random.Random(1), planning_steps=5)
+    assert stats['planned_updates'] == 5 * stats['real_updates'] > 0
+
+
+def test_live_session_planning_counters(tmp_path, no_sleep):
+    """Metrics carry cumulative counters; a resumed session keeps its model."""
+    updates = []
+
+    async def collect(data):
+        updates.append(data)
+
+    manager = LiveTrainingManager(tmp_path)
+    asyncio.run(manager.start_training(
+        agent_id="dyna_live", seed=3, max_episodes=8, callback=collect,
+        config={"auto_stop": False, "checkpoint_every": 1000, "planning_steps": 4},
+        env_type="short_burst",
+    ))
+    metrics = [u["metrics"] for u in updates if u["type"] == "training_update"]
+    assert metrics[-1]["planned_updates"] == 4 * metrics[-1]["real_updates"] > 0
+    assert metrics[0]["real_updates"] < metrics[-1]["real_updates"]
+    final = updates[-1]
+    assert final["planning"]["planned_updates"] == metrics[-1]["planned_updates"]
+
+    saved = read_checkpoint(manager.checkpoint_path_for("dyna_live"))["meta"]["planner"]
+    assert saved["real_updates"] == metrics[-1]["real_updates"]
+
+    asyncio.run(manager.resume_training("dyna_live", collect, max_episodes=10))
+    state = manager.get_session_state("dyna_live")
+    assert state.planner.real_updates > saved["real_updates"]
+    assert len(state.planner.model) >= len(saved["model"]["pairs"])
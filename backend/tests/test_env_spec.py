@@ -0,0 +1,98 @@
+"""
+Environment Spec Tests
+
+Tests for typed environment specs and the cached environment registry.
+
+Test coverage:
+1. Env ids round-trip through EnvSpec; malformed and unknown ids are rejected
+   Presets with their own attack dynamics get their own env class and id
+2. Recycled instances replay exactly like freshly constructed environments
+3. The verifier replays registered non-cyber environments (EnergySlotEnv)
+"""
+
+import pytest
+
+from src.agent.policy import hash_policy, serialize_policy
+from src.agent.runner import PolicyClaim
+from src.agent.state import discretize_state
+from src.environments.cyber_env import CyberDefenseEnv
+from src.environments.energy_env import EnergySlotEnv
+from src.environments.env_presets import ENV_PRESETS
+from src.environments.env_spec import EnvRegistry, EnvSpec
+from src.verifier.verifier import PolicyVerifier, VerificationStatus
+
+
+def _rollout(env, actions):
+    env.reset()
+    trajectory = []
+    for action in actions:
+        if env.done:
+            break
+        trajectory.append(env.step(action))
+    return trajectory
+
+
+def test_env_id_round_trip():
+    """Specs produce the legacy id format and parse back; preset dynamics are part of the id."""
+    spec = EnvSpec.cyber(42, 24, preset="standard")
+    assert spec.env_id == "cyber_defense_env_seed_42_horizon_24"
+    assert EnvSpec.parse(spec.env_id) == spec.replay_key == EnvSpec.cyber(42, 24)
+
+    pressure = EnvSpec.cyber(42, 24, preset="high_pressure")
+    assert pressure.env_id == "cyber_defense_high_pressure_env_seed_42_horizon_24"
+    assert EnvSpec.parse(pressure.env_id) == pressure.replay_key
+    assert EnvSpec.cyber(42, 24, preset="no_such_preset").env_id == spec.env_id
+
+    registry = EnvRegistry()
+    standard_env, pressure_env = registry.make(spec), registry.make(pressure)
+    assert pressure_env.dynamics == ENV_PRESETS["high_pressure"].dynamics
+    assert (pressure_env.severity_schedule == 2).sum() > (standard_env.severity_schedule == 2).sum()
+
+    energy = EnvSpec("energy_slot", 7, 12)
+    assert EnvSpec.parse(energy.env_id) == energy
+    assert EnvSpec.from_env_config(3, {"time_horizon": 12, "env_type": "short_burst"}) == EnvSpec.cyber(3, 12, "short_burst")
+
+    for bad in ("cyber_defense_env_seed_x_horizon_24", "quantum_env_seed_1_horizon_5", "garbage"):
+        with pytest.raises(ValueError):
+            EnvSpec.parse(bad)
+
+
+def test_recycled_envs_replay_like_fresh_ones():
+    """A released env is restored (RNG and state) before it is handed out again."""
+    registry = EnvRegistry(max_specs=2, max_idle=1)
+    spec = EnvSpec.cyber(5, 12)
+    actions = [4, 3, 0, 2, 1, 4, 0, 0, 3, 2, 1, 4]
+    expected = _rollout(CyberDefenseEnv(time_horizon=12, seed=5), actions)
+
+    for _ in range(3):
+        with registry.env(spec) as env:
+            assert _rollout(env, actions) == expected
+    assert registry.built == 1 and registry.stats()["idle"] == 1
+
+    owned = registry.make(spec)
+    assert _rollout(owned, actions) == expected
+
+    registry.acquire(EnvSpec.cyber(6, 12))
+    registry.acquire(EnvSpec.cyber(7, 12))
+    assert registry.stats()["specs"] == 2  # Oldest spec evicted
+    assert registry.built == 3
+
+
+def test_verifier_replays_energy_env():
+    """An EnergySlotEnv claim verifies with no energy-specific verifier code."""
+    spec = EnvSpec("energy_slot", 9, 12)
+    policy = {}
+    env = EnergySlotEnv(time_slots=12, seed=9)
+    state = env.reset()
+    reward = 0.0
+    while not env.done:
+        key = discretize_state(state)
+        policy[key] = int(state["demand"])  # USE only when there is demand
+        state, r, _ = env.step(policy[key])
+        reward += r
+
+    artifact = serialize_policy(policy)
+    claim = PolicyClaim("energy_agent", spec.env_id, hash_policy(artifact), artifact, reward)
+    verifier = PolicyVerifier(reward_threshold=1e-6)
+    assert verifier.verify(claim).status == VerificationStatus.VALID
+    assert verifier.verify(claim._replace(claimed_reward=reward + 1)).status == VerificationStatus.INVALID
@@ -0,0 +1,68 @@
+"""
+Federated Training Tests
+
+Tests for visit-weighted Q-table aggregation across worker processes.
+
+Test coverage:
+1. Deltas carry only changed cells and reconstruct the worker table
+2. Aggregation is the visit-weighted mean of worker deltas
+3. A multi-process run is deterministic and accounts for every transition
+"""
+
+import numpy as np
+
+from src.training.federated import FederatedTrainer, QTableDelta, aggregate_deltas, encode_delta
+
+
+def test_delta_contains_only_changed_cells():
+    """Untouched cells are not sent; base + delta reproduces the local table."""
+    base = np.full((108, 5), 10.0)
+    local = base.copy()
+    visits = np.zeros((108, 5), dtype=np.int64)
+    local[3, 1], visits[3, 1] = 7.5, 4
+    local[50, 4], visits[50, 4] = 12.0, 1
+
+    delta = encode_delta(0, 0, local, base, visits)
+
+    assert delta.cells.tolist() == [3 * 5 + 1, 50 * 5 + 4]
+    assert delta.visits.tolist() == [4, 1]
+    rebuilt = base.copy().reshape(-1)
+    rebuilt[delta.cells] += delta.deltas
+    assert np.array_equal(rebuilt.reshape(108, 5), local)
+    assert delta.nbytes == 2 * (4 + 8 + 4)
+
+
+def test_aggregation_is_visit_weighted():
+    """A worker with 3× the visits pulls the cell 3× as hard."""
+    global_q = np.zeros((108, 5))
+    global_visits = np.zeros((108, 5), dtype=np.int64)
+
+    def delta(worker_id, cells, deltas, visits):
+        return QTableDelta(worker_id, 0, np.array(cells, dtype=np.int32), np.array(deltas, dtype=np.float64),
+                           np.array(visits, dtype=np.int32), 0.0, 0)
+
+    update = aggregate_deltas(global_q, global_visits, [
+        delta(1, [7, 9], [4.0, 1.0], [1, 2]),
+        delta(0, [7], [8.0], [3]),
+    ])
+
+    assert update.cells.tolist() == [7, 9]
+    assert global_q.reshape(-1)[7] == (3 * 8.0 + 1 * 4.0) / 4
+    assert global_q.reshape(-1)[9] == 1.0
+    assert update.values.tolist() == [7.0, 1.0]
+    assert global_visits.reshape(-1)[[7, 9]].tolist() == [4, 2]
+
+
+def test_federated_run_is_deterministic():
+    """Same seeds → same global table, whatever order workers report in."""
+    trainer = FederatedTrainer(rounds=3, episodes_per_round=5, time_horizon=12)
+    rounds = []
+
+    first = trainer.run([1, 2, 3], on_round=rounds.append)
+    second = trainer.run([1, 2, 3])
+
+    assert np.array_equal(first.q_values, second.q_values)
+    assert [r["round"] for r in rounds] == [0, 1, 2]
+    assert 0 < int(first.visits.sum()) == sum(r.transitions for r in first.rounds) <= 3 * 3 * 5 * 12
+    assert all(r.bytes_up < 3 * 108 * 5 * 16 for r in first.rounds)
+    assert first.policy()
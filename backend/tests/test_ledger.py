@@ -12,6 +12,8 @@ Test coverage:
 6. Empty ledger is valid
 7. Genesis entry has correct previous_hash
 8. Duplicate policy hashes allowed
+9. Concurrent appends keep one chain; append_if_absent records a policy once
+10. env_config is covered by the hash; legacy (v1) entries still verify
 """
 
 import pytest
@@ -404,6 +406,78 @@ def test_verify_chain_detects_manual_tampering():
     print(f"   Detection: hash mismatch")
 
 
+# =============================================================================
+# TEST 11: CONCURRENT APPENDS AND DEDUPLICATION
+# =============================================================================
+
+def test_concurrent_appends_and_append_if_absent(temp_ledger: PolicyLedger):
+    """
+    Test that appends from many threads never fork the chain, and that
+    append_if_absent records an (agent, policy) pair only once.
+    """
+    import threading
+    
+    def worker(i):
+        for j in range(10):
+            temp_ledger.append(f"{i}{j}".ljust(64, "c"), float(j), f"agent_{i}")
+        temp_ledger.append_if_absent("d" * 64, 20.0, "agent_shared")
+    
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    
+    assert temp_ledger.count() == 8 * 10 + 1
+    assert temp_ledger.verify_integrity() == (True, None)
+    assert PolicyLedger(temp_ledger.storage_path).verify_integrity() == (True, None)
+    
+    entry, appended = temp_ledger.append_if_absent("d" * 64, 99.0, "agent_shared")
+    assert not appended and entry.verified_reward == 20.0
+    _, appended = temp_ledger.append_if_absent("d" * 64, 20.0, "agent_other")
+    assert appended
+    
+    print("✅ Concurrent appends keep one chain; duplicates skipped")
+
+
+# =============================================================================
+# TEST 12: ENV CONFIG IS PART OF THE ENTRY HASH
+# =============================================================================
+
+def test_env_config_tamper_detected_and_legacy_entries_verify(temp_ledger: PolicyLedger):
+    """
+    Test that new entries hash their env_config, while entries written
+    before hash versioning (no hash_version field) still verify.
+    """
+    temp_ledger.append("a" * 64, 15.0, "agent_001", env_config={"env_id": "standard"})
+    entry = temp_ledger.read_all()[0]
+    assert entry.hash_version == 2 and entry.env_authenticated
+    
+    tampered = entry._replace(env_config={"env_id": "extended"})
+    is_valid, error = verify_chain_integrity([tampered])
+    assert not is_valid and "hash mismatch" in error.lower()
+    downgraded = entry._replace(hash_version=1)
+    assert not verify_chain_integrity([downgraded])[0]
+    
+    # A ledger file from before versioning: v1 hashes, no hash_version key
+    timestamp = "2025-12-28T12:00:00"
+    legacy = {
+        "policy_hash": "b" * 64, "verified_reward": 18.0, "agent_id": "agent_002",
+        "timestamp": timestamp, "previous_hash": "genesis",
+        "current_hash": compute_entry_hash("b" * 64, 18.0, "agent_002", timestamp, "genesis"),
+        "env_config": {"env_id": "standard"}
+    }
+    Path(temp_ledger.storage_path).write_text(json.dumps({"entries": [legacy]}))
+    
+    reloaded = PolicyLedger(temp_ledger.storage_path)
+    assert reloaded.verify_integrity() == (True, None)
+    assert reloaded.read_all()[0].hash_version == 1 and not reloaded.read_all()[0].env_authenticated
+    reloaded.append("c" * 64, 12.0, "agent_003", env_config={"env_id": "standard"})
+    assert PolicyLedger(temp_ledger.storage_path).verify_integrity() == (True, None)
+    
+    print("✅ env_config tampering detected; legacy entries still verify")
+
+
 # =============================================================================
 # MAIN (for manual testing)
 # =============================================================================
@@ -0,0 +1,145 @@
+"""
+Ledger Audit Tests
+
+Tests for bulk replay of ledger entries against their policy artifacts.
+
+Test coverage:
+1. Honest entries reproduce; a tampered recorded reward is flagged
+2. Missing artifacts, tampered artifacts and entries without an env id
+3. Process-pool and in-process audits agree; the report is streamed to JSONL
+4. Legacy entries whose env_id is outside the hash are flagged
+5. The chain is checked in the same pass over a one-shot stream (iter_entries)
+"""
+
+import json
+
+import pytest
+
+from src.agent.policy import deserialize_policy
+from src.agent.runner import run_agent
+from src.ledger.ledger import PolicyLedger, hash_entry, verify_chain_integrity
+from src.ledger.sqlite_ledger import SqlitePolicyLedger
+from src.ledger.policy_store import PolicyStore
+from src.verifier.audit import audit_entries, run_audit
+from src.verifier.verifier import PolicyVerifier
+
+
+@pytest.fixture(scope="module")
+def claims():
+    return [
+        run_agent(agent_id=f"audit_agent_{seed}", seed=seed, episodes=30, time_horizon=12)
+        for seed in (3, 4, 5)
+    ]
+
+
+@pytest.fixture
+def audited_ledger(claims, tmp_path):
+    """Store with every artifact and a ledger recording each verified reward."""
+    store = PolicyStore(tmp_path / "policies")
+    ledger = PolicyLedger(tmp_path / "ledger.json")
+    verifier = PolicyVerifier()
+    for claim in claims:
+        store.put_policy(deserialize_policy(claim.policy_artifact), claim.policy_hash, {"agent_id": claim.agent_id})
+        reward = verifier.verify(claim).verified_reward
+        ledger.append(claim.policy_hash, reward, claim.agent_id, env_config={"env_id": claim.env_id})
+    return store, ledger
+
+
+def test_honest_entries_pass_and_tampered_reward_flagged(audited_ledger):
+    """Recorded rewards reproduce; an inflated one is a reward_mismatch."""
+    store, ledger = audited_ledger
+    summary = run_audit(ledger.read_all(), store.root, max_workers=1)
+    assert summary.clean and summary.chain_intact
+    assert summary.counts["ok"] == 3 and summary.episodes_replayed > 0
+
+    entries = ledger.read_all()
+    entries[1] = entries[1]._replace(verified_reward=entries[1].verified_reward + 5.0)
+    records = sorted(audit_entries(entries, store.root, max_workers=1))
+    assert [r.status for r in records] == ["ok", "reward_mismatch", "ok"]
+    assert records[1].replayed_reward == pytest.approx(entries[1].verified_reward - 5.0)
+
+
+def test_missing_tampered_and_unreplayable_entries(audited_ledger):
+    """Each failure mode gets its own status instead of aborting the audit."""
+    store, ledger = audited_ledger
+    entries = ledger.read_all()
+    entries[0] = entries[0]._replace(env_config=None)
+    entries[1] = entries[1]._replace(policy_hash="0" * 64)
+
+    path = store.locate(entries[2].policy_hash)
+    artifact = json.loads(path.read_text())
+    state = next(iter(artifact["policy"]))
+    artifact["policy"][state] = (artifact["policy"][state] + 1) % 5
+    path.write_text(json.dumps(artifact))
+
+    summary = run_audit(entries, store.root, max_workers=1, check_chain=False)
+    assert summary.chain_intact is None and not summary.clean
+    assert summary.counts["no_env"] == 1
+    assert summary.counts["missing_artifact"] == 1
+    assert summary.counts["hash_mismatch"] == 1
+
+
+def test_pool_matches_in_process_and_streams_report(audited_ledger, tmp_path):
+    """A two-worker audit agrees with the in-process one and writes one line per entry."""
+    store, ledger = audited_ledger
+    entries = ledger.read_all()
+    entries[2] = entries[2]._replace(verified_reward=-123.0)
+
+    serial = sorted(audit_entries(entries, store.root, max_workers=1))
+    seen = []
+    report = tmp_path / "audit" / "report.jsonl"
+    summary = run_audit(entries, store.root, report_path=report, max_workers=2,
+                        check_chain=False, on_record=seen.append)
+
+    assert sorted(seen) == serial
+    assert summary.total == 3 and summary.counts["reward_mismatch"] == 1
+    assert summary.entries_per_second > 0
+
+    lines = [json.loads(line) for line in report.read_text().splitlines()]
+    assert len(lines) == 4 and lines[-1]["summary"]["report_path"] == str(report)
+    assert sorted(line["index"] for line in lines[:-1]) == [0, 1, 2]
+
+    run_audit(entries, store.root, report_path=report, max_workers=1, check_chain=False, mismatches_only=True)
+    lines = report.read_text().splitlines()
+    assert len(lines) == 2 and json.loads(lines[0])["status"] == "reward_mismatch"
+
+
+def test_legacy_entries_flag_unauthenticated_env(audited_ledger):
+    """Entries hashed without env_config replay, but are counted as unauthenticated."""
+    store, ledger = audited_ledger
+    entries = ledger.read_all()
+    summary = run_audit(entries, store.root, max_workers=1)
+    assert summary.unauthenticated_env == 0
+
+    previous_hash = "genesis"
+    legacy = []
+    for entry in entries:
+        entry = entry._replace(previous_hash=previous_hash, hash_version=1)
+        entry = entry._replace(current_hash=hash_entry(entry))
+        legacy.append(entry)
+        previous_hash = entry.current_hash
+
+    records = sorted(audit_entries(legacy, store.root, max_workers=1))
+    assert [r.status for r in records] == ["ok"] * 3
+    assert not any(r.env_authenticated for r in records)
+    summary = run_audit(legacy, store.root, max_workers=1)
+    assert summary.chain_intact and summary.clean and summary.unauthenticated_env == 3
+
+
+def test_chain_checked_while_streaming(audited_ledger, tmp_path):
+    """iter_entries() feeds the audit and the chain check at once; breaks are still found."""
+    store, ledger = audited_ledger
+    sqlite_ledger = SqlitePolicyLedger(tmp_path / "ledger.db")
+    sqlite_ledger.import_entries(ledger.read_all())
+
+    for source in (ledger, sqlite_ledger):
+        summary = run_audit(source.iter_entries(), store.root, max_workers=2)
+        assert summary.chain_intact and summary.clean and summary.total == 3
+    sqlite_ledger.close()
+
+    entries = ledger.read_all()
+    entries[1] = entries[1]._replace(verified_reward=entries[1].verified_reward + 5.0)
+    assert not verify_chain_integrity(entries)[0]
+    summary = run_audit(iter(entries), store.root, max_workers=1)
+    assert summary.chain_intact is False
+    assert summary.total == 3 and summary.counts["reward_mismatch"] == 1
@@ -0,0 +1,116 @@
+"""
+Multi-Step TD Tests
+
+Tests for n-step returns and Watkins Q(λ) in the trainer.
+
+Test coverage:
+1. n-step ring buffer returns discounted sums and resets in place
+2. Eligibility traces replace, decay and drop below the cutoff
+3. A terminal reward reaches the first state in one episode (n-step, Q(λ))
+4. Exploratory actions cut Q(λ) traces
+5. train() and live sessions accept the TD method; unknown methods are rejected
+"""
+
+import asyncio
+import random
+
+import pytest
+
+from src.agent.multistep import EligibilityTraces, MultiStepLearner, NStepBuffer, make_episode_fn
+from src.agent.trainer import train, train_episode
+from src.environments.cyber_env import CyberDefenseEnv
+from src.training.live_trainer import LiveTrainingManager
+
+from conftest import ChainEnv
+
+
+def _run(episode_fn, epsilon=0.0, rng=None):
+    q_table = {}
+    episode_fn(ChainEnv(), q_table, epsilon, discretize_fn=lambda s: s, alpha=1.0, gamma=1.0,
+               rng=rng or random.Random(0))
+    return q_table
+
+
+def test_n_step_buffer():
+    """Oldest step comes out with its discounted reward sum."""
+    buffer = NStepBuffer(3)
+    for i, reward in enumerate([1.0, 2.0, 4.0]):
+        buffer.push(i, 0, reward)
+    assert buffer.full()
+
+    assert buffer.pop_return(0.5) == (0, 0, 1.0 + 0.5 * 2.0 + 0.25 * 4.0, 0.125)
+    assert buffer.pop_return(0.5) == (1, 0, 2.0 + 0.5 * 4.0, 0.25)
+    buffer.reset()
+    assert buffer.count == 0 and not buffer.full()
+
+
+def test_eligibility_traces():
+    """Replacing traces reset to 1; decayed traces under the cutoff are dropped."""
+    traces = EligibilityTraces(cutoff=0.1)
+    traces.replace("a")
+    traces.decay(0.5)
+    traces.replace("b")
+    traces.replace("a")
+    assert dict(zip(traces.keys, traces.values)) == {"a": 1.0, "b": 1.0}
+
+    traces.replace("c")
+    traces.decay(0.05)
+    assert len(traces) == 0
+    traces.replace("d")
+    assert traces.slots == {"d": 0}
+
+
+def test_terminal_reward_reaches_first_state():
+    """One-step moves the reward one state back; n-step and Q(λ) move it all the way."""
+    one_step = _run(train_episode)
+    n_step = _run(MultiStepLearner("n_step", n_step=3).run_episode)
+    q_lambda = _run(MultiStepLearner("q_lambda", trace_lambda=1.0).run_episode)
+
+    def value(q_table, state):
+        return max(q_table.get((state, a), 0.0) for a in (0, 1))
+
+    assert [value(one_step, s) for s in range(3)] == [0.0, 0.0, 10.0]
+    for q_table in (n_step, q_lambda):
+        assert [value(q_table, s) for s in range(3)] == [10.0, 10.0, 10.0]
+
+
+def test_exploratory_action_cuts_traces():
+    """A non-greedy action cuts the trace: the terminal reward stops short of it."""
+    learner = MultiStepLearner("q_lambda", trace_lambda=1.0)
+    q_table = {(1, 0): 5.0}  # Greedy action in state 1 is 0
+
+    class AlwaysOne(random.Random):
+        def random(self):
+            return 0.0  # Always explore
+
+        def choice(self, seq):
+            return 1
+
+    learner.run_episode(ChainEnv(), q_table, 1.0, discretize_fn=lambda s: s, alpha=1.0, gamma=1.0, rng=AlwaysOne())
+
+    assert q_table[(2, 1)] == 10.0
+    assert q_table[(0, 1)] == 5.0  # Bootstrapped from Q(1, 0); trace cut before the reward
+    assert q_table[(1, 1)] == 10.0  # Action 1 ties as greedy in state 2, so this trace survives
+
+
+def test_td_method_selection(tmp_path, no_sleep):
+    """train() and live sessions run every method; typos fail fast."""
+    for method in ("n_step", "q_lambda"):
+        q_table, _, stats = train(CyberDefenseEnv(time_horizon=12, seed=1), 20, stopping_rules=[],
+                                  rng=random.Random(1), td_method=method)
+        assert stats['episodes_trained'] == 20 and q_table
+
+    with pytest.raises(ValueError):
+        make_episode_fn("sarsa")
+
+    async def ignore(_data):
+        return None
+
+    manager = LiveTrainingManager(tmp_path)
+    asyncio.run(manager.start_training(
+        agent_id="lambda_live", seed=2, max_episodes=15, callback=ignore,
+        config={"auto_stop": False, "checkpoint_every": 0, "td_method": "q_lambda"},
+        env_type="short_burst",
+    ))
+    state = manager.get_session_state("lambda_live")
+    assert state.status == "completed" and state.episodes_completed == 15
@@ -0,0 +1,53 @@
+"""
+Policy Extraction Tests
+
+Tests for single-pass and array-native policy extraction.
+
+Test coverage:
+1. Ties go to the lowest action id regardless of key insertion order
+2. Dense arrays give the same policy as the dict path
+"""
+
+import random
+
+import numpy as np
+
+from src.agent.policy import (
+    extract_policy, extract_policy_arrays, hash_policy, serialize_policy
+)
+from src.agent.vectorized import merge_q_arrays
+
+
+def _random_q_table(rng, states=40, actions=5):
+    return {
+        ((s, s % 3), a): float(rng.randint(0, 3))  # Small value range: plenty of ties
+        for s in range(states) for a in range(actions) if rng.random() < 0.7
+    }
+
+
+def test_tie_breaking_is_deterministic():
+    """Equal Q-values pick the lowest action; key order does not change the hash."""
+    assert extract_policy({((0,), 3): 1.0, ((0,), 1): 1.0, ((0,), 4): 0.5}) == {(0,): 1}
+
+    rng = random.Random(0)
+    q_table = _random_q_table(rng)
+    items = list(q_table.items())
+    rng.shuffle(items)
+    shuffled = dict(items)
+
+    policy = extract_policy(q_table)
+    assert policy == extract_policy(shuffled)
+    assert hash_policy(serialize_policy(policy)) == hash_policy(serialize_policy(extract_policy(shuffled)))
+    for state, action in policy.items():
+        values = {a: v for (s, a), v in q_table.items() if s == state}
+        assert action == min(a for a, v in values.items() if v == max(values.values()))
+
+
+def test_array_extraction_matches_dict():
+    """Unvisited cells never win, ties still go to the lowest action."""
+    rng = np.random.default_rng(1)
+    q_values = rng.integers(-2, 3, size=(108, 5)).astype(float)
+    visits = rng.integers(0, 2, size=(108, 5))
+    q_values[visits == 0] = 100.0  # Must be ignored
+
+    assert extract_policy_arrays(q_values, visits) == extract_policy(merge_q_arrays(q_values, q_values, visits))
@@ -0,0 +1,139 @@
+"""
+Policy Pack Tests
+
+Tests for the memory-mapped policy pack and its packing tools.
+
+Test coverage:
+1. Policies round-trip through a pack; appends dedupe and survive reopening
+2. matrix() exposes every policy as a K x 108 action table
+3. pack / unpack from a PolicyStore and store reads served by the pack
+4. Rebuilt or rewritten packs are re-indexed; other writers' packs are picked up
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from src.agent.policy import hash_policy, serialize_policy
+from src.agent.state import NUM_CYBER_STATES, decode_cyber_state
+from src.ledger.policy_pack import (
+    MISSING_ACTION, RECORD_DTYPE, PolicyPack, encode_policy_actions, pack_policies, unpack_policies
+)
+from src.ledger.policy_store import PolicyStore
+
+
+def _cyber_policy(seed, coverage=0.6):
+    rng = random.Random(seed)
+    return {
+        decode_cyber_state(i): rng.randrange(5)
+        for i in range(NUM_CYBER_STATES) if rng.random() < coverage
+    }
+
+
+def _hash(policy):
+    return hash_policy(serialize_policy(policy))
+
+
+def test_pack_round_trip_and_reopen(tmp_path):
+    """Packed policies decode to the identical dict and hash; duplicates are skipped."""
+    path = tmp_path / "policies.pack"
+    pack = PolicyPack(path)
+    policies = [_cyber_policy(seed) for seed in range(5)]
+    for policy in policies:
+        assert pack.append(_hash(policy), policy)
+    assert not pack.append(_hash(policies[0]), policies[0])
+
+    reopened = PolicyPack(path, create=False)
+    assert len(reopened) == 5
+    for policy in policies:
+        restored = reopened.policy(_hash(policy))
+        assert restored == policy
+        assert _hash(restored) == _hash(policy)
+
+    with pytest.raises(ValueError):
+        pack.append(_hash({(0, 0, 0): 1}), {(0, 0, 0): 1})  # Not a cyber state
+    with pytest.raises(KeyError):
+        reopened.policy("0" * 64)
+
+    with open(path, "ab") as f:
+        f.write(b"\x01" * 17)  # Torn record from an interrupted append
+    assert len(PolicyPack(path)) == 5
+
+
+def test_matrix_view(tmp_path):
+    """Rows follow append order; undefined states are MISSING_ACTION."""
+    pack = PolicyPack(tmp_path / "policies.pack")
+    policies = [_cyber_policy(seed, coverage=0.3) for seed in range(3)]
+    for policy in policies:
+        pack.append(_hash(policy), policy)
+
+    matrix = pack.matrix()
+    assert matrix.shape == (3, NUM_CYBER_STATES) and matrix.dtype == np.int8
+    for row, policy in enumerate(policies):
+        expected = np.full(NUM_CYBER_STATES, MISSING_ACTION)
+        for i in range(NUM_CYBER_STATES):
+            expected[i] = policy.get(decode_cyber_state(i), MISSING_ACTION)
+        assert np.array_equal(matrix[row], expected)
+
+    subset = pack.matrix([_hash(policies[2]), _hash(policies[0])])
+    assert np.array_equal(subset, matrix[[2, 0]])
+
+
+def test_pack_and_unpack_store(tmp_path):
+    """Tools move every cyber policy between store and pack; store reads use the pack."""
+    store = PolicyStore(tmp_path / "store")
+    policies = [_cyber_policy(seed) for seed in range(4)]
+    for policy in policies:
+        store.put_policy(policy, _hash(policy), {"agent_id": "a"})
+    energy = {(0, 1, 0): 1}
+    store.put_policy(energy, _hash(energy), {})
+
+    written, skipped = pack_policies(store, tmp_path / "all.pack")
+    assert written == 4 and skipped == [_hash(energy)]
+
+    restored = PolicyStore(tmp_path / "restored")
+    assert unpack_policies(tmp_path / "all.pack", restored) == 4
+    assert sorted(restored.iter_hashes()) == sorted(_hash(p) for p in policies)
+    assert restored.artifact_bytes(_hash(policies[1])) == serialize_policy(policies[1])
+
+    packed_store = PolicyStore(tmp_path / "packed", pack_path=tmp_path / "packed" / "policies.pack")
+    packed_store.put_policy(policies[0], _hash(policies[0]), {})
+    packed_store.put_policy(energy, _hash(energy), {})
+    assert len(packed_store.pack) == 1
+    assert packed_store.load_policy(_hash(policies[0])) == policies[0]
+    assert packed_store.load_policy(_hash(energy)) == energy
+    assert sorted(packed_store.iter_hashes()) == sorted([_hash(policies[0]), _hash(energy)])
+
+
+def test_rebuilt_pack_never_serves_stale_rows(tmp_path):
+    """A replaced, shrunk or rewritten pack is re-indexed instead of trusting old rows."""
+    path = tmp_path / "policies.pack"
+    policies = [_cyber_policy(seed) for seed in range(4)]
+    reader = PolicyPack(path)
+    for policy in policies[:3]:
+        reader.append(_hash(policy), policy)
+
+    path.unlink()  # Rebuild with fewer, different records
+    rebuilt = PolicyPack(path)
+    rebuilt.append(_hash(policies[3]), policies[3])
+    reader.refresh()
+    assert len(reader) == 1 and _hash(policies[0]) not in reader
+    assert reader.policy(_hash(policies[3])) == policies[3]
+
+    record = np.zeros(1, dtype=RECORD_DTYPE)  # Rewrite row 0 in place: same inode, same size
+    record["hash"][0] = np.frombuffer(bytes.fromhex(_hash(policies[1])), dtype=np.uint8)
+    record["actions"][0] = encode_policy_actions(policies[1])
+    with open(path, "r+b") as f:
+        f.seek(reader.data_offset)
+        f.write(record.tobytes())
+    with pytest.raises(KeyError):
+        reader.policy(_hash(policies[3]))
+    assert reader.policy(_hash(policies[1])) == policies[1]
+
+    server = PolicyStore(tmp_path / "store", pack_path=tmp_path / "store" / "policies.pack")
+    assert len(server.pack) == 0
+    other = PolicyStore(tmp_path / "store", pack_path=tmp_path / "store" / "policies.pack")
+    other.put_policy(policies[2], _hash(policies[2]), {})
+    assert server.load_policy(_hash(policies[2])) == policies[2]
+    assert _hash(policies[2]) in server.pack  # Served from the pack after a refresh on miss
@@ -0,0 +1,95 @@
+"""
+Policy Store Tests
+
+Tests for the sharded, content-addressed policy artifact store.
+
+Test coverage:
+1. Artifacts land in hash-prefix shards, dedupe on identical hashes and round-trip
+2. Content that does not match its hash is rejected; legacy flat artifacts stay readable
+3. Garbage collection keeps ledger-referenced, pinned and recent artifacts
+"""
+
+import os
+import time
+
+import pytest
+
+from src.agent.policy import hash_policy, serialize_policy
+from src.ledger.ledger import PolicyLedger
+from src.ledger.policy_store import PolicyStore
+
+
+def _policy(seed):
+    return {(seed, i, 0, 1, 2): (seed + i) % 5 for i in range(4)}
+
+
+def _store_policy(store, seed, **metadata):
+    policy = _policy(seed)
+    policy_hash = hash_policy(serialize_policy(policy))
+    return policy_hash, store.put_policy(policy, policy_hash, metadata)
+
+
+def test_sharded_put_get_and_dedupe(tmp_path):
+    """Second put of the same hash is a no-op; reads return the exact hashed bytes."""
+    store = PolicyStore(tmp_path)
+    policy_hash, written = _store_policy(store, 1, agent_id="a")
+    assert written
+    assert store.path_for(policy_hash) == tmp_path / policy_hash[:2] / f"{policy_hash}.json"
+    assert store.path_for(policy_hash).exists()
+
+    _, written_again = _store_policy(store, 1, agent_id="b")
+    assert not written_again
+    assert store.get(policy_hash)["metadata"]["agent_id"] == "a"
+
+    assert store.load_policy(policy_hash) == _policy(1)
+    assert hash_policy(store.artifact_bytes(policy_hash)) == policy_hash
+    assert list(store.iter_hashes()) == [policy_hash]
+    assert not any(name.endswith(".tmp") for _, _, files in os.walk(tmp_path) for name in files)
+
+    with pytest.raises(FileNotFoundError):
+        store.get("0" * 64)
+
+
+def test_hash_mismatch_and_legacy_layout(tmp_path):
+    """Wrong hashes never get stored; flat artifacts are found and migrated."""
+    store = PolicyStore(tmp_path)
+    with pytest.raises(ValueError):
+        store.put_policy(_policy(1), "ab" * 32, {})
+    with pytest.raises(ValueError):
+        store.put_policy(_policy(1), "../escape", {})
+
+    legacy_store = PolicyStore(tmp_path / "legacy")
+    policy_hash, _ = _store_policy(legacy_store, 2)
+    legacy_path = tmp_path / "legacy" / f"{policy_hash}.json"
+    os.replace(legacy_store.path_for(policy_hash), legacy_path)
+
+    assert legacy_store.locate(policy_hash) == legacy_path
+    assert legacy_store.load_policy(policy_hash) == _policy(2)
+    assert legacy_store.migrate_flat() == 1
+    assert legacy_store.locate(policy_hash) == legacy_store.path_for(policy_hash)
+
+
+def test_garbage_collection(tmp_path):
+    """Only old artifacts with no ledger reference or pin are deleted."""
+    store = PolicyStore(tmp_path / "policies")
+    ledger = PolicyLedger(str(tmp_path / "ledger.json"))
+    referenced, _ = _store_policy(store, 1)
+    pinned, _ = _store_policy(store, 2)
+    orphan, _ = _store_policy(store, 3)
+    fresh, _ = _store_policy(store, 4)
+    ledger.append(referenced, 10.0, "agent_1")
+    ledger.append(referenced, 11.0, "agent_2")
+
+    old = time.time() - 7200
+    for policy_hash in (referenced, pinned, orphan):
+        os.utime(store.path_for(policy_hash), (old, old))
+
+    assert store.refcounts(ledger) == {referenced: 2}
+    preview = store.collect_garbage(ledger, pinned=[pinned], grace_seconds=3600, dry_run=True)
+    assert preview.deleted == [orphan] and orphan in store
+
+    result = store.collect_garbage(ledger, pinned=[pinned], grace_seconds=3600)
+    assert (result.scanned, result.referenced, result.recent) == (4, 2, 1)
+    assert result.deleted == [orphan] and result.bytes_freed > 0
+    assert orphan not in store
+    assert all(h in store for h in (referenced, pinned, fresh))
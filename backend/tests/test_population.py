@@ -0,0 +1,75 @@
+"""
+Population Training Tests
+
+Tests for parallel training of many agents across seeds and presets.
+
+Test coverage:
+1. Grid covers every (seed offset, preset) pair with the preset's seed_base and horizon
+2. Unknown presets are rejected
+3. Parallel run collects one claim per successful agent, in grid order
+4. Progress events are streamed for every agent
+5. Per-episode callback in train() sees every episode
+"""
+
+import pytest
+
+from src.agent.trainer import train
+from src.environments.cyber_env import CyberDefenseEnv
+from src.environments.env_presets import ENV_PRESETS
+from src.environments.env_spec import EnvSpec
+from src.training.population import PopulationTrainer, build_population
+
+
+def test_grid_covers_seeds_and_presets():
+    """Every seed offset is paired with every requested preset, from the preset's seed_base."""
+    members = build_population(seeds=[1, 2, 3], env_types=["standard", "extended"], episodes=5)
+
+    assert len(members) == 6
+    assert {(m.seed, m.env_type) for m in members} == {
+        (ENV_PRESETS[t].seed_base + s, t) for s in [1, 2, 3] for t in ["standard", "extended"]
+    }
+    for member in members:
+        assert member.time_horizon == ENV_PRESETS[member.env_type].time_horizon
+    assert len({m.agent_id for m in members}) == 6
+
+
+def test_unknown_preset_rejected():
+    """Typos in env types fail fast instead of silently training 'standard'."""
+    with pytest.raises(ValueError):
+        build_population(seeds=[1], env_types=["no_such_env"])
+
+
+def test_parallel_population_run():
+    """Claims land in the collector in grid order and progress is streamed."""
+    members = build_population(seeds=[7, 8], env_types=["standard", "short_burst"], episodes=20)
+    events = []
+
+    trainer = PopulationTrainer(max_workers=2, progress_every=5)
+    result = trainer.run(members, on_progress=events.append)
+
+    assert [r.member for r in result.results] == members
+    succeeded = [r for r in result.results if r.claim is not None]
+    assert result.collector.count_submissions() == len(succeeded)
+    assert [s.claim.agent_id for s in result.collector.get_all_submissions()] == [
+        r.member.agent_id for r in succeeded
+    ]
+    for r in succeeded:
+        assert r.claim.env_id == EnvSpec.cyber(r.member.seed, r.member.time_horizon, r.member.env_type).env_id
+
+    completions = [e for e in events if e["type"] == "agent_complete"]
+    assert {e["agent_id"] for e in completions} == {m.agent_id for m in members}
+    progress_agents = {e["agent_id"] for e in events if e["type"] == "progress"}
+    assert progress_agents == {m.agent_id for m in members}
+
+    assert result.total_episodes == sum(r.episodes_trained for r in result.results)
+    assert result.episodes_per_second > 0
+
+
+def test_train_episode_callback():
+    """train() reports every episode it runs."""
+    env = CyberDefenseEnv(time_horizon=12, seed=3)
+    seen = []
+
+    _, _, stats = train(env, 15, episode_callback=lambda ep, reward, eps: seen.append(ep))
+
+    assert seen == list(range(stats["episodes_trained"]))
@@ -0,0 +1,118 @@
+"""
+Prioritized Experience Replay Tests
+
+Tests for the sum-tree and TD-error proportional replay buffer.
+
+Test coverage:
+1. Sum-tree totals, updates and prefix lookups
+2. Sampling frequency follows priorities
+3. Importance-sampling weights and priority updates
+4. train() and live sessions accept the prioritized option
+5. Prioritized buffers survive a checkpoint round trip
+"""
+
+import asyncio
+import random
+
+import pytest
+
+from src.agent.double_q_learning import PrioritizedExperienceReplay, SumTree, create_replay_buffer
+from src.agent.trainer import train
+from src.environments.cyber_env import CyberDefenseEnv
+from src.training.checkpoint import decode_replay, encode_replay, replay_meta
+from src.training.live_trainer import LiveTrainingManager
+
+
+def _experience(i):
+    return ((i % 3, 0, 1, 0, 0), i % 5, float(i), (0, 0, 0, 0, 1), False)
+
+
+def test_sum_tree_updates_and_find():
+    """Root is the total; find() maps cumulative ranges to indices."""
+    tree = SumTree(5)  # Non power of two capacity
+    for index, priority in enumerate([1.0, 2.0, 0.0, 3.0, 4.0]):
+        tree.update(index, priority)
+
+    assert tree.total == 10.0
+    assert [tree.find(v) for v in (0.0, 0.99, 1.0, 2.99, 3.0, 5.99, 6.0, 9.99)] == [0, 0, 1, 1, 3, 3, 4, 4]
+
+    tree.update(1, 0.5)
+    assert tree.total == 8.5
+    assert tree.find(1.2) == 1
+    assert tree.find(1.6) == 3
+
+
+def test_sampling_follows_priorities():
+    """A transition with 9x the priority is sampled ~9x as often."""
+    random.seed(0)
+    buffer = PrioritizedExperienceReplay(max_size=2, batch_size=1, min_size=1, alpha=1.0, epsilon=0.0)
+    buffer.add(*_experience(0))
+    buffer.add(*_experience(1))
+    buffer.update_priorities([0, 1], [1.0, 9.0])
+
+    counts = [0, 0]
+    for _ in range(5000):
+        _, indices, _ = buffer.sample()
+        counts[indices[0]] += 1
+
+    assert counts[1] / counts[0] == pytest.approx(9.0, rel=0.15)
+
+
+def test_weights_and_priority_updates():
+    """IS weights are normalized to 1 and favor rare transitions."""
+    random.seed(1)
+    buffer = PrioritizedExperienceReplay(max_size=4, batch_size=4, min_size=1, alpha=1.0, beta_start=1.0, epsilon=0.0)
+    for i in range(6):  # Wraps around the ring buffer
+        buffer.add(*_experience(i))
+    assert buffer.size() == 4 and buffer.position == 2
+    assert buffer.buffer[0] == _experience(4)
+
+    buffer.update_priorities([0, 1, 2, 3], [1.0, 1.0, 1.0, 5.0])
+    assert buffer.max_priority == 5.0
+
+    _, indices, weights = buffer.sample()
+    assert max(weights) == 1.0
+    by_index = dict(zip(indices, weights))
+    if 3 in by_index and len(by_index) > 1:
+        assert by_index[3] == min(weights)
+
+
+def test_train_and_live_accept_prioritized(tmp_path, no_sleep):
+    """Both training paths run with prioritized replay."""
+    random.seed(0)
+    env = CyberDefenseEnv(time_horizon=12, seed=2)
+    _, _, stats = train(env, 30, replay="prioritized")
+    assert stats["episodes_trained"] == 30
+
+    async def ignore(_data):
+        return None
+
+    manager = LiveTrainingManager(tmp_path)
+    asyncio.run(manager.start_training(
+        agent_id="per_agent", seed=3, max_episodes=30, callback=ignore,
+        config={"replay": "prioritized", "auto_stop": False, "checkpoint_every": 0},
+    ))
+    state = manager.get_session_state("per_agent")
+    assert state.status == "completed"
+    assert isinstance(state.replay_buffer, PrioritizedExperienceReplay)
+    assert state.replay_buffer.beta > 0.4  # Replay actually sampled
+
+    with pytest.raises(ValueError):
+        create_replay_buffer("lifo", 10, 2, 1)
+
+
+def test_prioritized_checkpoint_round_trip():
+    """Slots, priorities, position and beta are restored exactly."""
+    random.seed(2)
+    buffer = create_replay_buffer("prioritized", 8, 4, 1)
+    for i in range(11):
+        buffer.add(*_experience(i))
+    _, indices, _ = buffer.sample()
+    buffer.update_priorities(indices, [0.3, -2.0, 7.5, 0.01])
+
+    restored = decode_replay(encode_replay(buffer), replay_meta(buffer))
+
+    assert isinstance(restored, PrioritizedExperienceReplay)
+    assert restored.buffer == buffer.buffer
+    assert restored.tree.tree == buffer.tree.tree
+    assert (restored.position, restored.max_priority, restored.beta) == (buffer.position, buffer.max_priority, buffer.beta)
@@ -0,0 +1,118 @@
+"""
+Hot-Path Profiling Tests
+
+Tests for opt-in per-phase timing of train_episode and live sessions.
+
+Test coverage:
+1. Phases are charged once per step and profiling does not change training
+2. A traced episode range dumps a readable cProfile stats file
+3. Live sessions with "profile" set expose per-phase totals; bad trace ranges are rejected
+4. Concurrent traced sessions each get their own trace (cProfile is paused across awaits)
+"""
+
+import asyncio
+import pstats
+import random
+
+import pytest
+
+from src.agent.double_q_learning import ExperienceReplay
+from src.agent.profiling import PhaseProfiler, check_trace_episodes
+from src.agent.trainer import train, train_episode
+from src.environments.cyber_env import CyberDefenseEnv
+from src.training.live_trainer import LiveTrainingManager
+
+
+def test_phases_counted_per_step_without_changing_training():
+    """Every step hits each per-step phase once; Q-tables match an unprofiled run."""
+    tables = []
+    for profiler in (None, PhaseProfiler()):
+        q_a, q_b = {}, {}
+        replay = ExperienceReplay(max_size=500, batch_size=8, min_size=8)
+        env = CyberDefenseEnv(time_horizon=12, seed=2)
+        rng = random.Random(9)
+        for _ in range(5):
+            train_episode(env, {}, 0.5, q_table_a=q_a, q_table_b=q_b, replay_buffer=replay, rng=rng,
+                          profiler=profiler)
+        tables.append((q_a, q_b))
+
+    assert tables[0] == tables[1]
+    steps = profiler.calls["env_step"]
+    assert steps > 0
+    for phase in ("select_action", "action_counting", "discretize", "replay_add", "q_update"):
+        assert profiler.calls[phase] == steps
+    assert profiler.calls["env_reset"] == 5
+    assert profiler.calls["replay_sample"] == profiler.calls["replay_update"] > 0
+    assert profiler.calls["monitor"] == 0
+
+
+def test_trace_range_dumps_pstats(tmp_path):
+    """cProfile runs only over the requested episodes and writes a stats file."""
+    trace_path = tmp_path / "trace.prof"
+    profiler = PhaseProfiler(trace_episodes=(2, 4), trace_path=trace_path)
+
+    train(CyberDefenseEnv(time_horizon=12, seed=1), 6, stopping_rules=[], rng=random.Random(1), profiler=profiler)
+
+    report = profiler.report()
+    assert report["episodes"] == 6
+    assert report["trace_path"] == str(trace_path)
+    stats = pstats.Stats(str(trace_path))
+    assert any(name == "train_episode" for _, _, name in stats.stats)
+    assert profiler.collapsed().startswith("train_episode;")
+
+
+def test_live_session_profile(tmp_path, no_sleep):
+    """Profiled sessions report per-phase totals; others have no profiler."""
+    async def ignore(_data):
+        return None
+
+    manager = LiveTrainingManager(tmp_path / "checkpoints", tmp_path / "profiles")
+
+    for agent_id, profile in (("prof_on", True), ("prof_off", False)):
+        asyncio.run(manager.start_training(
+            agent_id=agent_id, seed=3, max_episodes=10, callback=ignore,
+            config={"auto_stop": False, "checkpoint_every": 0, "profile": profile,
+                    "profile_trace_episodes": [0, 2] if profile else None},
+            env_type="short_burst",
+        ))
+
+    assert manager.get_session_state("prof_off").profiler is None
+    report = manager.get_session_state("prof_on").profiler.report()
+    phases = {p["phase"]: p for p in report["phases"]}
+    assert report["episodes"] == 10
+    assert phases["merge_q_tables"]["calls"] == phases["broadcast"]["calls"] == 10
+    assert abs(sum(p["share"] for p in report["phases"]) - 1.0) < 1e-9
+    assert (tmp_path / "profiles" / "prof_on_episodes_0_2.prof").exists()
+
+    trace_only = manager.get_session_state("prof_off")
+    assert manager._build_profiler(trace_only, {"profile_trace_episodes": [1, 3]}).trace_episodes == (1, 3)
+    for bad in ([3, 3], [-1, 2], [5, 1], ["a", 2]):
+        with pytest.raises(ValueError):
+            check_trace_episodes(bad)
+
+
+def test_concurrent_sessions_both_trace(tmp_path, yield_only):
+    """A session's trace is paused while it awaits, so another session can trace meanwhile."""
+    manager = LiveTrainingManager(tmp_path / "checkpoints", tmp_path / "profiles")
+
+    async def slow_callback(_data):
+        await asyncio.sleep(0)  # The other session runs while this one broadcasts
+
+    async def run_both():
+        await asyncio.gather(*(
+            manager.start_training(
+                agent_id=agent_id, seed=3, max_episodes=6, callback=slow_callback,
+                config={"auto_stop": False, "checkpoint_every": 0, "profile_trace_episodes": [1, 4]},
+                env_type="short_burst",
+            )
+            for agent_id in ("trace_a", "trace_b")
+        ))
+
+    asyncio.run(run_both())
+
+    for agent_id in ("trace_a", "trace_b"):
+        report = manager.get_session_state(agent_id).profiler.report()
+        assert report["trace_error"] is None
+        stats = pstats.Stats(report["trace_path"])
+        assert any(name == "train_episode" for _, _, name in stats.stats)
+        assert not any(name == "slow_callback" for _, _, name in stats.stats)
@@ -0,0 +1,118 @@
+"""
+Scenario Bank Tests
+
+Tests for pre-generated, memory-mapped attack scenarios and the batched env.
+
+Test coverage:
+1. Bank schedules match CyberDefenseEnv generation
+2. Bank-backed env reproduces the scalar trajectory exactly
+3. Batched env reproduces N scalar trajectories exactly
+4. Verifier gives identical rewards with and without a bank
+5. Invalid files and unknown seeds are rejected
+"""
+
+import numpy as np
+import pytest
+
+from src.environments.cyber_env import CyberDefenseEnv
+from src.environments.batch_env import BatchCyberDefenseEnv
+from src.environments.scenario_bank import ScenarioBank, build_scenario_bank, main
+from src.verifier.verifier import PolicyVerifier
+
+
+SEEDS = list(range(100, 116))
+
+
+@pytest.fixture
+def bank(tmp_path):
+    path = build_scenario_bank(str(tmp_path / "scenarios.bank"), SEEDS, time_horizon=24)
+    return ScenarioBank(str(path))
+
+
+def _rollout(env, actions):
+    """Collect (state, reward, done) triples for an action sequence."""
+    trajectory = []
+    env.reset()
+    for action in actions:
+        state, reward, done = env.step(action)
+        trajectory.append((tuple(state.values()), reward, done))
+        if done:
+            break
+    return trajectory
+
+
+def test_bank_schedules_match_env(bank):
+    """Stored schedules are exactly what CyberDefenseEnv generates."""
+    for seed in SEEDS:
+        env = CyberDefenseEnv(time_horizon=24, seed=seed)
+        row = bank.schedules[bank.row_of(seed)]
+        assert np.array_equal(row[0], env.severity_schedule)
+        assert np.array_equal(row[1], env.attack_type_schedule)
+        assert np.array_equal(row[2], env.confidence_schedule)
+
+
+def test_bank_env_reproduces_scalar_trajectory(bank):
+    """Same seed + same actions → same states and rewards, bit for bit."""
+    rng = np.random.RandomState(0)
+    for seed in SEEDS:
+        actions = rng.randint(0, 5, size=24).tolist()
+        expected = _rollout(CyberDefenseEnv(time_horizon=24, seed=seed), actions)
+        assert _rollout(bank.make_env(seed), actions) == expected
+
+
+def test_batch_env_matches_scalar_envs(bank):
+    """Every batched episode follows its scalar counterpart exactly."""
+    rng = np.random.RandomState(1)
+    action_plan = rng.randint(0, 5, size=(24, len(SEEDS)))
+
+    for batch in (BatchCyberDefenseEnv.from_seeds(SEEDS), bank.make_batch_env(SEEDS)):
+        scalars = [CyberDefenseEnv(time_horizon=24, seed=s) for s in SEEDS]
+        for env in scalars:
+            env.reset()
+        batch.reset()
+
+        for t in range(24):
+            obs, rewards, dones = batch.step(action_plan[t])
+            for i, env in enumerate(scalars):
+                if env.done:
+                    assert rewards[i] == 0.0
+                    continue
+                state, reward, done = env.step(int(action_plan[t, i]))
+                assert tuple(obs[i]) == tuple(state.values())
+                assert rewards[i] == reward
+                assert dones[i] == done
+            if dones.all():
+                break
+
+
+def test_verifier_same_reward_with_bank(bank):
+    """Replaying through the bank does not change verification results."""
+    policy = {(2, 0, 1, 1, 1): 2, (1, 1, 0, 0, 0): 1, (0, 0, 0, 0, 0): 0}
+    env_id = f"cyber_defense_env_seed_{SEEDS[3]}_horizon_24"
+
+    plain = PolicyVerifier()._replay_policy(env_id, policy)
+    banked = PolicyVerifier(scenario_bank=bank)._replay_policy(env_id, policy)
+
+    assert plain == banked
+
+
+def test_unknown_seed_and_bad_file(bank, tmp_path):
+    """Seeds outside the bank and non-bank files are rejected."""
+    with pytest.raises(KeyError):
+        bank.make_env(99999)
+    assert not bank.covers(SEEDS[0], time_horizon=48)
+
+    bogus = tmp_path / "bogus.bank"
+    bogus.write_bytes(b"not a bank at all")
+    with pytest.raises(ValueError):
+        ScenarioBank(str(bogus))
+
+
+def test_cli_build(tmp_path, capsys):
+    """CLI builds a bank from a seed range."""
+    path = tmp_path / "cli.bank"
+    main(["build", str(path), "--seeds", "0:8", "--horizon", "12"])
+
+    bank = ScenarioBank(str(path))
+    assert bank.seeds == list(range(8))
+    assert bank.time_horizon == 12
@@ -0,0 +1,75 @@
+"""
+Sequential Verification Tests
+
+Tests for early-exit verification with confidence intervals.
+
+Test coverage:
+1. t quantiles match reference values without scipy
+2. Replay stops at the first decisive check, and cached episodes are reused
+3. Noisy rewards keep sampling, then fall back to the fixed rule at the budget
+"""
+
+import math
+import random
+
+import pytest
+
+from src.agent.runner import run_agent
+from src.verifier.cache import VerificationCache
+from src.verifier.sequential import SequentialTest, check, t_quantile
+from src.verifier.verifier import PolicyVerifier, VerificationStatus
+
+
+def test_t_quantile_reference_values():
+    """Quantiles agree with tabulated Student-t values."""
+    assert t_quantile(0.975, 1) == pytest.approx(12.706, abs=1e-3)
+    assert t_quantile(0.975, 2) == pytest.approx(4.303, abs=1e-3)
+    assert t_quantile(0.975, 10) == pytest.approx(2.228, abs=1e-3)
+    assert t_quantile(0.995, 30) == pytest.approx(2.750, abs=1e-3)
+    assert t_quantile(0.9995, 5) == pytest.approx(6.869, rel=2e-2)
+
+
+def test_early_exit_and_cached_episodes():
+    """Deterministic replays decide after min_episodes; later claims replay nothing."""
+    claim = run_agent(agent_id="seq_agent", seed=9, episodes=40, time_horizon=12)
+    cache = VerificationCache()
+    verifier = PolicyVerifier(reward_threshold=1e-6, cache=cache, sequential=SequentialTest())
+
+    honest = verifier.verify(claim)
+    assert honest.status == VerificationStatus.VALID
+    assert honest.episodes == SequentialTest().min_episodes
+    assert honest.confidence_interval[0] <= honest.verified_reward <= honest.confidence_interval[1]
+
+    liar = verifier.verify(claim._replace(agent_id="liar", claimed_reward=claim.claimed_reward + 50))
+    assert liar.status == VerificationStatus.INVALID
+    assert liar.episodes == 0
+    assert liar.verified_reward == honest.verified_reward
+
+    fixed = PolicyVerifier(reward_threshold=1e-6).verify(claim)
+    assert fixed.verified_reward == pytest.approx(honest.verified_reward)
+    assert fixed.episodes > honest.episodes
+
+    with pytest.raises(ValueError):
+        PolicyVerifier(sequential=SequentialTest(min_episodes=1))
+
+
+def test_noisy_rewards_continue_then_fall_back():
+    """An undecided interval asks for more episodes; the budget forces a decision."""
+    test = SequentialTest(error_rate=0.01, batch_episodes=4, min_episodes=4, max_episodes=12)
+    assert test.max_looks == 3
+
+    rng = random.Random(0)
+    rewards = [10 + rng.gauss(0, 3) for _ in range(12)]
+    mean = sum(rewards) / len(rewards)
+
+    early = check(rewards[:4], claimed_reward=10.0, threshold=1.0, test=test)
+    assert not early.decided and early.valid is None
+    assert early.interval[0] < 9.0 and early.interval[1] > 11.0
+
+    final = check(rewards, claimed_reward=10.0, threshold=1.0, test=test)
+    assert final.decided
+    assert final.valid == (abs(10.0 - mean) <= 1.0)
+
+    far = check(rewards[:4], claimed_reward=100.0, threshold=1.0, test=test)
+    assert far.decided and far.valid is False
+    assert math.isfinite(far.interval[1])
@@ -0,0 +1,162 @@
+"""
+SQLite Ledger Tests
+
+Tests for the SQLite ledger backend and JSON ledger migration.
+
+Test coverage:
+1. Same interface and hashes as PolicyLedger; WAL mode; persists across reopen
+2. Filtered, paginated queries agree with the JSON ledger
+3. Migration copies entries verbatim; broken chains and non-empty targets are refused
+4. Schema 1 databases gain hash_version; their legacy entries still verify
+5. Entries recorded with only an env_id are filtered by the env type it names
+   (older databases have that column backfilled on open)
+"""
+
+import sqlite3
+
+import pytest
+
+from src.environments.env_spec import EnvSpec
+from src.ledger.ledger import PolicyLedger, compute_entry_hash, entry_env_type, verify_chain_integrity
+from src.ledger.sqlite_ledger import SCHEMA_VERSION, SqlitePolicyLedger, migrate_json_ledger
+
+
+def _fill(ledger):
+    for i in range(12):
+        env_type = ["standard", "extended", None][i % 3]
+        env_config = {"env_type": env_type} if env_type else None
+        ledger.append(f"{i:064x}", float(i % 5), f"agent_{i % 4}", env_config=env_config)
+
+
+def test_interface_and_persistence(tmp_path):
+    """Appends chain like PolicyLedger and survive reopening."""
+    path = tmp_path / "ledger.db"
+    ledger = SqlitePolicyLedger(path)
+    assert ledger.count() == 0 and ledger.get_latest() is None and ledger.verify_integrity() == (True, None)
+
+    _fill(ledger)
+    entries = ledger.read_all()
+    assert ledger.count() == 12 and entries[0].previous_hash == "genesis"
+    assert verify_chain_integrity(entries) == (True, None)
+    assert ledger.get_latest() == entries[-1] and entries[1].env_config == {"env_type": "extended"}
+    assert ledger._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    ledger.close()
+
+    reopened = SqlitePolicyLedger(path)
+    assert reopened.read_all() == entries
+    assert list(reopened.iter_entries(batch_size=5)) == entries
+    reopened.append("f" * 64, 9.0, "agent_9")
+    assert reopened.get_latest().previous_hash == entries[-1].current_hash
+    assert reopened.append_if_absent("f" * 64, 1.0, "agent_9") == (reopened.get_latest(), False)
+    assert reopened.append_if_absent("f" * 64, 1.0, "agent_8")[1] and reopened.count() == 14
+    reopened.close()
+
+
+def test_queries_match_json_ledger(tmp_path):
+    """Every filter and ordering returns what the in-memory ledger returns."""
+    json_ledger = PolicyLedger(tmp_path / "ledger.json")
+    _fill(json_ledger)
+    sqlite_ledger = SqlitePolicyLedger(tmp_path / "ledger.db")
+    sqlite_ledger.import_entries(json_ledger.read_all())
+
+    cases = [
+        {},
+        {"agent_id": "agent_1"},
+        {"policy_hash": f"{7:064x}"},
+        {"env_type": "standard", "order_by": "verified_reward", "descending": True},
+        {"min_reward": 1.0, "max_reward": 3.0, "limit": 3, "offset": 2},
+        {"descending": True, "limit": 4},
+        {"order_by": "verified_reward", "limit": 5, "offset": 5},
+    ]
+    for kwargs in cases:
+        assert sqlite_ledger.query(**kwargs) == json_ledger.query(**kwargs), kwargs
+    assert sqlite_ledger.count_matching(env_type="extended", min_reward=2.0) == \
+        json_ledger.count_matching(env_type="extended", min_reward=2.0)
+    assert sqlite_ledger.count_matching() == 12
+
+    top = sqlite_ledger.query(order_by="verified_reward", descending=True, limit=2)
+    assert [e.verified_reward for e in top] == [4.0, 4.0]
+    with pytest.raises(ValueError):
+        sqlite_ledger.query(order_by="agent_id")
+    sqlite_ledger.close()
+
+
+def test_migration_and_tamper_detection(tmp_path):
+    """Migration keeps hashes; tampering halts on open; migration never merges."""
+    json_ledger = PolicyLedger(tmp_path / "ledger.json")
+    _fill(json_ledger)
+    db_path = tmp_path / "ledger.db"
+
+    assert migrate_json_ledger(tmp_path / "ledger.json", db_path) == 12
+    migrated = SqlitePolicyLedger(db_path)
+    assert migrated.read_all() == json_ledger.read_all()
+    with pytest.raises(ValueError):
+        migrated.import_entries(json_ledger.read_all()[:1])  # Does not continue the chain
+    assert migrated.count() == 12
+    migrated.close()
+
+    with pytest.raises(ValueError):
+        migrate_json_ledger(tmp_path / "ledger.json", db_path)
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("UPDATE entries SET verified_reward = 100.0 WHERE seq = 3")
+    conn.commit()
+    conn.close()
+    with pytest.raises(RuntimeError, match="CORRUPTION"):
+        SqlitePolicyLedger(db_path)
+
+
+def test_schema_1_database_upgrades(tmp_path):
+    """A database without hash_version keeps verifying, appends versioned entries and indexes env_id entries."""
+    db_path = tmp_path / "ledger.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE entries (seq INTEGER PRIMARY KEY AUTOINCREMENT, policy_hash TEXT NOT NULL, "
+        "verified_reward REAL NOT NULL, agent_id TEXT NOT NULL, timestamp TEXT NOT NULL, "
+        "previous_hash TEXT NOT NULL, current_hash TEXT NOT NULL UNIQUE, env_type TEXT, env_config TEXT)"
+    )
+    timestamp = "2025-12-28T12:00:00"
+    legacy_hash = compute_entry_hash("a" * 64, 1.0, "agent_0", timestamp, "genesis")
+    conn.execute("INSERT INTO entries (policy_hash, verified_reward, agent_id, timestamp, previous_hash, "
+                 "current_hash, env_type, env_config) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                 ("a" * 64, 1.0, "agent_0", timestamp, "genesis", legacy_hash, "standard",
+                  '{"env_type": "standard"}'))
+    env_id = EnvSpec.cyber(300, 12, "short_burst").env_id
+    conn.execute("INSERT INTO entries (policy_hash, verified_reward, agent_id, timestamp, previous_hash, "
+                 "current_hash, env_type, env_config) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                 ("c" * 64, 3.0, "agent_2", timestamp, legacy_hash,
+                  compute_entry_hash("c" * 64, 3.0, "agent_2", timestamp, legacy_hash), None,
+                  f'{{"env_id": "{env_id}"}}'))
+    conn.commit()
+    conn.close()
+
+    ledger = SqlitePolicyLedger(db_path)
+    ledger.append("b" * 64, 2.0, "agent_1", env_config={"env_type": "extended"})
+    assert [e.hash_version for e in ledger.read_all()] == [1, 1, 2]
+    assert ledger._conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    assert [e.agent_id for e in ledger.query(env_type="short_burst")] == ["agent_2"]
+    ledger.close()
+
+    reopened = SqlitePolicyLedger(db_path)
+    assert reopened.verify_integrity() == (True, None)
+    assert not reopened.read_all()[0].env_authenticated and reopened.read_all()[2].env_authenticated
+    reopened.close()
+
+
+def test_env_type_from_env_id(tmp_path):
+    """/ledger/add-style entries (env_id only) count toward their preset."""
+    assert entry_env_type({"env_id": EnvSpec.cyber(1, 12, "short_burst").env_id}) == "short_burst"
+    assert entry_env_type({"env_id": EnvSpec.cyber(1, 24).env_id}) == "standard"
+    assert entry_env_type({"env_id": "energy_slot_env_seed_1_horizon_24"}) is None
+    assert entry_env_type({"env_id": "nonsense"}) is None
+    assert entry_env_type({"env_type": "extended", "env_id": EnvSpec.cyber(1, 12, "short_burst").env_id}) == "extended"
+
+    json_ledger = PolicyLedger(tmp_path / "ledger.json")
+    sqlite_ledger = SqlitePolicyLedger(tmp_path / "ledger.db")
+    for ledger in (json_ledger, sqlite_ledger):
+        ledger.append("a" * 64, 1.0, "agent_a", env_config={"env_id": EnvSpec.cyber(300, 12, "short_burst").env_id})
+        ledger.append("b" * 64, 2.0, "agent_b", env_config={"env_type": "short_burst"})
+        ledger.append("c" * 64, 3.0, "agent_c", env_config={"env_id": EnvSpec.cyber(42, 24).env_id})
+        assert [e.agent_id for e in ledger.query(env_type="short_burst")] == ["agent_a", "agent_b"]
+        assert ledger.count_matching(env_type="standard") == 1
+    sqlite_ledger.close()
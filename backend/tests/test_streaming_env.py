@@ -0,0 +1,170 @@
+"""
+Streaming Scenario Tests
+
+Tests for chunked, on-demand attack schedule generation.
+
+Test coverage:
+1. Same seed + same actions → same trajectory
+2. Chunk size does not leak into anything but the scenario stream boundaries
+3. Only one chunk is resident at a time (O(chunk) memory)
+4. Reset rewinds the scenario stream
+5. Escalation carries across chunk boundaries, however the stream is consumed
+6. Chunks follow the env's AttackDynamics (preset dynamics included)
+7. Executor runs past the fixed horizon without retaining steps
+"""
+
+import pytest
+
+from src.environments.cyber_env import AttackDynamics
+from src.environments.env_presets import ENV_PRESETS
+from src.environments.streaming_env import StreamingCyberDefenseEnv
+from src.execution.live_executor import (
+    LivePolicyExecutor,
+    ExecutionConfig,
+    create_execution_env
+)
+
+
+def _rollout(env, steps: int, action: int = 1):
+    """Run a fixed action and collect (state, reward) pairs."""
+    trajectory = []
+    state = env.reset()
+    for _ in range(steps):
+        state, reward, done = env.step(action)
+        trajectory.append((tuple(state.values()), reward))
+        if done:
+            break
+    return trajectory
+
+
+def test_same_seed_same_trajectory():
+    """Deterministic continuation across chunk boundaries."""
+    env_a = StreamingCyberDefenseEnv(time_horizon=5000, seed=7, chunk_size=64)
+    env_b = StreamingCyberDefenseEnv(time_horizon=5000, seed=7, chunk_size=64)
+
+    assert _rollout(env_a, 1000) == _rollout(env_b, 1000)
+
+
+def test_different_seeds_differ():
+    """Different seeds produce different schedules."""
+    env_a = StreamingCyberDefenseEnv(time_horizon=500, seed=1, chunk_size=64)
+    env_b = StreamingCyberDefenseEnv(time_horizon=500, seed=2, chunk_size=64)
+
+    schedule_a = [env_a._scenario_at(t) for t in range(500)]
+    schedule_b = [env_b._scenario_at(t) for t in range(500)]
+    assert schedule_a != schedule_b
+
+
+def test_only_one_chunk_resident():
+    """Memory stays O(chunk) no matter how far the episode runs."""
+    env = StreamingCyberDefenseEnv(time_horizon=1_000_000, seed=3, chunk_size=128)
+
+    for t in range(0, 10_000, 7):
+        env._scenario_at(t)
+
+    assert len(env._chunk_severity) == 128
+    assert not hasattr(env, "severity_schedule")
+
+
+def test_reset_rewinds_scenario():
+    """Reading the schedule twice yields identical values."""
+    env = StreamingCyberDefenseEnv(time_horizon=2000, seed=11, chunk_size=100)
+
+    first_pass = [env._scenario_at(t) for t in range(2000)]
+    env.reset()
+    second_pass = [env._scenario_at(t) for t in range(2000)]
+
+    assert first_pass == second_pass
+
+
+def test_escalation_rule_holds_across_chunks():
+    """Chunks fed one by one with the carried severity reproduce a single pass."""
+    horizon, chunk_size = 3000, 50
+    env = StreamingCyberDefenseEnv(time_horizon=horizon, seed=5, chunk_size=chunk_size)
+    single_pass = [env._scenario_at(t) for t in range(horizon)]
+    for severity, attack_type, confidence in single_pass:
+        assert 0 <= severity <= 2 and 0 <= attack_type <= 2 and confidence in (0, 1)
+
+    chunked, carry, carried_high = [], None, 0
+    for k in range(horizon // chunk_size):
+        severity, attack_type, confidence = env._generate_chunk(k, prev_severity=carry)
+        uncarried = env._generate_chunk(k, prev_severity=None)[0]
+        if carry == env.SEVERITY_HIGH and severity[0] == env.SEVERITY_HIGH != uncarried[0]:
+            carried_high += 1  # HIGH persisted only because the previous chunk ended HIGH
+        chunked.extend(zip(severity.tolist(), attack_type.tolist(), confidence.tolist()))
+        carry = int(severity[-1])
+    assert chunked == single_pass
+    assert carried_high > 0
+
+    # Out-of-order access (rewinds, jumps across several chunks) sees the same stream
+    other = StreamingCyberDefenseEnv(time_horizon=horizon, seed=5, chunk_size=chunk_size)
+    for t in (2999, 0, 1234, 49, 50, 51, 700, 699):
+        assert other._scenario_at(t) == single_pass[t]
+
+
+def test_chunks_follow_dynamics():
+    """Severity, escalation, attack type and confidence come from the env's dynamics."""
+    always_high = AttackDynamics(severity_probs=(0.0, 0.0, 1.0), escalation_prob=0.0,
+                                 attack_type_probs=(0.0, 0.0, 1.0), confidence_probs=(0.0, 0.0, 1.0))
+    env = StreamingCyberDefenseEnv(time_horizon=300, seed=3, chunk_size=64, dynamics=always_high)
+    assert {env._scenario_at(t) for t in range(300)} == {(env.SEVERITY_HIGH, env.TYPE_DOS, env.CONFIDENCE_HIGH)}
+
+    never_high = always_high._replace(severity_probs=(1.0, 0.0, 0.0), escalation_prob=1.0,
+                                      confidence_probs=(0.0, 1.0, 1.0))
+    env = StreamingCyberDefenseEnv(time_horizon=300, seed=3, chunk_size=64, dynamics=never_high)
+    assert {env._scenario_at(t) for t in range(300)} == {(env.SEVERITY_LOW, env.TYPE_DOS, env.CONFIDENCE_LOW)}
+
+    dynamics = next(p.dynamics for p in ENV_PRESETS.values() if p.dynamics.escalation_prob > 0.6)
+    horizon = 20000
+    preset = StreamingCyberDefenseEnv(time_horizon=horizon, seed=3, chunk_size=512, dynamics=dynamics)
+    default = StreamingCyberDefenseEnv(time_horizon=horizon, seed=3, chunk_size=512)
+
+    def high_share(stream):
+        return sum(stream._scenario_at(t)[0] == stream.SEVERITY_HIGH for t in range(horizon)) / horizon
+
+    assert high_share(preset) > high_share(default)
+
+
+def test_invalid_chunk_size_rejected():
+    """Chunk size must be positive."""
+    with pytest.raises(ValueError):
+        StreamingCyberDefenseEnv(time_horizon=100, seed=1, chunk_size=0)
+
+
+def test_executor_runs_past_fixed_horizon():
+    """Streaming mode lets execute_batch run max_steps without keeping steps."""
+    policy = {}
+    config = ExecutionConfig(
+        policy_hash="soak",
+        max_steps=3000,
+        speed_ms=0,
+        scenario_mode="streaming",
+        scenario_chunk_size=256,
+        retain_steps=False
+    )
+    env = create_execution_env(seed=42, config=config)
+    executor = LivePolicyExecutor(env, policy, config)
+
+    steps = executor.execute_batch()
+    summary = executor.get_summary()
+
+    assert steps == []
+    assert env.time_horizon == config.max_steps
+    assert summary["total_steps"] == env.current_step
+    # Run ends at max_steps unless the system was compromised first
+    assert (
+        summary["total_steps"] == config.max_steps
+        or env.system_health == env.HEALTH_CRITICAL
+    )
+
+
+def test_fixed_mode_unchanged():
+    """Fixed mode still uses the materialized 24-step environment."""
+    config = ExecutionConfig(policy_hash="fixed", max_steps=500, speed_ms=0)
+    env = create_execution_env(seed=42, config=config)
+    executor = LivePolicyExecutor(env, {}, config)
+
+    steps = executor.execute_batch()
+
+    assert len(steps) <= 24
+    assert executor.get_summary()["total_steps"] == len(steps)
@@ -0,0 +1,95 @@
+"""
+Hyperparameter Sweep Tests
+
+Tests for successive-halving sweeps over training hyperparameters.
+
+Test coverage:
+1. Search space expansion (grid, sampling, validation)
+2. Rung schedule
+3. Halving eliminates trials and writes a results file
+4. Results do not depend on the number of workers
+5. Surviving trials are submitted as verifiable claims
+"""
+
+import json
+
+import pytest
+
+from src.submission.collector import SubmissionCollector
+from src.training.sweep import DEFAULT_HYPERPARAMS, SweepEngine, expand_search_space, halving_schedule
+from src.verifier.verifier import PolicyVerifier, VerificationStatus
+
+
+SPACE = {"alpha": [0.1, 0.5], "gamma": [0.9, 0.95]}
+
+
+def _engine(workers=2):
+    return SweepEngine(max_workers=workers, min_episodes=15, max_episodes=60, eta=2, seed=7)
+
+
+def test_expand_search_space():
+    """Full grid, sampled subset and unknown-parameter errors."""
+    grid = expand_search_space(SPACE)
+    assert len(grid) == 4
+    assert all(p["epsilon_decay"] == DEFAULT_HYPERPARAMS["epsilon_decay"] for p in grid)
+    assert {(p["alpha"], p["gamma"]) for p in grid} == {(0.1, 0.9), (0.1, 0.95), (0.5, 0.9), (0.5, 0.95)}
+
+    sampled = expand_search_space(SPACE, num_trials=3, seed=1)
+    assert len(sampled) == 3 and sampled == expand_search_space(SPACE, num_trials=3, seed=1)
+
+    with pytest.raises(ValueError):
+        expand_search_space({"learning_rate": [0.1]})
+
+
+def test_halving_schedule():
+    """Budgets grow by eta and end at max_episodes."""
+    assert halving_schedule(200, 1800, 3) == [200, 600, 1800]
+    assert halving_schedule(100, 500, 2) == [100, 200, 400, 500]
+    with pytest.raises(ValueError):
+        halving_schedule(100, 50, 2)
+
+
+def test_sweep_halves_and_writes_results(tmp_path):
+    """4 trials → 2 → 1; the results file lists every trial."""
+    engine = _engine()
+    trials = engine.build_trials(expand_search_space(SPACE), env_seed=3, time_horizon=12)
+    events = []
+
+    result = engine.run(trials, results_path=str(tmp_path / "sweep.json"), on_progress=events.append)
+
+    assert [len(e["survivors"]) for e in events] == [2, 1]
+    assert result.best.eliminated_at_rung is None
+    assert result.best.episodes_trained == 30
+    assert sorted(r.eliminated_at_rung for r in result.results if r.eliminated_at_rung is not None) == [0, 0, 1]
+    for r in result.results:
+        rungs_reached = 2 if r.eliminated_at_rung is None else r.eliminated_at_rung + 1
+        assert len(r.scores) == rungs_reached
+
+    saved = json.loads((tmp_path / "sweep.json").read_text())
+    assert len(saved["trials"]) == 4
+    assert saved["best"]["trial_id"] == result.best.trial.trial_id
+
+
+def test_sweep_independent_of_workers():
+    """Per-trial RNG streams make scores identical for 1 or 2 workers."""
+    trials = SweepEngine.build_trials(expand_search_space(SPACE), env_seed=3, time_horizon=12)
+
+    one = _engine(workers=1).run(trials)
+    two = _engine(workers=2).run(trials)
+
+    assert [(r.trial.trial_id, r.scores) for r in one.results] == [(r.trial.trial_id, r.scores) for r in two.results]
+
+
+def test_sweep_claims_verify():
+    """Survivors become claims that pass verification."""
+    engine = _engine()
+    trials = engine.build_trials(expand_search_space(SPACE), env_seed=3, time_horizon=12)
+    collector = SubmissionCollector()
+
+    result = engine.run(trials, collector=collector, agent_prefix="tune")
+
+    submissions = collector.get_all_submissions()
+    assert len(submissions) == 1
+    claim = submissions[0].claim
+    assert claim.agent_id == f"tune_trial_{result.best.trial.trial_id}"
+    assert PolicyVerifier().verify(claim).status == VerificationStatus.VALID
@@ -0,0 +1,127 @@
+"""
+Trajectory Digest Tests
+
+Tests for per-step replay digests and divergence bisection.
+
+Test coverage:
+1. Claims carry a digest that the verifier's replay reproduces
+2. Bisection finds the first divergent step with prefix-only replays
+3. Determinism checks compare digests of single-episode replays
+4. Live sessions record the digest; INVALID results name the divergent step
+"""
+
+import asyncio
+
+import pytest
+
+from src.agent.runner import run_agent
+from src.agent.trajectory import TrajectoryDigest, first_divergence
+from src.agent.runner import PolicyClaim
+from src.environments.env_spec import EnvSpec
+from src.ledger.policy_store import PolicyStore
+from src.training.live_trainer import LiveTrainingManager
+from src.verifier.jobs import result_to_dict
+from src.verifier.verifier import PolicyVerifier, VerificationStatus
+
+
+@pytest.fixture(scope="module")
+def claim():
+    return run_agent(agent_id="trajectory_agent", seed=11, episodes=40, time_horizon=12)
+
+
+def test_claim_digest_reproduced(claim):
+    """The claimed episode's digest matches an independent replay."""
+    digest = claim.trajectory
+    assert 1 <= digest.steps <= 12 and len(digest.step_hashes) == digest.steps
+    assert TrajectoryDigest.from_dict(digest.to_dict()) == digest
+
+    verifier = PolicyVerifier()
+    policy = verifier._load_policy(claim.policy_artifact)
+    assert verifier.trajectory_digest(claim.env_id, policy).matches(digest)
+    assert verifier.locate_divergence(claim) is None
+
+
+def test_bisection_finds_first_divergent_step(claim, monkeypatch):
+    """A tampered step is located exactly, replaying only prefixes."""
+    steps = claim.trajectory.steps
+    for step in (1, steps // 2, steps):
+        hashes = list(claim.trajectory.step_hashes)
+        for k in range(step - 1, len(hashes)):
+            hashes[k] = "f" * len(hashes[k])  # Rolling hash: everything after the divergence differs
+        tampered = claim._replace(trajectory=claim.trajectory._replace(step_hashes=tuple(hashes)))
+
+        verifier = PolicyVerifier()
+        limits = []
+        replay = verifier._replay_episode
+
+        def counted(spec, policy, recorder=None, step_limit=None):
+            limits.append(step_limit)
+            return replay(spec, policy, recorder, step_limit)
+
+        monkeypatch.setattr(verifier, "_replay_episode", counted)
+        divergence = verifier.locate_divergence(tampered)
+        assert divergence.step == step
+        assert divergence.actual_hash == claim.trajectory.step_hash(step)
+        assert divergence.state is not None and divergence.action is not None
+        assert len(limits) <= 5 and all(limit <= steps for limit in limits)
+
+    longer = claim._replace(trajectory=claim.trajectory._replace(
+        steps=steps + 1, step_hashes=claim.trajectory.step_hashes + ("0" * 16,)))
+    divergence = PolicyVerifier().locate_divergence(longer)
+    assert divergence.step == steps + 1 and divergence.actual_hash is None and divergence.state is None
+
+    assert first_divergence(8, lambda k: k < 5, lambda k: True) == 5
+    assert first_divergence(8, lambda k: True, lambda k: True) is None
+
+
+def test_determinism_uses_digests(claim, monkeypatch):
+    """Determinism replays one episode per run and detects step-level differences."""
+    verifier = PolicyVerifier()
+    assert verifier.verify_determinism(claim, num_runs=3)
+
+    digests = iter([claim.trajectory, claim.trajectory._replace(final_hash="0" * 64)])
+    monkeypatch.setattr(verifier, "trajectory_digest", lambda env_id, policy: next(digests))
+    assert not verifier.verify_determinism(claim, num_runs=2)
+
+
+def test_live_session_claim_explains_invalid_results(tmp_path, no_sleep, monkeypatch):
+    """The live evaluation digest replays exactly; INVALID results say where (or whether) replay departs."""
+    monkeypatch.setattr("src.ledger.policy_store.default_policy_store", lambda: PolicyStore(tmp_path / "policies"))
+
+    async def ignore(_data):
+        return None
+
+    manager = LiveTrainingManager(tmp_path / "checkpoints")
+    asyncio.run(manager.start_training(
+        agent_id="live_digest", seed=4, max_episodes=15, callback=ignore,
+        config={"auto_stop": False, "checkpoint_every": 0}, env_type="short_burst",
+    ))
+    session = manager.get_session_state("live_digest")
+    store = PolicyStore(tmp_path / "policies")
+    claim = PolicyClaim(
+        agent_id="live_digest",
+        env_id=EnvSpec.from_env_config(session.seed, session.env_config).env_id,
+        policy_hash=session.final_policy_hash,
+        policy_artifact=store.artifact_bytes(session.final_policy_hash),
+        claimed_reward=session.final_reward,
+        trajectory=session.final_trajectory,
+    )
+    verifier = PolicyVerifier()
+    assert session.final_trajectory.steps > 0
+    assert verifier.verify(claim).status == VerificationStatus.VALID
+    assert verifier.locate_divergence(claim) is None
+
+    inflated = verifier.verify(claim._replace(claimed_reward=claim.claimed_reward + 50.0))
+    assert inflated.status == VerificationStatus.INVALID and inflated.divergence is None
+    assert "reproduces the claimed trajectory" in inflated.reason
+
+    hashes = list(claim.trajectory.step_hashes)
+    hashes[2:] = ["f" * len(h) for h in hashes[2:]]
+    forged = claim._replace(claimed_reward=claim.claimed_reward + 50.0,
+                            trajectory=claim.trajectory._replace(step_hashes=tuple(hashes)))
+    result = verifier.verify(forged)
+    assert result.divergence.step == 3 and "step 3" in result.reason
+    assert result_to_dict(result)["divergence"]["step"] == 3
+
+    no_digest = verifier.verify(claim._replace(claimed_reward=claim.claimed_reward + 50.0, trajectory=None))
+    assert no_digest.divergence is None and "trajectory" not in no_digest.reason
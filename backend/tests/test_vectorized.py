@@ -0,0 +1,153 @@
+"""
+Vectorized Q-Learning Tests
+
+Tests for lockstep Double Q-Learning over batched cyber defense envs.
+
+Test coverage:
+1. Flat state encoding round-trips every cyber state
+2. Greedy batch selection matches select_action_double_q
+3. Conflicting updates to one cell are averaged, independent of batch order
+4. Single-transition update matches the dict Double-Q rule
+5. Training is deterministic and yields an extract_policy-compatible policy
+6. Exploration decays per episode, ending where sequential train() ends
+"""
+
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+from src.agent.state import (
+    CYBER_STATE_SHAPE,
+    NUM_CYBER_STATES,
+    encode_cyber_states,
+    decode_cyber_state,
+)
+from src.agent.double_q_learning import select_action_double_q
+from src.agent.policy import extract_policy
+from src.agent.trainer import train
+from src.agent.vectorized import (
+    initialize_q_arrays,
+    select_actions_batch,
+    update_double_q_batch,
+    train_vectorized,
+    merge_q_arrays,
+    _scatter_mean_update,
+)
+from src.environments.batch_env import BatchCyberDefenseEnv
+from src.environments.cyber_env import CyberDefenseEnv
+from src.shared.config import GAMMA
+
+
+def test_state_encoding_round_trip():
+    """Every cyber state maps to a unique index and back."""
+    states = np.array(list(itertools.product(*[range(n) for n in CYBER_STATE_SHAPE])))
+    indices = encode_cyber_states(states)
+
+    assert sorted(indices.tolist()) == list(range(NUM_CYBER_STATES))
+    for state, index in zip(states, indices):
+        assert decode_cyber_state(int(index)) == tuple(state)
+
+
+def test_greedy_selection_matches_dict_version():
+    """With epsilon=0 the batch picks the same action as the dict selector."""
+    rng = np.random.default_rng(0)
+    q_a, q_b, _ = initialize_q_arrays()
+    # Coarse values so ties actually occur
+    q_a[:] = rng.integers(0, 3, size=q_a.shape)
+    q_b[:] = rng.integers(0, 3, size=q_b.shape)
+
+    table_a = {(decode_cyber_state(s), a): q_a[s, a] for s in range(NUM_CYBER_STATES) for a in range(5)}
+    table_b = {(decode_cyber_state(s), a): q_b[s, a] for s in range(NUM_CYBER_STATES) for a in range(5)}
+
+    states = np.arange(NUM_CYBER_STATES)
+    actions = select_actions_batch(states, q_a, q_b, epsilon=0.0, rng=rng)
+
+    for s, action in zip(states, actions):
+        assert action == select_action_double_q(decode_cyber_state(int(s)), table_a, table_b, epsilon=0.0)
+
+
+def test_conflicting_updates_are_averaged_and_order_free():
+    """Three updates to one cell move it by alpha × mean TD, in any order."""
+    base = np.zeros((4, 2))
+    states = np.array([1, 1, 1, 3])
+    actions = np.array([0, 0, 0, 1])
+    td_errors = np.array([1.0, 2.0, 6.0, -4.0])
+
+    forward = base.copy()
+    _scatter_mean_update(forward, states, actions, td_errors, alpha=0.5)
+    permuted = base.copy()
+    order = np.array([3, 2, 0, 1])
+    _scatter_mean_update(permuted, states[order], actions[order], td_errors[order], alpha=0.5)
+
+    assert forward[1, 0] == 0.5 * 3.0
+    assert forward[3, 1] == 0.5 * -4.0
+    assert np.array_equal(forward, permuted)
+
+
+def test_single_transition_matches_double_q_rule():
+    """One transition updates exactly one table with the Double-Q target."""
+    q_a, q_b, visits = initialize_q_arrays(optimistic_value=0.0)
+    q_a[7] = [0.0, 3.0, 1.0, 0.0, 0.0]   # Q_A prefers action 1 in next state
+    q_b[7] = [0.0, 2.0, 0.0, 0.0, 5.0]   # Q_B prefers action 4 in next state
+
+    seed = 11
+    coin_a = np.random.default_rng(seed).random(1)[0] < 0.5
+    update_double_q_batch(
+        q_a, q_b,
+        states=np.array([2]), actions=np.array([3]), rewards=np.array([1.0]),
+        next_states=np.array([7]), dones=np.array([False]),
+        rng=np.random.default_rng(seed), alpha=0.5, visits=visits,
+    )
+
+    if coin_a:
+        assert q_a[2, 3] == 0.5 * (1.0 + GAMMA * 2.0)  # Q_B evaluates Q_A's argmax
+        assert q_b[2, 3] == 0.0
+    else:
+        assert q_b[2, 3] == 0.5 * (1.0 + GAMMA * 3.0)  # Q_A evaluates Q_B's argmax
+        assert q_a[2, 3] == 0.0
+    assert visits[2, 3] == 1
+
+
+def test_training_deterministic_and_policy_format():
+    """Same seeds → same tables; merged tables feed extract_policy."""
+    def run():
+        batch = BatchCyberDefenseEnv.from_seeds(list(range(32)))
+        return train_vectorized(batch, episodes=32 * 10, seed=5)
+
+    q_a1, q_b1, stats1 = run()
+    q_a2, q_b2, stats2 = run()
+
+    assert np.array_equal(q_a1, q_a2) and np.array_equal(q_b1, q_b2)
+    assert stats1["episodes_trained"] == 320
+    assert stats1["transitions"] == int(stats1["visits"].sum())
+
+    policy = extract_policy(merge_q_arrays(q_a1, q_b1, stats1["visits"]))
+    assert policy
+    for state, action in policy.items():
+        assert len(state) == 5
+        assert 0 <= action < 5
+
+
+def test_shared_dynamics_batch_trains():
+    """Shared-Generator dynamics mode runs the same training loop."""
+    batch = BatchCyberDefenseEnv.from_seeds(list(range(64)), dynamics_seed=0)
+    _, _, stats = train_vectorized(batch, episodes=64 * 5, seed=1)
+
+    assert stats["transitions"] > 0
+    assert len(stats["reward_history"]) == 5
+
+
+def test_epsilon_schedule_matches_sequential_train():
+    """Same episode budget → same final epsilon, whatever the batch size."""
+    episodes = 320
+    _, _, sequential = train(CyberDefenseEnv(time_horizon=12, seed=0), episodes,
+                             stopping_rules=[], rng=random.Random(0))
+    assert sequential["episodes_trained"] == episodes
+
+    for n_envs in (1, 8, 32):
+        batch = BatchCyberDefenseEnv.from_seeds(list(range(n_envs)), time_horizon=12)
+        _, _, stats = train_vectorized(batch, episodes=episodes, seed=0)
+        assert stats["episodes_trained"] == episodes
+        assert stats["final_epsilon"] == pytest.approx(sequential["final_epsilon"])
@@ -0,0 +1,85 @@
+"""
+Verification Cache Tests
+
+Tests for reusing deterministic replay results across verifications.
+
+Test coverage:
+1. Identical policies are replayed once; claims are still compared each time
+2. The cache persists to disk and the verifier version is part of the key
+3. Invalidation by policy, by stale version, or entirely
+"""
+
+import pytest
+
+from src.agent.runner import run_agent
+from src.verifier.cache import VerificationCache
+from src.verifier.verifier import PolicyVerifier, VerificationStatus
+
+
+@pytest.fixture(scope="module")
+def claim():
+    return run_agent(agent_id="cache_agent", seed=5, episodes=40, time_horizon=12)
+
+
+def _counting_verifier(cache, monkeypatch):
+    verifier = PolicyVerifier(reward_threshold=1e-6, cache=cache)
+    calls = []
+    replay = verifier._replay_policy
+
+    def counted(env_id, policy, on_episode=None):
+        calls.append(env_id)
+        return replay(env_id, policy, on_episode)
+
+    monkeypatch.setattr(verifier, "_replay_policy", counted)
+    return verifier, calls
+
+
+def test_identical_policy_replayed_once(claim, monkeypatch):
+    """A second agent with the same policy hits the cache; a false claim still fails."""
+    cache = VerificationCache()
+    verifier, calls = _counting_verifier(cache, monkeypatch)
+
+    first = verifier.verify(claim)
+    second = verifier.verify(claim._replace(agent_id="copycat"))
+    inflated = verifier.verify(claim._replace(agent_id="liar", claimed_reward=claim.claimed_reward + 50))
+
+    assert len(calls) == 1
+    assert first.status == second.status == VerificationStatus.VALID
+    assert second.verified_reward == first.verified_reward
+    assert inflated.status == VerificationStatus.INVALID
+    assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 1
+
+    tampered = claim._replace(policy_artifact=claim.policy_artifact + b" ")
+    assert verifier.verify(tampered).status == VerificationStatus.INVALID  # Hash check runs before the cache
+    assert cache.stats()["hits"] == 2
+
+
+def test_persistence_and_versioning(claim, tmp_path, monkeypatch):
+    """A new process reuses results; a bumped verifier version does not."""
+    path = tmp_path / "verification_cache.json"
+    PolicyVerifier(cache=VerificationCache(path)).verify(claim)
+
+    verifier, calls = _counting_verifier(VerificationCache(path), monkeypatch)
+    verifier.verify(claim)
+    assert calls == []
+
+    bumped, calls = _counting_verifier(VerificationCache(path, verifier_version="2"), monkeypatch)
+    bumped.verify(claim)
+    assert len(calls) == 1
+
+
+def test_invalidation(claim, tmp_path):
+    """Entries can be dropped per policy, for stale versions, or all at once."""
+    path = tmp_path / "verification_cache.json"
+    old = VerificationCache(path, verifier_version="1")
+    old.put(claim.policy_hash, claim.env_id, 20, 1.5)
+    old.put("other", claim.env_id, 20, 2.5)
+
+    current = VerificationCache(path, verifier_version="2")
+    current.put(claim.policy_hash, claim.env_id, 20, 1.75)
+    assert len(current) == 3
+    assert current.invalidate(stale_only=True) == 2
+    assert current.get(claim.policy_hash, claim.env_id, 20) == 1.75
+
+    assert current.invalidate(policy_hash=claim.policy_hash) == 1
+    assert len(VerificationCache(path, verifier_version="2")) == 0
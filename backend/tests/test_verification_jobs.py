@@ -0,0 +1,97 @@
+"""
+Verification Job Tests
+
+Tests for background verification jobs with streamed progress.
+
+Test coverage:
+1. Observers of the same agent share one job and receive progress then the result
+2. Cancellation stops replay and records nothing
+3. Late observers catch up on the latest progress and the final result
+"""
+
+import asyncio
+
+import pytest
+
+from src.agent.runner import run_agent
+from src.verifier.jobs import VerificationJobManager
+from src.verifier.sequential import SequentialTest
+from src.verifier.verifier import PolicyVerifier
+
+
+@pytest.fixture(scope="module")
+def claim():
+    return run_agent(agent_id="job_agent", seed=3, episodes=40, time_horizon=12)
+
+
+async def _drain(queue):
+    events = []
+    while True:
+        event = await queue.get()
+        events.append(event)
+        if event["type"] != "verification_progress" and event["type"] != "verification_started":
+            return events
+
+
+def test_observers_share_one_job(claim):
+    """Starting twice joins the running job; both observers see identical streams."""
+    verifier = PolicyVerifier(reward_threshold=1e-6)
+    calls = []
+    verify = verifier.verify
+    verifier.verify = lambda *args: calls.append(args[0]) or verify(*args)
+    manager = VerificationJobManager(verifier)
+    recorded = []
+
+    async def scenario():
+        job = manager.start(claim, on_result=recorded.append)
+        assert manager.start(claim) is job
+        first, second = job.subscribe(), job.subscribe()
+        return await asyncio.gather(_drain(first), _drain(second))
+
+    first, second = asyncio.run(scenario())
+    assert len(calls) == 1 and len(recorded) == 1
+    assert first == second
+    assert first[0]["type"] == "verification_started"
+    progress = [e for e in first if e["type"] == "verification_progress"]
+    assert [e["episodes"] for e in progress] == [4, 8, 12, 16, 20]
+    assert progress[-1]["eta_seconds"] == 0
+    assert progress[-1]["ci_lower"] <= progress[-1]["running_mean"] <= progress[-1]["ci_upper"]
+    assert first[-1]["type"] == "verification_complete"
+    assert first[-1]["result"]["status"] == "VALID"
+    assert first[-1]["result"]["verified_reward"] == pytest.approx(progress[-1]["running_mean"])
+
+
+def test_cancellation(claim):
+    """A cancelled job ends with verification_cancelled and never runs its hook."""
+    manager = VerificationJobManager(PolicyVerifier())
+    recorded = []
+
+    async def scenario():
+        job = manager.start(claim, on_result=recorded.append)
+        queue = job.subscribe()
+        assert manager.cancel(claim.agent_id)
+        events = await _drain(queue)
+        await job.task
+        return job, events
+
+    job, events = asyncio.run(scenario())
+    assert events[-1]["type"] == "verification_cancelled"
+    assert job.status == "cancelled" and job.result is None
+    assert recorded == []
+    assert not manager.cancel(claim.agent_id)
+
+
+def test_late_observer_catches_up(claim):
+    """An observer joining after completion receives the latest progress and the result."""
+    manager = VerificationJobManager(PolicyVerifier(reward_threshold=1e-6, sequential=SequentialTest()))
+
+    async def scenario():
+        job = manager.start(claim)
+        await job.task
+        return job, await _drain(job.subscribe())
+
+    job, events = asyncio.run(scenario())
+    assert [e["type"] for e in events] == ["verification_progress", "verification_complete"]
+    assert events[0]["episodes"] == SequentialTest().min_episodes
+    assert events[1]["result"]["episodes"] == job.result.episodes
+    assert job.subscribers == set()
@@ -0,0 +1,121 @@
+"""
+Warm Start Tests
+
+Tests for seeding training from a ledger policy or a session checkpoint.
+
+Test coverage:
+1. Seeded Q-tables reproduce the source policy greedily; episodes-saved arithmetic
+2. Policy warm start requires a ledger entry and records provenance in the artifact
+3. Live sessions warm-start from a checkpoint and report episodes saved
+4. Invalid source combinations are rejected
+5. Sources trained on another environment are rejected
+"""
+
+import asyncio
+
+import pytest
+
+from src.agent.policy import extract_policy
+from src.agent.runner import run_agent
+from src.environments.env_spec import EnvSpec
+from src.ledger.ledger import PolicyLedger
+from src.ledger.policy_store import default_policy_store
+from src.shared.config import EPSILON_START, WARM_START_EPSILON
+from src.training.live_trainer import LiveTrainingManager
+from src.training.warm_start import (
+    WarmStart, check_warm_start_env, episodes_saved, exploration_episodes, load_warm_start,
+    policy_to_q_tables, warm_start_from_checkpoint, warm_start_from_policy
+)
+
+
+def test_policy_tables_and_episode_arithmetic():
+    """Greedy action of the seeded tables is the policy's action."""
+    policy = {(0, 1, 2, 0, 1): 3, (2, 2, 0, 1, 0): 1}
+    q_table_a, q_table_b = policy_to_q_tables(policy)
+
+    assert extract_policy(q_table_a) == policy
+    assert q_table_a == q_table_b
+    assert exploration_episodes(EPSILON_START) == 919
+    assert exploration_episodes(0.005) == 0
+    assert episodes_saved(WARM_START_EPSILON) == 919 - exploration_episodes(WARM_START_EPSILON) > 0
+
+
+def test_policy_warm_start_requires_ledger_and_records_provenance(tmp_path):
+    """Only ledger policies seed training; the new artifact names its source."""
+    source = run_agent(agent_id="warm_source", seed=3, episodes=60, time_horizon=12)
+    ledger = PolicyLedger(str(tmp_path / "ledger.json"))
+
+    with pytest.raises(ValueError):
+        warm_start_from_policy(source.policy_hash, ledger=ledger)
+
+    ledger.append(source.policy_hash, source.claimed_reward, "warm_source")
+    warm_start = warm_start_from_policy(source.policy_hash, ledger=ledger)
+    assert warm_start.provenance["verified_reward"] == source.claimed_reward
+
+    claim = run_agent(agent_id="warm_child", seed=3, episodes=30, time_horizon=12, warm_start=warm_start)
+    metadata = default_policy_store().get(claim.policy_hash)["metadata"]
+
+    assert metadata["warm_start"]["source"] == "policy"
+    assert metadata["warm_start"]["policy_hash"] == source.policy_hash
+    assert metadata["warm_start"]["episodes_saved"] == episodes_saved(WARM_START_EPSILON)
+
+
+def test_live_session_warm_starts_from_checkpoint(tmp_path, no_sleep):
+    """A new session starts from checkpointed tables and reports the saving."""
+    messages = []
+
+    async def collect(data):
+        messages.append(data)
+
+    manager = LiveTrainingManager(tmp_path)
+
+    asyncio.run(manager.start_training(
+        agent_id="warm_ckpt", seed=5, max_episodes=30, callback=collect,
+        config={"auto_stop": False, "checkpoint_every": 1000}, env_type="short_burst",
+    ))
+    checkpoint_path = manager.checkpoint_path_for("warm_ckpt")
+    assert checkpoint_path.exists()
+
+    warm_start = warm_start_from_checkpoint(str(checkpoint_path))
+    assert warm_start.provenance["episodes_completed"] == 30
+
+    messages.clear()
+    asyncio.run(manager.start_training(
+        agent_id="warm_live", seed=6, max_episodes=1, callback=collect,
+        config={"auto_stop": False, "checkpoint_every": 0}, env_type="short_burst", warm_start=warm_start,
+    ))
+    state = manager.get_session_state("warm_live")
+    final = next(m for m in messages if m.get("type") == "training_complete")
+
+    assert state.episodes_completed == 1
+    assert len(state.q_table_a) >= len(warm_start.q_table_a)
+    assert state.epsilon <= WARM_START_EPSILON
+    assert final["warm_start"]["source"] == "checkpoint"
+    assert final["episodes_saved"] == episodes_saved(WARM_START_EPSILON)
+
+
+def test_invalid_sources_rejected(tmp_path):
+    """Both sources at once, or a missing checkpoint, fail loudly."""
+    with pytest.raises(ValueError):
+        load_warm_start(policy_hash="abc", checkpoint_path=str(tmp_path / "x.npz"))
+    with pytest.raises(FileNotFoundError):
+        load_warm_start(checkpoint_path=str(tmp_path / "missing.npz"))
+    assert load_warm_start() is None
+
+
+def test_env_mismatch_rejected(tmp_path):
+    """A source from another env class, or with tables that do not fit, cannot seed training."""
+    source = run_agent(agent_id="warm_pressure", seed=3, episodes=20, time_horizon=12, preset="high_pressure")
+    ledger = PolicyLedger(str(tmp_path / "ledger.json"))
+    ledger.append(source.policy_hash, source.claimed_reward, "warm_pressure", env_config={"env_id": source.env_id})
+
+    same = load_warm_start(source.policy_hash, ledger=ledger, target=EnvSpec.cyber(9, 24, "high_pressure"))
+    assert same.source_spec == EnvSpec.parse(source.env_id)
+    with pytest.raises(ValueError, match="different environment"):
+        load_warm_start(source.policy_hash, ledger=ledger, target=EnvSpec.cyber(9, 24, "standard"))
+
+    q_table_a, q_table_b = policy_to_q_tables({(0, 1, 2, 0, 1): 4})
+    unrecorded = WarmStart(q_table_a, q_table_b, WARM_START_EPSILON, {"source": "policy"})
+    check_warm_start_env(unrecorded, EnvSpec.cyber(1, 24))
+    with pytest.raises(ValueError, match="does not fit"):
+        check_warm_start_env(unrecorded, EnvSpec("energy_slot", 1, 24))